@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Capture engine benchmark for Camera Dashboard.
+
+Compares the two capture scheduling models on simulated cameras (pipes fed
+at the camera frame rate by one producer thread, each write carrying its
+timestamp):
+
+- threads: one thread per camera that blocks until a frame is ready, takes
+  it, then sleeps 1 ms - the CaptureWorker grab() + msleep(1) loop
+- engine: every camera's descriptor registered with a CaptureEngine,
+  handlers dispatched only on readiness
+
+Reports the process's context switches per second (summed over all
+threads from /proc/self/task/*/status) and the mean/max delay from
+"frame ready" to "frame taken" per model.
+
+Usage:
+    python benchmarks/capture_engine_bench.py [--cameras 4] [--fps 30] [--seconds 5] [--aligned]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from core.capture_engine import CaptureEngine  # noqa: E402
+from core.performance import read_context_switches  # noqa: E402
+
+_STAMP = struct.Struct("d")
+
+
+def _produce(
+    writers: list[int], fps: float, aligned: bool, stop: threading.Event
+) -> None:
+    """Write a timestamp to every camera pipe at ``fps``.
+
+    Unless ``aligned``, cameras are phase-shifted evenly across the frame
+    interval, as free-running USB cameras are.
+    """
+    groups = [writers] if aligned else [[w] for w in writers]
+    interval = 1.0 / fps / len(groups)
+    next_tick = time.monotonic()
+    while not stop.is_set():
+        for group in groups:
+            for w in group:
+                os.write(w, _STAMP.pack(time.monotonic()))
+            next_tick += interval
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+
+def _take(fd: int, delays: list[float]) -> None:
+    """Read every pending frame stamp from ``fd`` and record its delay."""
+    try:
+        data = os.read(fd, 4096)
+    except BlockingIOError:
+        return
+    now = time.monotonic()
+    for (stamp,) in _STAMP.iter_unpack(data[: len(data) - len(data) % _STAMP.size]):
+        delays.append(now - stamp)
+
+
+def _thread_loop(fd: int, delays: list[float], stop: threading.Event) -> None:
+    """Per-camera loop: block for a frame, take it, sleep 1 ms."""
+    while not stop.is_set():
+        readable, _, _ = select.select([fd], [], [], 0.5)
+        if readable:
+            _take(fd, delays)
+        time.sleep(0.001)
+
+
+def _ctx_total() -> int:
+    counts = read_context_switches() or {"voluntary": 0, "involuntary": 0}
+    return counts["voluntary"] + counts["involuntary"]
+
+
+def _run(
+    mode: str, cameras: int, fps: float, seconds: float, aligned: bool
+) -> tuple[float, float, float]:
+    """Run one model; return (context switches/s, mean delay ms, max delay ms)."""
+    pipes = [os.pipe() for _ in range(cameras)]
+    for r, _ in pipes:
+        os.set_blocking(r, False)
+    delays: list[list[float]] = [[] for _ in range(cameras)]
+    stop = threading.Event()
+    engine = None
+    threads = []
+    if mode == "engine":
+        engine = CaptureEngine(1)
+        for (r, _), camera_delays in zip(pipes, delays):
+            engine.register(r, lambda fd=r, d=camera_delays: (_take(fd, d), True)[1])
+    else:
+        for (r, _), camera_delays in zip(pipes, delays):
+            thread = threading.Thread(target=_thread_loop, args=(r, camera_delays, stop))
+            thread.start()
+            threads.append(thread)
+    producer = threading.Thread(
+        target=_produce, args=([w for _, w in pipes], fps, aligned, stop)
+    )
+
+    time.sleep(0.2)
+    start_ctx = _ctx_total()
+    start = time.monotonic()
+    producer.start()
+    time.sleep(seconds)
+    stop.set()
+    producer.join()
+    elapsed = time.monotonic() - start
+    ctx_rate = (_ctx_total() - start_ctx) / elapsed
+
+    for thread in threads:
+        thread.join()
+    if engine is not None:
+        engine.shutdown()
+    for r, w in pipes:
+        os.close(r)
+        os.close(w)
+    merged = [d for camera_delays in delays for d in camera_delays]
+    mean_ms = sum(merged) / len(merged) * 1000.0 if merged else 0.0
+    max_ms = max(merged) * 1000.0 if merged else 0.0
+    return ctx_rate, mean_ms, max_ms
+
+
+def main(argv: list[str]) -> int:
+    """Run both models and print a small results table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cameras", type=int, default=4)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument(
+        "--aligned", action="store_true", help="all cameras deliver at the same instant"
+    )
+    args = parser.parse_args(argv)
+
+    phase = "aligned" if args.aligned else "staggered"
+    print(
+        f"{args.cameras} cameras @ {args.fps:.0f} fps ({phase}), "
+        f"{args.seconds:.0f} s per model"
+    )
+    results = {}
+    for mode in ("threads", "engine"):
+        results[mode] = _run(mode, args.cameras, args.fps, args.seconds, args.aligned)
+        ctx_rate, mean_ms, max_ms = results[mode]
+        print(
+            f"  {mode:<8}: {ctx_rate:8.0f} ctx switches/s, "
+            f"ready->taken mean {mean_ms:6.3f} ms, max {max_ms:6.3f} ms"
+        )
+    if results["engine"][0] > 0:
+        print(f"  context switch reduction: {results['threads'][0] / results['engine'][0]:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Grid render benchmark for Camera Dashboard: label widgets vs compositor vs mosaic.
+
+Builds a grid of real CameraWidget tiles (no capture) under a plain
+container (render_mode = widgets) or a GridCompositor (render_mode =
+compositor), then times what the UI thread does per render tick: install
+a new frame in every tile, run each tile's render tick, and paint the
+window. Filling the frames (the capture workers' job) is not timed. The
+widgets path uploads each frame to a QPixmap and sets it on the tile's
+QLabel; the compositor draws each frame's QImage in one paintEvent;
+the mosaic mode (render_mode = mosaic) hands each frame to the background
+MosaicComposer and paints the one composed image. For the mosaic the
+composer thread's own time per composition is reported separately and
+the wait for it is not timed.
+
+Usage:
+    python benchmarks/compositor_bench.py [--cameras 4] [--width 640] [--height 480] [--ticks 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from PyQt6 import QtWidgets  # noqa: E402
+
+from core.frame_pool import FramePool  # noqa: E402
+from ui.compositor import GridCompositor  # noqa: E402
+from ui.frame_clock import get_frame_clock  # noqa: E402
+from ui.layout import get_smart_grid  # noqa: E402
+from ui.widgets import CameraWidget  # noqa: E402
+
+
+def _tick_ms(
+    mode: str, args: argparse.Namespace, app: QtWidgets.QApplication
+) -> tuple[float, float]:
+    """Return mean UI-thread ms per render tick and composer ms for one mode."""
+    container = GridCompositor() if mode != "widgets" else QtWidgets.QWidget()
+    if mode == "mosaic":
+        container.enable_mosaic(max_fps=30)
+    layout = QtWidgets.QGridLayout(container)
+    rows, cols = get_smart_grid(args.cameras)
+    tiles = []
+    for i in range(args.cameras):
+        tile = CameraWidget(1, 1, stream_link=None, parent=container, enable_capture=False)
+        # Ticks are driven by hand below, not by the frame clock.
+        get_frame_clock().unregister(tile)
+        layout.addWidget(tile, i // cols, i % cols)
+        tiles.append(tile)
+    container.resize(args.width * cols, args.height * rows)
+    container.show()
+    app.processEvents()
+
+    rng = np.random.default_rng(0)
+    pool = FramePool(3 * args.cameras)
+
+    def capture() -> list:
+        """Stand in for the capture workers: one new frame per tile."""
+        leases = []
+        for tile in tiles:
+            # Frames arrive at the tile's size, as negotiated with the worker.
+            size = tile.video_rect().size()
+            lease = pool.lease((size.height(), size.width(), 3))
+            lease.array[...] = rng.integers(0, 256, 3, dtype=np.uint8)
+            leases.append(lease)
+        return leases
+
+    def render(leases: list) -> float:
+        """Run the UI thread's share and return its wall-clock seconds.
+
+        That is every tile's render tick, then painting the window. The
+        wait for the mosaic composer in between is not counted.
+        """
+        start = time.perf_counter()
+        for tile, lease in zip(tiles, leases):
+            tile.on_frame(lease)
+            tile._render_latest_frame()
+        elapsed = time.perf_counter() - start
+        paints = container.stats()["paints"] if mode != "widgets" else 0
+        if mode == "mosaic":
+            while container.composer.stats()["compositions"] == 0 or not (
+                container.composer.mailbox.has_pending()
+            ):
+                time.sleep(0.0002)
+        start = time.perf_counter()
+        if mode == "mosaic":
+            # Deliver the composer's wake-up, then paint what it marked dirty.
+            while container.stats()["paints"] == paints:
+                app.processEvents()
+        else:
+            app.processEvents()
+        return elapsed + time.perf_counter() - start
+
+    for _ in range(5):
+        render(capture())
+    elapsed = 0.0
+    for _ in range(args.ticks):
+        elapsed += render(capture())
+    compose_ms = container.stats()["compose_ms"] if mode == "mosaic" else 0.0
+
+    for tile in tiles:
+        tile._release_current_frame()
+        tile.cleanup()
+    if mode != "widgets":
+        container.shutdown()
+    container.close()
+    return elapsed * 1000.0 / args.ticks, compose_ms
+
+
+def main(argv: list[str]) -> int:
+    """Run the benchmark and print a small results table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cameras", type=int, default=4)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--ticks", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    app = QtWidgets.QApplication(sys.argv[:1])
+    widgets_ms, _ = _tick_ms("widgets", args, app)
+    compositor_ms, _ = _tick_ms("compositor", args, app)
+    mosaic_ms, compose_ms = _tick_ms("mosaic", args, app)
+
+    print(f"{args.cameras} cameras, {args.width}x{args.height} tiles, {args.ticks} ticks")
+    print(f"  render_mode=widgets    : {widgets_ms:7.3f} ms/tick "
+          f"({widgets_ms / args.cameras:6.3f} ms/frame)")
+    print(f"  render_mode=compositor : {compositor_ms:7.3f} ms/tick "
+          f"({compositor_ms / args.cameras:6.3f} ms/frame)")
+    print(f"  render_mode=mosaic     : {mosaic_ms:7.3f} ms/tick "
+          f"({mosaic_ms / args.cameras:6.3f} ms/frame, composer thread "
+          f"{compose_ms:.3f} ms/mosaic)")
+    if compositor_ms > 0 and mosaic_ms > 0:
+        print(f"  UI thread speedup      : {widgets_ms / compositor_ms:7.2f}x compositor, "
+              f"{widgets_ms / mosaic_ms:.2f}x mosaic")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Render scheduling benchmark for Camera Dashboard: per-tile timers vs FrameClock.
+
+Counts UI-thread timer wake-ups per second for a grid of tiles, once with
+the old scheme (every tile runs a render timer at its UI rate, a 5 s status
+timer and a 1 s FPS timer) and once with the shared FrameClock. Each mode
+runs twice: idle (no camera delivers frames) and streaming (every camera
+delivers frames at --camera-fps from its own simulated worker). The
+simulated workers' own timers are not counted. Renders are counted too, to
+show the clock draws every frame the timers did.
+
+Usage:
+    python benchmarks/frame_clock_bench.py [--tiles 4] [--ui-fps 15] [--camera-fps 15] [--seconds 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from PyQt6 import QtCore, QtWidgets  # noqa: E402
+
+from ui.frame_clock import FrameClock  # noqa: E402
+
+
+class Tile:
+    """Counts render ticks and the renders that had a new frame to draw."""
+
+    def __init__(self) -> None:
+        self.ticks = 0
+        self.renders = 0
+        self.has_frame = False
+
+    def _render_latest_frame(self) -> None:
+        self.ticks += 1
+        if self.has_frame:
+            self.has_frame = False
+            self.renders += 1
+
+    def clock_housekeeping(self, log_status: bool) -> None:
+        self.ticks += 1
+
+
+def _run(
+    mode: str, streaming: bool, args: argparse.Namespace, app: QtWidgets.QApplication
+) -> tuple[float, float]:
+    """Return (wake-ups/s, renders/s) for one scheduling mode."""
+    tiles = [Tile() for _ in range(args.tiles)]
+    timers: list[QtCore.QTimer] = []
+    clock = None
+    if mode == "timers":
+        for tile in tiles:
+            for interval, slot in (
+                (max(1, int(1000 / args.ui_fps) - 3), tile._render_latest_frame),
+                (5000, lambda t=tile: t.clock_housekeeping(True)),
+                (1000, lambda t=tile: t.clock_housekeeping(False)),
+            ):
+                timer = QtCore.QTimer()
+                timer.setInterval(interval)
+                timer.timeout.connect(slot)
+                timer.start()
+                timers.append(timer)
+    else:
+        clock = FrameClock()
+        for tile in tiles:
+            clock.register(tile, args.ui_fps)
+
+    cameras: list[QtCore.QTimer] = []
+    if streaming:
+        for tile in tiles:
+
+            def deliver(t: Tile = tile) -> None:
+                t.has_frame = True
+                if clock is not None:
+                    clock.request_frame(t)
+
+            camera = QtCore.QTimer()
+            camera.setInterval(int(1000 / args.camera_fps))
+            camera.timeout.connect(deliver)
+            camera.start()
+            cameras.append(camera)
+
+    end = time.monotonic() + args.seconds
+    while time.monotonic() < end:
+        app.processEvents(QtCore.QEventLoop.ProcessEventsFlag.WaitForMoreEvents, 50)
+
+    for timer in timers + cameras:
+        timer.stop()
+    renders = sum(t.renders for t in tiles) / args.seconds
+    if clock is not None:
+        stats = clock.stats()
+        clock._timer.stop()
+        clock._housekeeping.stop()
+        return stats["wakeups"] / args.seconds, renders
+    return sum(t.ticks for t in tiles) / args.seconds, renders
+
+
+def main(argv: list[str]) -> int:
+    """Run the benchmark and print a small results table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tiles", type=int, default=4)
+    parser.add_argument("--ui-fps", type=int, default=15)
+    parser.add_argument("--camera-fps", type=int, default=15)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args(argv)
+
+    app = QtWidgets.QApplication(sys.argv[:1])
+    print(f"{args.tiles} tiles, UI {args.ui_fps} FPS, cameras {args.camera_fps} FPS, "
+          f"{args.seconds:.0f} s per run")
+    for streaming in (False, True):
+        label = "streaming" if streaming else "idle"
+        for mode in ("timers", "clock"):
+            wakeups, renders = _run(mode, streaming, args, app)
+            print(f"  {label:9s} {mode:6s}: {wakeups:7.1f} wake-ups/s, "
+                  f"{renders:6.1f} renders/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
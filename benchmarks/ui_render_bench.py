@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+UI-thread frame upload benchmark for Camera Dashboard.
+
+Measures the per-frame cost of what CameraWidget does on the UI thread for
+each output format: wrapping the numpy frame in a QImage and uploading it
+with QPixmap.convertFromImage. BGR888 frames are converted to the pixmap's
+native 32-bit layout on every upload; RGB32 frames are copied as-is. The
+worker-side BGR->BGRx conversion that rgb32 mode adds is reported
+separately, since it runs on the capture thread. Night mode is measured as
+a one-channel luma frame uploaded through an Indexed8 red palette.
+
+Usage:
+    python benchmarks/ui_render_bench.py [--width 640] [--height 480] [--frames 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from typing import Optional
+
+import cv2
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6 import QtGui  # noqa: E402
+
+
+def _upload_ms(
+    frame: np.ndarray,
+    image_format: QtGui.QImage.Format,
+    frames: int,
+    color_table: Optional[list[int]] = None,
+) -> float:
+    """Return mean milliseconds per QImage wrap + convertFromImage."""
+    h, w = frame.shape[:2]
+    bytes_per_line = frame.strides[0]
+
+    def wrap() -> QtGui.QImage:
+        img = QtGui.QImage(frame.data, w, h, bytes_per_line, image_format)
+        if color_table is not None:
+            img.setColorTable(color_table)
+        return img
+
+    pixmap = QtGui.QPixmap()
+    # Warm up so the pixmap's backing store is allocated outside the timing.
+    pixmap.convertFromImage(wrap())
+    start = time.perf_counter()
+    for _ in range(frames):
+        pixmap.convertFromImage(wrap())
+    return (time.perf_counter() - start) * 1000.0 / frames
+
+
+def _convert_ms(frame: np.ndarray, frames: int) -> float:
+    """Return mean milliseconds per worker-side BGR -> BGRx conversion."""
+    dst = np.empty(frame.shape[:2] + (4,), dtype=np.uint8)
+    start = time.perf_counter()
+    for _ in range(frames):
+        cv2.cvtColor(frame, cv2.COLOR_BGR2BGRA, dst=dst)
+    return (time.perf_counter() - start) * 1000.0 / frames
+
+
+def main(argv: list[str]) -> int:
+    """Run the benchmark and print a small results table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--frames", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    _app = QtGui.QGuiApplication(sys.argv[:1])
+
+    rng = np.random.default_rng(0)
+    bgr = rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8)
+    bgrx = cv2.cvtColor(bgr, cv2.COLOR_BGR2BGRA)
+
+    bgr_ms = _upload_ms(bgr, QtGui.QImage.Format.Format_BGR888, args.frames)
+    rgb32_ms = _upload_ms(bgrx, QtGui.QImage.Format.Format_RGB32, args.frames)
+    convert_ms = _convert_ms(bgr, args.frames)
+    luma = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+    night_ms = _upload_ms(
+        luma,
+        QtGui.QImage.Format.Format_Indexed8,
+        args.frames,
+        [QtGui.qRgb(i, 0, 0) for i in range(256)],
+    )
+
+    print(f"{args.width}x{args.height}, {args.frames} frames")
+    print(f"  UI thread, output_format=bgr   : {bgr_ms:7.3f} ms/frame")
+    print(f"  UI thread, output_format=rgb32 : {rgb32_ms:7.3f} ms/frame")
+    print(f"  UI thread, night mode          : {night_ms:7.3f} ms/frame")
+    print(f"  capture thread BGR->BGRx       : {convert_ms:7.3f} ms/frame")
+    if rgb32_ms > 0:
+        print(f"  UI thread speedup              : {bgr_ms / rgb32_ms:7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -24,6 +24,27 @@ __all__ = [
     "find_working_cameras",
     "get_video_indexes",
     "test_single_camera",
+    # capture_engine module exports
+    "CaptureEngine",
+    "get_capture_engine",
+    "shutdown_capture_engine",
+    # decode_pool module exports
+    "DecodePool",
+    "get_decode_pool",
+    "shutdown_decode_pool",
+    # gst_mosaic module exports
+    "GstMosaicWorker",
+    "mosaic_supported",
+    # mosaic module exports
+    "MosaicComposer",
+    # process_capture module exports
+    "ProcessCaptureWorker",
+    # shm_ring module exports
+    "ShmFrameRing",
+    # frame_pool module exports
+    "FrameLease",
+    "FrameMailbox",
+    "FramePool",
     # performance module exports
     "is_system_stressed",
 ]
@@ -47,4 +68,11 @@ from .config import (
     HEALTH_LOG_INTERVAL_SEC,
 )
 from .camera import CaptureWorker, find_working_cameras, get_video_indexes, test_single_camera
+from .capture_engine import CaptureEngine, get_capture_engine, shutdown_capture_engine
+from .decode_pool import DecodePool, get_decode_pool, shutdown_decode_pool
+from .gst_mosaic import GstMosaicWorker, mosaic_supported
+from .frame_pool import FrameLease, FrameMailbox, FramePool
+from .mosaic import MosaicComposer
+from .process_capture import ProcessCaptureWorker
+from .shm_ring import ShmFrameRing
 from .performance import is_system_stressed
@@ -12,7 +12,6 @@ import logging
 import platform
 import threading
 import time
-from collections import deque
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Optional, Union
 
@@ -22,9 +21,39 @@ from numpy.typing import NDArray
 from PyQt6.QtCore import QObject, QThread, pyqtSignal
 
 from core import config
+from core.capture_engine import get_capture_engine
+from core.controls import CameraControls
+from core.decode_pool import DecodePool, get_decode_pool
+from core.frame_pool import FrameLease, FrameMailbox, FramePool
+from core.gst_backend import GstCapture, gi_available
+from core.gst_pipeline import build_camera_pipeline
+from core.imaging import night_luma
+from core.pacing import FrameDecimator, HardwareRateGovernor
+from core.v4l2 import V4L2Capture
 from utils import kill_device_holders
 
 
+# Config names a CaptureWorker reads through its per-worker settings
+# (CaptureWorker._config, config.capture_backend_for, config.controls_for).
+# Only these travel with a daemon subscription, so changing anything else
+# (UI, logging, load thresholds) does not re-open a streaming camera.
+CAPTURE_SETTINGS = (
+    "CAPTURE_BACKEND",
+    "CAPTURE_BACKEND_OVERRIDES",
+    "CAPTURE_ENGINE",
+    "USE_GSTREAMER",
+    "REDUCED_DECODE",
+    "SHARED_DECODE",
+    "OUTPUT_FORMAT",
+    "COUPLE_CAPTURE_TO_RENDER",
+    "HARDWARE_FPS",
+    "HARDWARE_FPS_HOLD_SEC",
+    "CAMERA_CONTROLS_ENABLED",
+    "CAMERA_CONTROLS",
+    "CAMERA_CONTROL_OVERRIDES",
+    "EXPOSURE_LIMIT_RATIO",
+)
+
 # Cache for GStreamer availability check
 _gstreamer_available: Optional[bool] = None
 
@@ -64,17 +93,26 @@ def _check_gstreamer_available() -> bool:
     return _gstreamer_available
 
 
+def _is_compressed(buf: NDArray[np.uint8]) -> bool:
+    """True if ``buf`` is an undecoded byte buffer (a single row or 1-D)."""
+    return buf.ndim == 1 or (buf.ndim == 2 and buf.shape[0] == 1)
+
+
 class CaptureWorker(QThread):
     """Background thread for capturing frames from a camera."""
     
-    # Signal emitted when a new frame is ready for the UI thread.
-    frame_ready = pyqtSignal(object)
+    # Coalesced wake-up: a new frame is waiting in ``mailbox``. At most one
+    # of these is queued at a time, regardless of how far behind the UI is.
+    frame_ready = pyqtSignal()
     # Signal emitted when camera connection status changes.
     status_changed = pyqtSignal(bool)
 
     # Pre-allocated frame pool size (reduces GC pressure)
     FRAME_POOL_SIZE = 3
 
+    # False: the owning widget restarts this worker after stale frames.
+    supervises_restarts = False
+
     def __init__(
         self,
         stream_link: Union[int, str],
@@ -82,66 +120,657 @@ class CaptureWorker(QThread):
         target_fps: Optional[float] = None,
         capture_width: Optional[int] = None,
         capture_height: Optional[int] = None,
+        settings: Optional[dict[str, Any]] = None,
     ) -> None:
-        """Initialize camera capture settings and state."""
+        """Initialize camera capture settings and state.
+
+        ``settings`` maps config names to values that override the global
+        config for this worker only (see _config).
+        """
         super().__init__(parent)
         self.stream_link = stream_link
+        self._settings: dict[str, Any] = dict(settings or {})
         self._running = True
         self._reconnect_backoff = 1.0
         self._cap: Optional[cv2.VideoCapture] = None
         self._last_emit = 0.0
         self._target_fps = target_fps
         self._emit_interval = 1.0 / 30.0
+        # Cadence-accurate emit selection (phase accumulator).
+        self._decimator = FrameDecimator(30.0)
+        # Follows a lasting lower publish rate with the camera's own rate.
+        self._rate_governor = HardwareRateGovernor(self._config("HARDWARE_FPS_HOLD_SEC"))
+        # Render rate reported by the consuming widget (None = unknown).
+        self._consumer_fps: Optional[float] = None
+        # Publish cap while the consuming tile is hidden (None = visible,
+        # 0 = grab only). The governor ignores it so resuming is instant.
+        self._standby_fps: Optional[float] = None
+        self._governor_target = 30.0
+        # Output size negotiated with the consuming widget (device pixels).
+        self._output_lock = threading.Lock()
+        self._output_size: Optional[tuple[int, int]] = None
+        # Shape of the last decoded frame and full-size decode scratch buffer
+        # used when frames are post-processed before handoff.
+        self._decode_shape: Optional[tuple[int, ...]] = None
+        self._scratch_frame: Optional[NDArray[np.uint8]] = None
+        # Resize output kept in the worker when a format conversion follows.
+        self._scaled_frame: Optional[NDArray[np.uint8]] = None
+        # Same, for shared decode pool jobs, which can overlap the capture
+        # thread after a fallback to inline decoding.
+        self._pool_scaled_frame: Optional[NDArray[np.uint8]] = None
+        # Pixel format handed to the UI ("bgr" or "rgb32"), fixed per worker.
+        self._output_format = self._config("OUTPUT_FORMAT")
+        # Night mode: emit single-channel brightened luma instead of colour.
+        self._night_mode = False
+        # Reduced-resolution MJPEG decode: retrieve() returns the compressed
+        # JPEG and the worker decodes it at a libjpeg DCT scale of 1/N.
+        self._compressed_decode = False
+        self._reduced_decode_failed = False
+        self._source_size: Optional[tuple[int, int]] = None
+        self._decode_scale = 1
+        # Shared decode pool, attached on the first compressed frame.
+        self._shared_decode: Optional[DecodePool] = None
         self.capture_width = capture_width
         self.capture_height = capture_height
         self._online = False
         self._start_ts = time.time()
         self._open_fail_count = 0
-        # Track if using GStreamer backend for proper cleanup
+        # Track if using OpenCV's GStreamer backend for proper cleanup
         self._using_gstreamer = False
+        # Capture backend in use ("V4L2", "V4L2-mmap", "GStreamer" or "PyGObject").
+        self._backend_name = "none"
         # Cached FOURCC string, updated by worker thread, read by main thread.
         self._fourcc: str = "unknown"
         # Lock protects changes to FPS/emit interval from other threads.
         self._fps_lock = threading.Lock()
         self._stop_event = threading.Event()
+        # Capture engine streaming: set by the engine handler on failure
+        # (and by stop()) to wake this camera's parked thread.
+        self._engine_wake = threading.Event()
+        self._engine_failed = False
+        self._last_engine_frame = 0.0
         
-        # Pre-allocated frame pool to reduce memory allocations/GC pressure
-        self._frame_pool: deque[NDArray[np.uint8]] = deque(maxlen=self.FRAME_POOL_SIZE)
-        self._frame_pool_lock = threading.Lock()
-        self._pool_frame_shape: Optional[tuple[int, ...]] = None
+        # Pre-allocated frame pool to reduce memory allocations/GC pressure.
+        # Frames leave the worker as FrameLease objects that return their
+        # buffer here when the last holder releases them.
+        self._frame_pool = FramePool(self.FRAME_POOL_SIZE)
+        # Latest-frame handoff to the UI thread (pulled on each render tick).
+        self.mailbox = FrameMailbox()
 
-    def _get_pooled_frame(self, shape: tuple[int, ...], dtype: np.dtype) -> NDArray[np.uint8]:
-        """Get a pre-allocated frame from pool or create new one.
-        
-        This reduces memory allocation overhead and GC pressure by reusing
-        frame buffers instead of allocating new ones for each capture.
+        # Capture scheduler counters (grabbed >= decoded >= emitted).
+        self._frames_grabbed = 0
+        self._frames_decoded = 0
+        self._frames_emitted = 0
+        # Zero-copy retrieve accounting: decoded in place into a pooled
+        # buffer, backend reallocated (adopted without copy), or copied.
+        self._retrieve_in_place = 0
+        self._retrieve_reallocated = 0
+        self._retrieve_copied = 0
+        # Frames not decoded because the previous one was still unrendered.
+        self._backpressure_skips = 0
+        self._standby_skips = 0
+        # Frames resized to the negotiated output size in this thread.
+        self._frames_scaled = 0
+        # Frames converted to the 32-bit output format in this thread.
+        self._frames_converted = 0
+        # Frames reduced to night-mode luma in this thread.
+        self._frames_night = 0
+        # Frames decoded from JPEG at a reduced (1/2, 1/4, 1/8) scale.
+        self._frames_reduced_decode = 0
+        # Device frame rate changes applied without reopening the capture.
+        self._hw_rate_changes = 0
+        # V4L2 control handle (profile applied on open, exposure-limit
+        # watch) and the frame rate the open capture negotiated.
+        self._controls: Optional[CameraControls] = None
+        self._negotiated_fps = 0.0
+
+    def get_pool_stats(self) -> dict[str, Any]:
+        """Return frame pool hit rate, outstanding/leaked leases, alloc rate."""
+        return self._frame_pool.stats()
+
+    def get_mailbox_stats(self) -> dict[str, int]:
+        """Return UI handoff counters (published, taken, overwritten, wakeups)."""
+        return self.mailbox.stats()
+
+    def get_decode_stats(self) -> dict[str, Any]:
+        """Return per-stage queue depth and decode latency for this camera.
+
+        ``pending``/``in_flight`` describe the capture -> decode pool stage,
+        ``mailbox_pending`` the decode -> UI stage. Pool figures are zero
+        while frames are decoded in the capture thread.
         """
-        with self._frame_pool_lock:
-            # If shape changed, invalidate pool
-            if self._pool_frame_shape != shape:
-                self._frame_pool.clear()
-                self._pool_frame_shape = shape
-            
-            # Try to get existing frame from pool
-            if self._frame_pool:
-                return self._frame_pool.popleft()
-        
-        # Allocate new frame (contiguous for efficient Qt conversion)
-        return np.empty(shape, dtype=dtype, order='C')
-    
-    def _return_to_pool(self, frame: NDArray[np.uint8]) -> None:
-        """Return a frame buffer to the pool for reuse."""
-        with self._frame_pool_lock:
-            if (
-                self._pool_frame_shape is not None
-                and frame.shape == self._pool_frame_shape
-                and len(self._frame_pool) < self.FRAME_POOL_SIZE
-            ):
-                self._frame_pool.append(frame)
+        pool = self._shared_decode
+        if pool is not None:
+            stats = pool.stats(self)
+        else:
+            stats = {
+                "pending": 0,
+                "in_flight": 0,
+                "submitted": 0,
+                "completed": 0,
+                "superseded": 0,
+                "failed": 0,
+                "decode_ms": 0.0,
+                "decode_max_ms": 0.0,
+                "wait_ms": 0.0,
+            }
+        stats["mailbox_pending"] = 1 if self.mailbox.has_pending() else 0
+        return stats
+
+    def _should_emit(self, now: float) -> bool:
+        """Return True if a frame grabbed at ``now`` should be published."""
+        with self._fps_lock:
+            return self._decimator.should_emit(now)
+
+    def _process_next_frame(self) -> None:
+        """Grab one frame and decode/emit it only if the throttle allows.
+
+        grab() drains the driver buffer cheaply; retrieve() does the MJPEG
+        decode and BGR conversion, so it only runs for frames that will
+        actually be published.
+        """
+        if self._cap is None:
+            return
+        self._renegotiate_rate()
+        grabbed = self._cap.grab()
+        if not grabbed:
+            self._on_read_failure("grab")
+            return
+        if not self._handle_grabbed():
+            self._on_read_failure("retrieve")
+
+    def _handle_grabbed(self) -> bool:
+        """Decode and publish the grabbed frame if the throttle allows.
+
+        Returns False if retrieve() failed.
+        """
+        self._frames_grabbed += 1
+        controls = self._controls
+        if controls is not None:
+            self._watch_exposure(controls)
+
+        now = time.time()
+        # When coupled to the renderer, don't decode while the previous frame
+        # is still waiting in the mailbox; it would only be overwritten.
+        if self._config("COUPLE_CAPTURE_TO_RENDER") and self.mailbox.has_pending():
+            self._backpressure_skips += 1
+            return True
+        # Hidden tile with grab-only standby: keep the stream, skip decode.
+        if self._standby_fps == 0:
+            self._standby_skips += 1
+            return True
+        # Decimate to target FPS to avoid UI overload.
+        if not self._should_emit(now):
+            return True
+
+        # MJPEG buffers are decoded on the shared pool so a slow decode
+        # never delays this camera's next grab.
+        if self._compressed_decode and self._config("SHARED_DECODE"):
+            return self._submit_decode(now)
+
+        lease = self._retrieve_frame()
+        if lease is None:
+            return False
+        self._frames_decoded += 1
+        self._publish(lease, now)
+        return True
+
+    def _uses_capture_engine(self) -> bool:
+        """True if the open capture should be streamed by the capture engine."""
+        return self._config("CAPTURE_ENGINE") and isinstance(self._cap, V4L2Capture)
 
-    def return_frame(self, frame: NDArray[np.uint8]) -> None:
-        """Public helper to return a frame buffer to the pool."""
-        self._return_to_pool(frame)
+    def _stream_on_engine(self) -> None:
+        """Let the shared capture engine stream this camera until it fails.
+
+        The engine dequeues frames when the driver signals readiness; this
+        thread stays parked, waking only to check for a stalled device.
+        """
+        cap = self._cap
+        engine = get_capture_engine()
+        fd = cap.fileno()
+        self._engine_failed = False
+        self._engine_wake.clear()
+        self._last_engine_frame = time.monotonic()
+        engine.register(fd, self._on_engine_ready)
+        try:
+            while self._running and not self._engine_failed:
+                self._engine_wake.wait(timeout=cap.timeout)
+                if time.monotonic() - self._last_engine_frame > cap.timeout:
+                    logging.debug("Camera %s: no frame from driver", self.stream_link)
+                    self._engine_failed = True
+        finally:
+            stopped = engine.unregister(fd)
+        if not stopped:
+            # The engine thread may still be dequeuing from this capture;
+            # closing it now would release buffers under that handler.
+            logging.warning(
+                "Camera %s: capture engine stopped mid-frame, keeping capture open",
+                self.stream_link,
+            )
+            return
+        if self._running:
+            self._on_read_failure("grab")
+
+    def _on_engine_ready(self) -> bool:
+        """Engine handler: take the ready buffer and publish it.
+
+        Returns False (stop watching) when the capture failed; the camera
+        thread then reconnects.
+        """
+        cap = self._cap
+        if cap is None or not self._running:
+            return False
+        self._renegotiate_rate()
+        if cap.grab(timeout=0):
+            self._last_engine_frame = time.monotonic()
+            if self._handle_grabbed():
+                return True
+        elif cap.error is None:
+            # Woken without a filled buffer; keep waiting.
+            return True
+        self._engine_failed = True
+        self._engine_wake.set()
+        return False
+
+    def _retrieve_frame(self) -> Optional[FrameLease]:
+        """Decode the grabbed frame and return it as a lease ready for the UI.
+
+        Frames that need no post-processing are decoded straight into a pool
+        buffer. Frames that will be resized are decoded into a reusable
+        worker-private scratch buffer and resized into the pool buffer, so
+        the full-size frame never leaves the capture thread.
+        Returns None if retrieve() failed.
+        """
+        if self._cap is None:
+            return None
+        if self._compressed_decode:
+            return self._retrieve_compressed()
+        expect_processing = self._decode_shape is not None and self._needs_processing(
+            self._decode_shape
+        )
+        if not expect_processing:
+            lease = self._retrieve_into_pool()
+            if lease is None:
+                return None
+            self._decode_shape = lease.array.shape
+            if not self._needs_processing(self._decode_shape):
+                return lease
+            with lease as frame:
+                return self._process_frame(frame)
+
+        frame = self._retrieve_scratch()
+        if frame is None:
+            return None
+        self._decode_shape = frame.shape
+        return self._process_frame(frame)
+
+    # libjpeg DCT scale factors usable through cv2.imdecode, largest first.
+    _REDUCED_DECODE_FLAGS = {
+        8: (cv2.IMREAD_REDUCED_COLOR_8, cv2.IMREAD_REDUCED_GRAYSCALE_8),
+        4: (cv2.IMREAD_REDUCED_COLOR_4, cv2.IMREAD_REDUCED_GRAYSCALE_4),
+        2: (cv2.IMREAD_REDUCED_COLOR_2, cv2.IMREAD_REDUCED_GRAYSCALE_2),
+        1: (cv2.IMREAD_COLOR, cv2.IMREAD_GRAYSCALE),
+    }
+
+    def _choose_decode_scale(self) -> int:
+        """Return the largest JPEG scale divisor that still covers the tile.
+
+        The reduced image must be at least the negotiated output size in both
+        dimensions so the final resize only ever scales down.
+        """
+        with self._output_lock:
+            output_size = self._output_size
+        if output_size is None or self._source_size is None:
+            return 1
+        src_w, src_h = self._source_size
+        out_w, out_h = output_size
+        for scale in (8, 4, 2):
+            if src_w // scale >= out_w and src_h // scale >= out_h:
+                return scale
+        return 1
+
+    def _retrieve_compressed(self) -> Optional[FrameLease]:
+        """Fetch and decode the grabbed MJPEG buffer in the calling thread."""
+        buf = self._fetch_compressed()
+        if buf is None:
+            return None
+        return self._decode_compressed(buf)
+
+    def _fetch_compressed(self) -> Optional[NDArray[np.uint8]]:
+        """Retrieve the grabbed frame without decoding it (capture thread only).
+
+        If the backend does not actually hand out JPEG data, reduced decoding
+        is switched off for the rest of this worker's life and the decoded
+        frame is returned instead.
+        """
+        if self._cap is None:
+            return None
+        if self._reduced_decode_failed:
+            self._disable_reduced_decode()
+        ret, buf = self._cap.retrieve()
+        if not ret or buf is None:
+            return None
+        if not _is_compressed(buf):
+            self._reject_reduced_decode("backend returned decoded frames")
+            self._disable_reduced_decode()
+        return buf
+
+    def _decode_compressed(
+        self, buf: NDArray[np.uint8], on_pool: bool = False
+    ) -> Optional[FrameLease]:
+        """Decode an MJPEG buffer at a scale matched to the tile size.
+
+        In night mode only the luma plane is decoded. Safe to call from a
+        decode pool thread (``on_pool``): it never touches the capture handle
+        or the capture thread's scratch state, since a queued job can still
+        run after the capture thread has fallen back to decoding inline.
+        """
+        if not _is_compressed(buf):
+            frame = buf
+        else:
+            scale = self._choose_decode_scale()
+            color_flag, gray_flag = self._REDUCED_DECODE_FLAGS[scale]
+            frame = cv2.imdecode(buf, gray_flag if self._night_mode else color_flag)
+            if frame is None:
+                self._reject_reduced_decode("imdecode failed")
+                return None
+            if not self._reduced_decode_failed:
+                self._decode_scale = scale
+            if scale > 1:
+                self._frames_reduced_decode += 1
+        if not on_pool:
+            self._decode_shape = frame.shape
+        if self._needs_processing(frame.shape):
+            return self._process_frame(frame, pooled_scratch=on_pool)
+        # imdecode allocated a fresh array; hand it over without a copy.
+        self._retrieve_reallocated += 1
+        return self._frame_pool.adopt(frame)
+
+    def _submit_decode(self, now: float) -> bool:
+        """Fetch the grabbed MJPEG buffer and queue its decode on the shared pool.
+
+        Returns False if retrieve() failed.
+        """
+        buf = self._fetch_compressed()
+        if buf is None:
+            return False
+        # The backend may hand out a view of driver memory; the decode runs
+        # after the next grab, so it needs its own copy (a few tens of KB).
+        buf = buf.copy()
+        if self._shared_decode is None:
+            self._shared_decode = get_decode_pool()
+        self._shared_decode.submit(self, lambda: self._decode_and_publish(buf, now))
+        return True
+
+    def _decode_and_publish(self, buf: NDArray[np.uint8], now: float) -> None:
+        """Decode pool job: decode one buffer and publish it to the UI."""
+        lease = self._decode_compressed(buf, on_pool=True)
+        if lease is None:
+            return
+        if not self._running:
+            lease.release()
+            return
+        self._frames_decoded += 1
+        self._publish(lease, now)
+
+    def _publish(self, lease: FrameLease, now: float) -> None:
+        """Hand a finished frame to the mailbox and wake the UI if needed."""
+        if self.mailbox.publish(lease):
+            self.frame_ready.emit()
+        self._last_emit = now
+        self._frames_emitted += 1
+
+    def _enable_reduced_decode(self, cap: cv2.VideoCapture, fourcc: str) -> None:
+        """Switch a freshly opened V4L2 MJPEG capture to compressed retrieve."""
+        self._compressed_decode = False
+        if not self._config("REDUCED_DECODE") or self._reduced_decode_failed or fourcc != "MJPG":
+            return
+        try:
+            self._compressed_decode = bool(cap.set(cv2.CAP_PROP_CONVERT_RGB, 0))
+        except Exception:
+            self._compressed_decode = False
+        if self._compressed_decode:
+            logging.info(
+                "Camera %s: reduced-resolution MJPEG decode enabled", self.stream_link
+            )
+
+    def _reject_reduced_decode(self, reason: str) -> None:
+        """Mark reduced decoding as unusable; the capture thread switches back."""
+        if not self._reduced_decode_failed:
+            logging.warning(
+                "Camera %s: disabling reduced MJPEG decode (%s)", self.stream_link, reason
+            )
+        self._reduced_decode_failed = True
+
+    def _disable_reduced_decode(self) -> None:
+        """Fall back to backend decoding for the rest of this worker's life."""
+        self._compressed_decode = False
+        self._reduced_decode_failed = True
+        self._decode_scale = 1
+        try:
+            if self._cap is not None:
+                self._cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+        except Exception:
+            pass
+
+    def _retrieve_scratch(self) -> Optional[NDArray[np.uint8]]:
+        """Decode the grabbed frame into the worker's reusable scratch buffer."""
+        if self._cap is None:
+            return None
+        scratch = self._scratch_frame
+        ret, frame = self._cap.retrieve(image=scratch)
+        if not ret or frame is None:
+            return None
+        if scratch is not None and frame is scratch:
+            self._retrieve_in_place += 1
+        else:
+            self._retrieve_reallocated += 1
+            if frame.flags["C_CONTIGUOUS"] and frame.flags["WRITEABLE"]:
+                self._scratch_frame = frame
+        return frame
+
+    def _needs_processing(self, shape: tuple[int, ...]) -> bool:
+        """True if a decoded frame of ``shape`` must be transformed before handoff."""
+        return (
+            self._night_mode
+            or self._target_output_size(shape) is not None
+            or self._needs_conversion(shape)
+        )
+
+    def _needs_conversion(self, shape: tuple[int, ...]) -> bool:
+        """True if a decoded frame of ``shape`` is not yet in the output format.
+
+        In rgb32 mode 3-channel BGR frames are expanded to 32-bit BGRx (the
+        byte order of Qt's Format_RGB32 on little-endian machines) so the UI
+        can upload them without converting. Grayscale frames pass through.
+        """
+        return self._output_format == "rgb32" and len(shape) == 3 and shape[2] == 3
+
+    def _target_output_size(self, shape: tuple[int, ...]) -> Optional[tuple[int, int]]:
+        """Return the (width, height) to scale a frame of ``shape`` to, if any.
+
+        Frames are only ever scaled down; when the negotiated size is larger
+        than the capture (e.g. fullscreen) the UI scales the full frame.
+        """
+        with self._output_lock:
+            output_size = self._output_size
+        if output_size is None:
+            return None
+        src_h, src_w = shape[:2]
+        out_w = max(1, min(int(output_size[0]), src_w))
+        out_h = max(1, min(int(output_size[1]), src_h))
+        if (out_w, out_h) == (src_w, src_h):
+            return None
+        return out_w, out_h
+
+    def _process_frame(
+        self, frame: NDArray[np.uint8], pooled_scratch: bool = False
+    ) -> FrameLease:
+        """Transform a decoded frame into a new pool lease.
+
+        Frames are resized first so the night-mode or format conversion only
+        touches output pixels; each stage writes straight into its destination.
+        Decode pool jobs (``pooled_scratch``) resize into their own scratch
+        buffer: ``_scaled_frame`` belongs to the capture thread, and the pool
+        never runs two jobs for one camera at once.
+        """
+        size = self._target_output_size(frame.shape)
+        night = self._night_mode
+        convert = not night and self._needs_conversion(frame.shape)
+        if size is not None:
+            out_w, out_h = size
+            scaled_shape = (out_h, out_w) + frame.shape[2:]
+            if convert or night:
+                attr = "_pool_scaled_frame" if pooled_scratch else "_scaled_frame"
+                dst = getattr(self, attr)
+                if dst is None or dst.shape != scaled_shape:
+                    dst = np.empty(scaled_shape, dtype=frame.dtype)
+                    setattr(self, attr, dst)
+                lease = None
+            else:
+                lease = self._frame_pool.lease(scaled_shape, frame.dtype)
+                dst = lease.array
+            cv2.resize(frame, (out_w, out_h), dst=dst, interpolation=cv2.INTER_AREA)
+            self._frames_scaled += 1
+            if lease is not None:
+                return lease
+            frame = dst
+        if night:
+            lease = self._frame_pool.lease(frame.shape[:2], frame.dtype)
+            night_luma(frame, dst=lease.array)
+            self._frames_night += 1
+            return lease
+        if convert:
+            lease = self._frame_pool.lease(frame.shape[:2] + (4,), frame.dtype)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2BGRA, dst=lease.array)
+            self._frames_converted += 1
+            return lease
+        lease = self._frame_pool.lease(frame.shape, frame.dtype)
+        np.copyto(lease.array, frame)
+        self._retrieve_copied += 1
+        return lease
+
+    def set_night_mode(self, enabled: bool) -> None:
+        """Switch the night-mode stage on or off (takes effect next frame).
+
+        In night mode frames leave the worker as single-channel luma with
+        the night gain applied, ready for an indexed red palette in the UI.
+        """
+        self._night_mode = bool(enabled)
+
+    def set_output_size(self, size: Optional[tuple[int, int]]) -> None:
+        """Set the (width, height) in device pixels the consumer displays at.
+
+        Called by the widget whenever its tile or fullscreen size changes;
+        None disables worker-side scaling.
+        """
+        if size is not None:
+            size = (int(size[0]), int(size[1]))
+            if size[0] <= 0 or size[1] <= 0:
+                size = None
+        with self._output_lock:
+            self._output_size = size
+
+    def _retrieve_into_pool(self) -> Optional[FrameLease]:
+        """Decode the grabbed frame directly into a leased pool buffer.
+
+        OpenCV writes into the ``image`` output argument in place when its
+        shape and dtype match the decoded frame. If the backend reallocates
+        instead (first frame, resolution change), the fresh array is adopted
+        by the pool so the next retrieve can go zero-copy again.
+        Returns None if retrieve() failed.
+        """
+        if self._cap is None:
+            return None
+        shape = self._frame_pool.shape
+        target = self._frame_pool.lease(shape) if shape else None
+
+        ret, frame = self._cap.retrieve(image=target.array if target else None)
+        if not ret or frame is None:
+            if target is not None:
+                target.release()
+            return None
+
+        if target is not None and frame is target.array:
+            self._retrieve_in_place += 1
+            return target
+
+        # Backend allocated its own output buffer.
+        if target is not None:
+            target.release()
+        if frame.flags["C_CONTIGUOUS"] and frame.flags["WRITEABLE"]:
+            self._retrieve_reallocated += 1
+            return self._frame_pool.adopt(frame)
+
+        lease = self._frame_pool.lease(frame.shape, frame.dtype)
+        np.copyto(lease.array, frame)
+        self._retrieve_copied += 1
+        return lease
+
+    def _on_read_failure(self, op: str) -> None:
+        """Close the capture after a failed read and report the camera offline."""
+        logging.debug("Camera %s: %s() failed, closing capture", self.stream_link, op)
+        self._close_capture()
+        if self._online:
+            self._online = False
+            self.status_changed.emit(False)
+
+    def get_capture_stats(self) -> dict[str, Any]:
+        """Return capture scheduler counters and emit cadence statistics."""
+        grabbed = self._frames_grabbed
+        decoded = self._frames_decoded
+        controls = self._controls
+        with self._fps_lock:
+            cadence = self._decimator.stats()
+        return {
+            **cadence,
+            "grabbed": grabbed,
+            "decoded": decoded,
+            "emitted": self._frames_emitted,
+            "decode_skipped": grabbed - decoded,
+            "retrieve_in_place": self._retrieve_in_place,
+            "retrieve_reallocated": self._retrieve_reallocated,
+            "retrieve_copied": self._retrieve_copied,
+            "backpressure_skips": self._backpressure_skips,
+            "standby": self._standby_fps,
+            "standby_skips": self._standby_skips,
+            "consumer_fps": self._consumer_fps or 0.0,
+            "frames_scaled": self._frames_scaled,
+            "frames_converted": self._frames_converted,
+            "output_format": self._output_format,
+            "frames_night": self._frames_night,
+            "decode_scale": self._decode_scale,
+            "frames_reduced_decode": self._frames_reduced_decode,
+            "output_size": self._output_size,
+            "backend": self._backend_name,
+            "capture_engine": self._uses_capture_engine(),
+            "device_fps": self._rate_governor.device_fps or 0.0,
+            "hw_rate_changes": self._hw_rate_changes,
+            "delivered_fps": controls.delivered_fps if controls else 0.0,
+            "exposure_limited": bool(controls and controls.exposure_limited),
+            **self._backend_stats(),
+        }
+
+    def _backend_stats(self) -> dict[str, Any]:
+        """Return latency and driver drop counts the capture backend reports.
+
+        ``pipeline_latency_ms`` is GStreamer's latency query (gi backend) or
+        the kernel-timestamp age of the last dequeued buffer (V4L2 mmap);
+        ``driver_dropped`` counts gaps in the V4L2 buffer sequence.
+        """
+        cap = self._cap
+        latency = 0.0
+        dropped = 0
+        try:
+            if isinstance(cap, GstCapture):
+                latency = cap.latency_ms() or 0.0
+            elif isinstance(cap, V4L2Capture):
+                stats = cap.stats()
+                latency = stats.get("latency_ms", 0.0)
+                dropped = stats.get("dropped", 0)
+        except Exception:
+            pass
+        return {"pipeline_latency_ms": latency, "driver_dropped": dropped}
 
     def run(self) -> None:
         """Capture loop: open camera, grab frames, emit, reconnect on failure."""
@@ -175,42 +804,10 @@ class CaptureWorker(QThread):
                         self._online = True
                         self.status_changed.emit(True)
 
-                # Grab & retrieve keeps latency low vs read().
-                grabbed = self._cap.grab()
-                if not grabbed:
-                    logging.debug(
-                        "Camera %s: grab() failed, closing capture",
-                        self.stream_link,
-                    )
-                    self._close_capture()
-                    if self._online:
-                        self._online = False
-                        self.status_changed.emit(False)
-                    continue
-
-                ret, frame = self._cap.retrieve()
-                if not ret or frame is None:
-                    logging.debug(
-                        "Camera %s: retrieve() failed, closing capture",
-                        self.stream_link,
-                    )
-                    self._close_capture()
-                    if self._online:
-                        self._online = False
-                        self.status_changed.emit(False)
+                if self._uses_capture_engine():
+                    self._stream_on_engine()
                     continue
-
-                now = time.time()
-                with self._fps_lock:
-                    emit_interval = self._emit_interval
-                # Throttle emits to target FPS to avoid UI overload.
-                if now - self._last_emit >= emit_interval:
-                    # Use pooled frame to reduce allocations
-                    pooled = self._get_pooled_frame(frame.shape, frame.dtype)
-                    np.copyto(pooled, frame)
-                    self.frame_ready.emit(pooled)
-                    self._last_emit = now
-
+                self._process_next_frame()
                 self.msleep(1)
             except Exception:
                 logging.exception("Exception in CaptureWorker %s", self.stream_link)
@@ -281,9 +878,22 @@ class CaptureWorker(QThread):
                     return None
                 return local_cap
 
+            # Alternative backends when configured for this camera.
+            backend_choice = config.capture_backend_for(self.stream_link, self._settings)
+            if platform.system() == "Linux" and isinstance(self.stream_link, int):
+                if backend_choice == "gi" and self._config("USE_GSTREAMER"):
+                    cap = self._open_gi_capture()
+                    if cap is not None:
+                        backend_name = "PyGObject"
+                elif backend_choice == "v4l2":
+                    cap = self._open_native_v4l2()
+                    if cap is not None:
+                        backend_name = "V4L2-mmap"
+
             # Try GStreamer first if enabled and available (more efficient MJPEG pipeline)
             if (
-                config.USE_GSTREAMER
+                cap is None
+                and self._config("USE_GSTREAMER")
                 and _check_gstreamer_available()
                 and platform.system() == "Linux"
                 and isinstance(self.stream_link, int)
@@ -291,34 +901,30 @@ class CaptureWorker(QThread):
                 try:
                     w = int(self.capture_width) if self.capture_width else 640
                     h = int(self.capture_height) if self.capture_height else 480
-                    # Use jpegdec (libjpeg) for MJPEG decoding - stable and efficient
-                    # GStreamer pipeline optimized for low-latency:
-                    # - v4l2src: capture from V4L2 device
-                    # - queue: decouple source from decode (max 2 buffers, leaky=downstream)
-                    # - appsink: sync=false for no A/V sync overhead, drop=1 for frame dropping
-                    # - max-buffers=1: only keep latest frame to minimize latency
-                    pipeline = (
-                        f"v4l2src device=/dev/video{self.stream_link} ! "
-                        f"image/jpeg,width={w},height={h} ! "
-                        f"queue max-size-buffers=2 leaky=downstream ! "
-                        f"jpegdec ! videoconvert ! "
-                        f"appsink drop=1 max-buffers=1 sync=false"
-                    )
-                    cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
-                    if cap and cap.isOpened():
-                        # Test if we can actually grab a frame
-                        test_ret = cap.grab()
-                        if test_ret:
-                            backend_name = "GStreamer"
-                            logging.info(
-                                "GStreamer pipeline opened for camera %s (jpegdec)",
-                                self.stream_link,
-                            )
-                        else:
+                    # In rgb32 mode ask videoconvert for BGRx first so frames
+                    # arrive in Qt's native layout; fall back to BGR caps if
+                    # this OpenCV build can't deliver it.
+                    formats = ["BGR"]
+                    if self._output_format == "rgb32":
+                        formats.insert(0, "BGRx")
+                    for pixel_format in formats:
+                        cap = cv2.VideoCapture(
+                            self._gstreamer_pipeline(w, h, pixel_format),
+                            cv2.CAP_GSTREAMER,
+                        )
+                        if cap and cap.isOpened():
+                            # Test if we can actually decode a frame
+                            test_ret, _ = cap.read()
+                            if test_ret:
+                                backend_name = "GStreamer"
+                                logging.info(
+                                    "GStreamer pipeline opened for camera %s (jpegdec, %s)",
+                                    self.stream_link,
+                                    pixel_format,
+                                )
+                                break
                             cap.release()
-                            cap = None
-                    else:
-                        if cap is not None:
+                        elif cap is not None:
                             cap.release()
                         cap = None
                 except Exception as e:
@@ -329,7 +935,7 @@ class CaptureWorker(QThread):
 
             # Fallback to V4L2 if GStreamer failed or not enabled/available
             if cap is None:
-                if config.USE_GSTREAMER and _check_gstreamer_available():
+                if self._config("USE_GSTREAMER") and _check_gstreamer_available():
                     logging.info(
                         "Camera %s: GStreamer unavailable, falling back to V4L2",
                         self.stream_link,
@@ -359,6 +965,7 @@ class CaptureWorker(QThread):
             if cap.isOpened():
                 self._cap = cap
                 self._using_gstreamer = backend_name == "GStreamer"
+                self._backend_name = backend_name
                 self._configure_fps_from_camera()
                 try:
                     raw = int(cap.get(cv2.CAP_PROP_FOURCC))
@@ -374,6 +981,8 @@ class CaptureWorker(QThread):
                     actual_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
                     actual_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
                     actual_fps = float(cap.get(cv2.CAP_PROP_FPS))
+                    if actual_w > 0 and actual_h > 0:
+                        self._source_size = (actual_w, actual_h)
                     logging.info(
                         "Camera %s format %dx%d @ %.1f FPS (%s)",
                         self.stream_link,
@@ -384,6 +993,9 @@ class CaptureWorker(QThread):
                     )
                 except Exception:
                     pass
+                if backend_name in ("V4L2", "V4L2-mmap"):
+                    self._enable_reduced_decode(cap, self._fourcc)
+                self._open_controls()
                 logging.info(
                     "Opened capture %s (requested %sx%s) -> emit fps=%.1f",
                     self.stream_link,
@@ -400,6 +1012,84 @@ class CaptureWorker(QThread):
         except Exception:
             logging.exception("Failed to open capture %s", self.stream_link)
 
+    def _gstreamer_pipeline(
+        self,
+        width: int,
+        height: int,
+        pixel_format: Optional[str],
+        sink_name: Optional[str] = None,
+    ) -> str:
+        """Build the MJPEG capture pipeline for this camera.
+
+        videorate caps the rate at the target FPS before decode. Scaling
+        stays in the worker: an OpenCV-owned pipeline can't renegotiate
+        caps when the tile size changes (e.g. entering fullscreen).
+        """
+        return build_camera_pipeline(
+            int(self.stream_link),
+            width,
+            height,
+            fps=self._target_fps,
+            pixel_format=pixel_format,
+            sink_name=sink_name,
+        )
+
+    def _open_gi_capture(self) -> Optional[GstCapture]:
+        """Open the camera pipeline through the PyGObject appsink backend.
+
+        Returns None (so the OpenCV backends are tried) if PyGObject is
+        missing or no output format produces a frame.
+        """
+        if not gi_available():
+            logging.info(
+                "Camera %s: PyGObject GStreamer unavailable, using OpenCV",
+                self.stream_link,
+            )
+            return None
+        w = int(self.capture_width) if self.capture_width else 640
+        h = int(self.capture_height) if self.capture_height else 480
+        formats = ["BGR"]
+        if self._output_format == "rgb32":
+            formats.insert(0, "BGRx")
+        for pixel_format in formats:
+            cap = GstCapture(self._gstreamer_pipeline(w, h, pixel_format, "sink"))
+            if cap.isOpened() and cap.read()[0]:
+                logging.info(
+                    "PyGObject pipeline opened for camera %s (jpegdec, %s, latency %.1f ms)",
+                    self.stream_link,
+                    pixel_format,
+                    cap.latency_ms() or 0.0,
+                )
+                return cap
+            logging.warning(
+                "Camera %s: PyGObject pipeline failed (%s): %s",
+                self.stream_link,
+                pixel_format,
+                cap.error,
+            )
+            cap.release()
+        return None
+
+    def _open_native_v4l2(self) -> Optional[V4L2Capture]:
+        """Open the camera through the native mmap backend (MJPEG only).
+
+        Returns None (so the OpenCV backends are tried) if the device can't
+        stream MJPEG or no frame arrives.
+        """
+        w = int(self.capture_width) if self.capture_width else 640
+        h = int(self.capture_height) if self.capture_height else 480
+        cap = V4L2Capture(int(self.stream_link), w, h)
+        if cap.isOpened() and cap.grab():
+            logging.info("V4L2 mmap capture opened for camera %s", self.stream_link)
+            return cap
+        logging.warning(
+            "Camera %s: V4L2 mmap capture failed: %s",
+            self.stream_link,
+            cap.error or "no frame",
+        )
+        cap.release()
+        return None
+
     def _configure_fps_from_camera(self) -> None:
         """Pick a usable FPS value and update emit interval."""
         if self._target_fps and self._target_fps > 0:
@@ -412,9 +1102,92 @@ class CaptureWorker(QThread):
 
         with self._fps_lock:
             self._emit_interval = 1.0 / max(1.0, fps)
+            self._apply_emit_target()
+            self._decimator.reset()
+        self._rate_governor.reset(self._hardware_rate())
+
+    def _open_controls(self) -> None:
+        """Apply the camera's control profile and start the exposure watch."""
+        cap = self._cap
+        try:
+            self._negotiated_fps = max(0.0, float(cap.get(cv2.CAP_PROP_FPS))) if cap else 0.0
+        except Exception:
+            self._negotiated_fps = 0.0
+        if not self._config("CAMERA_CONTROLS_ENABLED"):
+            return
+        controls = CameraControls.open(self.stream_link, self._config("EXPOSURE_LIMIT_RATIO"))
+        if controls is None:
+            return
+        try:
+            controls.apply(
+                config.controls_for(self.stream_link, self._settings), self._negotiated_fps
+            )
+        except OSError as exc:
+            logging.info("Camera %s: controls not applied (%s)", self.stream_link, exc)
+        self._controls = controls
+
+    def _watch_exposure(self, controls: CameraControls) -> None:
+        """Compare the delivered frame rate with the negotiated one."""
+        # A device rate lowered by the governor is the new baseline.
+        negotiated = self._rate_governor.device_fps or self._negotiated_fps
+        controls.update(self._frames_grabbed, negotiated, time.monotonic())
+
+    def _hardware_rate(self) -> Optional[float]:
+        """Return the device frame rate if it can change while streaming.
+
+        Only the native V4L2 (S_PARM) and PyGObject (videorate max-rate)
+        backends can; OpenCV's backends restart the pipeline on an FPS
+        change, so they stay throttled in software.
+        """
+        cap = self._cap
+        if not self._config("HARDWARE_FPS") or cap is None:
+            return None
+        if self._backend_name not in ("V4L2-mmap", "PyGObject"):
+            return None
+        fps = float(cap.get(cv2.CAP_PROP_FPS))
+        return fps if fps > 0 else None
+
+    def _renegotiate_rate(self) -> None:
+        """Apply a due device rate change (capture or engine thread, between grabs).
+
+        A device that grants a rate too far from the one asked for is put
+        back to its previous rate and that rate is not asked for again.
+        """
+        governor = self._rate_governor
+        previous = governor.device_fps
+        if previous is None:
+            return
+        with self._fps_lock:
+            target = self._governor_target
+        fps = governor.update(target, time.monotonic())
+        cap = self._cap
+        if fps is None or cap is None:
+            return
+        granted = float(cap.get(cv2.CAP_PROP_FPS)) if cap.set(cv2.CAP_PROP_FPS, fps) else 0.0
+        if granted <= 0 or abs(granted - fps) > governor.tolerance * fps:
+            governor.reject(fps)
+            if granted > 0:
+                cap.set(cv2.CAP_PROP_FPS, previous)
+            logging.info(
+                "Camera %s: device rate %.1f FPS unavailable (got %.1f), staying at %.1f",
+                self.stream_link,
+                fps,
+                granted,
+                previous,
+            )
+            return
+        governor.applied(granted)
+        self._hw_rate_changes += 1
+        logging.info(
+            "Camera %s device rate %.1f -> %.1f FPS (target %.1f)",
+            self.stream_link,
+            previous,
+            granted,
+            target,
+        )
 
     def set_target_fps(self, fps: Optional[float]) -> None:
-        """Update target FPS at runtime (software throttling only)."""
+        """Update target FPS at runtime (software throttling right away)."""
         if fps is None:
             return
         try:
@@ -424,33 +1197,78 @@ class CaptureWorker(QThread):
             with self._fps_lock:
                 self._target_fps = fps
                 self._emit_interval = 1.0 / max(1.0, fps)
-            # Note: We don't call cap.set(CAP_PROP_FPS) here because:
-            # 1. GStreamer pipelines restart when FPS is changed, causing disconnects
-            # 2. Software throttling via _emit_interval is sufficient for stress management
+                self._apply_emit_target()
+            # Note: We don't call cap.set(CAP_PROP_FPS) here because OpenCV's
+            # GStreamer pipelines restart when FPS is changed, causing
+            # disconnects. Backends that can change rate while streaming get
+            # it from _renegotiate_rate() once the lower rate has held.
         except Exception:
             logging.exception("set_target_fps")
 
+    def set_consumer_fps(self, fps: Optional[float]) -> None:
+        """Report the consumer's measured render rate (None to decouple).
+
+        When coupling is enabled the decimator publishes at
+        min(target FPS, consumer FPS), so frames are not decoded faster
+        than the widget can show them.
+        """
+        with self._fps_lock:
+            self._consumer_fps = float(fps) if fps and fps > 0 else None
+            self._apply_emit_target()
+
+    def _config(self, name: str) -> Any:
+        """Config value ``name`` for this worker: its own settings, else global."""
+        return self._settings.get(name, getattr(config, name))
+
+    def set_standby(self, fps: Optional[float]) -> None:
+        """Cap publishing while the consuming tile is hidden.
+
+        ``fps`` is the keep-alive rate; 0 keeps grabbing (the device stays
+        streaming) but decodes nothing, and None or a negative value
+        resumes the normal rate.
+        """
+        with self._fps_lock:
+            self._standby_fps = None if fps is None or fps < 0 else float(fps)
+            self._apply_emit_target()
+
+    def _apply_emit_target(self) -> None:
+        """Push the effective publish rate to the decimator (lock held)."""
+        fps = 1.0 / self._emit_interval
+        if self._config("COUPLE_CAPTURE_TO_RENDER") and self._consumer_fps:
+            fps = min(fps, self._consumer_fps)
+        fps = max(1.0, fps)
+        self._governor_target = fps
+        if self._standby_fps:
+            fps = min(fps, self._standby_fps)
+        self._decimator.set_target_fps(fps)
+
     def _close_capture(self) -> None:
         """Release camera handle if open.
         
-        For GStreamer captures, we add a small delay to allow the pipeline
-        to properly transition through states before releasing, which helps
-        avoid "Pipeline is live and does not need PREROLL" warnings and
-        potential segfaults during cleanup.
+        For OpenCV GStreamer captures, we add a small delay to allow the
+        pipeline to properly transition through states before releasing,
+        which helps avoid "Pipeline is live and does not need PREROLL"
+        warnings and potential segfaults during cleanup. The PyGObject
+        backend waits for its NULL state change itself, so needs no delay.
         """
+        if self._controls is not None:
+            self._controls.close()
+            self._controls = None
         try:
             if self._cap:
-                # For GStreamer backend, give pipeline time to drain
+                # For OpenCV's GStreamer backend, give pipeline time to drain
                 if self._using_gstreamer:
                     # Small delay helps GStreamer complete pending operations
                     time.sleep(0.05)
                 self._cap.release()
                 self._cap = None
                 self._using_gstreamer = False
+                self._compressed_decode = False
         except Exception:
             logging.debug("Exception during capture release for %s", self.stream_link)
             self._cap = None
             self._using_gstreamer = False
+            self._compressed_decode = False
 
     def stop(self) -> None:
         """Stop capture loop and wait briefly for thread exit.
@@ -461,6 +1279,7 @@ class CaptureWorker(QThread):
         """
         self._running = False
         self._stop_event.set()
+        self._engine_wake.set()
         
         # Wait for thread to finish (includes cleanup in run())
         if not self.wait(2000):
@@ -479,6 +1298,8 @@ class CaptureWorker(QThread):
         
         # Ensure capture is closed even if thread didn't exit cleanly
         self._close_capture()
+        if self._shared_decode is not None:
+            self._shared_decode.discard(self)
     
     def is_healthy(self) -> bool:
         """Check if the worker thread is alive and responsive.
@@ -0,0 +1,599 @@
+"""
+Capture daemon for Camera Dashboard.
+
+With ``capture_mode = daemon`` cameras are opened and streamed by a
+long-lived local process instead of by the UI, so restarting the UI (from
+the settings tile or after a config change) does not re-run discovery or
+re-open devices: the new UI re-attaches to cameras that are already
+streaming and shows their newest frame right away. Only a change to the
+capture size, profile rate or a capture setting (core.camera's
+CAPTURE_SETTINGS) re-opens a camera. Cameras nobody is
+attached to keep streaming for ``[daemon] idle_timeout_sec`` and are then
+closed; the daemon exits once it has no cameras and no clients left.
+
+The dashboard talks to the daemon over a Unix socket (mode 0600) with
+multiprocessing.connection, so messages are pickled and the socket must
+only be reachable by the dashboard's user. Each connection sends one
+request:
+
+- ("cameras", None): working camera indexes, discovered once per daemon
+- ("probe", [index, ...]): [(index, index or None), ...] for rescans
+- ("shutdown", None): stop every camera and exit
+- ("subscribe", {...}): turn the connection into one camera's stream
+
+A subscribed connection carries the same messages as a capture process
+pipe (core.process_capture): "frame", "status" and "stats" from the
+daemon, control messages from the dashboard. Frames travel through a
+ShmFrameRing the daemon creates and the dashboard attaches read-only.
+
+Run ``python -m core.capture_daemon --stop`` to stop a running daemon.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fcntl
+import logging
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Optional, Union
+
+from PyQt6.QtCore import Qt
+
+from core import config
+from core.camera import CaptureWorker, find_working_cameras, test_single_camera
+from core.process_capture import (
+    _CONTROLS,
+    ProcessCaptureWorker,
+    _capture_settings,
+    _RingForwarder,
+)
+from core.shm_ring import ShmFrameRing
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def daemon_socket_path() -> str:
+    """Return the configured daemon socket, or the per-user default."""
+    if config.CAPTURE_DAEMON_SOCKET:
+        return config.CAPTURE_DAEMON_SOCKET
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "camera-dashboard.sock")
+    return os.path.join(tempfile.gettempdir(), f"camera-dashboard-{os.getuid()}.sock")
+
+
+def connect_daemon(path: Optional[str] = None) -> Connection:
+    """Open a connection to the daemon; raises OSError if none is listening."""
+    return Client(path or daemon_socket_path(), family="AF_UNIX")
+
+
+def request_daemon(op: str, value: Any = None, timeout: float = 5.0) -> Any:
+    """Send one request to the daemon and return the reply payload."""
+    conn = connect_daemon()
+    try:
+        conn.send((op, value))
+        if not conn.poll(timeout):
+            raise TimeoutError(f"capture daemon did not answer {op!r} in {timeout:.0f}s")
+        _reply, payload = conn.recv()
+        return payload
+    finally:
+        conn.close()
+
+
+def ensure_capture_daemon(timeout: float = 10.0) -> bool:
+    """Start the daemon unless one is listening; True once it accepts connections."""
+    try:
+        connect_daemon().close()
+        return True
+    except OSError:
+        pass
+    path = daemon_socket_path()
+    logging.info("Starting capture daemon on %s", path)
+    env = dict(os.environ)
+    env["CAMERA_DASHBOARD_CONFIG"] = os.path.abspath(config.CONFIG_PATH)
+    try:
+        # --detach double-forks, so this returns as soon as the daemon is
+        # running on its own.
+        subprocess.run(
+            [sys.executable, "-m", "core.capture_daemon", "--detach", "--socket", path],
+            cwd=_PROJECT_ROOT,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            timeout=timeout,
+            check=True,
+        )
+    except (OSError, subprocess.SubprocessError):
+        logging.exception("Failed to launch capture daemon")
+        return False
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connect_daemon(path).close()
+            return True
+        except OSError:
+            time.sleep(0.05)
+    logging.error("Capture daemon did not come up on %s", path)
+    return False
+
+
+def daemon_find_cameras() -> Optional[list[int]]:
+    """Working cameras as seen by the daemon (started if needed), or None."""
+    if not ensure_capture_daemon():
+        return None
+    try:
+        # The first query runs camera discovery in the daemon.
+        return list(request_daemon("cameras", timeout=60.0))
+    except (OSError, EOFError, TimeoutError):
+        logging.exception("Capture daemon camera query failed")
+        return None
+
+
+class _DaemonCamera:
+    """One camera streamed by the daemon to any number of subscribers."""
+
+    def __init__(
+        self,
+        stream_link: Union[int, str],
+        capture_width: Optional[int],
+        capture_height: Optional[int],
+        target_fps: Optional[float],
+        settings: dict[str, Any],
+    ) -> None:
+        self.stream_link = stream_link
+        self.capture_size = (capture_width, capture_height)
+        # Rate the camera was opened at; later rate changes arrive as controls.
+        self.target_fps = target_fps
+        self.settings = settings
+        ring_w = max(640, capture_width or 0)
+        ring_h = max(480, capture_height or 0)
+        self._slot_bytes = ring_w * ring_h * 4
+        self.ring = ShmFrameRing.create(ProcessCaptureWorker.RING_SLOTS, self._slot_bytes)
+        self._writer = ShmFrameRing.attach(self.ring.name)
+        self._lock = threading.Lock()
+        self._subscribers: list[Connection] = []
+        self.online = False
+        self.idle_since = time.monotonic()
+        # Cameras run with the configuration of the UI that opened them,
+        # without touching the daemon's config or its other cameras.
+        self.worker = CaptureWorker(
+            stream_link,
+            target_fps=target_fps,
+            capture_width=capture_width,
+            capture_height=capture_height,
+            settings=settings,
+        )
+        self.forwarder = _RingForwarder(self.worker, self._writer, self.broadcast)
+        # No event loop runs in the daemon, so slots run in the emitting thread.
+        self.worker.frame_ready.connect(
+            self.forwarder.on_frame_ready, Qt.ConnectionType.DirectConnection
+        )
+        self.worker.status_changed.connect(
+            self._on_status_changed, Qt.ConnectionType.DirectConnection
+        )
+        self.worker.start()
+
+    def _on_status_changed(self, online: bool) -> None:
+        self.online = bool(online)
+        self.broadcast(("status", self.online))
+
+    def broadcast(self, message: tuple[str, Any]) -> None:
+        """Send ``message`` to every subscriber, dropping the ones gone."""
+        with self._lock:
+            for conn in list(self._subscribers):
+                try:
+                    conn.send(message)
+                except (OSError, ValueError):
+                    self._drop(conn)
+
+    def _drop(self, conn: Connection) -> None:
+        """Forget ``conn`` (lock held)."""
+        if conn in self._subscribers:
+            self._subscribers.remove(conn)
+            if not self._subscribers:
+                self.idle_since = time.monotonic()
+
+    def ensure_ring(self) -> bool:
+        """Recreate the ring if its segment was unlinked; True if replaced.
+
+        Something other than the daemon (e.g. a resource tracker of a UI that
+        attached with tracking on) may unlink the segment while the camera
+        keeps running; a fresh ring lets new subscribers attach again.
+        """
+        if ShmFrameRing.exists(self.ring.name):
+            return False
+        logging.warning(
+            "Camera %s: frame ring %s vanished, recreating", self.stream_link, self.ring.name
+        )
+        ring = ShmFrameRing.create(ProcessCaptureWorker.RING_SLOTS, self._slot_bytes)
+        writer = ShmFrameRing.attach(ring.name)
+        old_ring, old_writer = self.ring, self._writer
+        self.ring, self._writer = ring, writer
+        self.forwarder.set_ring(writer)
+        old_writer.close()
+        old_ring.close()
+        return True
+
+    def subscribe(self, conn: Connection, reply: tuple[str, Any]) -> None:
+        """Send ``reply`` and start streaming to ``conn``."""
+        with self._lock:
+            conn.send(reply)
+            self._subscribers.append(conn)
+
+    def unsubscribe(self, conn: Connection) -> None:
+        """Stop streaming to ``conn``; the camera keeps running."""
+        with self._lock:
+            self._drop(conn)
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def control(self, op: str, value: Any) -> None:
+        """Apply a dashboard control message to the worker."""
+        if op in _CONTROLS and value is not None:
+            getattr(self.worker, _CONTROLS[op])(value)
+
+    def stats(self) -> dict[str, Any]:
+        """Stats payload in the capture process format."""
+        return {
+            "capture": self.worker.get_capture_stats(),
+            "decode": self.worker.get_decode_stats(),
+            "fourcc": self.worker.get_fourcc(),
+            "ring_written": self.forwarder.written,
+            "ring_fitted": self.forwarder.fitted,
+        }
+
+    def stop(self) -> None:
+        """Stop capture, disconnect subscribers and free the ring."""
+        self.worker.stop()
+        with self._lock:
+            subscribers, self._subscribers = self._subscribers, []
+        for conn in subscribers:
+            conn.close()
+        self._writer.close()
+        self.ring.close()
+
+
+class CaptureDaemon:
+    """Unix-socket server owning every camera across UI restarts."""
+
+    HEARTBEAT_SEC = ProcessCaptureWorker.HEARTBEAT_SEC
+
+    def __init__(self, socket_path: str, idle_timeout: float) -> None:
+        """Prepare a daemon listening on ``socket_path``."""
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._streams: dict[Union[int, str], _DaemonCamera] = {}
+        self._known: Optional[list[int]] = None
+        self._clients = 0
+        self._idle_since = time.monotonic()
+        self._running = True
+        self._stop_event = threading.Event()
+        self._listener: Optional[Listener] = None
+
+    # -- requests ---------------------------------------------------------
+
+    def _cameras(self) -> list[int]:
+        """Discovered cameras plus the ones streaming (discovery runs once)."""
+        if self._known is None:
+            self._known = find_working_cameras()
+        with self._lock:
+            streaming = [link for link in self._streams if isinstance(link, int)]
+        return sorted(set(self._known) | set(streaming))
+
+    def _probe(self, indexes: list[int]) -> list[tuple[int, Optional[int]]]:
+        """Test candidate cameras for a rescan; streaming ones pass as is."""
+        results: list[tuple[int, Optional[int]]] = []
+        for index in indexes:
+            with self._lock:
+                streaming = index in self._streams
+            ok = index if streaming else test_single_camera(
+                index, retries=2, retry_delay=0.15, allow_kill=False
+            )
+            if ok is not None and self._known is not None and ok not in self._known:
+                self._known.append(ok)
+            results.append((index, ok))
+        return results
+
+    def _subscribe(self, conn: Connection, request: dict[str, Any]) -> _DaemonCamera:
+        """Attach ``conn`` to a camera, opening or reopening it as needed."""
+        link = request["stream_link"]
+        size = (request.get("capture_width"), request.get("capture_height"))
+        # The profile rate, not the live "target_fps" control, which
+        # dynamic FPS may have lowered before a re-subscribe.
+        target_fps = request.get("profile_fps")
+        settings = request.get("settings") or {}
+        with self._lock:
+            camera = self._streams.get(link)
+            reused = (
+                camera is not None
+                and camera.capture_size == size
+                and camera.target_fps == target_fps
+                and camera.settings == settings
+            )
+            if camera is not None and not reused:
+                logging.info("Reopening camera %s with new settings", link)
+                self._streams.pop(link)
+                camera.stop()
+                camera = None
+            if camera is None:
+                camera = _DaemonCamera(link, size[0], size[1], target_fps, settings)
+                self._streams[link] = camera
+            else:
+                camera.ensure_ring()
+        for op in _CONTROLS:
+            camera.control(op, request.get(op))
+        camera.subscribe(
+            conn,
+            (
+                "subscribed",
+                {
+                    "ring": camera.ring.name,
+                    "latest": camera.ring.latest_seq,
+                    "online": camera.online,
+                    "reused": reused,
+                    "pid": os.getpid(),
+                },
+            ),
+        )
+        logging.info(
+            "Camera %s subscribed (%s stream, %d subscribers)",
+            link,
+            "running" if reused else "new",
+            camera.subscribers,
+        )
+        return camera
+
+    def _serve_client(self, conn: Connection) -> None:
+        """Handle one connection: a request/reply or a camera subscription."""
+        with self._lock:
+            self._clients += 1
+        camera: Optional[_DaemonCamera] = None
+        try:
+            op, value = conn.recv()
+            if op == "cameras":
+                conn.send(("cameras", self._cameras()))
+            elif op == "probe":
+                conn.send(("probe", self._probe(list(value))))
+            elif op == "shutdown":
+                conn.send(("shutdown", True))
+                self.shutdown()
+            elif op == "subscribe":
+                camera = self._subscribe(conn, value)
+                camera.broadcast(("stats", camera.stats()))
+                while self._running:
+                    op, value = conn.recv()
+                    camera.control(op, value)
+        except (EOFError, OSError):
+            pass
+        except Exception:
+            logging.exception("Capture daemon client failed")
+        finally:
+            if camera is not None:
+                camera.unsubscribe(conn)
+            conn.close()
+            with self._lock:
+                self._clients -= 1
+                self._idle_since = time.monotonic()
+
+    def _accept_loop(self) -> None:
+        listener = self._listener
+        assert listener is not None
+        while self._running:
+            try:
+                conn = listener.accept()
+            except OSError:
+                if self._running:
+                    logging.exception("Capture daemon accept failed")
+                    time.sleep(0.1)
+                continue
+            if not self._running:
+                conn.close()
+                break
+            threading.Thread(
+                target=self._serve_client, args=(conn,), name="daemon-client", daemon=True
+            ).start()
+
+    # -- lifecycle --------------------------------------------------------
+
+    def _housekeeping(self) -> bool:
+        """Send stats heartbeats and close idle cameras; False once idle."""
+        now = time.monotonic()
+        with self._lock:
+            streams = list(self._streams.items())
+        for link, camera in streams:
+            if camera.subscribers:
+                camera.broadcast(("stats", camera.stats()))
+            elif now - camera.idle_since > self.idle_timeout:
+                logging.info("Camera %s unused for %.0fs, closing", link, self.idle_timeout)
+                with self._lock:
+                    self._streams.pop(link, None)
+                camera.stop()
+        with self._lock:
+            busy = bool(self._streams) or self._clients > 0
+            idle_for = now - self._idle_since
+        return busy or idle_for <= self.idle_timeout
+
+    def serve_forever(self) -> None:
+        """Listen and serve until shutdown() or nothing is left to serve."""
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._listener = Listener(self.socket_path, family="AF_UNIX")
+        os.chmod(self.socket_path, 0o600)
+        logging.info("Capture daemon listening on %s (pid %d)", self.socket_path, os.getpid())
+        threading.Thread(target=self._accept_loop, name="daemon-accept", daemon=True).start()
+        while self._running:
+            if not self._housekeeping():
+                logging.info("Capture daemon idle, exiting")
+                break
+            self._stop_event.wait(self.HEARTBEAT_SEC)
+        self._close()
+
+    def shutdown(self) -> None:
+        """Ask serve_forever() to stop."""
+        self._running = False
+        self._stop_event.set()
+
+    def _close(self) -> None:
+        self._running = False
+        with self._lock:
+            streams = list(self._streams.values())
+            self._streams.clear()
+        for camera in streams:
+            camera.stop()
+        listener = self._listener
+        self._listener = None
+        if listener is not None:
+            # Wake the accept() call, then close (which unlinks the socket).
+            try:
+                Client(self.socket_path, family="AF_UNIX").close()
+            except OSError:
+                pass
+            listener.close()
+        logging.info("Capture daemon stopped")
+
+
+def _detach() -> None:
+    """Double-fork into a session of our own so the launcher returns at once."""
+    if os.fork():
+        os._exit(0)
+    os.setsid()
+    if os.fork():
+        os._exit(0)
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the capture daemon (``python -m core.capture_daemon``)."""
+    parser = argparse.ArgumentParser(description="Camera Dashboard capture daemon")
+    parser.add_argument("--socket", help="Unix socket path (default from config)")
+    parser.add_argument("--detach", action="store_true", help="run in the background")
+    parser.add_argument("--stop", action="store_true", help="stop a running daemon")
+    args = parser.parse_args(argv)
+
+    config.apply_config(config.load_config())
+    if args.socket:
+        config.CAPTURE_DAEMON_SOCKET = args.socket
+    if args.stop:
+        try:
+            request_daemon("shutdown")
+        except OSError:
+            print("No capture daemon running", file=sys.stderr)
+            return 1
+        return 0
+
+    if args.detach:
+        _detach()
+    if config.LOG_FILE:
+        root, ext = os.path.splitext(config.LOG_FILE)
+        config.LOG_FILE = f"{root}_daemon{ext or '.log'}"
+    config.configure_logging()
+
+    path = daemon_socket_path()
+    # One daemon per socket: a second one started concurrently just exits.
+    lock_file = open(path + ".lock", "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        logging.info("Capture daemon already running on %s", path)
+        return 0
+
+    daemon = CaptureDaemon(path, config.CAPTURE_DAEMON_IDLE_SEC)
+    signal.signal(signal.SIGTERM, lambda *_: daemon.shutdown())
+    signal.signal(signal.SIGINT, lambda *_: daemon.shutdown())
+    daemon.serve_forever()
+    return 0
+
+
+class DaemonCaptureWorker(ProcessCaptureWorker):
+    """Dashboard side of a camera streamed by the capture daemon.
+
+    Supervision works as for a capture process, except that "starting"
+    means subscribing to the daemon (launching it if needed) and stopping
+    only disconnects: the camera keeps streaming for the next UI.
+    """
+
+    # A subscription answers quickly unless the daemon has to open the camera.
+    START_TIMEOUT_SEC = 10.0
+
+    def _create_ring(self) -> Optional[ShmFrameRing]:
+        """The daemon owns the ring; it is attached on subscribe."""
+        return None
+
+    def _spawn(self) -> bool:
+        """Subscribe to this camera's stream on the daemon."""
+        started = time.monotonic()
+        if not ensure_capture_daemon():
+            return False
+        with self._control_lock:
+            controls = dict(self._controls)
+        try:
+            conn = connect_daemon()
+        except OSError:
+            logging.warning("Camera %s: capture daemon not reachable", self.stream_link)
+            return False
+        try:
+            conn.send(
+                (
+                    "subscribe",
+                    {
+                        "stream_link": self.stream_link,
+                        "profile_fps": self.profile_fps,
+                        "settings": _capture_settings(),
+                        **controls,
+                    },
+                )
+            )
+            if not conn.poll(self.START_TIMEOUT_SEC):
+                raise TimeoutError("no reply to subscribe")
+            _op, reply = conn.recv()
+            if self._ring is None or self._ring.name != reply["ring"]:
+                if self._ring is not None:
+                    self._ring.close()
+                # Untracked when the daemon is another process: the ring is
+                # the daemon's and must survive this UI exiting.
+                self._ring = ShmFrameRing.attach(
+                    reply["ring"], writable=False, track=reply["pid"] == os.getpid()
+                )
+                self.mailbox.set_ring(self._ring)
+        except (OSError, EOFError, TimeoutError, KeyError, ValueError):
+            logging.exception("Camera %s: subscribing to capture daemon failed", self.stream_link)
+            conn.close()
+            return False
+        self._starts += 1
+        self._pid = reply["pid"]
+        with self._control_lock:
+            self._conn = conn
+        self._set_online(bool(reply["online"]))
+        if reply["latest"] and self.mailbox.note_frame(reply["latest"]):
+            self.frame_ready.emit()
+        logging.info(
+            "Camera %s attached to capture daemon (pid %s, %s stream) in %.0f ms",
+            self.stream_link,
+            self._pid,
+            "running" if reply["reused"] else "new",
+            (time.monotonic() - started) * 1000.0,
+        )
+        return True
+
+    def _reap(self) -> None:
+        """Disconnect from the daemon; the camera keeps streaming there."""
+        with self._control_lock:
+            conn = self._conn
+            self._conn = None
+        if conn is not None:
+            conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
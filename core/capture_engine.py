@@ -0,0 +1,281 @@
+"""
+Event-driven capture engine for Camera Dashboard.
+
+Instead of every camera's QThread looping grab() + msleep(1), cameras whose
+backend exposes a pollable file descriptor (the native V4L2 mmap backend)
+register it with a CaptureEngine. One or two selector threads (epoll on
+Linux) sleep until the driver signals a filled buffer and then dispatch
+that camera's handler, so there are no polling sleeps and several cameras
+that become ready together are served by a single wake-up. The cameras'
+own threads only supervise (open, reconnect) and stay parked meanwhile.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import selectors
+import threading
+from collections import deque
+from typing import Any, Callable, Optional
+
+from core import config
+
+# Handler run on the engine thread when a descriptor is readable; returning
+# False unregisters the descriptor.
+ReadyHandler = Callable[[], bool]
+
+
+class _SelectorLoop:
+    """One engine thread: a selector plus a wake-up pipe for commands."""
+
+    # How long a waiting unregister gives a shut-down loop to leave its handler.
+    SHUTDOWN_JOIN_SEC = 1.0
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+        self._lock = threading.Lock()
+        # Pending (op, fd, handler, done) register/unregister requests.
+        self._commands: deque[
+            tuple[str, int, Optional[ReadyHandler], Optional[threading.Event]]
+        ] = deque()
+        # Registered descriptors (as requested; applied by the loop thread).
+        self._fds: set[int] = set()
+        self._shutdown = False
+        # Selector returns, and handler calls made across them.
+        self.wakeups = 0
+        self.dispatches = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def count(self) -> int:
+        """Number of descriptors registered on this loop."""
+        with self._lock:
+            return len(self._fds)
+
+    def owns(self, fd: int) -> bool:
+        """True if ``fd`` is registered on this loop."""
+        with self._lock:
+            return fd in self._fds
+
+    def _command(
+        self, op: str, fd: int, handler: Optional[ReadyHandler], wait: bool
+    ) -> bool:
+        """Queue a register/unregister for the loop thread and wake it.
+
+        With ``wait``, blocks until the loop applied the command, however
+        long the running handler takes; only shutdown() cuts the wait
+        short. Returns False if the loop thread may still be in a handler.
+        """
+        if threading.current_thread() is self._thread:
+            self._apply(op, fd, handler)
+            return True
+        done = threading.Event() if wait else None
+        with self._lock:
+            shutdown = self._shutdown
+            if not shutdown:
+                self._commands.append((op, fd, handler, done))
+        if not shutdown:
+            try:
+                os.write(self._wake_w, b"\0")
+            except BlockingIOError:
+                # Pipe already full of wake-ups; the loop will see the command.
+                pass
+            if done is None:
+                return True
+            done.wait()
+            with self._lock:
+                shutdown = self._shutdown
+            if not shutdown:
+                return True
+        elif not wait:
+            return True
+        # Released by shutdown(): the loop thread may still be dispatching.
+        self._thread.join(timeout=self.SHUTDOWN_JOIN_SEC)
+        if self._thread.is_alive():
+            logging.warning("%s: still in a handler after shutdown (fd %d)", self.name, fd)
+            return False
+        return True
+
+    def add(self, fd: int, handler: ReadyHandler) -> None:
+        """Start dispatching ``handler`` whenever ``fd`` is readable."""
+        with self._lock:
+            self._fds.add(fd)
+        self._command("add", fd, handler, wait=False)
+
+    def remove(self, fd: int) -> bool:
+        """Stop watching ``fd``; returns once the loop no longer dispatches it.
+
+        Returns False only if the loop was shut down while a handler was
+        still running, so the descriptor may not be safe to close yet.
+        """
+        with self._lock:
+            self._fds.discard(fd)
+        return self._command("remove", fd, None, wait=True)
+
+    def _apply(self, op: str, fd: int, handler: Optional[ReadyHandler]) -> None:
+        """Apply one command to the selector (loop thread only)."""
+        if op == "add":
+            try:
+                self._selector.register(fd, selectors.EVENT_READ, handler)
+            except (KeyError, ValueError, OSError):
+                logging.exception("%s: failed to register fd %d", self.name, fd)
+                with self._lock:
+                    self._fds.discard(fd)
+        else:
+            try:
+                self._selector.unregister(fd)
+            except (KeyError, ValueError):
+                pass
+
+    def _drain_commands(self) -> None:
+        """Empty the wake-up pipe and apply queued commands."""
+        try:
+            while os.read(self._wake_r, 512):
+                pass
+        except BlockingIOError:
+            pass
+        while True:
+            with self._lock:
+                if not self._commands:
+                    return
+                op, fd, handler, done = self._commands.popleft()
+            self._apply(op, fd, handler)
+            if done is not None:
+                done.set()
+
+    def _run(self) -> None:
+        """Sleep in select() and dispatch handlers for ready descriptors."""
+        while True:
+            events = self._selector.select()
+            with self._lock:
+                if self._shutdown:
+                    break
+            self.wakeups += 1
+            for key, _mask in events:
+                if key.data is None:
+                    self._drain_commands()
+                    continue
+                # Skip descriptors unregistered earlier in this batch.
+                if not self.owns(key.fd):
+                    continue
+                self.dispatches += 1
+                try:
+                    keep = key.data()
+                except Exception:
+                    logging.exception("%s: handler for fd %d failed", self.name, key.fd)
+                    keep = True
+                if not keep:
+                    # Unregister before dropping ownership so unregister()
+                    # callers never see the fd released while still watched.
+                    self._apply("remove", key.fd, None)
+                    with self._lock:
+                        self._fds.discard(key.fd)
+        self._selector.close()
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the loop thread; pending commands are released."""
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            commands = list(self._commands)
+            self._commands.clear()
+        for _op, _fd, _handler, done in commands:
+            if done is not None:
+                done.set()
+        try:
+            os.write(self._wake_w, b"\0")
+        except OSError:
+            pass
+        if wait and threading.current_thread() is not self._thread:
+            self._thread.join(timeout=1.0)
+
+
+class CaptureEngine:
+    """Selector threads dispatching capture handlers on driver readiness."""
+
+    def __init__(self, threads: int = 1) -> None:
+        """Start ``threads`` selector threads; cameras are spread across them."""
+        self.threads = max(1, int(threads))
+        self._loops = [
+            _SelectorLoop(f"capture-engine-{i}") for i in range(self.threads)
+        ]
+        self._lock = threading.Lock()
+
+    def register(self, fd: int, handler: ReadyHandler) -> None:
+        """Call ``handler`` on an engine thread each time ``fd`` is readable.
+
+        The descriptor goes to the least loaded thread. The handler should
+        take one ready frame without blocking and return False to stop.
+        """
+        with self._lock:
+            loop = min(self._loops, key=lambda candidate: candidate.count)
+            loop.add(fd, handler)
+
+    def unregister(self, fd: int) -> bool:
+        """Stop dispatching ``fd``; safe to close it once this returns True.
+
+        Waits for a handler already running for ``fd`` to finish. False
+        means the engine was shut down with that handler still running.
+        """
+        stopped = True
+        for loop in self._loops:
+            if loop.owns(fd):
+                stopped = loop.remove(fd) and stopped
+        return stopped
+
+    def stats(self) -> dict[str, Any]:
+        """Return registered descriptors, wake-ups and handler dispatches."""
+        registered = sum(loop.count for loop in self._loops)
+        wakeups = sum(loop.wakeups for loop in self._loops)
+        dispatches = sum(loop.dispatches for loop in self._loops)
+        return {
+            "threads": self.threads,
+            "registered": registered,
+            "wakeups": wakeups,
+            "dispatches": dispatches,
+            "dispatches_per_wakeup": dispatches / wakeups if wakeups else 0.0,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop all selector threads."""
+        for loop in self._loops:
+            loop.shutdown(wait)
+
+
+_shared_engine: Optional[CaptureEngine] = None
+_shared_engine_lock = threading.Lock()
+
+
+def get_capture_engine() -> CaptureEngine:
+    """Return the process-wide capture engine, creating it on first use.
+
+    Sized by ``[performance] capture_engine_threads``.
+    """
+    global _shared_engine
+    with _shared_engine_lock:
+        if _shared_engine is None:
+            _shared_engine = CaptureEngine(config.CAPTURE_ENGINE_THREADS)
+            logging.info(
+                "Capture engine started with %d threads", config.CAPTURE_ENGINE_THREADS
+            )
+        return _shared_engine
+
+
+def shutdown_capture_engine() -> None:
+    """Stop the process-wide capture engine if it was started."""
+    global _shared_engine
+    with _shared_engine_lock:
+        engine = _shared_engine
+        _shared_engine = None
+    if engine is not None:
+        engine.shutdown()
@@ -53,6 +53,37 @@ RESTART_COOLDOWN_SEC = 5.0
 MAX_RESTARTS_PER_WINDOW = 3
 RESTART_WINDOW_SEC = 30.0
 
+# Drive each capture worker's publish rate from its widget's measured
+# render rate so frames are not decoded only to be dropped unseen.
+COUPLE_CAPTURE_TO_RENDER = True
+
+# Decode compressed frames on a pool shared by all cameras instead of in
+# each capture thread. DECODE_THREADS = 0 sizes the pool to the core count.
+SHARED_DECODE = True
+DECODE_THREADS = 0
+
+# Stream native V4L2 cameras from one or two epoll threads woken by the
+# driver, instead of a polling loop per camera thread.
+CAPTURE_ENGINE = False
+CAPTURE_ENGINE_THREADS = 1
+
+# Ask the camera itself for a lower frame rate once a reduced publish rate
+# has held for HARDWARE_FPS_HOLD_SEC (V4L2 mmap and PyGObject backends).
+HARDWARE_FPS = True
+HARDWARE_FPS_HOLD_SEC = 10.0
+
+# V4L2 control profile applied when a camera opens (core.controls): keys
+# left out keep the camera's own setting. CAMERA_CONTROL_OVERRIDES holds
+# per-camera profiles from [controls.videoN] sections, merged over it.
+# Cameras delivering less than EXPOSURE_LIMIT_RATIO of their negotiated
+# frame rate are checked for exposure limiting.
+CAMERA_CONTROLS_ENABLED = True
+CAMERA_CONTROLS: dict[str, Any] = {"exposure_auto_priority": False}
+CAMERA_CONTROL_OVERRIDES: dict[int, dict[str, Any]] = {}
+EXPOSURE_MODES = ("auto", "manual")
+POWER_LINE_FREQUENCIES = ("disabled", "50", "60", "auto")
+EXPOSURE_LIMIT_RATIO = 0.8
+
 
 # ============================================================
 # CAMERA RESCAN (HOT-PLUG SUPPORT)
@@ -76,8 +107,50 @@ PROFILE_UI_FPS = 20
 # GStreamer pipeline support
 USE_GSTREAMER = True
 
-# Render overhead compensation (ms)
-RENDER_OVERHEAD_MS = 3
+# Capture architecture: "threads" (one CaptureWorker per camera tile),
+# "gst_mosaic" (one GStreamer compositor pipeline producing a grid mosaic) or
+# "process" (each CaptureWorker in its own supervised process, frames in a
+# shared-memory ring; core.process_capture) or "daemon" (cameras streamed by
+# a long-lived capture daemon that survives UI restarts; core.capture_daemon).
+CAPTURE_MODE = "threads"
+CAPTURE_MODES = ("threads", "gst_mosaic", "process", "daemon")
+
+# Capture daemon: Unix socket path ("" = $XDG_RUNTIME_DIR or /tmp default)
+# and how long cameras keep streaming with no UI attached.
+CAPTURE_DAEMON_SOCKET = ""
+CAPTURE_DAEMON_IDLE_SEC = 30.0
+
+# Capture backend: "opencv" (cv2 GStreamer/V4L2), "gi" (PyGObject appsink,
+# core.gst_backend) or "v4l2" (native mmap MJPEG capture, core.v4l2).
+# CAPTURE_BACKEND_OVERRIDES maps camera indexes to a backend, from the
+# [capture_backends] section.
+CAPTURE_BACKEND = "opencv"
+CAPTURE_BACKENDS = ("opencv", "gi", "v4l2")
+CAPTURE_BACKEND_OVERRIDES: dict[int, str] = {}
+
+# Pixel format handed to the UI: "bgr" (24-bit BGR888) or "rgb32"
+# (32-bit BGRx, Qt's native Format_RGB32, uploaded without conversion).
+OUTPUT_FORMAT = "bgr"
+OUTPUT_FORMATS = ("bgr", "rgb32")
+
+# On the V4L2 MJPEG path, fetch the compressed JPEG and decode it at 1/2,
+# 1/4 or 1/8 scale when the tile is small enough (libjpeg DCT scaling).
+REDUCED_DECODE = True
+
+# UI rendering: "widgets" (each tile shows its frame as a QLabel pixmap) or
+# "compositor" (the grid container paints every tile's frame in one
+# paintEvent, repainting only tiles with a new frame; ui.compositor) or
+# "mosaic" (a background thread composes every tile's frame into one image
+# the grid presents; core.mosaic).
+RENDER_MODE = "widgets"
+RENDER_MODES = ("widgets", "compositor", "mosaic")
+
+# Tiles that cannot be seen (covered by a fullscreen camera, window
+# minimized, display blanked) stop rendering and their capture drops to
+# HIDDEN_CAPTURE_FPS frames per second; 0 keeps the camera streaming but
+# decodes nothing. Everything resumes at full rate once visible again.
+SUSPEND_HIDDEN_TILES = True
+HIDDEN_CAPTURE_FPS = 1.0
 
 
 # ============================================================
@@ -138,6 +211,68 @@ def _as_float(
     return parsed
 
 
+def _as_choice(value: Any, default: str, choices: tuple[str, ...]) -> str:
+    """Parse a value as one of a fixed set of lowercase keywords."""
+    if value is None:
+        return default
+    text = str(value).strip().lower()
+    return text if text in choices else default
+
+
+def capture_backend_for(stream_link: Any, settings: Optional[dict[str, Any]] = None) -> str:
+    """Return the capture backend configured for a camera index.
+
+    ``settings`` (config names to values) takes precedence over the globals.
+    """
+    settings = settings or {}
+    backend = settings.get("CAPTURE_BACKEND", CAPTURE_BACKEND)
+    if isinstance(stream_link, int):
+        overrides = settings.get("CAPTURE_BACKEND_OVERRIDES", CAPTURE_BACKEND_OVERRIDES)
+        return overrides.get(stream_link, backend)
+    return backend
+
+
+def _parse_controls(items: list[tuple[str, str]], section: str) -> dict[str, Any]:
+    """Parse the control profile keys of a [controls] section; blank = unset."""
+    profile: dict[str, Any] = {}
+    for key, value in items:
+        value = value.strip()
+        if key in ("enabled", "exposure_limit_ratio") or not value:
+            continue
+        if key == "exposure_auto_priority":
+            parsed: Any = _as_bool(value, None)  # type: ignore[arg-type]
+        elif key == "exposure_mode":
+            parsed = _as_choice(value, "", EXPOSURE_MODES) or None
+        elif key == "exposure_time_ms":
+            parsed = _as_float(value, 0.0, max_value=10000.0)
+            parsed = parsed if parsed > 0 else None
+        elif key == "gain":
+            parsed = _as_int(value, -1, max_value=65535)
+            parsed = parsed if parsed >= 0 else None
+        elif key == "power_line_frequency":
+            parsed = _as_choice(value, "", POWER_LINE_FREQUENCIES) or None
+        else:
+            parsed = None
+        if parsed is None:
+            logging.warning("Ignoring [%s] entry %s = %s", section, key, value)
+            continue
+        profile[key] = parsed
+    return profile
+
+
+def controls_for(stream_link: Any, settings: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+    """Return the control profile configured for a camera index.
+
+    ``settings`` (config names to values) takes precedence over the globals.
+    """
+    settings = settings or {}
+    profile = dict(settings.get("CAMERA_CONTROLS", CAMERA_CONTROLS))
+    if isinstance(stream_link, int):
+        overrides = settings.get("CAMERA_CONTROL_OVERRIDES", CAMERA_CONTROL_OVERRIDES)
+        profile.update(overrides.get(stream_link, {}))
+    return profile
+
+
 def load_config(path: Optional[str] = None) -> configparser.ConfigParser:
     """Load configuration from INI file."""
     if path is None:
@@ -158,7 +293,14 @@ def apply_config(parser: configparser.ConfigParser) -> None:
     global RESCAN_INTERVAL_MS, FAILED_CAMERA_COOLDOWN_SEC, CAMERA_SLOT_COUNT
     global HEALTH_LOG_INTERVAL_SEC, KILL_DEVICE_HOLDERS
     global PROFILE_CAPTURE_WIDTH, PROFILE_CAPTURE_HEIGHT, PROFILE_CAPTURE_FPS
-    global PROFILE_UI_FPS, USE_GSTREAMER
+    global PROFILE_UI_FPS, USE_GSTREAMER, COUPLE_CAPTURE_TO_RENDER, OUTPUT_FORMAT
+    global REDUCED_DECODE, SHARED_DECODE, DECODE_THREADS, CAPTURE_MODE
+    global CAPTURE_BACKEND, CAPTURE_BACKEND_OVERRIDES
+    global CAPTURE_ENGINE, CAPTURE_ENGINE_THREADS
+    global HARDWARE_FPS, HARDWARE_FPS_HOLD_SEC
+    global CAPTURE_DAEMON_SOCKET, CAPTURE_DAEMON_IDLE_SEC
+    global CAMERA_CONTROLS_ENABLED, CAMERA_CONTROLS, CAMERA_CONTROL_OVERRIDES
+    global EXPOSURE_LIMIT_RATIO, RENDER_MODE, SUSPEND_HIDDEN_TILES, HIDDEN_CAPTURE_FPS
 
     if parser.has_section("logging"):
         LOG_LEVEL = parser.get("logging", "level", fallback=LOG_LEVEL)
@@ -266,6 +408,47 @@ def apply_config(parser: configparser.ConfigParser) -> None:
             RESTART_WINDOW_SEC,
             min_value=5.0,
         )
+        COUPLE_CAPTURE_TO_RENDER = _as_bool(
+            parser.get(
+                "performance",
+                "couple_capture_to_render",
+                fallback=COUPLE_CAPTURE_TO_RENDER,
+            ),
+            COUPLE_CAPTURE_TO_RENDER,
+        )
+        SHARED_DECODE = _as_bool(
+            parser.get("performance", "shared_decode", fallback=SHARED_DECODE),
+            SHARED_DECODE,
+        )
+        DECODE_THREADS = _as_int(
+            parser.get("performance", "decode_threads", fallback=DECODE_THREADS),
+            DECODE_THREADS,
+            min_value=0,
+            max_value=64,
+        )
+        CAPTURE_ENGINE = _as_bool(
+            parser.get("performance", "capture_engine", fallback=CAPTURE_ENGINE),
+            CAPTURE_ENGINE,
+        )
+        CAPTURE_ENGINE_THREADS = _as_int(
+            parser.get(
+                "performance", "capture_engine_threads", fallback=CAPTURE_ENGINE_THREADS
+            ),
+            CAPTURE_ENGINE_THREADS,
+            min_value=1,
+            max_value=4,
+        )
+        HARDWARE_FPS = _as_bool(
+            parser.get("performance", "hardware_fps", fallback=HARDWARE_FPS),
+            HARDWARE_FPS,
+        )
+        HARDWARE_FPS_HOLD_SEC = _as_float(
+            parser.get(
+                "performance", "hardware_fps_hold_sec", fallback=HARDWARE_FPS_HOLD_SEC
+            ),
+            HARDWARE_FPS_HOLD_SEC,
+            min_value=0.0,
+        )
 
     if parser.has_section("camera"):
         RESCAN_INTERVAL_MS = _as_int(
@@ -295,6 +478,73 @@ def apply_config(parser: configparser.ConfigParser) -> None:
         USE_GSTREAMER = _as_bool(
             parser.get("camera", "use_gstreamer", fallback=USE_GSTREAMER), USE_GSTREAMER
         )
+        OUTPUT_FORMAT = _as_choice(
+            parser.get("camera", "output_format", fallback=OUTPUT_FORMAT),
+            OUTPUT_FORMAT,
+            OUTPUT_FORMATS,
+        )
+        CAPTURE_MODE = _as_choice(
+            parser.get("camera", "capture_mode", fallback=CAPTURE_MODE),
+            CAPTURE_MODE,
+            CAPTURE_MODES,
+        )
+        REDUCED_DECODE = _as_bool(
+            parser.get("camera", "reduced_decode", fallback=REDUCED_DECODE),
+            REDUCED_DECODE,
+        )
+        CAPTURE_BACKEND = _as_choice(
+            parser.get("camera", "capture_backend", fallback=CAPTURE_BACKEND),
+            CAPTURE_BACKEND,
+            CAPTURE_BACKENDS,
+        )
+
+    if parser.has_section("capture_backends"):
+        # Keys are camera indexes ("0" or "video0"); unknown entries are skipped.
+        overrides: dict[int, str] = {}
+        for key, value in parser.items("capture_backends"):
+            index = _as_int(key[len("video"):] if key.startswith("video") else key, -1)
+            backend = _as_choice(value, "", CAPTURE_BACKENDS)
+            if index >= 0 and backend:
+                overrides[index] = backend
+            else:
+                logging.warning("Ignoring capture_backends entry %s = %s", key, value)
+        CAPTURE_BACKEND_OVERRIDES = overrides
+
+    if parser.has_section("controls"):
+        CAMERA_CONTROLS_ENABLED = _as_bool(
+            parser.get("controls", "enabled", fallback=CAMERA_CONTROLS_ENABLED),
+            CAMERA_CONTROLS_ENABLED,
+        )
+        EXPOSURE_LIMIT_RATIO = _as_float(
+            parser.get("controls", "exposure_limit_ratio", fallback=EXPOSURE_LIMIT_RATIO),
+            EXPOSURE_LIMIT_RATIO,
+            min_value=0.1,
+            max_value=1.0,
+        )
+        CAMERA_CONTROLS = _parse_controls(parser.items("controls"), "controls")
+
+    # Per-camera profiles: [controls.video2] or [controls.2].
+    control_overrides: dict[int, dict[str, Any]] = {}
+    for section in parser.sections():
+        if not section.startswith("controls."):
+            continue
+        key = section[len("controls."):]
+        index = _as_int(key[len("video"):] if key.startswith("video") else key, -1)
+        if index < 0:
+            logging.warning("Ignoring section [%s]", section)
+            continue
+        control_overrides[index] = _parse_controls(parser.items(section), section)
+    CAMERA_CONTROL_OVERRIDES = control_overrides
+
+    if parser.has_section("daemon"):
+        CAPTURE_DAEMON_SOCKET = parser.get(
+            "daemon", "socket_path", fallback=CAPTURE_DAEMON_SOCKET
+        ).strip()
+        CAPTURE_DAEMON_IDLE_SEC = _as_float(
+            parser.get("daemon", "idle_timeout_sec", fallback=CAPTURE_DAEMON_IDLE_SEC),
+            CAPTURE_DAEMON_IDLE_SEC,
+            min_value=1.0,
+        )
 
     if parser.has_section("profile"):
         PROFILE_CAPTURE_WIDTH = _as_int(
@@ -322,6 +572,23 @@ def apply_config(parser: configparser.ConfigParser) -> None:
             max_value=60,
         )
 
+    if parser.has_section("ui"):
+        RENDER_MODE = _as_choice(
+            parser.get("ui", "render_mode", fallback=RENDER_MODE),
+            RENDER_MODE,
+            RENDER_MODES,
+        )
+        SUSPEND_HIDDEN_TILES = _as_bool(
+            parser.get("ui", "suspend_hidden", fallback=SUSPEND_HIDDEN_TILES),
+            SUSPEND_HIDDEN_TILES,
+        )
+        HIDDEN_CAPTURE_FPS = _as_float(
+            parser.get("ui", "hidden_capture_fps", fallback=HIDDEN_CAPTURE_FPS),
+            HIDDEN_CAPTURE_FPS,
+            min_value=0.0,
+            max_value=30.0,
+        )
+
     if parser.has_section("health"):
         HEALTH_LOG_INTERVAL_SEC = _as_float(
             parser.get("health", "log_interval_sec", fallback=HEALTH_LOG_INTERVAL_SEC),
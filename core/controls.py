@@ -0,0 +1,256 @@
+"""
+V4L2 camera controls for Camera Dashboard.
+
+Many UVC cameras ship with ``exposure_auto_priority`` on, which lets auto
+exposure run longer than the frame period: in low light the camera quietly
+drops to half (or a third of) its negotiated frame rate, and the dashboard
+sees a slow camera that looks like system stress. CameraControls applies
+the configured control profile when a camera opens (exposure priority,
+exposure mode and time, gain, power-line frequency) and compares the rate
+the camera delivers with the rate it negotiated, logging when a camera is
+exposure-limited.
+
+Controls are set through a second handle on the device node, which V4L2
+allows while another handle streams, so this works with every backend.
+"""
+
+from __future__ import annotations
+
+import logging
+import platform
+from typing import Any, Optional
+
+from core.v4l2 import (
+    DeviceIO,
+    V4L2Device,
+    V4L2_CID_AUTOGAIN,
+    V4L2_CID_EXPOSURE_ABSOLUTE,
+    V4L2_CID_EXPOSURE_AUTO,
+    V4L2_CID_EXPOSURE_AUTO_PRIORITY,
+    V4L2_CID_GAIN,
+    V4L2_CID_POWER_LINE_FREQUENCY,
+    V4L2_EXPOSURE_APERTURE_PRIORITY,
+    V4L2_EXPOSURE_AUTO,
+    V4L2_EXPOSURE_MANUAL,
+)
+
+# Readable control names (as v4l2-ctl prints them) for log lines and stats.
+CONTROL_NAMES = {
+    V4L2_CID_EXPOSURE_AUTO: "exposure_auto",
+    V4L2_CID_EXPOSURE_AUTO_PRIORITY: "exposure_auto_priority",
+    V4L2_CID_EXPOSURE_ABSOLUTE: "exposure_absolute",
+    V4L2_CID_AUTOGAIN: "gain_automatic",
+    V4L2_CID_GAIN: "gain",
+    V4L2_CID_POWER_LINE_FREQUENCY: "power_line_frequency",
+}
+
+POWER_LINE_VALUES = {"disabled": 0, "50": 1, "60": 2, "auto": 3}
+
+
+class CameraControls:
+    """Applies a control profile to one camera and watches for exposure limiting."""
+
+    # Delivered rate is measured over windows of this length; this many
+    # consecutive slow windows make an episode.
+    CHECK_INTERVAL_SEC = 5.0
+    SLOW_CHECKS = 2
+
+    def __init__(self, device: V4L2Device, name: Any, limit_ratio: float = 0.8) -> None:
+        """Wrap an opened (not streaming) device handle."""
+        self._device = device
+        self.name = name
+        self.limit_ratio = limit_ratio
+        # True while the camera delivers below limit_ratio of its negotiated
+        # rate because of its exposure settings.
+        self.exposure_limited = False
+        self.delivered_fps = 0.0
+        self._window_start: Optional[float] = None
+        self._window_frames = 0
+        self._slow_checks = 0
+        self._slow = False
+
+    @classmethod
+    def open(
+        cls, stream_link: Any, limit_ratio: float = 0.8, io: Optional[DeviceIO] = None
+    ) -> Optional[CameraControls]:
+        """Open a control handle on /dev/video<stream_link>; None if unavailable."""
+        if not isinstance(stream_link, int) or (io is None and platform.system() != "Linux"):
+            return None
+        device = V4L2Device(f"/dev/video{stream_link}", io)
+        try:
+            device.open()
+        except OSError as exc:
+            logging.debug("Camera %s: no control handle (%s)", stream_link, exc)
+            return None
+        return cls(device, stream_link, limit_ratio)
+
+    def close(self) -> None:
+        """Close the control handle."""
+        try:
+            self._device.close()
+        except OSError:
+            pass
+
+    def _get(self, cid: int) -> Optional[int]:
+        """Return a control's value, or None if the camera lacks it."""
+        if self._device.query_control(cid) is None:
+            return None
+        try:
+            return self._device.get_control(cid)
+        except OSError:
+            return None
+
+    def _set(self, cid: int, value: int, changes: dict[str, tuple[int, int]]) -> bool:
+        """Set a control the camera has, clamped to its range; record changes."""
+        query = self._device.query_control(cid)
+        if query is None:
+            logging.debug("Camera %s has no %s control", self.name, CONTROL_NAMES[cid])
+            return False
+        value = max(query.minimum, min(query.maximum, int(value)))
+        try:
+            old = self._device.get_control(cid)
+            if old != value:
+                new = self._device.set_control(cid, value)
+                changes[CONTROL_NAMES[cid]] = (old, new)
+        except OSError as exc:
+            logging.info(
+                "Camera %s: cannot set %s=%d (%s)", self.name, CONTROL_NAMES[cid], value, exc
+            )
+            return False
+        return True
+
+    def _set_exposure_mode(self, mode: str, changes: dict[str, tuple[int, int]]) -> None:
+        """Switch between manual and automatic exposure.
+
+        UVC cameras offer auto exposure as aperture priority (the exposure
+        time is automatic), so that is tried first for "auto".
+        """
+        if mode == "manual":
+            self._set(V4L2_CID_EXPOSURE_AUTO, V4L2_EXPOSURE_MANUAL, changes)
+            return
+        for value in (V4L2_EXPOSURE_APERTURE_PRIORITY, V4L2_EXPOSURE_AUTO):
+            query = self._device.query_control(V4L2_CID_EXPOSURE_AUTO)
+            if query is None or not query.minimum <= value <= query.maximum:
+                continue
+            if self._set(V4L2_CID_EXPOSURE_AUTO, value, changes):
+                return
+
+    def apply(self, profile: dict[str, Any], fps: float) -> dict[str, tuple[int, int]]:
+        """Apply a control profile for a camera negotiated at ``fps``.
+
+        Returns the controls changed as name -> (old, new). A manual exposure
+        time is capped at the frame period so it cannot lower the frame rate.
+        """
+        changes: dict[str, tuple[int, int]] = {}
+        mode = profile.get("exposure_mode")
+        if mode:
+            self._set_exposure_mode(mode, changes)
+        if "exposure_auto_priority" in profile:
+            self._set(
+                V4L2_CID_EXPOSURE_AUTO_PRIORITY, int(bool(profile["exposure_auto_priority"])), changes
+            )
+        exposure_ms = profile.get("exposure_time_ms")
+        if exposure_ms:
+            if fps > 0:
+                exposure_ms = min(exposure_ms, 1000.0 / fps)
+            # exposure_absolute counts 100 us units.
+            self._set(V4L2_CID_EXPOSURE_ABSOLUTE, max(1, round(exposure_ms * 10)), changes)
+        gain = profile.get("gain")
+        if gain is not None:
+            self._set(V4L2_CID_AUTOGAIN, 0, changes)
+            self._set(V4L2_CID_GAIN, gain, changes)
+        power_line = profile.get("power_line_frequency")
+        if power_line:
+            self._set(V4L2_CID_POWER_LINE_FREQUENCY, POWER_LINE_VALUES[power_line], changes)
+        if changes:
+            logging.info(
+                "Camera %s controls %s",
+                self.name,
+                " ".join(f"{name}={old}->{new}" for name, (old, new) in changes.items()),
+            )
+        return changes
+
+    def read(self) -> dict[str, int]:
+        """Return the current value of each known control the camera has."""
+        values = {}
+        for cid, name in CONTROL_NAMES.items():
+            value = self._get(cid)
+            if value is not None:
+                values[name] = value
+        return values
+
+    def exposure_cause(self, fps: float) -> Optional[str]:
+        """Describe how exposure holds the camera below ``fps``, or None."""
+        mode = self._get(V4L2_CID_EXPOSURE_AUTO)
+        exposure = self._get(V4L2_CID_EXPOSURE_ABSOLUTE)
+        exposure_ms = exposure / 10.0 if exposure is not None else None
+        if mode is not None and mode != V4L2_EXPOSURE_MANUAL:
+            if self._get(V4L2_CID_EXPOSURE_AUTO_PRIORITY) == 1:
+                if exposure_ms is None:
+                    return "exposure_auto_priority is on"
+                return f"exposure_auto_priority is on (exposure {exposure_ms:.1f} ms)"
+            return None
+        if mode == V4L2_EXPOSURE_MANUAL and exposure_ms is not None and fps > 0:
+            period_ms = 1000.0 / fps
+            if exposure_ms > period_ms:
+                return (
+                    f"manual exposure {exposure_ms:.1f} ms exceeds the "
+                    f"{period_ms:.1f} ms frame period"
+                )
+        return None
+
+    def update(self, frames: int, negotiated_fps: float, now: float) -> None:
+        """Account the camera's total frame count at monotonic time ``now``.
+
+        Once per CHECK_INTERVAL_SEC the delivered rate is compared with the
+        negotiated rate; an episode of slow windows is logged once, as
+        exposure-limited when the controls explain it.
+        """
+        if self._window_start is None:
+            self._window_start = now
+            self._window_frames = frames
+            return
+        elapsed = now - self._window_start
+        if elapsed < self.CHECK_INTERVAL_SEC:
+            return
+        self.delivered_fps = max(0, frames - self._window_frames) / elapsed
+        self._window_start = now
+        self._window_frames = frames
+        if negotiated_fps <= 0:
+            return
+        if self.delivered_fps >= self.limit_ratio * negotiated_fps:
+            if self._slow:
+                logging.info(
+                    "Camera %s back to %.1f of %.1f FPS",
+                    self.name,
+                    self.delivered_fps,
+                    negotiated_fps,
+                )
+            self._slow_checks = 0
+            self._slow = False
+            self.exposure_limited = False
+            return
+        self._slow_checks += 1
+        if self._slow or self._slow_checks < self.SLOW_CHECKS:
+            return
+        self._slow = True
+        try:
+            cause = self.exposure_cause(negotiated_fps)
+        except OSError:
+            cause = None
+        self.exposure_limited = cause is not None
+        if cause is not None:
+            logging.warning(
+                "Camera %s is exposure-limited: %.1f of %.1f FPS, %s",
+                self.name,
+                self.delivered_fps,
+                negotiated_fps,
+                cause,
+            )
+        else:
+            logging.info(
+                "Camera %s delivers %.1f of %.1f FPS (not exposure-limited)",
+                self.name,
+                self.delivered_fps,
+                negotiated_fps,
+            )
@@ -0,0 +1,206 @@
+"""
+Shared frame decode pool for Camera Dashboard.
+
+Capture threads only dequeue compressed buffers and submit the decode to a
+DecodePool shared by every camera. Each camera (key) holds at most one
+pending job: submitting while one is still waiting replaces it, so a slow
+decode never builds a backlog and the newest frame always wins. Jobs for
+the same key never run concurrently, which keeps per-camera scratch
+buffers single-threaded, while different cameras spread across the pool's
+threads (sized to the core count by default).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Hashable, Optional
+
+from core import config
+
+
+class _KeyStats:
+    """Per-key counters and recent decode timings."""
+
+    __slots__ = ("submitted", "completed", "superseded", "failed", "latency", "wait")
+
+    def __init__(self, window: int) -> None:
+        self.submitted = 0
+        self.completed = 0
+        self.superseded = 0
+        self.failed = 0
+        # Seconds spent running the job, and waiting for a pool thread.
+        self.latency: deque[float] = deque(maxlen=window)
+        self.wait: deque[float] = deque(maxlen=window)
+
+
+class DecodePool:
+    """Bounded latest-wins job pool shared by all capture workers."""
+
+    # Number of recent jobs per key used for latency statistics.
+    STATS_WINDOW = 60
+
+    def __init__(self, threads: int) -> None:
+        """Start ``threads`` daemon decode threads."""
+        self.threads = max(1, int(threads))
+        self._cond = threading.Condition()
+        self._pending: dict[Hashable, tuple[Callable[[], None], float]] = {}
+        self._ready: deque[Hashable] = deque()
+        self._busy: set[Hashable] = set()
+        self._stats: dict[Hashable, _KeyStats] = {}
+        self._shutdown = False
+        self._workers = [
+            threading.Thread(target=self._run, name=f"decode-{i}", daemon=True)
+            for i in range(self.threads)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, key: Hashable, job: Callable[[], None]) -> bool:
+        """Queue ``job`` as the latest work for ``key``.
+
+        Returns True if it replaced a job for the same key that had not
+        started yet (that job is dropped without running).
+        """
+        with self._cond:
+            if self._shutdown:
+                return False
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _KeyStats(self.STATS_WINDOW)
+            stats.submitted += 1
+            replaced = key in self._pending
+            self._pending[key] = (job, time.monotonic())
+            if replaced:
+                stats.superseded += 1
+            elif key not in self._busy:
+                self._ready.append(key)
+                self._cond.notify()
+            return replaced
+
+    def discard(self, key: Hashable) -> None:
+        """Drop any pending job and the statistics for ``key``."""
+        with self._cond:
+            if self._pending.pop(key, None) is not None:
+                try:
+                    self._ready.remove(key)
+                except ValueError:
+                    pass
+            self._stats.pop(key, None)
+
+    def _run(self) -> None:
+        """Decode thread: run the oldest ready key's latest job."""
+        while True:
+            with self._cond:
+                while not self._ready and not self._shutdown:
+                    self._cond.wait()
+                if self._shutdown:
+                    return
+                key = self._ready.popleft()
+                job, submitted_at = self._pending.pop(key)
+                self._busy.add(key)
+            started = time.monotonic()
+            ok = True
+            try:
+                job()
+            except Exception:
+                ok = False
+                logging.exception("Decode job failed for %s", key)
+            finished = time.monotonic()
+            with self._cond:
+                self._busy.discard(key)
+                stats = self._stats.get(key)
+                if stats is not None:
+                    if ok:
+                        stats.completed += 1
+                    else:
+                        stats.failed += 1
+                    stats.latency.append(finished - started)
+                    stats.wait.append(started - submitted_at)
+                # A newer job arrived while this one ran; it is next.
+                if key in self._pending:
+                    self._ready.append(key)
+                    self._cond.notify()
+
+    def stats(self, key: Hashable) -> dict[str, Any]:
+        """Return queue depth, counters and decode/wait latency for ``key``."""
+        with self._cond:
+            stats = self._stats.get(key)
+            pending = 1 if key in self._pending else 0
+            in_flight = 1 if key in self._busy else 0
+            if stats is None:
+                latency: list[float] = []
+                wait: list[float] = []
+                counters = (0, 0, 0, 0)
+            else:
+                latency = list(stats.latency)
+                wait = list(stats.wait)
+                counters = (
+                    stats.submitted,
+                    stats.completed,
+                    stats.superseded,
+                    stats.failed,
+                )
+        submitted, completed, superseded, failed = counters
+        return {
+            "pending": pending,
+            "in_flight": in_flight,
+            "submitted": submitted,
+            "completed": completed,
+            "superseded": superseded,
+            "failed": failed,
+            "decode_ms": (sum(latency) / len(latency) * 1000.0) if latency else 0.0,
+            "decode_max_ms": max(latency) * 1000.0 if latency else 0.0,
+            "wait_ms": (sum(wait) / len(wait) * 1000.0) if wait else 0.0,
+        }
+
+    def pool_stats(self) -> dict[str, int]:
+        """Return thread count and the number of keys waiting for a thread."""
+        with self._cond:
+            return {
+                "threads": self.threads,
+                "ready": len(self._ready),
+                "busy": len(self._busy),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the decode threads; pending jobs are dropped."""
+        with self._cond:
+            self._shutdown = True
+            self._pending.clear()
+            self._ready.clear()
+            self._cond.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join(timeout=1.0)
+
+
+_shared_pool: Optional[DecodePool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_decode_pool() -> DecodePool:
+    """Return the process-wide decode pool, creating it on first use.
+
+    Sized by ``[performance] decode_threads``; 0 means one thread per core.
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            threads = config.DECODE_THREADS or (os.cpu_count() or 1)
+            _shared_pool = DecodePool(threads)
+            logging.info("Shared decode pool started with %d threads", threads)
+        return _shared_pool
+
+
+def shutdown_decode_pool() -> None:
+    """Stop the process-wide decode pool if it was started."""
+    global _shared_pool
+    with _shared_pool_lock:
+        pool = _shared_pool
+        _shared_pool = None
+    if pool is not None:
+        pool.shutdown()
@@ -0,0 +1,254 @@
+"""
+Reference-counted frame buffer pool for Camera Dashboard.
+
+CaptureWorker decodes into buffers leased from a FramePool and hands the
+FrameLease to the UI. Whoever holds the lease releases it when done; the
+buffer goes back to the pool once the last reference is released. Leases
+that are dropped without an explicit release (e.g. still queued in a Qt
+signal when a worker is disposed) are reclaimed by the finalizer and
+counted as leaked, so pool sizing can be checked from the stats instead
+of guessed. FrameMailbox hands the newest lease from a worker to the UI
+without queueing one event per frame.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class FrameLease:
+    """Reference-counted handle on one pooled frame buffer."""
+
+    __slots__ = ("array", "_pool", "_refs", "__weakref__")
+
+    def __init__(self, pool: FramePool, array: NDArray[np.uint8]) -> None:
+        """Wrap ``array`` with a single reference owned by the caller."""
+        self.array = array
+        self._pool = pool
+        self._refs = 1
+
+    @property
+    def released(self) -> bool:
+        """True once every reference has been released."""
+        return self._refs <= 0
+
+    def acquire(self) -> FrameLease:
+        """Add a reference (for an additional holder) and return self."""
+        with self._pool._lock:
+            if self._refs <= 0:
+                raise RuntimeError("acquire() on a released frame lease")
+            self._refs += 1
+        return self
+
+    def release(self) -> None:
+        """Drop one reference; the last release returns the buffer to the pool.
+
+        Releasing an already released lease is a no-op so cleanup paths can
+        release defensively.
+        """
+        pool = self._pool
+        with pool._lock:
+            if self._refs <= 0:
+                return
+            self._refs -= 1
+            if self._refs > 0:
+                return
+        pool._reclaim(self.array, leaked=False)
+
+    def __enter__(self) -> NDArray[np.uint8]:
+        return self.array
+
+    def __exit__(self, *exc: Any) -> None:
+        self.release()
+
+    def __del__(self) -> None:
+        # Last-resort reclaim for leases dropped without release(), e.g.
+        # frames still queued in Qt's cross-thread signal queue at dispose.
+        try:
+            if self._refs > 0:
+                self._refs = 0
+                self._pool._reclaim(self.array, leaked=True)
+        except Exception:
+            pass
+
+
+class FramePool:
+    """Fixed-capacity pool of same-shaped frame buffers handed out as leases."""
+
+    # Window used for the allocations-per-second figure.
+    ALLOC_RATE_WINDOW_SEC = 10.0
+
+    def __init__(self, capacity: int) -> None:
+        """Create an empty pool keeping at most ``capacity`` free buffers."""
+        self.capacity = max(1, int(capacity))
+        self._lock = threading.RLock()
+        self._free: deque[NDArray[np.uint8]] = deque()
+        self._shape: Optional[tuple[int, ...]] = None
+        self._dtype: np.dtype = np.dtype(np.uint8)
+        self._outstanding = 0
+        self._hits = 0
+        self._misses = 0
+        self._leaked = 0
+        self._allocations = 0
+        self._alloc_times: deque[float] = deque(maxlen=1024)
+
+    @property
+    def shape(self) -> Optional[tuple[int, ...]]:
+        """Shape of the buffers currently pooled (None until first use)."""
+        return self._shape
+
+    def _set_shape(self, shape: tuple[int, ...], dtype: np.dtype) -> None:
+        """Switch pool geometry, dropping free buffers of the old shape."""
+        if self._shape != shape or self._dtype != dtype:
+            self._free.clear()
+            self._shape = shape
+            self._dtype = dtype
+
+    def lease(self, shape: tuple[int, ...], dtype: Any = np.uint8) -> FrameLease:
+        """Lease a buffer of ``shape``, reusing a free one when possible."""
+        dtype = np.dtype(dtype)
+        with self._lock:
+            self._set_shape(tuple(shape), dtype)
+            self._outstanding += 1
+            if self._free:
+                self._hits += 1
+                return FrameLease(self, self._free.popleft())
+            self._misses += 1
+            self._note_allocation()
+        # Allocate new frame (contiguous for efficient Qt conversion)
+        return FrameLease(self, np.empty(shape, dtype=dtype, order="C"))
+
+    def adopt(self, array: NDArray[np.uint8]) -> FrameLease:
+        """Wrap an externally allocated array as a lease of this pool.
+
+        Used when a backend allocated its own output buffer; the array's
+        shape becomes the pool shape so it is recycled on release.
+        """
+        with self._lock:
+            self._set_shape(array.shape, array.dtype)
+            self._outstanding += 1
+            self._note_allocation()
+        return FrameLease(self, array)
+
+    def _note_allocation(self) -> None:
+        """Record one buffer allocation (caller holds the lock)."""
+        self._allocations += 1
+        self._alloc_times.append(time.monotonic())
+
+    def _reclaim(self, array: NDArray[np.uint8], leaked: bool) -> None:
+        """Return a released buffer to the free list if it still fits."""
+        with self._lock:
+            self._outstanding = max(0, self._outstanding - 1)
+            if leaked:
+                self._leaked += 1
+            if (
+                array.shape == self._shape
+                and array.dtype == self._dtype
+                and len(self._free) < self.capacity
+            ):
+                self._free.append(array)
+
+    def clear(self) -> None:
+        """Drop all free buffers (outstanding leases are unaffected)."""
+        with self._lock:
+            self._free.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit rate, outstanding/leaked leases and allocation rate."""
+        now = time.monotonic()
+        with self._lock:
+            recent = sum(
+                1 for t in self._alloc_times if now - t <= self.ALLOC_RATE_WINDOW_SEC
+            )
+            requests = self._hits + self._misses
+            return {
+                "capacity": self.capacity,
+                "free": len(self._free),
+                "outstanding": self._outstanding,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / requests) if requests else 0.0,
+                "leaked": self._leaked,
+                "allocations": self._allocations,
+                "allocations_per_sec": recent / self.ALLOC_RATE_WINDOW_SEC,
+            }
+
+
+class FrameMailbox:
+    """Latest-frame mailbox between one capture worker and its consumer.
+
+    Together with a three-buffer FramePool this forms a triple buffer: the
+    worker decodes into one buffer, the mailbox holds the newest finished
+    frame and the UI displays a third. Publishing replaces (and releases)
+    any frame the consumer has not taken yet, so a stalled UI never builds
+    a backlog. publish() returns True only when the consumer needs a
+    wake-up; further wake-ups are suppressed until the consumer re-arms
+    them with take(), so at most one notification is ever in flight.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty mailbox with wake-ups armed."""
+        self._lock = threading.Lock()
+        self._pending: Optional[FrameLease] = None
+        self._notify_armed = True
+        self._published = 0
+        self._taken = 0
+        self._overwritten = 0
+        self._wakeups = 0
+
+    def publish(self, lease: FrameLease) -> bool:
+        """Store ``lease`` as the latest frame; return True to wake the consumer."""
+        with self._lock:
+            dropped = self._pending
+            self._pending = lease
+            self._published += 1
+            if dropped is not None:
+                self._overwritten += 1
+            notify = self._notify_armed
+            if notify:
+                self._notify_armed = False
+                self._wakeups += 1
+        if dropped is not None:
+            dropped.release()
+        return notify
+
+    def has_pending(self) -> bool:
+        """True while a published frame has not been taken yet."""
+        return self._pending is not None
+
+    def take(self, rearm: bool = True) -> Optional[FrameLease]:
+        """Remove and return the latest frame (caller must release it).
+
+        ``rearm`` re-enables wake-up notifications; the render tick passes
+        True so that at most one wake-up is delivered per render interval.
+        """
+        with self._lock:
+            lease = self._pending
+            self._pending = None
+            if lease is not None:
+                self._taken += 1
+            if rearm:
+                self._notify_armed = True
+        return lease
+
+    def clear(self) -> None:
+        """Release any pending frame (used when the worker is disposed)."""
+        lease = self.take()
+        if lease is not None:
+            lease.release()
+
+    def stats(self) -> dict[str, int]:
+        """Return published/taken/overwritten frame and wake-up counters."""
+        with self._lock:
+            return {
+                "published": self._published,
+                "taken": self._taken,
+                "overwritten": self._overwritten,
+                "wakeups": self._wakeups,
+            }
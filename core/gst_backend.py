@@ -0,0 +1,322 @@
+"""
+PyGObject GStreamer capture backend for Camera Dashboard.
+
+Contains GstCapture, a cv2.VideoCapture-compatible reader that runs a
+pipeline through ``gi.repository.Gst`` directly instead of OpenCV's
+CAP_GSTREAMER backend:
+
+- appsink buffers are mapped and exposed as NumPy views, so the only copy
+  is the one into the caller's ``image`` (a pooled buffer) - or none at all
+  when the worker resizes/converts straight out of the mapped view
+- the pipeline bus is checked for ERROR and EOS while waiting for samples,
+  so a failing camera is reported within ~100 ms instead of after a read
+  timeout, and the worker reconnects straight away
+- teardown waits for the NULL state change to complete rather than
+  sleeping for a fixed time
+- GStreamer's own latency query is exposed through latency_ms()
+- the frame rate can be lowered or raised while playing, through the
+  videorate element's max-rate, without rebuilding the pipeline
+
+PyGObject is optional; gi_available() is False when it is not installed.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from typing import Any, Optional
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+from core.gst_pipeline import RATE_ELEMENT
+
+try:
+    import gi
+
+    gi.require_version("Gst", "1.0")
+    from gi.repository import Gst
+except (ImportError, ValueError):
+    Gst = None
+
+# Bytes per pixel of the raw formats build_pipeline() can request.
+CHANNELS_BY_FORMAT = {"BGR": 3, "BGRx": 4, "GRAY8": 1}
+
+# Longest single wait on the appsink before the bus is checked again.
+_PULL_SLICE_SEC = 0.1
+
+_gst_initialized: Optional[bool] = None
+_gst_init_lock = threading.Lock()
+
+
+def gi_available() -> bool:
+    """True if PyGObject and GStreamer can be imported and initialized.
+
+    Caches the result; Gst.init runs once per process.
+    """
+    global _gst_initialized
+    with _gst_init_lock:
+        if _gst_initialized is None:
+            if Gst is None:
+                _gst_initialized = False
+            else:
+                try:
+                    _gst_initialized = bool(Gst.init_check(None))
+                except Exception:
+                    logging.exception("GStreamer initialization failed")
+                    _gst_initialized = False
+            if _gst_initialized:
+                logging.info("PyGObject GStreamer backend available")
+        return _gst_initialized
+
+
+def frame_view(
+    data: Any, width: int, height: int, channels: int
+) -> NDArray[np.uint8]:
+    """Return a read-only (height, width[, channels]) view of raw frame bytes.
+
+    ``data`` is a mapped buffer (memoryview or bytes). Rows may be padded
+    (GStreamer aligns packed formats to 4 bytes); the stride is derived
+    from the buffer size, and the padding is sliced off without copying.
+    """
+    flat = np.frombuffer(data, dtype=np.uint8)
+    row_bytes = width * channels
+    stride = flat.size // height if height > 0 else 0
+    if stride < row_bytes:
+        raise ValueError(
+            f"buffer of {flat.size} bytes too small for {width}x{height}x{channels}"
+        )
+    rows = flat[: stride * height].reshape(height, stride)[:, :row_bytes]
+    if channels == 1:
+        return rows
+    return rows.reshape(height, width, channels)
+
+
+class GstCapture:
+    """Minimal cv2.VideoCapture look-alike reading from a GStreamer appsink.
+
+    Supports the calls CaptureWorker makes: isOpened, grab, retrieve,
+    read, get, set and release. A retrieved view stays valid until the
+    next grab() or release().
+    """
+
+    def __init__(
+        self,
+        pipeline: str,
+        sink_name: str = "sink",
+        timeout: float = 2.0,
+    ) -> None:
+        """Parse and start ``pipeline``; its appsink must be named ``sink_name``.
+
+        ``timeout`` bounds both the start-up state change and each grab().
+        """
+        self.timeout = timeout
+        # Last ERROR/EOS seen on the bus (None while healthy).
+        self.error: Optional[str] = None
+        self._pipeline = None
+        self._sink = None
+        self._bus = None
+        self._sample = None
+        self._buffer = None
+        self._map_info = None
+        self._caps = None
+        self._layout: tuple[int, int, int] = (0, 0, 0)
+        self._fps = 0.0
+        if not gi_available():
+            self.error = "PyGObject GStreamer is not available"
+            return
+        try:
+            self._pipeline = Gst.parse_launch(pipeline)
+        except Exception as exc:
+            self.error = f"pipeline parse failed: {exc}"
+            logging.warning("GstCapture: %s", self.error)
+            return
+        self._sink = self._pipeline.get_by_name(sink_name)
+        if self._sink is None:
+            self.error = f"no appsink named {sink_name!r}"
+            self.release()
+            return
+        self._bus = self._pipeline.get_bus()
+        if self._pipeline.set_state(Gst.State.PLAYING) == Gst.StateChangeReturn.FAILURE:
+            self._poll_bus()
+            self.error = self.error or "pipeline failed to start"
+            self.release()
+            return
+        result, _state, _pending = self._pipeline.get_state(int(timeout * Gst.SECOND))
+        if result == Gst.StateChangeReturn.FAILURE:
+            self._poll_bus()
+            self.error = self.error or "pipeline failed to start"
+            self.release()
+
+    def isOpened(self) -> bool:
+        """True while the pipeline runs and no error or EOS was reported."""
+        return self._pipeline is not None and self.error is None
+
+    def _poll_bus(self) -> bool:
+        """Record any pending ERROR/EOS message; return True if one was found."""
+        if self._bus is None:
+            return False
+        found = False
+        while True:
+            msg = self._bus.pop_filtered(Gst.MessageType.ERROR | Gst.MessageType.EOS)
+            if msg is None:
+                return found
+            found = True
+            if msg.type == Gst.MessageType.ERROR:
+                err, debug = msg.parse_error()
+                self.error = f"{msg.src.get_name()}: {err.message}"
+                logging.warning("GstCapture error: %s (%s)", self.error, debug)
+            else:
+                self.error = "end of stream"
+                logging.info("GstCapture: end of stream")
+
+    def _unmap(self) -> None:
+        """Unmap and drop the current sample (invalidates retrieved views)."""
+        if self._map_info is not None:
+            self._buffer.unmap(self._map_info)
+        self._map_info = None
+        self._buffer = None
+        self._sample = None
+
+    def grab(self) -> bool:
+        """Wait for the next sample; False on timeout, error or EOS.
+
+        The wait is split into short slices with a bus check between them,
+        so an upstream failure ends the wait within one slice instead of
+        after the full timeout.
+        """
+        self._unmap()
+        if not self.isOpened():
+            return False
+        deadline = time.monotonic() + self.timeout
+        while True:
+            if self._poll_bus():
+                return False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            wait = min(remaining, _PULL_SLICE_SEC)
+            sample = self._sink.emit("try-pull-sample", int(wait * Gst.SECOND))
+            if sample is not None:
+                break
+            if self._sink.get_property("eos"):
+                self._poll_bus()
+                self.error = self.error or "end of stream"
+                return False
+        self._sample = sample
+        caps = sample.get_caps()
+        if caps is not None and (self._caps is None or not caps.is_equal(self._caps)):
+            self._update_layout(caps)
+        return True
+
+    def _update_layout(self, caps: Any) -> None:
+        """Cache width, height, channels and frame rate from negotiated caps."""
+        self._caps = caps
+        structure = caps.get_structure(0)
+        _, width = structure.get_int("width")
+        _, height = structure.get_int("height")
+        channels = CHANNELS_BY_FORMAT.get(structure.get_string("format"), 3)
+        self._layout = (int(width), int(height), channels)
+        ok, num, den = structure.get_fraction("framerate")
+        self._fps = float(num) / float(den) if ok and den else 0.0
+
+    def retrieve(
+        self, image: Optional[NDArray[np.uint8]] = None, flag: int = 0
+    ) -> tuple[bool, Optional[NDArray[np.uint8]]]:
+        """Return the grabbed frame.
+
+        With a matching ``image`` the frame is copied into it (the caller
+        keeps it past the next grab); otherwise a read-only view of the
+        mapped GstBuffer is returned without copying.
+        """
+        if self._sample is None:
+            return False, None
+        if self._map_info is None:
+            buffer = self._sample.get_buffer()
+            ok, info = buffer.map(Gst.MapFlags.READ)
+            if not ok:
+                return False, None
+            self._buffer = buffer
+            self._map_info = info
+        width, height, channels = self._layout
+        try:
+            view = frame_view(self._map_info.data, width, height, channels)
+        except ValueError:
+            logging.exception("GstCapture: unexpected buffer layout")
+            return False, None
+        if (
+            image is not None
+            and image.shape == view.shape
+            and image.dtype == view.dtype
+            and image.flags["WRITEABLE"]
+        ):
+            np.copyto(image, view)
+            return True, image
+        return True, view
+
+    def read(
+        self, image: Optional[NDArray[np.uint8]] = None
+    ) -> tuple[bool, Optional[NDArray[np.uint8]]]:
+        """grab() followed by retrieve()."""
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def get(self, prop_id: int) -> float:
+        """Return frame width, height or FPS from the negotiated caps (else 0)."""
+        width, height, _ = self._layout
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(width)
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(height)
+        if prop_id == cv2.CAP_PROP_FPS:
+            rate = self._rate_element()
+            if rate is not None:
+                return float(rate.get_property("max-rate"))
+            return self._fps
+        return 0.0
+
+    def _rate_element(self) -> Any:
+        """Return the pipeline's videorate named RATE_ELEMENT, if any."""
+        pipeline = self._pipeline
+        return pipeline.get_by_name(RATE_ELEMENT) if pipeline is not None else None
+
+    def set(self, prop_id: int, value: float) -> bool:
+        """Only CAP_PROP_FPS can change: the videorate's max-rate, while playing.
+
+        Needs a videorate named RATE_ELEMENT (build_pipeline() adds one when
+        given an fps); surplus frames are then dropped before decode.
+        """
+        if prop_id != cv2.CAP_PROP_FPS or value <= 0:
+            return False
+        rate = self._rate_element()
+        if rate is None:
+            return False
+        rate.set_property("max-rate", max(1, int(math.ceil(value))))
+        return True
+
+    def latency_ms(self) -> Optional[float]:
+        """Return the pipeline's minimum latency from a latency query, in ms."""
+        pipeline = self._pipeline
+        if pipeline is None:
+            return None
+        query = Gst.Query.new_latency()
+        if not pipeline.query(query):
+            return None
+        _live, min_latency, _max_latency = query.parse_latency()
+        return min_latency / 1e6
+
+    def release(self) -> None:
+        """Stop the pipeline, waiting for the NULL state change to finish."""
+        self._unmap()
+        pipeline = self._pipeline
+        self._pipeline = None
+        self._sink = None
+        self._bus = None
+        if pipeline is None:
+            return
+        pipeline.set_state(Gst.State.NULL)
+        pipeline.get_state(int(self.timeout * Gst.SECOND))
@@ -0,0 +1,114 @@
+"""
+GStreamer compositor capture for Camera Dashboard.
+
+Contains GstMosaicWorker, a CaptureWorker that reads a single mosaic of
+every camera from one compositor pipeline instead of one pipeline (and one
+Python capture thread) per camera. Decoding, scaling and mixing run in
+GStreamer's native threads; Python pulls one mosaic frame per tick and
+hands it to the UI through the usual frame pool and mailbox.
+"""
+
+from __future__ import annotations
+
+import logging
+import platform
+from typing import Optional
+
+import cv2
+from PyQt6.QtCore import QObject
+
+from core.camera import CaptureWorker, _check_gstreamer_available
+from core.gst_pipeline import build_mosaic_pipeline, camera_source
+
+
+def mosaic_supported() -> bool:
+    """True if this OpenCV build can run the compositor pipeline."""
+    return platform.system() == "Linux" and _check_gstreamer_available()
+
+
+class GstMosaicWorker(CaptureWorker):
+    """Capture worker for one compositor pipeline covering all cameras."""
+
+    def __init__(
+        self,
+        camera_indexes: list[int],
+        grid: tuple[int, int],
+        cell_size: tuple[int, int],
+        parent: Optional[QObject] = None,
+        target_fps: Optional[float] = None,
+        capture_width: Optional[int] = None,
+        capture_height: Optional[int] = None,
+        first_cell: int = 1,
+        sources: Optional[list[list[str]]] = None,
+    ) -> None:
+        """Lay ``camera_indexes`` out on a ``grid`` (rows, cols) of ``cell_size`` cells.
+
+        ``first_cell`` leaves leading grid cells empty (the settings tile).
+        ``sources`` replaces the v4l2src branches, e.g. with
+        ``gst_pipeline.videotest_source`` stand-ins for testing without cameras.
+        """
+        super().__init__(
+            "mosaic",
+            parent=parent,
+            target_fps=target_fps,
+            capture_width=capture_width,
+            capture_height=capture_height,
+        )
+        self.camera_indexes = list(camera_indexes)
+        self.grid = grid
+        self.cell_size = cell_size
+        self.first_cell = first_cell
+        self._sources = sources
+
+    def mosaic_pipeline(self) -> str:
+        """Return the compositor pipeline description for this worker."""
+        w = int(self.capture_width) if self.capture_width else 640
+        h = int(self.capture_height) if self.capture_height else 480
+        rows, cols = self.grid
+        pixel_format = "BGRx" if self._output_format == "rgb32" else "BGR"
+        sources = self._sources or [
+            camera_source(index, w, h) for index in self.camera_indexes
+        ]
+        return build_mosaic_pipeline(
+            sources,
+            rows,
+            cols,
+            self.cell_size,
+            fps=self._target_fps,
+            pixel_format=pixel_format,
+            first_cell=self.first_cell,
+        )
+
+    def _open_capture(self) -> None:
+        """Open the compositor pipeline through OpenCV's GStreamer backend."""
+        if not mosaic_supported():
+            logging.warning("Mosaic capture needs OpenCV built with GStreamer")
+            return
+        pipeline = self.mosaic_pipeline()
+        cap = None
+        try:
+            cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+            if cap is None or not cap.isOpened() or not cap.read()[0]:
+                logging.warning("Mosaic pipeline failed to start: %s", pipeline)
+                if cap is not None:
+                    cap.release()
+                return
+        except Exception:
+            logging.exception("Failed to open mosaic pipeline")
+            if cap is not None:
+                cap.release()
+            return
+        self._cap = cap
+        self._using_gstreamer = True
+        self._backend_name = "GStreamer"
+        self._fourcc = "mosaic"
+        self._configure_fps_from_camera()
+        rows, cols = self.grid
+        logging.info(
+            "Mosaic pipeline opened: %d cameras on %dx%d grid of %dx%d cells",
+            len(self.camera_indexes),
+            rows,
+            cols,
+            self.cell_size[0],
+            self.cell_size[1],
+        )
@@ -0,0 +1,220 @@
+"""
+GStreamer pipeline construction for Camera Dashboard.
+
+Builds gst-launch style pipeline descriptions from the capture profile
+instead of one hard-coded string. Optional stages:
+
+- videorate: drop surplus compressed frames before they are decoded
+- videoscale: scale to the tile size inside GStreamer's own threads
+- videoflip: mirror or rotate mounted-upside-down cameras
+- explicit output caps (BGR, BGRx or GRAY8) so negotiation is deterministic
+
+build_mosaic_pipeline() feeds several camera branches into one compositor
+so all cameras arrive as a single mosaic frame, mixed and scaled in
+GStreamer's native threads.
+
+videotestsrc sources that encode to JPEG stand in for cameras, so the same
+pipelines can be exercised without hardware.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Optional
+
+# Raw formats the appsink may be asked for (OpenCV/numpy friendly).
+OUTPUT_CAPS_FORMATS = ("BGR", "BGRx", "GRAY8")
+
+# videoflip methods accepted by the builder.
+FLIP_METHODS = (
+    "horizontal-flip",
+    "vertical-flip",
+    "rotate-180",
+    "clockwise",
+    "counterclockwise",
+    "upper-left-diagonal",
+    "upper-right-diagonal",
+)
+
+# Flip methods that swap width and height.
+_TRANSPOSING_FLIPS = (
+    "clockwise",
+    "counterclockwise",
+    "upper-left-diagonal",
+    "upper-right-diagonal",
+)
+
+# Leaky queue between source and decode (drop old frames, never block).
+_SOURCE_QUEUE = "queue max-size-buffers=2 leaky=downstream"
+
+# Low-latency appsink: keep only the newest frame, no clock sync.
+_APPSINK = "appsink drop=1 max-buffers=1 sync=false"
+
+# Name of a single-camera pipeline's videorate, whose max-rate can be
+# changed while the pipeline plays.
+RATE_ELEMENT = "rate"
+
+
+def camera_source(device: int, width: int, height: int) -> list[str]:
+    """Return elements producing MJPEG from ``/dev/video<device>``."""
+    return [
+        f"v4l2src device=/dev/video{int(device)}",
+        f"image/jpeg,width={int(width)},height={int(height)}",
+    ]
+
+
+def videotest_source(
+    width: int,
+    height: int,
+    fps: int = 30,
+    pattern: str = "smpte",
+) -> list[str]:
+    """Return elements producing live MJPEG from videotestsrc (camera stand-in)."""
+    return [
+        f"videotestsrc is-live=true pattern={pattern}",
+        f"video/x-raw,width={int(width)},height={int(height)},framerate={int(fps)}/1",
+        "jpegenc",
+        "image/jpeg",
+    ]
+
+
+def decode_chain(
+    fps: Optional[float] = None,
+    output_size: Optional[tuple[int, int]] = None,
+    pixel_format: Optional[str] = None,
+    flip: Optional[str] = None,
+) -> list[str]:
+    """Return the elements turning an MJPEG stream into raw output frames.
+
+    ``output_size`` is the (width, height) after ``flip`` is applied, i.e.
+    what the consumer displays. ``pixel_format`` None leaves the format to
+    the sink (OpenCV asks for BGR).
+    """
+    if pixel_format is not None and pixel_format not in OUTPUT_CAPS_FORMATS:
+        raise ValueError(f"unsupported pixel format: {pixel_format}")
+    if flip is not None and flip not in FLIP_METHODS:
+        raise ValueError(f"unsupported flip method: {flip}")
+
+    elements = [_SOURCE_QUEUE]
+    if fps is not None and fps > 0:
+        # Drop on compressed frames so surplus ones are never decoded.
+        elements.append(
+            f"videorate name={RATE_ELEMENT} drop-only=true max-rate={int(math.ceil(fps))}"
+        )
+    elements.append("jpegdec")
+    if output_size is not None:
+        # Scale in the decoder's YUV layout before conversion/flip; a
+        # transposing flip swaps the dimensions afterwards.
+        out_w, out_h = int(output_size[0]), int(output_size[1])
+        if out_w <= 0 or out_h <= 0:
+            raise ValueError(f"invalid output size: {output_size}")
+        if flip in _TRANSPOSING_FLIPS:
+            out_w, out_h = out_h, out_w
+        elements += ["videoscale", f"video/x-raw,width={out_w},height={out_h}"]
+    if flip is not None:
+        elements.append(f"videoflip method={flip}")
+    elements.append("videoconvert")
+    if pixel_format is not None:
+        elements.append(f"video/x-raw,format={pixel_format}")
+    return elements
+
+
+def build_pipeline(
+    source: list[str],
+    fps: Optional[float] = None,
+    output_size: Optional[tuple[int, int]] = None,
+    pixel_format: Optional[str] = None,
+    flip: Optional[str] = None,
+    sink_name: Optional[str] = None,
+) -> str:
+    """Join a source, the decode chain and a low-latency appsink."""
+    sink = f"{_APPSINK} name={sink_name}" if sink_name else _APPSINK
+    elements = source + decode_chain(fps, output_size, pixel_format, flip) + [sink]
+    return " ! ".join(elements)
+
+
+def build_camera_pipeline(
+    device: int,
+    width: int,
+    height: int,
+    fps: Optional[float] = None,
+    output_size: Optional[tuple[int, int]] = None,
+    pixel_format: Optional[str] = None,
+    flip: Optional[str] = None,
+    sink_name: Optional[str] = None,
+) -> str:
+    """Return the capture pipeline for V4L2 camera ``device``."""
+    return build_pipeline(
+        camera_source(device, width, height),
+        fps,
+        output_size,
+        pixel_format,
+        flip,
+        sink_name,
+    )
+
+
+def mosaic_cells(
+    count: int,
+    rows: int,
+    cols: int,
+    cell_size: tuple[int, int],
+    first_cell: int = 0,
+) -> list[tuple[int, int, int, int]]:
+    """Return (x, y, width, height) for ``count`` cells in row-major grid order.
+
+    ``first_cell`` skips leading cells (e.g. the settings tile at (0, 0)).
+    """
+    cell_w, cell_h = int(cell_size[0]), int(cell_size[1])
+    if cell_w <= 0 or cell_h <= 0:
+        raise ValueError(f"invalid cell size: {cell_size}")
+    if first_cell + count > rows * cols:
+        raise ValueError(f"{count} cells do not fit a {rows}x{cols} grid")
+    cells = []
+    for index in range(first_cell, first_cell + count):
+        row, col = divmod(index, cols)
+        cells.append((col * cell_w, row * cell_h, cell_w, cell_h))
+    return cells
+
+
+def build_mosaic_pipeline(
+    sources: list[list[str]],
+    rows: int,
+    cols: int,
+    cell_size: tuple[int, int],
+    fps: Optional[float] = None,
+    pixel_format: Optional[str] = None,
+    first_cell: int = 0,
+    sink_name: Optional[str] = None,
+) -> str:
+    """Return one pipeline compositing every MJPEG source into a grid mosaic.
+
+    Each source is decoded in its own branch and placed by a compositor
+    pad (which also scales it to the cell); a single appsink receives the
+    finished mosaic at ``fps``.
+    """
+    if pixel_format is not None and pixel_format not in OUTPUT_CAPS_FORMATS:
+        raise ValueError(f"unsupported pixel format: {pixel_format}")
+    cells = mosaic_cells(len(sources), rows, cols, cell_size, first_cell)
+    pads = " ".join(
+        f"sink_{i}::xpos={x} sink_{i}::ypos={y} sink_{i}::width={w} sink_{i}::height={h}"
+        for i, (x, y, w, h) in enumerate(cells)
+    )
+    canvas = f"video/x-raw,width={cols * int(cell_size[0])},height={rows * int(cell_size[1])}"
+    if fps is not None and fps > 0:
+        canvas += f",framerate={int(math.ceil(fps))}/1"
+    # ignore-inactive-pads keeps the mosaic running while a camera stalls.
+    mixer = f"compositor name=mosaic background=black ignore-inactive-pads=true {pads}"
+    head = [mixer.rstrip(), canvas, "videoconvert"]
+    if pixel_format is not None:
+        head.append(f"video/x-raw,format={pixel_format}")
+    head.append(f"{_APPSINK} name={sink_name}" if sink_name else _APPSINK)
+
+    chains = [" ! ".join(head)]
+    for i, source in enumerate(sources):
+        branch = source + [_SOURCE_QUEUE]
+        if fps is not None and fps > 0:
+            branch.append(f"videorate drop-only=true max-rate={int(math.ceil(fps))}")
+        branch += ["jpegdec", f"mosaic.sink_{i}"]
+        chains.append(" ! ".join(branch))
+    return "  ".join(chains)
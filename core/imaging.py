@@ -0,0 +1,43 @@
+"""
+Frame transforms shared by the capture worker and the UI for Camera Dashboard.
+
+Contains night_luma, the night-mode stage that turns a BGR/BGRx/gray frame
+into a single-channel brightened luma image.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+# Night mode brightness gain applied to luma (clamped to 255).
+NIGHT_MODE_GAIN = 1.6
+
+# Pre-computed LUT for the night mode gain.
+_NIGHT_LUT = np.clip(
+    np.arange(256, dtype=np.float32) * NIGHT_MODE_GAIN, 0, 255
+).astype(np.uint8)
+
+
+def night_luma(
+    frame: NDArray[np.uint8], dst: Optional[NDArray[np.uint8]] = None
+) -> NDArray[np.uint8]:
+    """Return the brightened single-channel luma of ``frame``.
+
+    The gain is applied in place on the one-channel output, so the only
+    full-colour pass is the read of ``frame``. ``dst`` is reused when its
+    shape matches the frame's height and width.
+    """
+    h, w = frame.shape[:2]
+    if dst is None or dst.shape != (h, w):
+        dst = np.empty((h, w), dtype=np.uint8)
+    if frame.ndim == 2:
+        cv2.LUT(frame, _NIGHT_LUT, dst=dst)
+        return dst
+    code = cv2.COLOR_BGRA2GRAY if frame.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+    cv2.cvtColor(frame, code, dst=dst)
+    cv2.LUT(dst, _NIGHT_LUT, dst=dst)
+    return dst
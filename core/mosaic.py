@@ -0,0 +1,250 @@
+"""
+Background mosaic composition for Camera Dashboard.
+
+Contains MosaicComposer, the stage behind ``render_mode = mosaic``. The
+grid tiles keep taking frames from their capture workers, but instead of
+converting and painting them on the UI thread each tile hands its frame
+lease to the composer. The composer thread resizes every camera's latest
+frame straight into its cell of one pooled mosaic buffer (cv2.resize and
+cvtColor write into views of the buffer, so nothing is copied twice) and
+publishes the finished mosaic through a FrameMailbox. The UI thread then
+presents a single image per tick however many cameras there are.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Hashable, Optional
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+from core.frame_pool import FrameLease, FrameMailbox, FramePool
+from core.imaging import night_luma
+
+# Cell rectangle in mosaic pixels: (x, y, width, height).
+CellRect = tuple[int, int, int, int]
+
+# cvtColor codes from a frame's channel count to the mosaic's.
+_CONVERT = {
+    (1, 3): cv2.COLOR_GRAY2BGR,
+    (1, 4): cv2.COLOR_GRAY2BGRA,
+    (3, 4): cv2.COLOR_BGR2BGRA,
+    (4, 3): cv2.COLOR_BGRA2BGR,
+}
+
+
+def _channels(array: NDArray[np.uint8]) -> int:
+    """Channel count of a frame or mosaic (1 for luma)."""
+    return 1 if array.ndim == 2 else array.shape[2]
+
+
+def blit_cell(
+    frame: NDArray[np.uint8],
+    cell: NDArray[np.uint8],
+    night: bool,
+    scratch: Optional[NDArray[np.uint8]] = None,
+) -> Optional[NDArray[np.uint8]]:
+    """Resize and convert ``frame`` into the mosaic view ``cell``.
+
+    In night mode the mosaic is one-channel luma and colour frames are
+    reduced with night_luma first, into ``scratch`` when it fits. Frames
+    already at the cell size are converted or copied without a resize
+    pass. Returns the luma buffer so the caller can reuse it.
+    """
+    ch, cw = cell.shape[:2]
+    if night and frame.ndim != 2:
+        frame = scratch = night_luma(frame, dst=scratch)
+    src_channels = _channels(frame)
+    dst_channels = _channels(cell)
+    size_matches = frame.shape[:2] == (ch, cw)
+    if src_channels != dst_channels:
+        if not size_matches:
+            frame = cv2.resize(frame, (cw, ch), interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(frame, _CONVERT[(src_channels, dst_channels)], dst=cell)
+    elif size_matches:
+        np.copyto(cell, frame)
+    else:
+        cv2.resize(frame, (cw, ch), dst=cell, interpolation=cv2.INTER_AREA)
+    return scratch
+
+
+class MosaicComposer(QThread):
+    """Thread that composes the grid's latest frames into one mosaic.
+
+    Tiles call submit() with a frame lease and the tile's cell rect; the
+    composer holds one reference per cell until the cell's next frame
+    replaces it. Compositions are coalesced to at most ``max_fps`` per
+    second, so tiles ticking out of step still produce one mosaic per
+    interval. frame_ready follows the FrameMailbox wake-up protocol.
+    """
+
+    frame_ready = pyqtSignal()
+
+    def __init__(
+        self,
+        max_fps: float = 30.0,
+        background: int = 0,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        """Create a stopped composer; ``background`` fills space between cells."""
+        super().__init__(parent)
+        self.mailbox = FrameMailbox()
+        self.max_fps = max_fps
+        self.background = background
+        self._pool = FramePool(3)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._running = True
+        self._cells: dict[Hashable, tuple[FrameLease, CellRect]] = {}
+        self._canvas_size = (0, 0)
+        self._channels = 3
+        self._night = False
+        self._dirty = False
+        self._night_scratch: Optional[NDArray[np.uint8]] = None
+        self._last_compose = 0.0
+        self._compositions = 0
+        self._cells_drawn = 0
+        self._compose_time = 0.0
+
+    def set_canvas(self, size: tuple[int, int], channels: int = 3) -> None:
+        """Set the mosaic size (width, height) and colour channels (3 or 4)."""
+        with self._lock:
+            if (tuple(size), channels) == (self._canvas_size, self._channels):
+                return
+            self._canvas_size = (int(size[0]), int(size[1]))
+            self._channels = channels
+            self._dirty = True
+        self._wake.set()
+
+    def set_night_mode(self, enabled: bool) -> None:
+        """Compose one-channel night-mode luma instead of colour."""
+        with self._lock:
+            if self._night == bool(enabled):
+                return
+            self._night = bool(enabled)
+            self._dirty = True
+        self._wake.set()
+
+    def submit(self, key: Hashable, lease: FrameLease, rect: CellRect) -> None:
+        """Make ``lease`` the latest frame of cell ``key`` at ``rect``.
+
+        The composer takes its own reference; the caller keeps its own.
+        """
+        lease.acquire()
+        with self._lock:
+            previous = self._cells.get(key)
+            self._cells[key] = (lease, tuple(rect))
+            self._dirty = True
+        if previous is not None:
+            previous[0].release()
+        self._wake.set()
+
+    def move(self, key: Hashable, rect: CellRect) -> None:
+        """Move cell ``key`` to ``rect`` (after a swap or a layout resize)."""
+        with self._lock:
+            current = self._cells.get(key)
+            if current is None or current[1] == tuple(rect):
+                return
+            self._cells[key] = (current[0], tuple(rect))
+            self._dirty = True
+        self._wake.set()
+
+    def discard(self, key: Hashable) -> None:
+        """Empty cell ``key`` (placeholder or removed tile)."""
+        with self._lock:
+            previous = self._cells.pop(key, None)
+            if previous is not None:
+                self._dirty = True
+        if previous is not None:
+            previous[0].release()
+            self._wake.set()
+
+    def run(self) -> None:
+        """Compose whenever cells change, at most ``max_fps`` times a second."""
+        while self._running:
+            self._wake.wait(0.5)
+            if not self._running:
+                break
+            interval = 1.0 / self.max_fps if self.max_fps > 0 else 0.0
+            delay = self._last_compose + interval - time.monotonic()
+            if delay > 0 and self._stop_event.wait(delay):
+                break
+            self._wake.clear()
+            try:
+                self.compose()
+            except Exception:
+                logging.exception("Mosaic composition failed")
+
+    def compose(self) -> bool:
+        """Compose one mosaic if anything changed; return True if published."""
+        with self._lock:
+            if not self._dirty:
+                return False
+            self._dirty = False
+            width, height = self._canvas_size
+            night = self._night
+            channels = self._channels
+            # Hold our own references so tiles may replace cells meanwhile.
+            cells = [(lease.acquire(), rect) for lease, rect in self._cells.values()]
+        try:
+            if width <= 0 or height <= 0:
+                return False
+            start = time.perf_counter()
+            shape = (height, width) if night else (height, width, channels)
+            canvas_lease = self._pool.lease(shape)
+            canvas = canvas_lease.array
+            canvas[...] = self.background
+            drawn = 0
+            for lease, (x, y, w, h) in cells:
+                # Clip to the canvas; a cell may be mid-resize.
+                x0, y0 = max(x, 0), max(y, 0)
+                x1, y1 = min(x + w, width), min(y + h, height)
+                if x1 <= x0 or y1 <= y0:
+                    continue
+                cell = canvas[y0:y1, x0:x1]
+                self._night_scratch = blit_cell(
+                    lease.array, cell, night, self._night_scratch
+                )
+                drawn += 1
+            self._last_compose = time.monotonic()
+            with self._lock:
+                self._compositions += 1
+                self._cells_drawn += drawn
+                self._compose_time += time.perf_counter() - start
+        finally:
+            for lease, _rect in cells:
+                lease.release()
+        if self.mailbox.publish(canvas_lease):
+            self.frame_ready.emit()
+        return True
+
+    def stop(self) -> None:
+        """Stop the thread and release every cell frame and the pending mosaic."""
+        self._running = False
+        self._stop_event.set()
+        self._wake.set()
+        if self.isRunning() and not self.wait(2000):
+            logging.warning("Mosaic composer did not stop in 2s")
+        with self._lock:
+            cells = list(self._cells.values())
+            self._cells.clear()
+        for lease, _rect in cells:
+            lease.release()
+        self.mailbox.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return compositions, cells drawn and mean composition time."""
+        with self._lock:
+            count = self._compositions
+            return {
+                "compositions": count,
+                "cells_drawn": self._cells_drawn,
+                "compose_ms": self._compose_time * 1000.0 / count if count else 0.0,
+                "cells": len(self._cells),
+            }
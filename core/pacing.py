@@ -0,0 +1,164 @@
+"""
+Frame pacing for Camera Dashboard.
+
+Contains FrameDecimator, which picks which captured frames to publish so
+that the emitted rate matches a target FPS on average, and
+HardwareRateGovernor, which decides when a lowered publish rate should
+also be requested from the camera itself.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Optional
+
+
+class FrameDecimator:
+    """Phase-accumulator decimator from the camera rate down to a target FPS.
+
+    Each captured frame advances a phase by ``elapsed * target_fps``; a frame
+    is emitted whenever the phase crosses 1.0. Unlike an "at least one
+    interval since the last emit" throttle, this does not alias when the
+    camera rate is not an integer multiple of the target: 25 -> 20 FPS emits
+    four of every five frames instead of every other frame, and the emit
+    timing error stays within one camera frame period.
+    """
+
+    # Number of recent inter-emit intervals used for rate/jitter statistics.
+    STATS_WINDOW = 60
+
+    def __init__(self, target_fps: float) -> None:
+        """Create a decimator that emits the first frame it sees."""
+        self._target_fps = max(0.1, float(target_fps))
+        self._phase = 1.0
+        self._last_frame_ts: Optional[float] = None
+        self._last_emit_ts: Optional[float] = None
+        self._intervals: deque[float] = deque(maxlen=self.STATS_WINDOW)
+
+    @property
+    def target_fps(self) -> float:
+        """Current target emit rate."""
+        return self._target_fps
+
+    def set_target_fps(self, fps: float) -> None:
+        """Change the target rate; the accumulated phase is kept."""
+        self._target_fps = max(0.1, float(fps))
+
+    def should_emit(self, now: float) -> bool:
+        """Advance the phase for a frame captured at ``now``; True to emit it."""
+        if self._last_frame_ts is not None:
+            elapsed = now - self._last_frame_ts
+            if elapsed > 0:
+                self._phase += elapsed * self._target_fps
+        self._last_frame_ts = now
+
+        # Small tolerance so float rounding (e.g. 0.2 + 0.8) does not slip
+        # an emit by one frame.
+        if self._phase < 1.0 - 1e-9:
+            return False
+        # Keep the fractional remainder for cadence, but never bank more
+        # than one frame so a pause or slow camera cannot cause a burst.
+        self._phase = min(max(0.0, self._phase - 1.0), 1.0 - 1e-6)
+        if self._last_emit_ts is not None:
+            self._intervals.append(now - self._last_emit_ts)
+        self._last_emit_ts = now
+        return True
+
+    def reset(self) -> None:
+        """Forget timing history (e.g. after the capture was reopened)."""
+        self._phase = 1.0
+        self._last_frame_ts = None
+        self._last_emit_ts = None
+        self._intervals.clear()
+
+    def stats(self) -> dict[str, float]:
+        """Return actual emitted FPS and inter-frame jitter over the window."""
+        intervals = list(self._intervals)
+        if not intervals:
+            return {"emit_fps": 0.0, "interval_ms": 0.0, "jitter_ms": 0.0}
+        mean = sum(intervals) / len(intervals)
+        variance = sum((i - mean) ** 2 for i in intervals) / len(intervals)
+        return {
+            "emit_fps": (1.0 / mean) if mean > 0 else 0.0,
+            "interval_ms": mean * 1000.0,
+            "jitter_ms": math.sqrt(variance) * 1000.0,
+        }
+
+
+class HardwareRateGovernor:
+    """Hysteresis for moving the camera's own frame rate with the target.
+
+    Decimating in software still transfers and dequeues every frame the
+    camera sends. Lowering the device rate avoids that, but costs a short
+    stream hiccup, so a lower rate is only requested once the target has
+    stayed below the device rate for ``hold_sec``; a higher target is
+    applied at once, since software can't make up frames the camera does
+    not send. The device is never asked for more than the rate it had when
+    the capture opened. Targets within ``tolerance`` (relative) of the
+    device rate count as unchanged, so a jittery measured render rate does
+    not cause renegotiation.
+    """
+
+    def __init__(self, hold_sec: float, tolerance: float = 0.1) -> None:
+        """Create a governor with no device rate yet (see reset())."""
+        self.hold_sec = max(0.0, float(hold_sec))
+        self.tolerance = max(0.0, float(tolerance))
+        self._device_fps: Optional[float] = None
+        self._ceiling_fps = 0.0
+        self._pending_fps: Optional[float] = None
+        self._pending_since = 0.0
+        # Rates (rounded) the device refused or could not match.
+        self._rejected: set[int] = set()
+
+    @property
+    def device_fps(self) -> Optional[float]:
+        """Rate the device currently runs at (None until reset())."""
+        return self._device_fps
+
+    def reset(self, device_fps: Optional[float]) -> None:
+        """Start over for a freshly opened capture running at ``device_fps``.
+
+        None or a non-positive rate disables the governor for this capture.
+        """
+        fps = float(device_fps) if device_fps and device_fps > 0 else None
+        self._device_fps = fps
+        self._ceiling_fps = fps or 0.0
+        self._pending_fps = None
+        self._rejected.clear()
+
+    def _same(self, a: float, b: float) -> bool:
+        return abs(a - b) <= self.tolerance * max(a, b)
+
+    def update(self, target_fps: float, now: float) -> Optional[float]:
+        """Feed the current publish target; return a device rate to apply now.
+
+        Returns None while no change is due. The caller reports the outcome
+        through applied() or reject().
+        """
+        device = self._device_fps
+        if device is None or target_fps <= 0:
+            return None
+        desired = min(float(target_fps), self._ceiling_fps)
+        if self._same(desired, device) or round(desired) in self._rejected:
+            self._pending_fps = None
+            return None
+        if desired > device:
+            self._pending_fps = None
+            return desired
+        if self._pending_fps is None or not self._same(desired, self._pending_fps):
+            self._pending_fps = desired
+            self._pending_since = now
+            return None
+        if now - self._pending_since < self.hold_sec:
+            return None
+        self._pending_fps = None
+        return desired
+
+    def applied(self, device_fps: float) -> None:
+        """Record the rate the device now runs at."""
+        self._device_fps = float(device_fps)
+
+    def reject(self, fps: float) -> None:
+        """Record that the device cannot run at ``fps``; it is not retried."""
+        self._rejected.add(round(fps))
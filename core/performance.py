@@ -1,11 +1,12 @@
 """
 Performance monitoring for Camera Dashboard.
 
-Handles CPU load and temperature monitoring.
+Handles CPU load, temperature and context switch monitoring.
 """
 
 from __future__ import annotations
 
+import glob
 import os
 from typing import Optional
 
@@ -43,6 +44,32 @@ def read_cpu_temp_c() -> Optional[float]:
     return None
 
 
+def read_context_switches() -> Optional[dict[str, int]]:
+    """Read this process's thread count and context switch totals.
+
+    /proc/self/status only counts the main thread, so the same fields are
+    summed over every thread in /proc/self/task/*/status.
+    """
+    threads = 0
+    voluntary = 0
+    involuntary = 0
+    for path in glob.glob("/proc/self/task/*/status"):
+        try:
+            with open(path, "r") as f:
+                for line in f:
+                    if line.startswith("voluntary_ctxt_switches:"):
+                        voluntary += int(line.split()[1])
+                    elif line.startswith("nonvoluntary_ctxt_switches:"):
+                        involuntary += int(line.split()[1])
+        except (OSError, ValueError, IndexError):
+            # Thread exited while being read.
+            continue
+        threads += 1
+    if threads == 0:
+        return None
+    return {"threads": threads, "voluntary": voluntary, "involuntary": involuntary}
+
+
 def is_system_stressed() -> tuple[bool, Optional[float], Optional[float]]:
     """
     Check CPU load or temperature thresholds.
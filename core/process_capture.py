@@ -0,0 +1,660 @@
+"""
+Process-isolated camera capture for Camera Dashboard.
+
+With ``capture_mode = process`` every camera's CaptureWorker runs in its
+own child process, so capture and decode no longer contend for the GIL
+with the UI thread, and a crash in a camera stack (a GStreamer segfault,
+a wedged driver ioctl) only takes that camera's process down. Frames come
+back through a ShmFrameRing; the pipe to the child carries only small
+control, "frame N ready", status and stats messages.
+
+ProcessCaptureWorker is the dashboard side. It is a QThread with the same
+interface as CaptureWorker, so CameraWidget uses it unchanged: the thread
+spawns and supervises the child, restarts it when it dies or stops
+sending heartbeats (replacing the widget's stale-frame restarts for this
+mode), and its mailbox copies the newest frame out of the ring when the
+render tick takes it.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import multiprocessing
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from multiprocessing.connection import Connection, wait
+from types import ModuleType
+from typing import Any, Callable, Optional, Union
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+from PyQt6.QtCore import QObject, Qt, QThread, pyqtSignal
+
+from core import config
+from core.camera import CAPTURE_SETTINGS, CaptureWorker
+from core.frame_pool import FrameLease, FramePool
+from core.shm_ring import ShmFrameRing
+
+# Control messages forwarded to the child, by the CaptureWorker setter
+# they map to.
+_CONTROLS = {
+    "night_mode": "set_night_mode",
+    "output_size": "set_output_size",
+    "target_fps": "set_target_fps",
+    "consumer_fps": "set_consumer_fps",
+    "standby": "set_standby",
+}
+
+# Signature of a capture process entry point:
+# (stream_link, ring_name, conn, settings, controls).
+ChildTarget = Callable[
+    [Union[int, str], str, Connection, dict[str, Any], dict[str, Any]], None
+]
+
+
+def _config_snapshot() -> dict[str, Any]:
+    """Return the current config globals, to re-apply in a child process."""
+    return {
+        name: value
+        for name, value in vars(config).items()
+        if name.isupper() and not callable(value) and not isinstance(value, ModuleType)
+    }
+
+
+def _capture_settings() -> dict[str, Any]:
+    """Return the config values a capture worker reads, keyed by name."""
+    return {name: getattr(config, name) for name in CAPTURE_SETTINGS}
+
+
+def _fit_frame(frame: NDArray[np.uint8], capacity: int) -> NDArray[np.uint8]:
+    """Downscale ``frame`` (keeping its aspect) until it fits ``capacity`` bytes."""
+    scale = math.sqrt(capacity / frame.nbytes)
+    h, w = frame.shape[:2]
+    size = (max(1, int(w * scale)), max(1, int(h * scale)))
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+
+class _RingForwarder:
+    """Moves frames from the child's CaptureWorker mailbox into the ring."""
+
+    def __init__(
+        self,
+        worker: CaptureWorker,
+        ring: ShmFrameRing,
+        send: Callable[[tuple[str, Any]], None],
+    ) -> None:
+        self._worker = worker
+        self._ring = ring
+        self._send = send
+        # frame_ready may be emitted from the capture or a decode thread.
+        self._lock = threading.Lock()
+        self.written = 0
+        self.fitted = 0
+
+    def on_frame_ready(self) -> None:
+        """Copy the newest frame into the ring and tell the dashboard."""
+        with self._lock:
+            lease = self._worker.mailbox.take()
+            if lease is None:
+                return
+            try:
+                frame = lease.array
+                if not self._ring.fits(frame):
+                    if not self.fitted:
+                        logging.warning(
+                            "Camera %s: %dx%d frames exceed the frame ring slot, "
+                            "downscaling",
+                            self._worker.stream_link,
+                            frame.shape[1],
+                            frame.shape[0],
+                        )
+                    self.fitted += 1
+                    frame = _fit_frame(frame, self._ring.slot_bytes)
+                seq = self._ring.write(frame)
+            finally:
+                lease.release()
+            self.written += 1
+        self._send(("frame", seq))
+
+    def set_ring(self, ring: ShmFrameRing) -> None:
+        """Write further frames into ``ring``."""
+        with self._lock:
+            self._ring = ring
+
+
+def capture_process_main(
+    stream_link: Union[int, str],
+    ring_name: str,
+    conn: Connection,
+    settings: dict[str, Any],
+    controls: dict[str, Any],
+) -> None:
+    """Entry point of a capture process: run one CaptureWorker into the ring.
+
+    Exits when the dashboard sends "stop" or closes its end of the pipe.
+    """
+    for name, value in settings.items():
+        setattr(config, name, value)
+    logging.basicConfig(
+        level=getattr(logging, str(config.LOG_LEVEL or "INFO").upper(), logging.INFO),
+        format=f"%(asctime)s [%(levelname)s] [cam {stream_link}] %(message)s",
+        stream=sys.stderr,
+        force=True,
+    )
+    # Ctrl+C is handled by the dashboard, which then stops its children.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    ring = ShmFrameRing.attach(ring_name)
+    send_lock = threading.Lock()
+
+    def send(message: tuple[str, Any]) -> None:
+        with send_lock:
+            try:
+                conn.send(message)
+            except (OSError, ValueError):
+                pass
+
+    worker = CaptureWorker(
+        stream_link,
+        target_fps=controls.get("target_fps"),
+        capture_width=controls.get("capture_width"),
+        capture_height=controls.get("capture_height"),
+    )
+    for op, value in controls.items():
+        if op in _CONTROLS and value is not None:
+            getattr(worker, _CONTROLS[op])(value)
+    forwarder = _RingForwarder(worker, ring, send)
+    # No event loop runs here, so slots are called in the emitting thread.
+    worker.frame_ready.connect(
+        forwarder.on_frame_ready, Qt.ConnectionType.DirectConnection
+    )
+    worker.status_changed.connect(
+        lambda online: send(("status", bool(online))), Qt.ConnectionType.DirectConnection
+    )
+    worker.start()
+    logging.info("Capture process for camera %s started", stream_link)
+
+    try:
+        next_beat = 0.0
+        while True:
+            now = time.monotonic()
+            if now >= next_beat:
+                send(
+                    (
+                        "stats",
+                        {
+                            "capture": worker.get_capture_stats(),
+                            "decode": worker.get_decode_stats(),
+                            "fourcc": worker.get_fourcc(),
+                            "ring_written": forwarder.written,
+                            "ring_fitted": forwarder.fitted,
+                        },
+                    )
+                )
+                next_beat = now + ProcessCaptureWorker.HEARTBEAT_SEC
+            if not conn.poll(max(0.0, next_beat - time.monotonic())):
+                continue
+            op, value = conn.recv()
+            if op == "stop":
+                break
+            if op in _CONTROLS:
+                getattr(worker, _CONTROLS[op])(value)
+    except (EOFError, OSError):
+        logging.warning("Dashboard went away, stopping camera %s", stream_link)
+    finally:
+        worker.stop()
+        ring.close()
+        conn.close()
+    logging.info("Capture process for camera %s stopped", stream_link)
+
+
+class RingMailbox:
+    """FrameMailbox counterpart fed from a ShmFrameRing.
+
+    The supervisor thread calls note_frame() for each "frame ready" message
+    instead of publish(); wake-ups are coalesced the same way. take()
+    copies the newest complete frame out of the ring into a pooled buffer,
+    so only frames that are actually rendered are copied.
+    """
+
+    def __init__(self, ring: Optional[ShmFrameRing], pool: FramePool) -> None:
+        """Read frames from ``ring`` (None until set_ring()) into ``pool`` leases."""
+        self._ring = ring
+        self._pool = pool
+        self._lock = threading.Lock()
+        self._noted_seq = 0
+        self._taken_seq = 0
+        self._notify_armed = True
+        self._published = 0
+        self._taken = 0
+        self._overwritten = 0
+        self._wakeups = 0
+        # Reads abandoned because the writer lapped the slot mid-copy.
+        self._torn = 0
+
+    def set_ring(self, ring: ShmFrameRing) -> None:
+        """Switch to another ring, forgetting sequences seen in the old one."""
+        with self._lock:
+            self._ring = ring
+            self._noted_seq = 0
+            self._taken_seq = 0
+
+    def note_frame(self, seq: int) -> bool:
+        """Record that frame ``seq`` is in the ring; return True to wake the consumer."""
+        with self._lock:
+            if self._noted_seq > self._taken_seq:
+                self._overwritten += 1
+            self._noted_seq = max(self._noted_seq, seq)
+            self._published += 1
+            notify = self._notify_armed
+            if notify:
+                self._notify_armed = False
+                self._wakeups += 1
+        return notify
+
+    def has_pending(self) -> bool:
+        """True while a noted frame has not been taken yet."""
+        return self._noted_seq > self._taken_seq
+
+    def take(self, rearm: bool = True) -> Optional[FrameLease]:
+        """Copy the newest frame out of the ring (caller must release it)."""
+        with self._lock:
+            if rearm:
+                self._notify_armed = True
+            if self._ring is None or self._noted_seq <= self._taken_seq:
+                return None
+            for _ in range(ShmFrameRing.READ_RETRIES):
+                latest = self._ring.peek()
+                if latest is None:
+                    break
+                seq, shape, _timestamp = latest
+                lease = self._pool.lease(shape)
+                if self._ring.copy_into(seq, lease.array):
+                    self._taken_seq = max(self._noted_seq, seq)
+                    self._noted_seq = self._taken_seq
+                    self._taken += 1
+                    return lease
+                lease.release()
+                self._torn += 1
+            return None
+
+    def clear(self) -> None:
+        """Drop any pending frame."""
+        with self._lock:
+            self._taken_seq = self._noted_seq
+
+    def stats(self) -> dict[str, int]:
+        """Return published/taken/overwritten/wake-up counters and torn reads."""
+        with self._lock:
+            return {
+                "published": self._published,
+                "taken": self._taken,
+                "overwritten": self._overwritten,
+                "wakeups": self._wakeups,
+                "torn": self._torn,
+            }
+
+
+class ProcessCaptureWorker(QThread):
+    """Supervisor thread for one camera's capture process."""
+
+    frame_ready = pyqtSignal()
+    status_changed = pyqtSignal(bool)
+
+    FRAME_POOL_SIZE = 3
+    RING_SLOTS = 3
+    # Child stats/heartbeat period, and silence after which it counts as hung.
+    HEARTBEAT_SEC = 1.0
+    HEARTBEAT_TIMEOUT_SEC = 5.0
+    # Allowance for the first message (the child imports OpenCV and Qt).
+    START_TIMEOUT_SEC = 20.0
+    STOP_TIMEOUT_SEC = 2.0
+
+    # Restarts are handled here rather than by the widget's stale-frame path.
+    supervises_restarts = True
+
+    def __init__(
+        self,
+        stream_link: Union[int, str],
+        parent: Optional[QObject] = None,
+        target_fps: Optional[float] = None,
+        capture_width: Optional[int] = None,
+        capture_height: Optional[int] = None,
+        target: Optional[ChildTarget] = None,
+    ) -> None:
+        """Create the frame ring; the capture process starts with the thread."""
+        super().__init__(parent)
+        self.stream_link = stream_link
+        self.capture_width = capture_width
+        self.capture_height = capture_height
+        # Profile rate the worker was created with; "target_fps" in the
+        # controls follows dynamic FPS changes.
+        self.profile_fps = target_fps
+        self._target = target or capture_process_main
+        self._ring = self._create_ring()
+        self._frame_pool = FramePool(self.FRAME_POOL_SIZE)
+        self.mailbox = RingMailbox(self._ring, self._frame_pool)
+        # Latest value of every control, replayed to each new process.
+        self._control_lock = threading.Lock()
+        self._controls: dict[str, Any] = {
+            "capture_width": capture_width,
+            "capture_height": capture_height,
+            "target_fps": target_fps,
+        }
+        self._conn: Optional[Connection] = None
+        self._process: Optional[multiprocessing.process.BaseProcess] = None
+        # Pid of the process producing frames (the child, or the daemon).
+        self._pid: Optional[int] = None
+        self._running = True
+        self._stop_event = threading.Event()
+        self._online = False
+        self._child_stats: dict[str, Any] = {}
+        self._last_frame_ts = 0.0
+        self._start_ts = time.time()
+        # Supervision counters.
+        self._starts = 0
+        self._crashes = 0
+        self._hangs = 0
+        self._last_exit = "none"
+        self._restart_events: deque[float] = deque(
+            maxlen=config.MAX_RESTARTS_PER_WINDOW * 2
+        )
+        self._closed = False
+
+    def _create_ring(self) -> Optional[ShmFrameRing]:
+        """Create the ring the capture process writes into."""
+        ring_w = max(640, self.capture_width or 0)
+        ring_h = max(480, self.capture_height or 0)
+        return ShmFrameRing.create(self.RING_SLOTS, ring_w * ring_h * 4)
+
+    # -- controls ---------------------------------------------------------
+
+    def _control(self, op: str, value: Any) -> None:
+        """Remember a control value and forward it to the running process."""
+        with self._control_lock:
+            self._controls[op] = value
+            conn = self._conn
+            if conn is None:
+                return
+            try:
+                conn.send((op, value))
+            except (OSError, ValueError):
+                pass
+
+    def set_night_mode(self, enabled: bool) -> None:
+        """Switch the child's night-mode stage on or off."""
+        self._control("night_mode", bool(enabled))
+
+    def set_output_size(self, size: Optional[tuple[int, int]]) -> None:
+        """Forward the display size, shrunk if needed to fit a ring slot.
+
+        Sizes beyond the slot capacity are scaled down keeping their aspect;
+        the widget scales the rest of the way.
+        """
+        if size is not None:
+            w, h = int(size[0]), int(size[1])
+            capacity = self._ring.slot_bytes if self._ring is not None else w * h * 4
+            if w <= 0 or h <= 0:
+                size = None
+            elif w * h * 4 > capacity:
+                scale = math.sqrt(capacity / (w * h * 4))
+                size = (max(1, int(w * scale)), max(1, int(h * scale)))
+            else:
+                size = (w, h)
+        self._control("output_size", size)
+
+    def set_target_fps(self, fps: Optional[float]) -> None:
+        """Update the child's target FPS."""
+        if fps is None or float(fps) <= 0:
+            return
+        self._control("target_fps", float(fps))
+
+    def set_consumer_fps(self, fps: Optional[float]) -> None:
+        """Report the widget's measured render rate to the child."""
+        self._control("consumer_fps", float(fps) if fps and fps > 0 else None)
+
+    def set_standby(self, fps: Optional[float]) -> None:
+        """Cap the child's publishing while the tile is hidden (None resumes).
+
+        Sent as -1 to resume, since None control values are not replayed.
+        """
+        self._control("standby", -1.0 if fps is None else max(0.0, float(fps)))
+
+    # -- supervision ------------------------------------------------------
+
+    def _spawn(self) -> bool:
+        """Start a capture process; return False if it could not be started."""
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        with self._control_lock:
+            controls = dict(self._controls)
+        process = context.Process(
+            target=self._target,
+            args=(self.stream_link, self._ring.name, child_conn, _config_snapshot(), controls),
+            name=f"capture-{self.stream_link}",
+            daemon=True,
+        )
+        try:
+            process.start()
+        except Exception:
+            logging.exception("Camera %s: failed to start capture process", self.stream_link)
+            parent_conn.close()
+            return False
+        finally:
+            child_conn.close()
+        self._starts += 1
+        self._process = process
+        self._pid = process.pid
+        with self._control_lock:
+            self._conn = parent_conn
+        logging.info(
+            "Camera %s capture process started (pid %s)", self.stream_link, process.pid
+        )
+        return True
+
+    def _handle_message(self, op: str, value: Any) -> None:
+        """Apply one message from the capture process."""
+        if op == "frame":
+            self._last_frame_ts = time.time()
+            if self.mailbox.note_frame(value):
+                self.frame_ready.emit()
+        elif op == "status":
+            self._set_online(bool(value))
+        elif op == "stats":
+            self._child_stats = value
+
+    def _set_online(self, online: bool) -> None:
+        if online != self._online:
+            self._online = online
+            self.status_changed.emit(online)
+
+    def _supervise(self) -> str:
+        """Pump messages until the peer exits, hangs or we are stopped.
+
+        Returns why supervision ended.
+        """
+        conn = self._conn
+        process = self._process
+        assert conn is not None
+        handles: list[Any] = [conn]
+        if process is not None:
+            handles.append(process.sentinel)
+        last_message = time.monotonic()
+        silence_limit = self.START_TIMEOUT_SEC
+        while self._running:
+            ready = wait(handles, timeout=0.5)
+            if conn in ready:
+                try:
+                    while conn.poll():
+                        self._handle_message(*conn.recv())
+                except (EOFError, OSError):
+                    if process is not None:
+                        process.join(self.STOP_TIMEOUT_SEC)
+                    return self._describe_exit(process)
+                last_message = time.monotonic()
+                silence_limit = self.HEARTBEAT_TIMEOUT_SEC
+            elif process is not None and process.sentinel in ready:
+                process.join(self.STOP_TIMEOUT_SEC)
+                return self._describe_exit(process)
+            if time.monotonic() - last_message > silence_limit:
+                self._hangs += 1
+                logging.error(
+                    "Camera %s capture peer (pid %s) silent for %.0fs, dropping it",
+                    self.stream_link,
+                    self._pid,
+                    silence_limit,
+                )
+                return "hung"
+        return "stopped"
+
+    def _describe_exit(self, process: Optional[multiprocessing.process.BaseProcess]) -> str:
+        """Log and describe how the capture process (or connection) ended."""
+        code = process.exitcode if process is not None else None
+        if code is None:
+            reason = "connection closed"
+        elif code < 0:
+            try:
+                reason = f"signal {signal.Signals(-code).name}"
+            except ValueError:
+                reason = f"signal {-code}"
+        else:
+            reason = f"exit code {code}"
+        if self._running:
+            self._crashes += 1
+            logging.error(
+                "Camera %s capture peer (pid %s) lost: %s",
+                self.stream_link,
+                self._pid,
+                reason,
+            )
+        return reason
+
+    def _reap(self) -> None:
+        """Stop the current process (politely, then forcibly) and drop the pipe."""
+        with self._control_lock:
+            conn = self._conn
+            self._conn = None
+        process = self._process
+        self._process = None
+        if conn is not None:
+            try:
+                conn.send(("stop", None))
+            except (OSError, ValueError):
+                pass
+        if process is not None:
+            process.join(self.STOP_TIMEOUT_SEC)
+            if process.is_alive():
+                process.terminate()
+                process.join(0.5)
+            if process.is_alive():
+                process.kill()
+                process.join(0.5)
+        if conn is not None:
+            conn.close()
+
+    def _restart_delay(self) -> float:
+        """Seconds to wait before the next restart, enforcing the restart window.
+
+        Uses the same cooldown and per-window limit as the widget's
+        stale-frame restarts; once the limit is hit the next attempt waits
+        twice the window.
+        """
+        now = time.time()
+        window = config.RESTART_WINDOW_SEC
+        recent = [t for t in self._restart_events if (now - t) <= window]
+        self._restart_events.append(now)
+        if len(recent) >= config.MAX_RESTARTS_PER_WINDOW:
+            self._restart_events.clear()
+            logging.warning(
+                "Camera %s capture process restarted %d times in %.0fs, "
+                "retrying in %.0fs",
+                self.stream_link,
+                len(recent),
+                window,
+                window * 2,
+            )
+            return window * 2
+        return config.RESTART_COOLDOWN_SEC
+
+    def run(self) -> None:
+        """Spawn the capture process and keep it alive until stop()."""
+        self._start_ts = time.time()
+        logging.info("Camera %s supervisor started", self.stream_link)
+        while self._running:
+            if not self._spawn():
+                self._stop_event.wait(self._restart_delay())
+                continue
+            reason = self._supervise()
+            self._reap()
+            if not self._running:
+                break
+            self._last_exit = reason
+            self._set_online(False)
+            self._stop_event.wait(self._restart_delay())
+        self._reap()
+        self._set_online(False)
+        logging.info("Camera %s supervisor stopped", self.stream_link)
+
+    def stop(self) -> None:
+        """Stop the capture process and supervisor, then free the ring."""
+        self._running = False
+        self._stop_event.set()
+        if self.isRunning() and not self.wait(int((self.STOP_TIMEOUT_SEC + 2.0) * 1000)):
+            logging.warning("Camera %s supervisor did not stop in time", self.stream_link)
+        self._reap()
+        if not self._closed and not self.isRunning():
+            self._closed = True
+            self.mailbox.clear()
+            if self._ring is not None:
+                self._ring.close()
+
+    # -- stats ------------------------------------------------------------
+
+    def is_healthy(self) -> bool:
+        """True while connected to the producer and frames arrived recently."""
+        process = self._process
+        if self._conn is None or (process is not None and not process.is_alive()):
+            return False
+        if self._last_frame_ts > 0:
+            return (time.time() - self._last_frame_ts) < 5.0
+        return (time.time() - self._start_ts) < 5.0
+
+    def get_capture_stats(self) -> dict[str, Any]:
+        """Return the child's capture stats plus process supervision counters."""
+        stats = dict(self._child_stats.get("capture", {}))
+        stats.update(
+            {
+                "process_pid": self._pid,
+                "process_starts": self._starts,
+                "process_restarts": max(0, self._starts - 1),
+                "process_crashes": self._crashes,
+                "process_hangs": self._hangs,
+                "process_last_exit": self._last_exit,
+                "ring_written": self._child_stats.get("ring_written", 0),
+                "ring_fitted": self._child_stats.get("ring_fitted", 0),
+            }
+        )
+        return stats
+
+    def get_decode_stats(self) -> dict[str, Any]:
+        """Return the child's decode stats and the local mailbox state."""
+        stats = dict(self._child_stats.get("decode", {}))
+        stats["mailbox_pending"] = 1 if self.mailbox.has_pending() else 0
+        return stats
+
+    def get_pool_stats(self) -> dict[str, Any]:
+        """Return stats of the pool frames are copied out of the ring into."""
+        return self._frame_pool.stats()
+
+    def get_mailbox_stats(self) -> dict[str, int]:
+        """Return UI handoff counters."""
+        return self.mailbox.stats()
+
+    def get_fourcc(self) -> str:
+        """Return the FOURCC last reported by the capture process."""
+        return self._child_stats.get("fourcc", "unknown")
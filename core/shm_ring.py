@@ -0,0 +1,237 @@
+"""
+Shared-memory frame ring for Camera Dashboard.
+
+Carries decoded frames from a capture process to the dashboard without
+pickling them. The ring is one ``multiprocessing.shared_memory`` segment:
+a small header, a fixed number of frame slots, and per-slot metadata
+guarded by a sequence counter (a seqlock). The writer makes a slot's
+counter odd while it copies a frame in and even again when done; a reader
+copies the newest slot out and keeps the copy only if the counter was
+even and unchanged across the copy, so a frame overwritten mid-read is
+detected and retried instead of shown torn.
+
+The dashboard creates the ring (and unlinks it at the end) and only reads
+from it; the capture process attaches to it by name and writes. With the
+capture daemon the roles of creator and writer move to the daemon, and the
+dashboard attaches read-only. The dashboard's handle is untracked: before
+Python 3.13 every attach registers the segment with the attaching process's
+resource tracker, which unlinks it when that process exits, and the
+daemon's rings must outlive UI restarts.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Header words (uint64): magic, slot count, slot capacity, latest sequence.
+_MAGIC = 0x43414D52494E4731  # "CAMRING1"
+_HEADER_WORDS = 8
+_H_MAGIC, _H_SLOTS, _H_SLOT_BYTES, _H_LATEST = range(4)
+# Slot metadata words: seqlock counter, frame sequence, timestamp (float64
+# bits), height, width, channels (0 for single-plane frames), byte count.
+_SLOT_WORDS = 8
+_S_LOCK, _S_SEQ, _S_TS, _S_H, _S_W, _S_CH, _S_NBYTES = range(7)
+_ALIGN = 64
+
+
+def _aligned(size: int) -> int:
+    return (size + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _open_untracked(name: str) -> shared_memory.SharedMemory:
+    """Open segment ``name`` without handing it to this process's resource tracker."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    shm = shared_memory.SharedMemory(name=name)
+    # Undo the registration SharedMemory() does for every handle before 3.13.
+    resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    return shm
+
+
+class ShmFrameRing:
+    """Fixed-slot frame ring in shared memory with seqlock-guarded slots."""
+
+    # Read attempts before giving up on a slot the writer keeps lapping.
+    READ_RETRIES = 3
+
+    def __init__(
+        self, shm: shared_memory.SharedMemory, owner: bool, writable: bool
+    ) -> None:
+        """Wrap an existing segment; use create() or attach() instead."""
+        self._shm = shm
+        self._owner = owner
+        self.writable = writable
+        buf = shm.buf
+        header = np.ndarray((_HEADER_WORDS,), dtype=np.uint64, buffer=buf)
+        if int(header[_H_MAGIC]) != _MAGIC:
+            raise ValueError(f"{shm.name} is not a frame ring")
+        self.slots = int(header[_H_SLOTS])
+        self.slot_bytes = int(header[_H_SLOT_BYTES])
+        self._header = header
+        self._meta = np.ndarray(
+            (self.slots, _SLOT_WORDS),
+            dtype=np.uint64,
+            buffer=buf,
+            offset=_HEADER_WORDS * 8,
+        )
+        self._timestamps = self._meta.view(np.float64)[:, _S_TS]
+        self._data_offset = _aligned((_HEADER_WORDS + self.slots * _SLOT_WORDS) * 8)
+        # Next sequence to write; continues after a previous writer's frames
+        # so readers see sequences increase across capture process restarts.
+        self._next_seq = int(header[_H_LATEST]) + 1
+
+    @classmethod
+    def create(cls, slots: int, slot_bytes: int) -> ShmFrameRing:
+        """Create a new ring of ``slots`` slots of ``slot_bytes`` each.
+
+        The returned handle owns the segment (close() unlinks it) and is
+        read-only: its frames can only be copied out.
+        """
+        slots = max(2, int(slots))
+        slot_bytes = _aligned(max(1, int(slot_bytes)))
+        data_offset = _aligned((_HEADER_WORDS + slots * _SLOT_WORDS) * 8)
+        shm = shared_memory.SharedMemory(
+            create=True, size=data_offset + slots * slot_bytes
+        )
+        header = np.ndarray((_HEADER_WORDS,), dtype=np.uint64, buffer=shm.buf)
+        header[:] = 0
+        header[_H_SLOTS] = slots
+        header[_H_SLOT_BYTES] = slot_bytes
+        np.ndarray(
+            (slots, _SLOT_WORDS), dtype=np.uint64, buffer=shm.buf, offset=_HEADER_WORDS * 8
+        )[:] = 0
+        header[_H_MAGIC] = _MAGIC
+        del header
+        return cls(shm, owner=True, writable=False)
+
+    @classmethod
+    def attach(cls, name: str, writable: bool = True, track: bool = True) -> ShmFrameRing:
+        """Attach to the ring ``name``, as its writer unless ``writable`` is False.
+
+        Pass ``track=False`` when the ring belongs to an unrelated process
+        (the capture daemon): a tracked handle makes this process's resource
+        tracker unlink the segment when this process exits. Processes that
+        share the owner's tracker (the owner itself, its spawned children)
+        keep the default, since unregistering would drop the owner's entry.
+        """
+        if track:
+            shm = shared_memory.SharedMemory(name=name)
+        else:
+            shm = _open_untracked(name)
+        return cls(shm, owner=False, writable=writable)
+
+    @staticmethod
+    def exists(name: str) -> bool:
+        """True if segment ``name`` is still linked (can be attached).
+
+        Opens the name directly rather than through SharedMemory, so no
+        resource tracker (the owner's included) hears about it.
+        """
+        import _posixshmem  # POSIX only, like the capture processes and daemon
+
+        try:
+            fd = _posixshmem.shm_open("/" + name.lstrip("/"), os.O_RDONLY, mode=0o600)
+        except FileNotFoundError:
+            return False
+        os.close(fd)
+        return True
+
+    @property
+    def name(self) -> str:
+        """Segment name to pass to attach()."""
+        return self._shm.name
+
+    @property
+    def latest_seq(self) -> int:
+        """Sequence of the newest complete frame (0 before the first)."""
+        return int(self._header[_H_LATEST])
+
+    def fits(self, frame: NDArray[np.uint8]) -> bool:
+        """True if ``frame`` fits in one slot."""
+        return frame.nbytes <= self.slot_bytes
+
+    def _slot_view(self, index: int, shape: tuple[int, ...]) -> NDArray[np.uint8]:
+        offset = self._data_offset + index * self.slot_bytes
+        return np.ndarray(shape, dtype=np.uint8, buffer=self._shm.buf, offset=offset)
+
+    def write(self, frame: NDArray[np.uint8], timestamp: Optional[float] = None) -> int:
+        """Copy ``frame`` into the next slot and publish it; return its sequence.
+
+        Raises ValueError if the frame does not fit a slot.
+        """
+        if not self.writable:
+            raise PermissionError("frame ring handle is read-only")
+        if frame.dtype != np.uint8 or frame.ndim not in (2, 3):
+            raise ValueError(f"unsupported frame {frame.dtype} {frame.shape}")
+        if not self.fits(frame):
+            raise ValueError(
+                f"frame of {frame.nbytes} bytes exceeds slot size {self.slot_bytes}"
+            )
+        seq = self._next_seq
+        self._next_seq += 1
+        index = seq % self.slots
+        meta = self._meta[index]
+        # Odd while the slot is written; a writer killed mid-copy leaves it
+        # odd, so step to the next odd value rather than toggling.
+        lock = int(meta[_S_LOCK])
+        meta[_S_LOCK] = lock + 2 if lock & 1 else lock + 1
+        np.copyto(self._slot_view(index, frame.shape), frame)
+        meta[_S_SEQ] = seq
+        self._timestamps[index] = time.monotonic() if timestamp is None else timestamp
+        meta[_S_H] = frame.shape[0]
+        meta[_S_W] = frame.shape[1]
+        meta[_S_CH] = frame.shape[2] if frame.ndim == 3 else 0
+        meta[_S_NBYTES] = frame.nbytes
+        meta[_S_LOCK] += 1  # even: slot stable
+        self._header[_H_LATEST] = seq
+        return seq
+
+    def peek(self) -> Optional[tuple[int, tuple[int, ...], float]]:
+        """Return (sequence, shape, timestamp) of the newest frame, or None."""
+        for _ in range(self.READ_RETRIES):
+            seq = self.latest_seq
+            if seq == 0:
+                return None
+            meta = self._meta[seq % self.slots]
+            lock = int(meta[_S_LOCK])
+            if lock & 1 or int(meta[_S_SEQ]) != seq:
+                continue
+            h, w, ch = int(meta[_S_H]), int(meta[_S_W]), int(meta[_S_CH])
+            timestamp = float(self._timestamps[seq % self.slots])
+            if int(meta[_S_LOCK]) == lock:
+                return seq, ((h, w, ch) if ch else (h, w)), timestamp
+        return None
+
+    def copy_into(self, seq: int, dst: NDArray[np.uint8]) -> bool:
+        """Copy frame ``seq`` into ``dst``; False if it was overwritten meanwhile."""
+        index = seq % self.slots
+        meta = self._meta[index]
+        lock = int(meta[_S_LOCK])
+        if lock & 1 or int(meta[_S_SEQ]) != seq:
+            return False
+        src = self._slot_view(index, dst.shape)
+        src.flags.writeable = False
+        np.copyto(dst, src)
+        return int(meta[_S_LOCK]) == lock and int(meta[_S_SEQ]) == seq
+
+    def close(self) -> None:
+        """Unmap the segment; the owning handle also unlinks it."""
+        self._header = self._meta = self._timestamps = None  # type: ignore[assignment]
+        try:
+            self._shm.close()
+        except BufferError:
+            # A numpy view is still alive; the mapping goes with the process.
+            pass
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                # Unlinked by someone else; still drop our tracker entry.
+                resource_tracker.unregister(self._shm._name, "shared_memory")  # type: ignore[attr-defined]
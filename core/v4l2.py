@@ -0,0 +1,704 @@
+"""
+Native V4L2 mmap capture for Camera Dashboard.
+
+Talks to /dev/video* directly with VIDIOC_* ioctls and mmap'd driver
+buffers instead of going through OpenCV, so the driver's per-buffer
+metadata is visible:
+
+- compressed MJPEG frames are handed out as zero-copy memoryviews of the
+  mmap'd buffer (valid until the buffer is queued again)
+- kernel timestamps give capture-to-dequeue latency
+- buffer sequence numbers expose exactly how many frames the driver or
+  USB link dropped
+- device controls (exposure, gain, ...) can be queried and set, from a
+  second handle while another backend streams
+
+All system calls go through a DeviceIO object, so the streaming logic can
+be exercised against a fake device in tests. V4L2Capture wraps V4L2Device
+in the cv2.VideoCapture subset CaptureWorker uses.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import errno
+import fcntl
+import logging
+import mmap
+import os
+import select
+import time
+from typing import Any, Optional, Union
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+
+# ============================================================
+# IOCTL ENCODING (linux/ioctl.h)
+# ============================================================
+_IOC_WRITE = 1
+_IOC_READ = 2
+
+
+def _ioc(direction: int, nr: int, struct: Any) -> int:
+    """Encode a 'V' ioctl request number for an argument of type ``struct``."""
+    return (direction << 30) | (ctypes.sizeof(struct) << 16) | (ord("V") << 8) | nr
+
+
+def fourcc_code(fourcc: str) -> int:
+    """Return the little-endian V4L2 pixel format code for a 4-char FOURCC."""
+    a, b, c, d = (ord(ch) for ch in fourcc)
+    return a | (b << 8) | (c << 16) | (d << 24)
+
+
+def fourcc_string(code: int) -> str:
+    """Return the 4-char FOURCC for a V4L2 pixel format code."""
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+
+
+# ============================================================
+# STRUCTURES (linux/videodev2.h)
+# ============================================================
+class v4l2_capability(ctypes.Structure):
+    _fields_ = [
+        ("driver", ctypes.c_char * 16),
+        ("card", ctypes.c_char * 32),
+        ("bus_info", ctypes.c_char * 32),
+        ("version", ctypes.c_uint32),
+        ("capabilities", ctypes.c_uint32),
+        ("device_caps", ctypes.c_uint32),
+        ("reserved", ctypes.c_uint32 * 3),
+    ]
+
+
+class v4l2_pix_format(ctypes.Structure):
+    _fields_ = [
+        ("width", ctypes.c_uint32),
+        ("height", ctypes.c_uint32),
+        ("pixelformat", ctypes.c_uint32),
+        ("field", ctypes.c_uint32),
+        ("bytesperline", ctypes.c_uint32),
+        ("sizeimage", ctypes.c_uint32),
+        ("colorspace", ctypes.c_uint32),
+        ("priv", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("ycbcr_enc", ctypes.c_uint32),
+        ("quantization", ctypes.c_uint32),
+        ("xfer_func", ctypes.c_uint32),
+    ]
+
+
+class _v4l2_format_union(ctypes.Union):
+    # The kernel union also holds v4l2_window, whose pointers set its alignment.
+    _fields_ = [
+        ("pix", v4l2_pix_format),
+        ("raw_data", ctypes.c_uint8 * 200),
+        ("_align", ctypes.c_void_p),
+    ]
+
+
+class v4l2_format(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_uint32), ("fmt", _v4l2_format_union)]
+
+
+class v4l2_requestbuffers(ctypes.Structure):
+    _fields_ = [
+        ("count", ctypes.c_uint32),
+        ("type", ctypes.c_uint32),
+        ("memory", ctypes.c_uint32),
+        ("capabilities", ctypes.c_uint32),
+        ("reserved", ctypes.c_uint32),
+    ]
+
+
+class timeval(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_long), ("tv_usec", ctypes.c_long)]
+
+
+class v4l2_timecode(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("frames", ctypes.c_uint8),
+        ("seconds", ctypes.c_uint8),
+        ("minutes", ctypes.c_uint8),
+        ("hours", ctypes.c_uint8),
+        ("userbits", ctypes.c_uint8 * 4),
+    ]
+
+
+class _v4l2_buffer_m(ctypes.Union):
+    _fields_ = [
+        ("offset", ctypes.c_uint32),
+        ("userptr", ctypes.c_ulong),
+        ("planes", ctypes.c_void_p),
+        ("fd", ctypes.c_int32),
+    ]
+
+
+class v4l2_buffer(ctypes.Structure):
+    _fields_ = [
+        ("index", ctypes.c_uint32),
+        ("type", ctypes.c_uint32),
+        ("bytesused", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("field", ctypes.c_uint32),
+        ("timestamp", timeval),
+        ("timecode", v4l2_timecode),
+        ("sequence", ctypes.c_uint32),
+        ("memory", ctypes.c_uint32),
+        ("m", _v4l2_buffer_m),
+        ("length", ctypes.c_uint32),
+        ("reserved2", ctypes.c_uint32),
+        ("request_fd", ctypes.c_int32),
+    ]
+
+
+class v4l2_fract(ctypes.Structure):
+    _fields_ = [("numerator", ctypes.c_uint32), ("denominator", ctypes.c_uint32)]
+
+
+class v4l2_captureparm(ctypes.Structure):
+    _fields_ = [
+        ("capability", ctypes.c_uint32),
+        ("capturemode", ctypes.c_uint32),
+        ("timeperframe", v4l2_fract),
+        ("extendedmode", ctypes.c_uint32),
+        ("readbuffers", ctypes.c_uint32),
+        ("reserved", ctypes.c_uint32 * 4),
+    ]
+
+
+class _v4l2_streamparm_union(ctypes.Union):
+    _fields_ = [("capture", v4l2_captureparm), ("raw_data", ctypes.c_uint8 * 200)]
+
+
+class v4l2_streamparm(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_uint32), ("parm", _v4l2_streamparm_union)]
+
+
+class v4l2_queryctrl(ctypes.Structure):
+    _fields_ = [
+        ("id", ctypes.c_uint32),
+        ("type", ctypes.c_uint32),
+        ("name", ctypes.c_char * 32),
+        ("minimum", ctypes.c_int32),
+        ("maximum", ctypes.c_int32),
+        ("step", ctypes.c_int32),
+        ("default_value", ctypes.c_int32),
+        ("flags", ctypes.c_uint32),
+        ("reserved", ctypes.c_uint32 * 2),
+    ]
+
+
+class v4l2_control(ctypes.Structure):
+    _fields_ = [("id", ctypes.c_uint32), ("value", ctypes.c_int32)]
+
+
+V4L2_BUF_TYPE_VIDEO_CAPTURE = 1
+V4L2_MEMORY_MMAP = 1
+V4L2_FIELD_ANY = 0
+V4L2_CAP_VIDEO_CAPTURE = 0x00000001
+V4L2_CAP_STREAMING = 0x04000000
+V4L2_CAP_DEVICE_CAPS = 0x80000000
+V4L2_CAP_TIMEPERFRAME = 0x00001000
+V4L2_BUF_FLAG_ERROR = 0x00000040
+V4L2_BUF_FLAG_TIMESTAMP_MASK = 0x0000E000
+V4L2_BUF_FLAG_TIMESTAMP_MONOTONIC = 0x00002000
+V4L2_CTRL_FLAG_DISABLED = 0x0001
+
+# Control IDs (user class and camera class).
+V4L2_CID_AUTOGAIN = 0x00980912
+V4L2_CID_GAIN = 0x00980913
+V4L2_CID_POWER_LINE_FREQUENCY = 0x00980918
+V4L2_CID_EXPOSURE_AUTO = 0x009A0901
+V4L2_CID_EXPOSURE_ABSOLUTE = 0x009A0902  # 100 us units
+V4L2_CID_EXPOSURE_AUTO_PRIORITY = 0x009A0903
+# V4L2_CID_EXPOSURE_AUTO menu values.
+V4L2_EXPOSURE_AUTO = 0
+V4L2_EXPOSURE_MANUAL = 1
+V4L2_EXPOSURE_APERTURE_PRIORITY = 3
+
+VIDIOC_QUERYCAP = _ioc(_IOC_READ, 0, v4l2_capability)
+VIDIOC_S_FMT = _ioc(_IOC_READ | _IOC_WRITE, 5, v4l2_format)
+VIDIOC_REQBUFS = _ioc(_IOC_READ | _IOC_WRITE, 8, v4l2_requestbuffers)
+VIDIOC_QUERYBUF = _ioc(_IOC_READ | _IOC_WRITE, 9, v4l2_buffer)
+VIDIOC_QBUF = _ioc(_IOC_READ | _IOC_WRITE, 15, v4l2_buffer)
+VIDIOC_DQBUF = _ioc(_IOC_READ | _IOC_WRITE, 17, v4l2_buffer)
+VIDIOC_STREAMON = _ioc(_IOC_WRITE, 18, ctypes.c_int)
+VIDIOC_STREAMOFF = _ioc(_IOC_WRITE, 19, ctypes.c_int)
+VIDIOC_G_PARM = _ioc(_IOC_READ | _IOC_WRITE, 21, v4l2_streamparm)
+VIDIOC_S_PARM = _ioc(_IOC_READ | _IOC_WRITE, 22, v4l2_streamparm)
+VIDIOC_G_CTRL = _ioc(_IOC_READ | _IOC_WRITE, 27, v4l2_control)
+VIDIOC_S_CTRL = _ioc(_IOC_READ | _IOC_WRITE, 28, v4l2_control)
+VIDIOC_QUERYCTRL = _ioc(_IOC_READ | _IOC_WRITE, 36, v4l2_queryctrl)
+
+
+# ============================================================
+# SYSTEM CALL LAYER
+# ============================================================
+class DeviceIO:
+    """System calls used by V4L2Device; tests substitute a fake device."""
+
+    def open(self, path: str) -> int:
+        """Open the device non-blocking for streaming I/O."""
+        return os.open(path, os.O_RDWR | os.O_NONBLOCK)
+
+    def close(self, fd: int) -> None:
+        """Close the device."""
+        os.close(fd)
+
+    def ioctl(self, fd: int, request: int, arg: Any) -> None:
+        """Issue ``request``; the kernel updates the ctypes ``arg`` in place."""
+        fcntl.ioctl(fd, request, arg)
+
+    def mmap(self, fd: int, length: int, offset: int) -> Any:
+        """Map one driver buffer."""
+        return mmap.mmap(
+            fd, length, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE, offset=offset
+        )
+
+    def wait_readable(self, fd: int, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for a filled buffer."""
+        readable, _, _ = select.select([fd], [], [], timeout)
+        return bool(readable)
+
+
+class V4L2Frame:
+    """One dequeued buffer: a view of its bytes plus driver metadata."""
+
+    __slots__ = ("index", "data", "sequence", "timestamp", "flags")
+
+    def __init__(
+        self, index: int, data: memoryview, sequence: int, timestamp: float, flags: int
+    ) -> None:
+        self.index = index
+        # Zero-copy view of the mmap'd buffer, valid until it is queued again.
+        self.data = data
+        self.sequence = sequence
+        # Kernel capture time in seconds (CLOCK_MONOTONIC on most drivers).
+        self.timestamp = timestamp
+        self.flags = flags
+
+
+class V4L2Device:
+    """Streaming (mmap) capture from one V4L2 device node."""
+
+    def __init__(self, path: str, io: Optional[DeviceIO] = None) -> None:
+        """Prepare to stream from ``path``; ``io`` defaults to real system calls."""
+        self.path = path
+        self.io = io or DeviceIO()
+        self.fd: Optional[int] = None
+        self.width = 0
+        self.height = 0
+        self.fourcc = ""
+        self._buffers: list[Any] = []
+        self._views: list[memoryview] = []
+        self._streaming = False
+        self._last_sequence: Optional[int] = None
+        self._monotonic_timestamps = False
+        # Frames dequeued, frames missing from the sequence, buffers
+        # flagged corrupt, and the last capture-to-dequeue latency.
+        self.frames = 0
+        self.dropped = 0
+        self.errors = 0
+        self.latency = 0.0
+
+    def open(self) -> None:
+        """Open the node and check it supports streaming video capture.
+
+        Raises OSError if it does not.
+        """
+        self.fd = self.io.open(self.path)
+        cap = v4l2_capability()
+        try:
+            self.io.ioctl(self.fd, VIDIOC_QUERYCAP, cap)
+        except OSError:
+            self.close()
+            raise
+        caps = cap.device_caps if cap.capabilities & V4L2_CAP_DEVICE_CAPS else cap.capabilities
+        if not (caps & V4L2_CAP_VIDEO_CAPTURE and caps & V4L2_CAP_STREAMING):
+            self.close()
+            raise OSError(errno.ENODEV, f"{self.path} is not a streaming capture device")
+
+    def set_format(self, width: int, height: int, fourcc: str = "MJPG") -> tuple[int, int, str]:
+        """Request a capture format; returns the (width, height, fourcc) granted."""
+        fmt = v4l2_format()
+        fmt.type = V4L2_BUF_TYPE_VIDEO_CAPTURE
+        fmt.fmt.pix.width = int(width)
+        fmt.fmt.pix.height = int(height)
+        fmt.fmt.pix.pixelformat = fourcc_code(fourcc)
+        fmt.fmt.pix.field = V4L2_FIELD_ANY
+        self.io.ioctl(self.fd, VIDIOC_S_FMT, fmt)
+        self.width = int(fmt.fmt.pix.width)
+        self.height = int(fmt.fmt.pix.height)
+        self.fourcc = fourcc_string(fmt.fmt.pix.pixelformat)
+        return self.width, self.height, self.fourcc
+
+    def start(self, buffer_count: int = 4) -> None:
+        """Allocate and map driver buffers, queue them all and start streaming."""
+        req = v4l2_requestbuffers()
+        req.count = int(buffer_count)
+        req.type = V4L2_BUF_TYPE_VIDEO_CAPTURE
+        req.memory = V4L2_MEMORY_MMAP
+        self.io.ioctl(self.fd, VIDIOC_REQBUFS, req)
+        if req.count < 1:
+            raise OSError(errno.ENOMEM, f"{self.path}: driver granted no buffers")
+        for index in range(req.count):
+            buf = self._buffer(index)
+            self.io.ioctl(self.fd, VIDIOC_QUERYBUF, buf)
+            mapped = self.io.mmap(self.fd, buf.length, buf.m.offset)
+            self._buffers.append(mapped)
+            self._views.append(memoryview(mapped))
+            self.io.ioctl(self.fd, VIDIOC_QBUF, buf)
+        self.io.ioctl(self.fd, VIDIOC_STREAMON, ctypes.c_int(V4L2_BUF_TYPE_VIDEO_CAPTURE))
+        self._streaming = True
+        self._last_sequence = None
+
+    def query_control(self, cid: int) -> Optional[v4l2_queryctrl]:
+        """Return control ``cid``'s range and flags, or None if unavailable."""
+        query = v4l2_queryctrl()
+        query.id = cid
+        try:
+            self.io.ioctl(self.fd, VIDIOC_QUERYCTRL, query)
+        except OSError as exc:
+            if exc.errno == errno.EINVAL:
+                return None
+            raise
+        if query.flags & V4L2_CTRL_FLAG_DISABLED:
+            return None
+        return query
+
+    def get_control(self, cid: int) -> int:
+        """Return the current value of control ``cid``."""
+        control = v4l2_control()
+        control.id = cid
+        self.io.ioctl(self.fd, VIDIOC_G_CTRL, control)
+        return int(control.value)
+
+    def set_control(self, cid: int, value: int) -> int:
+        """Set control ``cid``; return the value the driver kept."""
+        control = v4l2_control()
+        control.id = cid
+        control.value = int(value)
+        self.io.ioctl(self.fd, VIDIOC_S_CTRL, control)
+        return int(control.value)
+
+    def _stream_parm(self) -> v4l2_streamparm:
+        """Return the current capture parameters (VIDIOC_G_PARM)."""
+        parm = v4l2_streamparm()
+        parm.type = V4L2_BUF_TYPE_VIDEO_CAPTURE
+        self.io.ioctl(self.fd, VIDIOC_G_PARM, parm)
+        return parm
+
+    @staticmethod
+    def _parm_fps(parm: v4l2_streamparm) -> float:
+        interval = parm.parm.capture.timeperframe
+        return interval.denominator / interval.numerator if interval.numerator else 0.0
+
+    def get_frame_rate(self) -> float:
+        """Return the device's frame rate (0 if the driver does not report one)."""
+        return self._parm_fps(self._stream_parm())
+
+    def set_frame_rate(self, fps: float) -> float:
+        """Ask the driver for ``fps`` frames per second; return the rate granted.
+
+        Drivers pick their nearest supported frame interval. Raises OSError
+        if the device has no frame interval control. Drivers that refuse the
+        change while streaming (uvcvideo answers EBUSY) get it between a
+        STREAMOFF and a STREAMON; the mapped buffers are kept and queued
+        again, so nothing is reallocated and the device stays open.
+        """
+        parm = self._stream_parm()
+        if not parm.parm.capture.capability & V4L2_CAP_TIMEPERFRAME:
+            raise OSError(errno.ENOTSUP, f"{self.path} has no frame interval control")
+        parm.parm.capture.timeperframe.numerator = 1000
+        parm.parm.capture.timeperframe.denominator = max(1, int(round(fps * 1000)))
+        try:
+            self.io.ioctl(self.fd, VIDIOC_S_PARM, parm)
+        except OSError as exc:
+            if exc.errno != errno.EBUSY or not self._streaming:
+                raise
+            stream_type = ctypes.c_int(V4L2_BUF_TYPE_VIDEO_CAPTURE)
+            # STREAMOFF returns every buffer to us, including any not yet
+            # queued back; all of them are queued again below.
+            self.io.ioctl(self.fd, VIDIOC_STREAMOFF, stream_type)
+            try:
+                self.io.ioctl(self.fd, VIDIOC_S_PARM, parm)
+            finally:
+                for index in range(len(self._buffers)):
+                    self.io.ioctl(self.fd, VIDIOC_QBUF, self._buffer(index))
+                self.io.ioctl(self.fd, VIDIOC_STREAMON, stream_type)
+                # Drivers restart buffer sequence numbers at STREAMON.
+                self._last_sequence = None
+        return self._parm_fps(parm)
+
+    @staticmethod
+    def _buffer(index: int) -> v4l2_buffer:
+        """Return a v4l2_buffer addressing mmap buffer ``index``."""
+        buf = v4l2_buffer()
+        buf.index = index
+        buf.type = V4L2_BUF_TYPE_VIDEO_CAPTURE
+        buf.memory = V4L2_MEMORY_MMAP
+        return buf
+
+    def dequeue(self, timeout: float) -> Optional[V4L2Frame]:
+        """Wait up to ``timeout`` seconds for the next filled buffer.
+
+        The non-blocking DQBUF is tried first, so a ``timeout`` of 0 takes
+        a buffer only if one is ready (e.g. after an epoll wake-up).
+        Returns None on timeout. Buffers the driver flags as corrupt are
+        requeued and counted in ``errors``. The caller must queue() the
+        returned frame once done with its data.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            buf = self._buffer(0)
+            try:
+                self.io.ioctl(self.fd, VIDIOC_DQBUF, buf)
+            except OSError as exc:
+                if exc.errno != errno.EAGAIN:
+                    raise
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.io.wait_readable(self.fd, remaining):
+                    return None
+                continue
+            self._account(buf)
+            if buf.flags & V4L2_BUF_FLAG_ERROR:
+                self.errors += 1
+                self.io.ioctl(self.fd, VIDIOC_QBUF, self._buffer(buf.index))
+                continue
+            timestamp = buf.timestamp.tv_sec + buf.timestamp.tv_usec / 1e6
+            if buf.flags & V4L2_BUF_FLAG_TIMESTAMP_MASK == V4L2_BUF_FLAG_TIMESTAMP_MONOTONIC:
+                self.latency = max(0.0, time.monotonic() - timestamp)
+            data = self._views[buf.index][: buf.bytesused]
+            return V4L2Frame(buf.index, data, int(buf.sequence), timestamp, int(buf.flags))
+
+    def _account(self, buf: v4l2_buffer) -> None:
+        """Count the frame and any gap in the driver's sequence numbers."""
+        self.frames += 1
+        sequence = int(buf.sequence)
+        last = self._last_sequence
+        if last is not None and sequence > last + 1:
+            self.dropped += sequence - last - 1
+        self._last_sequence = sequence
+
+    def queue(self, frame: V4L2Frame) -> None:
+        """Return a dequeued frame's buffer to the driver."""
+        try:
+            # Invalidate the view so stale reads fail instead of seeing new data.
+            frame.data.release()
+        except BufferError:
+            # An array still wraps it; the caller owns that stale view.
+            pass
+        self.io.ioctl(self.fd, VIDIOC_QBUF, self._buffer(frame.index))
+
+    def stats(self) -> dict[str, Any]:
+        """Return frame, drop and error counters and the latest latency."""
+        return {
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "sequence": self._last_sequence if self._last_sequence is not None else -1,
+            "latency_ms": self.latency * 1000.0,
+        }
+
+    def stop(self) -> None:
+        """Stop streaming and release the mapped buffers."""
+        if self.fd is None:
+            return
+        if self._streaming:
+            self._streaming = False
+            try:
+                self.io.ioctl(
+                    self.fd, VIDIOC_STREAMOFF, ctypes.c_int(V4L2_BUF_TYPE_VIDEO_CAPTURE)
+                )
+            except OSError:
+                logging.debug("VIDIOC_STREAMOFF failed on %s", self.path)
+        for view in self._views:
+            try:
+                view.release()
+            except BufferError:
+                pass
+        for mapped in self._buffers:
+            try:
+                mapped.close()
+            except (AttributeError, BufferError):
+                # A caller still holds a view; the mapping goes with it.
+                pass
+        self._views = []
+        self._buffers = []
+        req = v4l2_requestbuffers()
+        req.type = V4L2_BUF_TYPE_VIDEO_CAPTURE
+        req.memory = V4L2_MEMORY_MMAP
+        try:
+            self.io.ioctl(self.fd, VIDIOC_REQBUFS, req)
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        """Stop streaming and close the device node."""
+        if self.fd is None:
+            return
+        self.stop()
+        try:
+            self.io.close(self.fd)
+        finally:
+            self.fd = None
+
+
+class V4L2Capture:
+    """cv2.VideoCapture look-alike over a streaming V4L2Device (MJPEG only).
+
+    Like OpenCV, retrieve() decodes to BGR unless CAP_PROP_CONVERT_RGB is
+    set to 0, in which case it returns the compressed JPEG as a read-only
+    1-D view of driver memory, valid until the next grab().
+    """
+
+    def __init__(
+        self,
+        device: Union[int, str],
+        width: int,
+        height: int,
+        buffer_count: int = 4,
+        timeout: float = 2.0,
+        io: Optional[DeviceIO] = None,
+    ) -> None:
+        """Open ``device`` (index or path) for MJPEG at ``width`` x ``height``."""
+        path = f"/dev/video{device}" if isinstance(device, int) else device
+        self.timeout = timeout
+        self.error: Optional[str] = None
+        self._convert_rgb = True
+        self._frame: Optional[V4L2Frame] = None
+        self._device: Optional[V4L2Device] = V4L2Device(path, io)
+        try:
+            self._device.open()
+            _, _, fourcc = self._device.set_format(width, height, "MJPG")
+            if fourcc != "MJPG":
+                raise OSError(errno.EINVAL, f"{path} cannot deliver MJPG (got {fourcc!r})")
+            self._device.start(buffer_count)
+        except OSError as exc:
+            self.error = str(exc)
+            logging.info("V4L2 mmap capture unavailable for %s: %s", path, exc)
+            self.release()
+
+    def isOpened(self) -> bool:
+        """True while the device is streaming."""
+        return self._device is not None
+
+    @property
+    def last_frame(self) -> Optional[V4L2Frame]:
+        """The grabbed frame with its sequence number and kernel timestamp."""
+        return self._frame
+
+    def fileno(self) -> int:
+        """Return the device's file descriptor (readable when a frame is ready)."""
+        if self._device is None or self._device.fd is None:
+            raise ValueError("capture is closed")
+        return self._device.fd
+
+    def grab(self, timeout: Optional[float] = None) -> bool:
+        """Requeue the previous buffer and dequeue the next one.
+
+        Waits up to ``timeout`` seconds (default: the capture's timeout);
+        0 only takes a buffer that is already filled. A False return with
+        ``error`` unset means no frame was ready.
+        """
+        if self._device is None:
+            return False
+        try:
+            if self._frame is not None:
+                frame, self._frame = self._frame, None
+                self._device.queue(frame)
+            self._frame = self._device.dequeue(self.timeout if timeout is None else timeout)
+        except OSError as exc:
+            self.error = str(exc)
+            logging.warning("V4L2 dequeue failed on %s: %s", self._device.path, exc)
+            return False
+        return self._frame is not None
+
+    def retrieve(
+        self, image: Optional[NDArray[np.uint8]] = None, flag: int = 0
+    ) -> tuple[bool, Optional[NDArray[np.uint8]]]:
+        """Return the grabbed frame, decoded or as compressed bytes."""
+        if self._frame is None:
+            return False, None
+        buf = np.frombuffer(self._frame.data, dtype=np.uint8)
+        if not self._convert_rgb:
+            buf.flags.writeable = False
+            return True, buf
+        frame = cv2.imdecode(buf, cv2.IMREAD_COLOR)
+        if frame is None:
+            return False, None
+        if image is not None and image.shape == frame.shape and image.dtype == frame.dtype:
+            np.copyto(image, frame)
+            return True, image
+        return True, frame
+
+    def read(
+        self, image: Optional[NDArray[np.uint8]] = None
+    ) -> tuple[bool, Optional[NDArray[np.uint8]]]:
+        """grab() followed by retrieve()."""
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def get(self, prop_id: int) -> float:
+        """Return the negotiated size, FOURCC or CONVERT_RGB flag (else 0)."""
+        device = self._device
+        if device is None:
+            return 0.0
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(device.width)
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(device.height)
+        if prop_id == cv2.CAP_PROP_FOURCC:
+            return float(fourcc_code(device.fourcc))
+        if prop_id == cv2.CAP_PROP_CONVERT_RGB:
+            return 1.0 if self._convert_rgb else 0.0
+        if prop_id == cv2.CAP_PROP_FPS:
+            try:
+                return device.get_frame_rate()
+            except OSError:
+                return 0.0
+        return 0.0
+
+    def set(self, prop_id: int, value: float) -> bool:
+        """Change CAP_PROP_CONVERT_RGB or, on a streaming device, CAP_PROP_FPS.
+
+        A frame rate change hands the grabbed frame's buffer back to the
+        driver, which may need it to restart the stream; get() reports the
+        rate the driver actually granted.
+        """
+        if prop_id == cv2.CAP_PROP_CONVERT_RGB:
+            self._convert_rgb = bool(value)
+            return True
+        device = self._device
+        if prop_id == cv2.CAP_PROP_FPS and device is not None and value > 0:
+            try:
+                if self._frame is not None:
+                    frame, self._frame = self._frame, None
+                    device.queue(frame)
+                device.set_frame_rate(value)
+            except OSError as exc:
+                logging.info("Frame rate change refused by %s: %s", device.path, exc)
+                return False
+            return True
+        return False
+
+    def stats(self) -> dict[str, Any]:
+        """Return the device's frame, drop and latency counters."""
+        device = self._device
+        return device.stats() if device is not None else {}
+
+    def release(self) -> None:
+        """Stop streaming and close the device."""
+        device, self._device = self._device, None
+        self._frame = None
+        if device is not None:
+            try:
+                device.close()
+            except OSError:
+                logging.debug("Error closing %s", device.path)
@@ -24,10 +24,20 @@ from core import (
     find_working_cameras,
     get_video_indexes,
     is_system_stressed,
+    mosaic_supported,
+    shutdown_capture_engine,
+    shutdown_decode_pool,
     test_single_camera,
 )
-from ui import CameraWidget, get_smart_grid
-from utils import log_health_summary
+from core.capture_daemon import daemon_find_cameras, request_daemon
+from ui import (
+    CameraWidget,
+    GridCompositor,
+    MosaicWidget,
+    get_smart_grid,
+    get_visibility_tracker,
+)
+from utils import log_health_summary, mark_restart
 
 
 def safe_cleanup(widgets: list[CameraWidget], cleaned_flag: list[bool]) -> None:
@@ -41,6 +51,8 @@ def safe_cleanup(widgets: list[CameraWidget], cleaned_flag: list[bool]) -> None:
             w.cleanup()
         except Exception:
             pass
+    shutdown_capture_engine()
+    shutdown_decode_pool()
 
 
 def main() -> None:
@@ -72,9 +84,15 @@ def main() -> None:
 
     mw = QtWidgets.QMainWindow()
     mw.setWindowFlags(QtCore.Qt.WindowType.FramelessWindowHint)
-    central_widget = QtWidgets.QWidget()
+    # render_mode = compositor/mosaic: the grid container paints all tile frames.
+    if config.RENDER_MODE in ("compositor", "mosaic"):
+        central_widget = GridCompositor()
+    else:
+        central_widget = QtWidgets.QWidget()
     setattr(central_widget, "selected_camera", None)
     mw.setCentralWidget(central_widget)
+    # Suspend tiles while the window is minimized or the display is blanked.
+    get_visibility_tracker().watch_window(mw)
 
     # Show first, then fullscreen (avoids race conditions)
     mw.show()
@@ -93,8 +111,17 @@ def main() -> None:
         if primary_screen
         else QtCore.QRect(0, 0, 1920, 1080)
     )
-    working_cameras = find_working_cameras()
+    working_cameras: Optional[list[int]] = None
+    if config.CAPTURE_MODE == "daemon":
+        # The daemon owns the devices; probing them here would fight it.
+        working_cameras = daemon_find_cameras()
+        if working_cameras is None:
+            logging.error("Capture daemon unavailable, capturing in-process instead")
+            config.CAPTURE_MODE = "threads"
+    if working_cameras is None:
+        working_cameras = find_working_cameras()
     logging.info("Found %d cameras", len(working_cameras))
+    logging.info("Render mode: %s", config.RENDER_MODE)
 
     known_indexes = set(get_video_indexes())
     active_indexes = set(working_cameras)
@@ -108,6 +135,7 @@ def main() -> None:
         """Restart the entire process (used by settings tile)."""
         logging.info("Restart requested from settings.")
         safe_cleanup(camera_widgets, cleaned_flag)
+        mark_restart()
         python = sys.executable
         try:
             os.execv(python, [python] + sys.argv)
@@ -147,9 +175,16 @@ def main() -> None:
     active_camera_count = max(1, min(len(working_cameras), config.CAMERA_SLOT_COUNT))
     cap_w, cap_h, cap_fps, ui_fps = config.choose_profile(active_camera_count)
     logging.info("Profile: %dx%d @ %d FPS (UI %d FPS)", cap_w, cap_h, cap_fps, ui_fps)
+    if config.RENDER_MODE == "mosaic" and isinstance(central_widget, GridCompositor):
+        central_widget.enable_mosaic(ui_fps)
+
+    use_mosaic = config.CAPTURE_MODE == "gst_mosaic" and bool(working_cameras)
+    if use_mosaic and not mosaic_supported():
+        logging.warning("capture_mode=gst_mosaic needs GStreamer; using threads")
+        use_mosaic = False
 
     # Exactly N camera slots at all times (based on config)
-    for slot_idx in range(config.CAMERA_SLOT_COUNT):
+    for slot_idx in range(0 if use_mosaic else config.CAMERA_SLOT_COUNT):
         if slot_idx < len(working_cameras):
             cam_index = working_cameras[slot_idx]
             cw = CameraWidget(
@@ -180,19 +215,46 @@ def main() -> None:
             placeholder_slots.append(cw)
         all_widgets.append(cw)
 
-    rows, cols = get_smart_grid(len(all_widgets))
+    # Same grid as threads mode: settings tile plus every configured slot.
+    rows, cols = get_smart_grid(1 + config.CAMERA_SLOT_COUNT)
     widget_width = max(1, screen.width() // cols)
     widget_height = max(1, screen.height() // rows)
 
-    for cw in all_widgets:
-        cw.screen_width = widget_width
-        cw.screen_height = widget_height
-
-    for i, cw in enumerate(all_widgets):
-        row = i // cols
-        col = i % cols
-        cw.grid_position = (row, col)
-        layout.addWidget(cw, row, col)
+    if use_mosaic:
+        # One compositor tile spans the grid; cameras fill the cells after
+        # the settings tile, which is laid over the empty top-left cell.
+        mosaic_cameras = working_cameras[: config.CAMERA_SLOT_COUNT]
+        cell_w = min(cap_w, widget_width)
+        cell_h = min(cap_h, widget_height)
+        mosaic = MosaicWidget(
+            mosaic_cameras,
+            (rows, cols),
+            (cell_w, cell_h),
+            parent=central_widget,
+            target_fps=cap_fps,
+            request_capture_size=(cap_w, cap_h),
+            ui_fps=ui_fps,
+        )
+        mosaic.set_night_mode(night_mode_state["enabled"])
+        mosaic.screen_width = widget_width * cols
+        mosaic.screen_height = widget_height * rows
+        camera_widgets.append(mosaic)
+        all_widgets.append(mosaic)
+        layout.addWidget(mosaic, 0, 0, rows, cols)
+        settings_tile.grid_position = (0, 0)
+        layout.addWidget(settings_tile, 0, 0)
+        settings_tile.raise_()
+        logging.info("Mosaic mode: %d cameras on %dx%d grid", len(mosaic_cameras), rows, cols)
+    else:
+        for cw in all_widgets:
+            cw.screen_width = widget_width
+            cw.screen_height = widget_height
+
+        for i, cw in enumerate(all_widgets):
+            row = i // cols
+            col = i % cols
+            cw.grid_position = (row, col)
+            layout.addWidget(cw, row, col)
 
     for r in range(rows):
         layout.setRowStretch(r, 1)
@@ -316,6 +378,8 @@ def main() -> None:
                 failed_indexes[idx] = now
 
     def _run_rescan_tests(candidates: list[int]) -> list[tuple[int, Optional[int]]]:
+        if config.CAPTURE_MODE == "daemon":
+            return request_daemon("probe", candidates, timeout=30.0)
         results: list[tuple[int, Optional[int]]] = []
         for idx in candidates:
             ok = test_single_camera(
@@ -419,10 +483,14 @@ def main() -> None:
         health_timer.start()
 
     app.aboutToQuit.connect(lambda: (stop_timers(), safe_cleanup(camera_widgets, cleaned_flag)))
+    if isinstance(central_widget, GridCompositor):
+        app.aboutToQuit.connect(central_widget.shutdown)
 
     def quit_handler() -> None:
         stop_timers()
         safe_cleanup(camera_widgets, cleaned_flag)
+        if isinstance(central_widget, GridCompositor):
+            central_widget.shutdown()
         app.quit()
 
     QtGui.QShortcut(QtGui.QKeySequence("q"), mw, quit_handler)
@@ -42,6 +42,13 @@ stale_frame_timeout_sec = 1.5
 restart_cooldown_sec = 5.0
 max_restarts_per_window = 3
 restart_window_sec = 30.0
+couple_capture_to_render = true
+shared_decode = true
+decode_threads = 0
+capture_engine = false
+capture_engine_threads = 1
+hardware_fps = true
+hardware_fps_hold_sec = 10
 
 [camera]
 rescan_interval_ms = 15000
@@ -49,6 +56,23 @@ failed_camera_cooldown_sec = 30.0
 slot_count = 3
 kill_device_holders = false
 use_gstreamer = true
+capture_mode = threads
+output_format = bgr
+reduced_decode = true
+capture_backend = opencv
+
+[controls]
+enabled = true
+exposure_auto_priority = false
+power_line_frequency = 50
+exposure_limit_ratio = 0.8
+
+[daemon]
+socket_path = /tmp/dashboard-test.sock
+idle_timeout_sec = 10
+
+[capture_backends]
+2 = gi
 
 [profile]
 capture_width = 640
@@ -56,6 +80,11 @@ capture_height = 480
 capture_fps = 20
 ui_fps = 15
 
+[ui]
+render_mode = widgets
+suspend_hidden = true
+hidden_capture_fps = 1
+
 [health]
 log_interval_sec = 30
 """)
@@ -88,7 +117,13 @@ _CONFIG_GLOBALS = [
     "RESCAN_INTERVAL_MS", "FAILED_CAMERA_COOLDOWN_SEC", "CAMERA_SLOT_COUNT",
     "HEALTH_LOG_INTERVAL_SEC", "KILL_DEVICE_HOLDERS",
     "PROFILE_CAPTURE_WIDTH", "PROFILE_CAPTURE_HEIGHT", "PROFILE_CAPTURE_FPS",
-    "PROFILE_UI_FPS", "USE_GSTREAMER",
+    "PROFILE_UI_FPS", "USE_GSTREAMER", "COUPLE_CAPTURE_TO_RENDER", "OUTPUT_FORMAT",
+    "REDUCED_DECODE", "SHARED_DECODE", "DECODE_THREADS",
+    "CAPTURE_ENGINE", "CAPTURE_ENGINE_THREADS", "HARDWARE_FPS", "HARDWARE_FPS_HOLD_SEC",
+    "CAPTURE_MODE", "CAPTURE_BACKEND", "CAPTURE_BACKEND_OVERRIDES",
+    "CAPTURE_DAEMON_SOCKET", "CAPTURE_DAEMON_IDLE_SEC",
+    "CAMERA_CONTROLS_ENABLED", "CAMERA_CONTROLS", "CAMERA_CONTROL_OVERRIDES",
+    "EXPOSURE_LIMIT_RATIO", "RENDER_MODE", "SUSPEND_HIDDEN_TILES", "HIDDEN_CAPTURE_FPS",
 ]
 
 
@@ -180,3 +180,910 @@ class TestFrameRateLimiting:
         
         # New interval should be longer (lower FPS = longer interval)
         assert new_interval > initial_interval
+
+    def test_lasting_lower_rate_reaches_device(self, monkeypatch):
+        """A held lower target is applied to a native V4L2 device in place."""
+        from core import config
+        from core.camera import CaptureWorker
+        from core.v4l2 import V4L2Capture
+        from tests.test_v4l2 import FakeDevice
+
+        monkeypatch.setattr(config, "HARDWARE_FPS_HOLD_SEC", 0.0)
+        monkeypatch.setattr(config, "COUPLE_CAPTURE_TO_RENDER", False)
+        device = FakeDevice()
+        worker = CaptureWorker(stream_link=0, parent=None, target_fps=30.0)
+        worker._cap = V4L2Capture(0, 16, 8, io=device)
+        worker._backend_name = "V4L2-mmap"
+        worker._configure_fps_from_camera()
+
+        worker.set_target_fps(15.0)
+        worker._renegotiate_rate()
+        worker._renegotiate_rate()
+
+        assert device.fps == 15 and device.streaming
+        stats = worker.get_capture_stats()
+        assert stats["device_fps"] == 15.0
+        assert stats["hw_rate_changes"] == 1
+
+        device.rates = (30, 15, 2)
+        worker.set_target_fps(5.0)
+        worker._renegotiate_rate()
+        worker._renegotiate_rate()
+
+        # The nearest interval the driver has (15 FPS) is far from 5: no change.
+        assert device.fps == 15
+        assert worker.get_capture_stats()["hw_rate_changes"] == 1
+        worker._close_capture()
+
+    def test_opencv_capture_stays_software_throttled(self, monkeypatch):
+        """OpenCV captures never get CAP_PROP_FPS changes while streaming."""
+        import cv2
+        from core import config
+        from core.camera import CaptureWorker
+
+        monkeypatch.setattr(config, "HARDWARE_FPS_HOLD_SEC", 0.0)
+        cap = MagicMock()
+        cap.get.return_value = 30.0
+        worker = CaptureWorker(stream_link=0, parent=None, target_fps=30.0)
+        worker._cap = cap
+        worker._configure_fps_from_camera()
+
+        worker.set_target_fps(10.0)
+        worker._renegotiate_rate()
+        worker._renegotiate_rate()
+
+        assert all(c.args[0] != cv2.CAP_PROP_FPS for c in cap.set.call_args_list)
+
+
+class TestDecodeOnDemand:
+    """Test that throttled frames are grabbed but never decoded."""
+
+    def _make_worker(self, fps=10.0):
+        import numpy as np
+        from core.camera import CaptureWorker
+
+        worker = CaptureWorker(stream_link=0, parent=None, target_fps=fps)
+        worker.set_target_fps(fps)
+        cap = MagicMock()
+        cap.grab.return_value = True
+        cap.retrieve.return_value = (True, np.zeros((4, 4, 3), dtype=np.uint8))
+        worker._cap = cap
+        return worker, cap
+
+    def test_throttled_frames_skip_retrieve(self):
+        """Frames inside the emit interval are grabbed only."""
+        worker, cap = self._make_worker(fps=10.0)
+
+        with patch("core.camera.time.time", return_value=100.0):
+            worker._process_next_frame()
+        with patch("core.camera.time.time", return_value=100.02):
+            worker._process_next_frame()
+            worker._process_next_frame()
+
+        stats = worker.get_capture_stats()
+        assert cap.grab.call_count == 3
+        assert cap.retrieve.call_count == 1
+        assert stats["grabbed"] == 3
+        assert stats["decoded"] == 1
+        assert stats["emitted"] == 1
+        assert stats["decode_skipped"] == 2
+
+    def test_stalled_consumer_gets_one_wakeup(self, monkeypatch):
+        """Frames published while the UI is stalled coalesce to one wake-up."""
+        from core import config
+
+        monkeypatch.setattr(config, "COUPLE_CAPTURE_TO_RENDER", False)
+        worker, cap = self._make_worker(fps=1000.0)
+        wakeups = []
+        worker.frame_ready.connect(lambda: wakeups.append(1))
+
+        for i in range(5):
+            with patch("core.camera.time.time", return_value=100.0 + i):
+                worker._process_next_frame()
+
+        assert len(wakeups) == 1
+        assert worker.get_mailbox_stats()["overwritten"] == 4
+        lease = worker.mailbox.take()
+        assert lease is not None
+        assert worker.get_pool_stats()["outstanding"] == 1
+
+    def test_coupled_backpressure_wastes_nothing(self, monkeypatch):
+        """With coupling on, no frame is decoded while one awaits rendering."""
+        from core import config
+
+        monkeypatch.setattr(config, "COUPLE_CAPTURE_TO_RENDER", True)
+        worker, cap = self._make_worker(fps=1000.0)
+
+        for i in range(5):
+            with patch("core.camera.time.time", return_value=100.0 + i):
+                worker._process_next_frame()
+
+        stats = worker.get_capture_stats()
+        assert worker.get_mailbox_stats()["overwritten"] == 0
+        assert stats["decoded"] == 1
+        assert stats["backpressure_skips"] == 4
+
+    def test_consumer_fps_caps_emit_rate(self, monkeypatch):
+        """The decimator runs at min(target, consumer render rate)."""
+        from core import config
+
+        monkeypatch.setattr(config, "COUPLE_CAPTURE_TO_RENDER", True)
+        worker, _ = self._make_worker(fps=25.0)
+        worker.set_consumer_fps(12.0)
+        assert worker._decimator.target_fps == pytest.approx(12.0)
+
+        worker.set_consumer_fps(None)
+        assert worker._decimator.target_fps == pytest.approx(25.0)
+
+    def test_capture_settings_cover_worker_config_reads(self):
+        """Every config name a worker reads is listed in CAPTURE_SETTINGS."""
+        import inspect
+        import re
+
+        from core import camera
+
+        source = inspect.getsource(camera.CaptureWorker)
+        names = set(re.findall(r'_config\("([A-Z_]+)"\)', source))
+        assert names
+        assert names <= set(camera.CAPTURE_SETTINGS)
+
+    def test_worker_settings_override_global_config(self, monkeypatch):
+        """Per-worker settings (a daemon camera's config) win over the globals."""
+        from core import config
+        from core.camera import CaptureWorker
+
+        monkeypatch.setattr(config, "COUPLE_CAPTURE_TO_RENDER", True)
+        worker = CaptureWorker(
+            stream_link=0,
+            parent=None,
+            target_fps=25.0,
+            settings={"COUPLE_CAPTURE_TO_RENDER": False},
+        )
+        worker.set_target_fps(25.0)
+        worker.set_consumer_fps(12.0)
+
+        assert worker._decimator.target_fps == pytest.approx(25.0)
+        assert config.COUPLE_CAPTURE_TO_RENDER is True
+
+    def test_grab_failure_closes_capture(self):
+        """A failed grab closes the capture without decoding."""
+        worker, cap = self._make_worker()
+        cap.grab.return_value = False
+
+        worker._process_next_frame()
+
+        assert cap.retrieve.call_count == 0
+        assert worker._cap is None
+        assert worker.get_capture_stats()["grabbed"] == 0
+
+
+class TestZeroCopyRetrieve:
+    """Test decoding straight into pooled frame buffers."""
+
+    def _make_worker(self, retrieve):
+        from core.camera import CaptureWorker
+
+        worker = CaptureWorker(stream_link=0, parent=None, target_fps=1000.0)
+        cap = MagicMock()
+        cap.grab.return_value = True
+        cap.retrieve.side_effect = retrieve
+        worker._cap = cap
+        return worker
+
+    def test_in_place_after_first_frame(self):
+        """First frame adopts the backend buffer, later frames decode in place."""
+        import numpy as np
+
+        def retrieve(image=None):
+            if image is None or image.shape != (4, 4, 3):
+                return True, np.ones((4, 4, 3), dtype=np.uint8)
+            image[:] = 2
+            return True, image
+
+        worker = self._make_worker(retrieve)
+        first = worker._retrieve_into_pool()
+        first_array = first.array
+        first.release()
+        second = worker._retrieve_into_pool()
+
+        stats = worker.get_capture_stats()
+        assert second.array is first_array
+        assert int(second.array[0, 0, 0]) == 2
+        assert stats["retrieve_reallocated"] == 1
+        assert stats["retrieve_in_place"] == 1
+        assert stats["retrieve_copied"] == 0
+
+    def test_resolution_change_falls_back(self):
+        """A backend reallocation on size change resets the pool shape."""
+        import numpy as np
+
+        shapes = iter([(4, 4, 3), (8, 8, 3)])
+
+        def retrieve(image=None):
+            return True, np.zeros(next(shapes), dtype=np.uint8)
+
+        worker = self._make_worker(retrieve)
+        worker._retrieve_into_pool().release()
+        lease = worker._retrieve_into_pool()
+
+        assert lease.array.shape == (8, 8, 3)
+        assert worker._frame_pool.shape == (8, 8, 3)
+        assert worker.get_capture_stats()["retrieve_reallocated"] == 2
+
+
+class TestOutputSizeNegotiation:
+    """Test worker-side scaling to the widget's tile size."""
+
+    def _make_worker(self):
+        import numpy as np
+        from core.camera import CaptureWorker
+
+        worker = CaptureWorker(stream_link=0, parent=None, target_fps=1000.0)
+        cap = MagicMock()
+        cap.grab.return_value = True
+
+        def retrieve(image=None):
+            if image is not None and image.shape == (480, 640, 3):
+                return True, image
+            return True, np.full((480, 640, 3), 50, dtype=np.uint8)
+
+        cap.retrieve.side_effect = retrieve
+        worker._cap = cap
+        return worker
+
+    def test_frames_scaled_down_to_output_size(self):
+        """Frames are resized in the worker to the negotiated tile size."""
+        worker = self._make_worker()
+        worker.set_output_size((320, 240))
+
+        leases = []
+        for _ in range(3):
+            lease = worker._retrieve_frame()
+            leases.append(lease.array.shape)
+            lease.release()
+
+        assert leases == [(240, 320, 3)] * 3
+        assert int(lease.array[0, 0, 0]) == 50
+        stats = worker.get_capture_stats()
+        assert stats["frames_scaled"] == 3
+        # Third frame decoded into the reused full-size scratch buffer.
+        assert stats["retrieve_in_place"] == 1
+
+    def test_no_upscaling_beyond_capture(self):
+        """A negotiated size larger than the capture leaves frames full size."""
+        worker = self._make_worker()
+        worker.set_output_size((1920, 1080))
+
+        lease = worker._retrieve_frame()
+
+        assert lease.array.shape == (480, 640, 3)
+        assert worker.get_capture_stats()["frames_scaled"] == 0
+
+    def test_clearing_output_size_restores_full_frames(self):
+        """set_output_size(None) disables worker-side scaling."""
+        worker = self._make_worker()
+        worker.set_output_size((320, 240))
+        worker._retrieve_frame().release()
+        worker.set_output_size(None)
+
+        lease = worker._retrieve_frame()
+        assert lease.array.shape == (480, 640, 3)
+
+
+class TestRgb32Output:
+    """Test worker-side conversion to Qt's native 32-bit layout."""
+
+    def _make_worker(self, monkeypatch):
+        import numpy as np
+        from core import config
+        from core.camera import CaptureWorker
+
+        monkeypatch.setattr(config, "OUTPUT_FORMAT", "rgb32")
+        worker = CaptureWorker(stream_link=0, parent=None, target_fps=1000.0)
+        cap = MagicMock()
+        cap.grab.return_value = True
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        frame[..., 0], frame[..., 1], frame[..., 2] = 10, 20, 30
+
+        def retrieve(image=None):
+            if image is not None and image.shape == frame.shape:
+                np.copyto(image, frame)
+                return True, image
+            return True, frame.copy()
+
+        cap.retrieve.side_effect = retrieve
+        worker._cap = cap
+        return worker
+
+    def test_bgr_frames_converted_to_bgrx(self, monkeypatch):
+        """BGR frames leave the worker as opaque 4-channel BGRx."""
+        worker = self._make_worker(monkeypatch)
+
+        lease = worker._retrieve_frame()
+
+        assert lease.array.shape == (480, 640, 4)
+        assert lease.array[0, 0].tolist() == [10, 20, 30, 255]
+        stats = worker.get_capture_stats()
+        assert stats["frames_converted"] == 1
+        assert stats["output_format"] == "rgb32"
+        lease.release()
+
+    def test_resize_runs_before_conversion(self, monkeypatch):
+        """Scaled frames are converted at tile size, not capture size."""
+        worker = self._make_worker(monkeypatch)
+        worker.set_output_size((320, 240))
+
+        for _ in range(2):
+            lease = worker._retrieve_frame()
+            assert lease.array.shape == (240, 320, 4)
+            lease.release()
+
+        stats = worker.get_capture_stats()
+        assert stats["frames_scaled"] == 2
+        assert stats["frames_converted"] == 2
+        assert worker._scaled_frame.shape == (240, 320, 3)
+
+    def test_four_channel_frames_pass_through(self, monkeypatch):
+        """Frames already delivered as BGRx (GStreamer caps) are not converted."""
+        import numpy as np
+
+        worker = self._make_worker(monkeypatch)
+        bgrx = np.full((480, 640, 4), 7, dtype=np.uint8)
+        worker._cap.retrieve.side_effect = lambda image=None: (True, bgrx)
+
+        lease = worker._retrieve_frame()
+
+        assert lease.array is bgrx
+        assert worker.get_capture_stats()["frames_converted"] == 0
+
+    def test_gstreamer_pipeline_requests_bgrx(self, monkeypatch):
+        """The rgb32 pipeline asks videoconvert for BGRx before the appsink."""
+        worker = self._make_worker(monkeypatch)
+
+        pipeline = worker._gstreamer_pipeline(640, 480, "BGRx")
+
+        assert "videoconvert ! video/x-raw,format=BGRx ! appsink" in pipeline
+        assert "format=" not in worker._gstreamer_pipeline(640, 480, None)
+
+
+class TestWorkerNightMode:
+    """Test the worker-side night-mode stage."""
+
+    def _make_worker(self):
+        import numpy as np
+        from core.camera import CaptureWorker
+
+        worker = CaptureWorker(stream_link=0, parent=None, target_fps=1000.0)
+        cap = MagicMock()
+        cap.grab.return_value = True
+
+        def retrieve(image=None):
+            if image is not None and image.shape == (480, 640, 3):
+                image[...] = 100
+                return True, image
+            return True, np.full((480, 640, 3), 100, dtype=np.uint8)
+
+        cap.retrieve.side_effect = retrieve
+        worker._cap = cap
+        return worker
+
+    def test_night_mode_emits_single_channel_luma(self):
+        """Night mode frames leave the worker as brightened luma."""
+        worker = self._make_worker()
+        worker.set_night_mode(True)
+
+        for _ in range(2):
+            lease = worker._retrieve_frame()
+            assert lease.array.shape == (480, 640)
+            assert int(lease.array[0, 0]) == 160
+            lease.release()
+
+        assert worker.get_capture_stats()["frames_night"] == 2
+
+    def test_night_mode_scales_before_luma(self, monkeypatch):
+        """With a tile size set, luma is computed at tile size (even in rgb32)."""
+        from core import config
+
+        monkeypatch.setattr(config, "OUTPUT_FORMAT", "rgb32")
+        worker = self._make_worker()
+        worker.set_output_size((320, 240))
+        worker.set_night_mode(True)
+
+        lease = worker._retrieve_frame()
+
+        assert lease.array.shape == (240, 320)
+        stats = worker.get_capture_stats()
+        assert stats["frames_scaled"] == 1
+        assert stats["frames_converted"] == 0
+
+    def test_disabling_night_mode_restores_colour(self):
+        """Turning night mode off returns to 3-channel frames."""
+        worker = self._make_worker()
+        worker.set_night_mode(True)
+        worker._retrieve_frame().release()
+        worker.set_night_mode(False)
+
+        lease = worker._retrieve_frame()
+        assert lease.array.shape == (480, 640, 3)
+
+
+class TestReducedDecode:
+    """Test reduced-resolution MJPEG decoding on the V4L2 path."""
+
+    def _make_worker(self):
+        import cv2
+        import numpy as np
+        from core.camera import CaptureWorker
+
+        worker = CaptureWorker(stream_link=0, parent=None, target_fps=1000.0)
+        frame = np.full((480, 640, 3), 90, dtype=np.uint8)
+        ok, jpeg = cv2.imencode(".jpg", frame)
+        assert ok
+        cap = MagicMock()
+        cap.grab.return_value = True
+        cap.set.return_value = True
+        cap.retrieve.return_value = (True, jpeg.reshape(1, -1))
+        worker._cap = cap
+        worker._source_size = (640, 480)
+        worker._enable_reduced_decode(cap, "MJPG")
+        return worker
+
+    def test_decode_scale_matches_tile_size(self):
+        """The largest DCT scale still covering the tile is used."""
+        worker = self._make_worker()
+        assert worker._compressed_decode
+
+        worker.set_output_size((160, 120))
+        assert worker._choose_decode_scale() == 4
+        worker.set_output_size((200, 150))
+        assert worker._choose_decode_scale() == 2
+        worker.set_output_size((1920, 1080))
+        assert worker._choose_decode_scale() == 1
+
+    def test_reduced_frame_at_tile_size_needs_no_resize(self):
+        """A 1/4-scale decode of a 160x120 tile is handed over as-is."""
+        worker = self._make_worker()
+        worker.set_output_size((160, 120))
+
+        lease = worker._retrieve_frame()
+
+        assert lease.array.shape == (120, 160, 3)
+        stats = worker.get_capture_stats()
+        assert stats["decode_scale"] == 4
+        assert stats["frames_reduced_decode"] == 1
+        assert stats["frames_scaled"] == 0
+
+    def test_reduced_frame_resized_to_exact_tile(self):
+        """Between DCT steps the reduced frame is resized down to the tile."""
+        worker = self._make_worker()
+        worker.set_output_size((200, 150))
+
+        lease = worker._retrieve_frame()
+
+        assert lease.array.shape == (150, 200, 3)
+        assert worker.get_capture_stats()["frames_scaled"] == 1
+
+    def test_night_mode_decodes_luma_only(self):
+        """Night mode decodes the grayscale plane and applies the gain."""
+        worker = self._make_worker()
+        worker.set_output_size((320, 240))
+        worker.set_night_mode(True)
+
+        lease = worker._retrieve_frame()
+
+        assert lease.array.shape == (240, 320)
+        assert abs(int(lease.array[10, 10]) - 144) <= 3
+
+    def test_only_mjpeg_enables_compressed_retrieve(self):
+        """YUYV captures keep the backend's own conversion."""
+        worker = self._make_worker()
+        worker._enable_reduced_decode(worker._cap, "YUYV")
+        assert not worker._compressed_decode
+
+    def test_decoded_buffers_disable_reduced_decode(self):
+        """A backend that ignores CONVERT_RGB=0 falls back permanently."""
+        import numpy as np
+
+        worker = self._make_worker()
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        worker._cap.retrieve.return_value = (True, frame)
+
+        lease = worker._retrieve_frame()
+
+        assert lease.array.shape == (480, 640, 3)
+        assert not worker._compressed_decode
+        worker._enable_reduced_decode(worker._cap, "MJPG")
+        assert not worker._compressed_decode
+
+    def test_pool_decode_keeps_off_capture_scratch(self):
+        """Pool jobs resize into their own buffer, not the capture thread's."""
+        worker = self._make_worker()
+        worker.set_output_size((200, 150))
+        worker.set_night_mode(True)
+        buf = worker._cap.retrieve.return_value[1]
+
+        pooled = worker._decode_compressed(buf, on_pool=True)
+        assert worker._scaled_frame is None
+        assert worker._decode_shape is None
+        inline = worker._retrieve_frame()
+
+        assert worker._scaled_frame is not None
+        assert worker._pool_scaled_frame is not worker._scaled_frame
+        assert pooled.array.shape == inline.array.shape == (150, 200)
+        assert (pooled.array == inline.array).all()
+
+    def test_shared_decode_publishes_from_pool(self, monkeypatch):
+        """With the shared pool the capture thread only fetches the buffer."""
+        from core import config
+        from core.decode_pool import DecodePool
+
+        monkeypatch.setattr(config, "SHARED_DECODE", True)
+        monkeypatch.setattr(config, "COUPLE_CAPTURE_TO_RENDER", False)
+        worker = self._make_worker()
+        worker.set_output_size((160, 120))
+        pool = DecodePool(1)
+        worker._shared_decode = pool
+        try:
+            worker._process_next_frame()
+
+            deadline = time.monotonic() + 2.0
+            while worker.get_decode_stats()["completed"] == 0:
+                assert time.monotonic() < deadline
+                time.sleep(0.005)
+        finally:
+            pool.shutdown()
+
+        lease = worker.mailbox.take()
+        assert lease.array.shape == (120, 160, 3)
+        lease.release()
+        stats = worker.get_decode_stats()
+        assert stats["completed"] == 1
+        assert stats["mailbox_pending"] == 0
+
+
+class TestGiCaptureBackend:
+    """Test selecting the PyGObject appsink backend per camera."""
+
+    def _fake_capture(self):
+        cap = MagicMock()
+        cap.isOpened.return_value = True
+        cap.read.return_value = (True, None)
+        cap.get.return_value = 0.0
+        cap.latency_ms.return_value = 12.5
+        return cap
+
+    def test_override_opens_gi_backend(self, save_restore_config):
+        """A camera overridden to gi is opened through GstCapture."""
+        from core import config
+        from core.camera import CaptureWorker
+
+        config.USE_GSTREAMER = True
+        config.CAPTURE_BACKEND = "opencv"
+        config.CAPTURE_BACKEND_OVERRIDES = {2: "gi"}
+        worker = CaptureWorker(stream_link=2, parent=None, capture_width=320, capture_height=240)
+        cap = self._fake_capture()
+        with patch("core.camera.platform.system", return_value="Linux"), patch(
+            "core.camera.gi_available", return_value=True
+        ), patch("core.camera.GstCapture", return_value=cap) as gst_capture, patch(
+            "core.camera.cv2.VideoCapture"
+        ) as video_capture:
+            worker._open_capture()
+
+        assert worker._cap is cap
+        assert not worker._using_gstreamer
+        assert not video_capture.called
+        pipeline = gst_capture.call_args[0][0]
+        assert "v4l2src device=/dev/video2" in pipeline
+        assert "appsink drop=1 max-buffers=1 sync=false name=sink" in pipeline
+        stats = worker.get_capture_stats()
+        assert stats["backend"] == "PyGObject"
+
+    def test_close_waits_on_pipeline_not_sleep(self, save_restore_config):
+        """Closing a gi capture releases it without the OpenCV drain delay."""
+        from core import config
+        from core.camera import CaptureWorker
+
+        config.CAPTURE_BACKEND = "gi"
+        worker = CaptureWorker(stream_link=0, parent=None)
+        cap = self._fake_capture()
+        with patch("core.camera.platform.system", return_value="Linux"), patch(
+            "core.camera.gi_available", return_value=True
+        ), patch("core.camera.GstCapture", return_value=cap):
+            worker._open_capture()
+        with patch("core.camera.time.sleep") as sleep:
+            worker._close_capture()
+
+        assert cap.release.called
+        assert not sleep.called
+        assert worker._cap is None
+
+    def test_missing_gi_falls_back_to_opencv(self, save_restore_config):
+        """Without PyGObject the configured gi camera uses the OpenCV path."""
+        from core import config
+        from core.camera import CaptureWorker
+
+        config.CAPTURE_BACKEND = "gi"
+        worker = CaptureWorker(stream_link=0, parent=None)
+        cap = self._fake_capture()
+        cap.grab.return_value = True
+        with patch("core.camera.platform.system", return_value="Linux"), patch(
+            "core.camera.gi_available", return_value=False
+        ), patch("core.camera.GstCapture") as gst_capture, patch(
+            "core.camera._check_gstreamer_available", return_value=False
+        ), patch("core.camera.cv2.VideoCapture", return_value=cap):
+            worker._open_capture()
+
+        assert not gst_capture.called
+        assert worker._cap is cap
+        assert worker.get_capture_stats()["backend"] == "V4L2"
+
+    def test_mapped_views_resized_without_copy(self):
+        """Read-only mapped frames feed the resize directly, never a scratch copy."""
+        import numpy as np
+        from core.camera import CaptureWorker
+
+        mapped = np.full((8, 8, 3), 7, dtype=np.uint8)
+        mapped.flags.writeable = False
+        worker = CaptureWorker(stream_link=0, parent=None)
+        cap = MagicMock()
+        cap.retrieve.return_value = (True, mapped)
+        worker._cap = cap
+        worker.set_output_size((4, 4))
+
+        worker._retrieve_frame().release()
+        lease = worker._retrieve_frame()
+
+        assert lease.array.shape == (4, 4, 3)
+        assert int(lease.array[0, 0, 0]) == 7
+        assert worker._scratch_frame is None
+        assert cap.retrieve.call_args.kwargs["image"] is None
+
+
+class TestNativeV4L2Backend:
+    """Test the worker on the native V4L2 mmap backend."""
+
+    def test_override_opens_mmap_capture_with_compressed_decode(self, save_restore_config):
+        """A v4l2 camera streams compressed frames and reports driver drops."""
+        import cv2
+        from core import config
+        from core.camera import CaptureWorker
+        from core.v4l2 import V4L2Capture, fourcc_code
+
+        config.REDUCED_DECODE = True
+        config.CAPTURE_BACKEND_OVERRIDES = {0: "v4l2"}
+        worker = CaptureWorker(stream_link=0, parent=None)
+        cap = MagicMock(spec=V4L2Capture)
+        cap.isOpened.return_value = True
+        cap.grab.return_value = True
+        cap.set.return_value = True
+        cap.get.side_effect = lambda prop: (
+            float(fourcc_code("MJPG")) if prop == cv2.CAP_PROP_FOURCC else 640.0
+        )
+        cap.stats.return_value = {"dropped": 3, "latency_ms": 4.0}
+        with patch("core.camera.platform.system", return_value="Linux"), patch(
+            "core.camera.V4L2Capture", return_value=cap
+        ), patch("core.camera.cv2.VideoCapture") as video_capture:
+            worker._open_capture()
+
+        assert worker._cap is cap
+        assert not video_capture.called
+        assert worker._compressed_decode
+        cap.set.assert_called_with(cv2.CAP_PROP_CONVERT_RGB, 0)
+        stats = worker.get_capture_stats()
+        assert stats["backend"] == "V4L2-mmap"
+        assert stats["driver_dropped"] == 3
+        assert stats["pipeline_latency_ms"] == 4.0
+
+    def test_failed_mmap_open_falls_back(self, save_restore_config):
+        """If the device can't stream MJPEG the OpenCV V4L2 path is used."""
+        from core import config
+        from core.camera import CaptureWorker
+
+        config.USE_GSTREAMER = False
+        config.CAPTURE_BACKEND = "v4l2"
+        worker = CaptureWorker(stream_link=0, parent=None)
+        native = MagicMock()
+        native.isOpened.return_value = False
+        opencv_cap = MagicMock()
+        opencv_cap.isOpened.return_value = True
+        opencv_cap.grab.return_value = True
+        opencv_cap.get.return_value = 0.0
+        with patch("core.camera.platform.system", return_value="Linux"), patch(
+            "core.camera.V4L2Capture", return_value=native
+        ), patch("core.camera.cv2.VideoCapture", return_value=opencv_cap):
+            worker._open_capture()
+
+        assert native.release.called
+        assert worker._cap is opencv_cap
+        assert worker.get_capture_stats()["backend"] == "V4L2"
+
+
+class TestCaptureEngineStreaming:
+    """Test a worker streaming through the shared capture engine."""
+
+    @pytest.fixture
+    def engine_config(self, save_restore_config):
+        from core import config
+        from core.capture_engine import shutdown_capture_engine
+
+        config.CAPTURE_ENGINE = True
+        config.SHARED_DECODE = False
+        config.COUPLE_CAPTURE_TO_RENDER = False
+        yield
+        shutdown_capture_engine()
+
+    def _pipe_device(self):
+        """A fake V4L2 device whose descriptor is a real pipe."""
+        import os
+        from core import v4l2
+        from tests.test_v4l2 import FakeDevice
+
+        class PipeDevice(FakeDevice):
+            def __init__(self):
+                super().__init__()
+                self.r, self.w = os.pipe()
+                os.set_blocking(self.r, False)
+                self.fail = False
+
+            def open(self, path):
+                return self.r
+
+            def close(self, fd):
+                super().close(fd)
+                os.close(self.r)
+                os.close(self.w)
+
+            def push(self, payload, sequence):
+                self.frames.append((payload, sequence, 0))
+                os.write(self.w, b"\0")
+
+            def ioctl(self, fd, request, arg):
+                if request == v4l2.VIDIOC_DQBUF:
+                    if self.fail:
+                        raise OSError(5, "Input/output error")
+                    if self.frames:
+                        os.read(self.r, 1)
+                super().ioctl(fd, request, arg)
+
+        return PipeDevice()
+
+    def _jpeg(self):
+        import cv2
+        import numpy as np
+
+        return cv2.imencode(".jpg", np.zeros((8, 16, 3), dtype=np.uint8))[1].tobytes()
+
+    def _wait_for(self, predicate, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.005)
+        return False
+
+    def _start(self, device):
+        import threading
+        from core.camera import CaptureWorker
+        from core.v4l2 import V4L2Capture
+
+        worker = CaptureWorker(stream_link=0, parent=None, target_fps=1000.0)
+        worker._cap = V4L2Capture(0, 16, 8, io=device)
+        worker._configure_fps_from_camera()
+        assert worker._uses_capture_engine()
+        thread = threading.Thread(target=worker._stream_on_engine)
+        thread.start()
+        return worker, thread
+
+    def test_frames_published_on_driver_readiness(self, engine_config):
+        """Each ready buffer is dequeued and published by the engine thread."""
+        from core.capture_engine import get_capture_engine
+
+        device = self._pipe_device()
+        worker, thread = self._start(device)
+        for count, sequence in enumerate((0, 1, 3), start=1):
+            device.push(self._jpeg(), sequence)
+            assert self._wait_for(lambda: worker._frames_grabbed == count)
+
+        lease = worker.mailbox.take()
+        assert lease.array.shape == (8, 16, 3)
+        lease.release()
+        assert worker.get_capture_stats()["driver_dropped"] == 1
+
+        worker._running = False
+        worker._engine_wake.set()
+        thread.join(timeout=2.0)
+        assert not thread.is_alive()
+        assert get_capture_engine().stats()["registered"] == 0
+        worker._close_capture()
+
+    def test_device_error_hands_back_for_reconnect(self, engine_config):
+        """A failing dequeue closes the capture from the camera's own thread."""
+        device = self._pipe_device()
+        worker, thread = self._start(device)
+
+        device.fail = True
+        device.push(self._jpeg(), 0)
+        thread.join(timeout=2.0)
+
+        assert not thread.is_alive()
+        assert worker._cap is None
+        assert device.closed
+
+    def test_capture_kept_open_while_engine_handler_runs(self, engine_config):
+        """A capture the engine may still be reading is not closed under it."""
+        from core import camera
+
+        device = self._pipe_device()
+        with patch.object(camera.get_capture_engine(), "unregister", return_value=False):
+            worker, thread = self._start(device)
+            worker._engine_failed = True
+            worker._engine_wake.set()
+            thread.join(timeout=2.0)
+
+        assert not thread.is_alive()
+        assert worker._cap is not None
+        assert not device.closed
+        worker._close_capture()
+
+
+class TestGstMosaicWorker:
+    """Test the compositor mosaic capture worker."""
+
+    def test_pipeline_covers_all_cameras(self):
+        """The worker's pipeline has one v4l2src branch per camera."""
+        from core.gst_mosaic import GstMosaicWorker
+
+        worker = GstMosaicWorker(
+            [0, 2, 4], (2, 2), (320, 240), target_fps=15,
+            capture_width=640, capture_height=480,
+        )
+
+        pipeline = worker.mosaic_pipeline()
+
+        for index in (0, 2, 4):
+            assert f"v4l2src device=/dev/video{index}" in pipeline
+        assert "video/x-raw,width=640,height=480,framerate=15/1" in pipeline
+        assert "video/x-raw,format=BGR ! appsink" in pipeline
+
+    def test_open_without_gstreamer_leaves_capture_closed(self):
+        """Without GStreamer support the worker stays offline and retries."""
+        from core.gst_mosaic import GstMosaicWorker
+
+        worker = GstMosaicWorker([0], (1, 2), (320, 240))
+        with patch("core.gst_mosaic.mosaic_supported", return_value=False):
+            worker._open_capture()
+
+        assert worker._cap is None
+
+    def test_open_uses_gstreamer_backend(self):
+        """A working pipeline becomes the worker's capture."""
+        import cv2
+        from core.gst_mosaic import GstMosaicWorker
+
+        worker = GstMosaicWorker([0, 1], (1, 3), (320, 240), target_fps=10)
+        cap = MagicMock()
+        cap.isOpened.return_value = True
+        cap.read.return_value = (True, None)
+        cap.get.return_value = 10.0
+        with patch("core.gst_mosaic.mosaic_supported", return_value=True), patch(
+            "core.gst_mosaic.cv2.VideoCapture", return_value=cap
+        ) as video_capture:
+            worker._open_capture()
+
+        assert worker._cap is cap
+        assert video_capture.call_args[0][1] == cv2.CAP_GSTREAMER
+        assert worker.get_fourcc() == "mosaic"
+
+    def test_videotest_sources_replace_cameras(self):
+        """videotestsrc stand-ins can replace the camera branches."""
+        from core.gst_mosaic import GstMosaicWorker
+        from core.gst_pipeline import videotest_source
+
+        worker = GstMosaicWorker(
+            [0, 1], (1, 3), (320, 240),
+            sources=[videotest_source(640, 480) for _ in range(2)],
+        )
+
+        pipeline = worker.mosaic_pipeline()
+        assert pipeline.count("videotestsrc") == 2
+        assert "v4l2src" not in pipeline
@@ -0,0 +1,289 @@
+"""
+Tests for core/capture_daemon.py - the persistent capture daemon.
+
+The daemon runs in a thread of the test process on a private socket, and
+its cameras are stand-in workers producing flat frames.
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+import pytest
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from core import capture_daemon, config
+from core.capture_daemon import CaptureDaemon, DaemonCaptureWorker, request_daemon
+from core.frame_pool import FrameMailbox, FramePool
+
+
+class _FakeCamera(QThread):
+    """Stand-in CaptureWorker: frames whose pixels are the night-mode flag."""
+
+    frame_ready = pyqtSignal()
+    status_changed = pyqtSignal(bool)
+    instances = []
+
+    def __init__(
+        self, stream_link, target_fps=None, capture_width=None, capture_height=None, settings=None
+    ):
+        super().__init__()
+        self.stream_link = stream_link
+        self.target_fps = target_fps
+        self.settings = settings
+        self.live_fps = target_fps
+        self.mailbox = FrameMailbox()
+        self._pool = FramePool(3)
+        self._night = False
+        self._running = True
+        self.stopped = False
+        _FakeCamera.instances.append(self)
+
+    def run(self):
+        self.status_changed.emit(True)
+        while self._running:
+            lease = self._pool.lease((48, 64))
+            lease.array[:] = 200 if self._night else 10
+            if self.mailbox.publish(lease):
+                self.frame_ready.emit()
+            time.sleep(0.02)
+
+    def set_night_mode(self, enabled):
+        self._night = bool(enabled)
+
+    def set_output_size(self, size):
+        pass
+
+    def set_target_fps(self, fps):
+        self.live_fps = fps
+
+    def set_consumer_fps(self, fps):
+        pass
+
+    def get_capture_stats(self):
+        return {"grabbed": 1}
+
+    def get_decode_stats(self):
+        return {}
+
+    def get_fourcc(self):
+        return "MJPG"
+
+    def stop(self):
+        self._running = False
+        self.wait(2000)
+        self.mailbox.clear()
+        self.stopped = True
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def _take_value(worker):
+    lease = worker.mailbox.take()
+    if lease is None:
+        return None
+    try:
+        return int(lease.array[0, 0])
+    finally:
+        lease.release()
+
+
+@pytest.fixture
+def daemon(qapp, monkeypatch):
+    """A daemon serving stand-in cameras on a private socket."""
+    monkeypatch.setattr(capture_daemon, "CaptureWorker", _FakeCamera)
+    monkeypatch.setattr(_FakeCamera, "instances", [])
+    socket_dir = tempfile.mkdtemp(prefix="dash-")
+    path = os.path.join(socket_dir, "daemon.sock")
+    monkeypatch.setattr(config, "CAPTURE_DAEMON_SOCKET", path)
+    server = CaptureDaemon(path, idle_timeout=0.5)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    assert _wait_for(lambda: os.path.exists(path))
+    yield server
+    server.shutdown()
+    thread.join(5.0)
+    os.rmdir(socket_dir)
+
+
+@pytest.fixture
+def make_worker(daemon):
+    """Factory for daemon-backed workers stopped after the test."""
+    workers = []
+
+    def make(stream_link=0):
+        worker = DaemonCaptureWorker(stream_link, capture_width=64, capture_height=48)
+        workers.append(worker)
+        return worker
+
+    yield make
+    for worker in workers:
+        worker.stop()
+
+
+class TestCaptureDaemon:
+    """Test daemon requests, subscriptions and camera lifetime."""
+
+    def test_cameras_and_probe(self, daemon, monkeypatch):
+        """Discovery runs once; probes test only what is not streaming."""
+        calls = []
+
+        def find():
+            calls.append(1)
+            return [0, 2]
+
+        monkeypatch.setattr(capture_daemon, "find_working_cameras", find)
+        monkeypatch.setattr(
+            capture_daemon,
+            "test_single_camera",
+            lambda idx, **kwargs: idx if idx == 3 else None,
+        )
+
+        assert request_daemon("cameras") == [0, 2]
+        assert request_daemon("cameras") == [0, 2]
+        assert len(calls) == 1
+        assert request_daemon("probe", [3, 4]) == [(3, 3), (4, None)]
+        assert request_daemon("cameras") == [0, 2, 3]
+
+    def test_frames_and_controls_reach_worker(self, make_worker):
+        """Frames arrive through the daemon's ring; controls reach its camera."""
+        worker = make_worker()
+        worker.start()
+
+        assert _wait_for(lambda: _take_value(worker) == 10)
+        assert _wait_for(lambda: worker.get_fourcc() == "MJPG")
+        worker.set_night_mode(True)
+
+        assert _wait_for(lambda: _take_value(worker) == 200)
+        assert worker.get_capture_stats()["process_pid"] == os.getpid()
+
+    def test_restarted_worker_reuses_running_camera(self, make_worker):
+        """A new worker attaches to the streaming camera without reopening it."""
+        first = make_worker()
+        first.start()
+        assert _wait_for(lambda: _take_value(first) == 10)
+        first.stop()
+
+        second = make_worker()
+        second.start()
+
+        assert _wait_for(lambda: _take_value(second) == 10)
+        assert len(_FakeCamera.instances) == 1
+        assert not _FakeCamera.instances[0].stopped
+
+    def test_changed_settings_reopen_camera(self, make_worker, monkeypatch):
+        """A UI with different capture settings gets a freshly opened camera."""
+        first = make_worker()
+        first.start()
+        assert _wait_for(lambda: _take_value(first) == 10)
+        first.stop()
+
+        monkeypatch.setattr(config, "REDUCED_DECODE", not config.REDUCED_DECODE)
+        second = make_worker()
+        second.start()
+
+        assert _wait_for(lambda: _take_value(second) == 10)
+        assert len(_FakeCamera.instances) == 2
+        assert _FakeCamera.instances[0].stopped
+
+    def test_ui_only_settings_keep_running_camera(self, make_worker, monkeypatch):
+        """Settings the capture side never reads do not re-open the camera."""
+        first = make_worker()
+        first.start()
+        assert _wait_for(lambda: _take_value(first) == 10)
+        first.stop()
+
+        monkeypatch.setattr(config, "LOG_LEVEL", "DEBUG")
+        monkeypatch.setattr(config, "CPU_LOAD_THRESHOLD", 0.5)
+        monkeypatch.setattr(config, "MIN_DYNAMIC_UI_FPS", config.MIN_DYNAMIC_UI_FPS + 1)
+        second = make_worker()
+        second.start()
+
+        assert _wait_for(lambda: _take_value(second) == 10)
+        assert len(_FakeCamera.instances) == 1
+        assert "LOG_LEVEL" not in _FakeCamera.instances[0].settings
+
+    def test_resubscribe_after_dynamic_fps_keeps_camera(self, daemon):
+        """A lowered live rate is replayed as a control, not used to re-open."""
+        worker = DaemonCaptureWorker(0, target_fps=20.0, capture_width=64, capture_height=48)
+        try:
+            worker.start()
+            assert _wait_for(lambda: _take_value(worker) == 10)
+            worker.set_target_fps(8.0)
+            assert _wait_for(lambda: _FakeCamera.instances[0].live_fps == 8.0)
+
+            worker._reap()
+            assert worker._spawn()
+
+            assert len(_FakeCamera.instances) == 1
+            camera = daemon._streams[0]
+            assert camera.target_fps == 20.0
+            assert _FakeCamera.instances[0].live_fps == 8.0
+        finally:
+            worker.stop()
+
+    def test_unused_camera_is_closed(self, daemon, make_worker):
+        """A camera nobody attaches to is closed after the idle timeout."""
+        worker = make_worker()
+        worker.start()
+        assert _wait_for(lambda: _take_value(worker) == 10)
+
+        worker.stop()
+
+        assert _wait_for(lambda: _FakeCamera.instances[0].stopped, timeout=5.0)
+        assert not daemon._streams
+
+    def test_changed_target_fps_reopens_camera(self, daemon, make_worker):
+        """A subscriber asking for another capture rate gets a camera opened at it."""
+        first = make_worker()
+        first.start()
+        assert _wait_for(lambda: _take_value(first) == 10)
+        first.stop()
+
+        second = DaemonCaptureWorker(0, target_fps=12.0, capture_width=64, capture_height=48)
+        try:
+            second.start()
+            assert _wait_for(lambda: _take_value(second) == 10)
+            assert len(_FakeCamera.instances) == 2
+            assert _FakeCamera.instances[1].target_fps == 12.0
+        finally:
+            second.stop()
+
+    def test_settings_stay_per_camera(self, daemon):
+        """A subscriber's settings reach its camera's worker, not the daemon config."""
+        before = config.USE_GSTREAMER
+        conn = capture_daemon.connect_daemon()
+        try:
+            conn.send(("subscribe", {"stream_link": 1, "settings": {"USE_GSTREAMER": "other"}}))
+            assert conn.poll(5.0)
+            conn.recv()
+
+            assert config.USE_GSTREAMER == before
+            assert _FakeCamera.instances[0].settings == {"USE_GSTREAMER": "other"}
+        finally:
+            conn.close()
+
+    def test_vanished_ring_is_recreated(self, daemon, make_worker):
+        """A ring unlinked behind the daemon's back is rebuilt for the next subscriber."""
+        first = make_worker()
+        first.start()
+        assert _wait_for(lambda: _take_value(first) == 10)
+        first.stop()
+        camera = daemon._streams[0]
+        old_name = camera.ring.name
+        camera.ring._shm.unlink()
+
+        second = make_worker()
+        second.start()
+
+        assert _wait_for(lambda: _take_value(second) == 10)
+        assert camera.ring.name != old_name
+        assert len(_FakeCamera.instances) == 1
@@ -0,0 +1,192 @@
+"""
+Tests for core/capture_engine.py - selector-driven capture dispatch.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from core.capture_engine import CaptureEngine
+
+
+def _wait_for(predicate, timeout=2.0):
+    """Poll ``predicate`` until it is true or ``timeout`` expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+@pytest.fixture
+def engine():
+    """A one-thread engine shut down after the test."""
+    capture_engine = CaptureEngine(1)
+    yield capture_engine
+    capture_engine.shutdown()
+
+
+@pytest.fixture
+def pipes():
+    """Factory for non-blocking pipes standing in for camera descriptors."""
+    opened = []
+
+    def make():
+        r, w = os.pipe()
+        os.set_blocking(r, False)
+        opened.extend([r, w])
+        return r, w
+
+    yield make
+    for fd in opened:
+        os.close(fd)
+
+
+def _reader(fd, seen, keep=True):
+    """Handler draining one byte from ``fd`` per dispatch."""
+
+    def handler():
+        seen.append(os.read(fd, 1))
+        return keep
+
+    return handler
+
+
+class TestCaptureEngine:
+    """Test readiness dispatch and registration."""
+
+    def test_handler_runs_only_when_readable(self, engine, pipes):
+        """Handlers are dispatched per ready byte, never while idle."""
+        r, w = pipes()
+        seen = []
+        engine.register(r, _reader(r, seen))
+
+        time.sleep(0.05)
+        assert seen == []
+        os.write(w, b"a")
+        assert _wait_for(lambda: seen == [b"a"])
+        os.write(w, b"b")
+        assert _wait_for(lambda: seen == [b"a", b"b"])
+
+    def test_false_return_unregisters(self, engine, pipes):
+        """A handler returning False is not called again."""
+        r, w = pipes()
+        seen = []
+        engine.register(r, _reader(r, seen, keep=False))
+
+        os.write(w, b"a")
+        assert _wait_for(lambda: engine.stats()["registered"] == 0)
+        os.write(w, b"b")
+        time.sleep(0.05)
+        assert seen == [b"a"]
+
+    def test_unregister_is_synchronous(self, engine, pipes):
+        """After unregister() returns the handler no longer runs."""
+        r, w = pipes()
+        seen = []
+        engine.register(r, _reader(r, seen))
+        os.write(w, b"a")
+        assert _wait_for(lambda: len(seen) == 1)
+
+        engine.unregister(r)
+        os.write(w, b"b")
+        time.sleep(0.05)
+
+        assert seen == [b"a"]
+        assert engine.stats()["registered"] == 0
+
+    def test_unregister_waits_for_slow_handler(self, engine, pipes):
+        """unregister() outlasts a long handler instead of timing out."""
+        r, w = pipes()
+        entered = threading.Event()
+        gate = threading.Event()
+
+        def slow():
+            entered.set()
+            gate.wait(5.0)
+            os.read(r, 1)
+            return True
+
+        engine.register(r, slow)
+        os.write(w, b"a")
+        assert entered.wait(1.0)
+        result = []
+        waiter = threading.Thread(target=lambda: result.append(engine.unregister(r)))
+        waiter.start()
+
+        waiter.join(1.2)
+        assert waiter.is_alive()
+        gate.set()
+        waiter.join(2.0)
+        assert result == [True]
+
+    def test_shutdown_releases_unregister_in_handler(self, pipes, monkeypatch):
+        """A shutdown with the handler still running reports it as unsafe."""
+        from core.capture_engine import _SelectorLoop
+
+        monkeypatch.setattr(_SelectorLoop, "SHUTDOWN_JOIN_SEC", 0.05)
+        engine = CaptureEngine(1)
+        r, w = pipes()
+        entered = threading.Event()
+        gate = threading.Event()
+
+        def stuck():
+            entered.set()
+            gate.wait(5.0)
+            return False
+
+        engine.register(r, stuck)
+        os.write(w, b"a")
+        assert entered.wait(1.0)
+        result = []
+        waiter = threading.Thread(target=lambda: result.append(engine.unregister(r)))
+        waiter.start()
+        time.sleep(0.05)
+        try:
+            engine.shutdown(wait=False)
+            waiter.join(2.0)
+            assert result == [False]
+        finally:
+            gate.set()
+            engine.shutdown()
+
+    def test_ready_cameras_share_wakeups(self, engine, pipes):
+        """Descriptors ready together are served by one select() return."""
+        fds = [pipes() for _ in range(3)]
+        seen = []
+        gate = threading.Event()
+
+        def first():
+            # Hold the loop until every pipe is readable.
+            gate.wait(1.0)
+            seen.append(os.read(fds[0][0], 1))
+            return True
+
+        engine.register(fds[0][0], first)
+        for r, _ in fds[1:]:
+            engine.register(r, _reader(r, seen))
+        time.sleep(0.05)
+        before = engine.stats()
+        for _, w in fds:
+            os.write(w, b"x")
+        gate.set()
+        assert _wait_for(lambda: len(seen) == 3)
+
+        stats = engine.stats()
+        assert stats["registered"] == 3
+        assert stats["dispatches"] - before["dispatches"] == 3
+        assert stats["wakeups"] - before["wakeups"] < 3
+
+    def test_descriptors_spread_across_threads(self, pipes):
+        """With two threads, registrations go to the least loaded one."""
+        engine = CaptureEngine(2)
+        try:
+            for _ in range(4):
+                r, _ = pipes()
+                engine.register(r, lambda: True)
+            assert [loop.count for loop in engine._loops] == [2, 2]
+        finally:
+            engine.shutdown()
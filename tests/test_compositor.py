@@ -0,0 +1,129 @@
+"""
+Tests for ui/compositor.py - single-pass grid painting of tile frames.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from core.frame_pool import FramePool
+
+
+@pytest.fixture
+def grid(qapp):
+    """A compositor with two frame tiles side by side."""
+    from PyQt6 import QtWidgets
+    from ui.compositor import GridCompositor
+    from ui.widgets import CameraWidget
+
+    compositor = GridCompositor()
+    layout = QtWidgets.QGridLayout(compositor)
+    tiles = []
+    for col in range(2):
+        tile = CameraWidget(1, 1, stream_link=None, parent=compositor, enable_capture=False)
+        tile.grid_position = (0, col)
+        layout.addWidget(tile, 0, col)
+        tiles.append(tile)
+    compositor.resize(400, 200)
+    compositor.show()
+    qapp.processEvents()
+    yield compositor, tiles
+    for tile in tiles:
+        tile._release_current_frame()
+        tile.cleanup()
+    compositor.close()
+
+
+def _show_frame(tile, pool, color):
+    size = tile.video_rect().size()
+    lease = pool.lease((size.height(), size.width(), 3))
+    lease.array[...] = color
+    tile.on_frame(lease)
+    tile._render_latest_frame()
+    return lease
+
+
+def _pixel(compositor, tile):
+    center = tile.video_rect().center()
+    return compositor.grab().toImage().pixelColor(center).getRgb()[:3]
+
+
+class TestGridCompositor:
+    """Test tiles rendered through the grid compositor."""
+
+    @pytest.mark.requires_display
+    def test_frames_painted_by_compositor(self, grid):
+        """Tile frames are drawn by the container, not uploaded to labels."""
+        compositor, tiles = grid
+        pool = FramePool(4)
+
+        _show_frame(tiles[0], pool, (0, 0, 255))
+        _show_frame(tiles[1], pool, (0, 255, 0))
+
+        assert tiles[0].video_label.isHidden()
+        assert tiles[0]._pixmap_cache.isNull()
+        assert _pixel(compositor, tiles[0]) == (255, 0, 0)
+        assert _pixel(compositor, tiles[1]) == (0, 255, 0)
+        assert compositor.stats()["tiles_painted"] >= 2
+
+    @pytest.mark.requires_display
+    def test_new_frame_repaints_only_its_tile(self, grid):
+        """A new frame schedules an update of that tile's rect alone."""
+        compositor, tiles = grid
+        pool = FramePool(4)
+
+        with patch.object(compositor, "update") as update:
+            _show_frame(tiles[1], pool, (10, 10, 10))
+
+        update.assert_called_once_with(tiles[1].video_rect())
+
+    @pytest.mark.requires_display
+    def test_displayed_buffer_stays_leased(self, grid):
+        """The buffer behind the painted image is held until replaced."""
+        compositor, tiles = grid
+        pool = FramePool(4)
+        first = _show_frame(tiles[0], pool, (1, 1, 1))
+
+        tiles[0].on_frame(pool.lease(first.array.shape))
+        assert not first.released
+
+        tiles[0]._render_latest_frame()
+        assert first.released
+
+        tiles[0]._release_current_frame()
+        tiles[0]._render_placeholder("DISCONNECTED")
+        assert tiles[0].frame_image is None
+        assert not tiles[0].video_label.isHidden()
+        assert pool.stats()["outstanding"] == 0
+
+    @pytest.mark.requires_display
+    def test_swapped_tiles_paint_at_new_positions(self, grid, qapp):
+        """After a swap each tile's frame follows it to its new cell."""
+        compositor, tiles = grid
+        pool = FramePool(4)
+        _show_frame(tiles[0], pool, (0, 0, 255))
+        _show_frame(tiles[1], pool, (0, 255, 0))
+
+        tiles[0].do_swap(tiles[0], tiles[1], compositor)
+        qapp.processEvents()
+        for tile in tiles:
+            tile._render_latest_frame()
+
+        assert tiles[0].grid_position == (0, 1)
+        left = compositor.grab().toImage().pixelColor(100, 100).getRgb()[:3]
+        assert left == (0, 255, 0)
+
+    @pytest.mark.requires_display
+    def test_fullscreen_uses_overlay(self, grid):
+        """A fullscreen tile renders to its overlay; the grid image is kept."""
+        compositor, tiles = grid
+        pool = FramePool(4)
+        _show_frame(tiles[0], pool, (0, 0, 255))
+        grid_image = tiles[0].frame_image
+
+        tiles[0].go_fullscreen()
+        tiles[0]._render_latest_frame()
+
+        assert not tiles[0]._pixmap_cache.isNull()
+        assert tiles[0].frame_image is grid_image
+        tiles[0].exit_fullscreen()
@@ -68,6 +68,13 @@ class TestConfigHelpers:
         assert config._as_float("not_a_number", 3.14) == pytest.approx(3.14)
         assert config._as_float("", 2.5) == pytest.approx(2.5)
 
+    def test_as_choice(self):
+        """Test _as_choice accepts known keywords case-insensitively."""
+        choices = ("bgr", "rgb32")
+        assert config._as_choice(" RGB32 ", "bgr", choices) == "rgb32"
+        assert config._as_choice("yuv", "bgr", choices) == "bgr"
+        assert config._as_choice(None, "bgr", choices) == "bgr"
+
 
 class TestLoadConfig:
     """Test config file loading."""
@@ -131,6 +138,99 @@ cpu_load_threshold = 5.0
         # cpu_load_threshold should be clamped to max 1.0
         assert config.CPU_LOAD_THRESHOLD <= 1.0
 
+    def test_capture_backend_overrides(self, tmp_path, save_restore_config):
+        """Test per-camera capture backends override the [camera] default."""
+        config_file = tmp_path / "test.ini"
+        config_file.write_text("""
+[camera]
+capture_backend = opencv
+
+[capture_backends]
+0 = gi
+video2 = GI
+4 = ffmpeg
+""")
+        parser = config.load_config(str(config_file))
+        config.apply_config(parser)
+
+        assert config.CAPTURE_BACKEND_OVERRIDES == {0: "gi", 2: "gi"}
+        assert config.capture_backend_for(0) == "gi"
+        assert config.capture_backend_for(2) == "gi"
+        assert config.capture_backend_for(4) == "opencv"
+        assert config.capture_backend_for("mosaic") == "opencv"
+
+    def test_daemon_section(self, tmp_path, save_restore_config):
+        """Test capture_mode = daemon and the [daemon] settings."""
+        config_file = tmp_path / "test.ini"
+        config_file.write_text("""
+[camera]
+capture_mode = Daemon
+
+[daemon]
+socket_path = /run/user/1000/cams.sock
+idle_timeout_sec = 0
+""")
+        parser = config.load_config(str(config_file))
+        config.apply_config(parser)
+
+        assert config.CAPTURE_MODE == "daemon"
+        assert config.CAPTURE_DAEMON_SOCKET == "/run/user/1000/cams.sock"
+        assert config.CAPTURE_DAEMON_IDLE_SEC == 1.0
+
+    def test_controls_profiles(self, tmp_path, save_restore_config):
+        """Test the [controls] profile and per-camera [controls.videoN] overrides."""
+        config_file = tmp_path / "test.ini"
+        config_file.write_text("""
+[controls]
+exposure_auto_priority = off
+exposure_mode =
+power_line_frequency = 50
+gain = loud
+exposure_limit_ratio = 2
+
+[controls.video2]
+exposure_mode = Manual
+exposure_time_ms = 20
+""")
+        parser = config.load_config(str(config_file))
+        config.apply_config(parser)
+
+        assert config.CAMERA_CONTROLS == {
+            "exposure_auto_priority": False,
+            "power_line_frequency": "50",
+        }
+        assert config.EXPOSURE_LIMIT_RATIO == 1.0
+        assert config.controls_for(2) == {
+            "exposure_auto_priority": False,
+            "power_line_frequency": "50",
+            "exposure_mode": "manual",
+            "exposure_time_ms": 20.0,
+        }
+        assert config.controls_for(0) == config.CAMERA_CONTROLS
+
+    def test_ui_render_mode(self, tmp_path, save_restore_config):
+        """Test [ui] render_mode accepts known modes only."""
+        config_file = tmp_path / "test.ini"
+        config_file.write_text("[ui]\nrender_mode = Compositor\n")
+        config.apply_config(config.load_config(str(config_file)))
+        assert config.RENDER_MODE == "compositor"
+
+        config_file.write_text("[ui]\nrender_mode = opengl\n")
+        config.apply_config(config.load_config(str(config_file)))
+        assert config.RENDER_MODE == "compositor"
+
+        config_file.write_text("[ui]\nrender_mode = mosaic\n")
+        config.apply_config(config.load_config(str(config_file)))
+        assert config.RENDER_MODE == "mosaic"
+
+    def test_ui_hidden_tiles(self, tmp_path, save_restore_config):
+        """Test [ui] suspend_hidden and the clamped hidden capture rate."""
+        config_file = tmp_path / "test.ini"
+        config_file.write_text("[ui]\nsuspend_hidden = no\nhidden_capture_fps = 99\n")
+        config.apply_config(config.load_config(str(config_file)))
+        assert config.SUSPEND_HIDDEN_TILES is False
+        assert config.HIDDEN_CAPTURE_FPS == 30.0
+
 
 class TestChooseProfile:
     """Test profile selection based on camera count."""
@@ -0,0 +1,150 @@
+"""
+Tests for core/controls.py - V4L2 control profiles and exposure-limit detection.
+"""
+
+import logging
+
+import pytest
+
+from core import v4l2
+from core.controls import CameraControls
+from tests.test_v4l2 import FakeDevice
+
+
+def _uvc_camera():
+    """A fake UVC camera with the usual control set and ranges."""
+    fake = FakeDevice()
+    fake.controls = {
+        # UVC offers manual (1) and aperture priority (3) only.
+        v4l2.V4L2_CID_EXPOSURE_AUTO: [3, 1, 3],
+        v4l2.V4L2_CID_EXPOSURE_AUTO_PRIORITY: [1, 0, 1],
+        v4l2.V4L2_CID_EXPOSURE_ABSOLUTE: [156, 3, 2047],
+        v4l2.V4L2_CID_AUTOGAIN: [1, 0, 1],
+        v4l2.V4L2_CID_GAIN: [0, 0, 100],
+        v4l2.V4L2_CID_POWER_LINE_FREQUENCY: [2, 0, 2],
+    }
+    return fake
+
+
+def _feed(controls, fps, negotiated, seconds, start=100.0, frames=0):
+    """Report a camera delivering ``fps`` for ``seconds``; return the frame count."""
+    step = 0.5
+    now = start
+    while now <= start + seconds:
+        controls.update(frames, negotiated, now)
+        frames += int(fps * step)
+        now += step
+    return frames
+
+
+class TestControlProfile:
+    """Test applying control profiles."""
+
+    def test_profile_is_applied_and_clamped(self):
+        """Profile values reach the camera, gain clamped and auto gain off."""
+        fake = _uvc_camera()
+        controls = CameraControls.open(0, io=fake)
+
+        changes = controls.apply(
+            {"exposure_auto_priority": False, "gain": 250, "power_line_frequency": "50"},
+            fps=30.0,
+        )
+
+        assert fake.controls[v4l2.V4L2_CID_EXPOSURE_AUTO_PRIORITY][0] == 0
+        assert fake.controls[v4l2.V4L2_CID_AUTOGAIN][0] == 0
+        assert fake.controls[v4l2.V4L2_CID_GAIN][0] == 100
+        assert fake.controls[v4l2.V4L2_CID_POWER_LINE_FREQUENCY][0] == 1
+        assert changes["exposure_auto_priority"] == (1, 0)
+        assert changes["gain"] == (0, 100)
+
+    def test_manual_exposure_capped_at_frame_period(self):
+        """A manual exposure longer than a frame is shortened to fit."""
+        fake = _uvc_camera()
+        controls = CameraControls.open(0, io=fake)
+
+        controls.apply({"exposure_mode": "manual", "exposure_time_ms": 50.0}, fps=30.0)
+
+        assert fake.controls[v4l2.V4L2_CID_EXPOSURE_AUTO][0] == v4l2.V4L2_EXPOSURE_MANUAL
+        assert fake.controls[v4l2.V4L2_CID_EXPOSURE_ABSOLUTE][0] == 333
+
+        controls.apply({"exposure_mode": "auto"}, fps=30.0)
+        assert (
+            fake.controls[v4l2.V4L2_CID_EXPOSURE_AUTO][0]
+            == v4l2.V4L2_EXPOSURE_APERTURE_PRIORITY
+        )
+
+    def test_missing_controls_are_skipped(self):
+        """Controls the camera lacks are left out without failing."""
+        fake = FakeDevice()
+        fake.controls = {v4l2.V4L2_CID_GAIN: [10, 0, 255]}
+        controls = CameraControls.open(0, io=fake)
+
+        changes = controls.apply(
+            {"exposure_auto_priority": False, "power_line_frequency": "60", "gain": 20},
+            fps=30.0,
+        )
+
+        assert changes == {"gain": (10, 20)}
+        assert controls.read() == {"gain": 20}
+
+
+class TestExposureLimit:
+    """Test delivered versus negotiated frame rate checks."""
+
+    def test_exposure_limited_episode_logged_once(self, caplog):
+        """A camera halved by exposure priority is flagged, then recovers."""
+        controls = CameraControls.open(0, io=_uvc_camera())
+
+        with caplog.at_level(logging.INFO):
+            frames = _feed(controls, fps=15, negotiated=30.0, seconds=30)
+
+        assert controls.exposure_limited
+        assert controls.delivered_fps == pytest.approx(15.0, rel=0.1)
+        warnings = [r for r in caplog.records if "exposure-limited" in r.getMessage()]
+        assert len(warnings) == 1
+        assert "exposure_auto_priority is on (exposure 15.6 ms)" in warnings[0].getMessage()
+
+        _feed(controls, fps=30, negotiated=30.0, seconds=10, start=131.0, frames=frames)
+        assert not controls.exposure_limited
+
+    def test_slow_camera_without_exposure_cause(self):
+        """A slow camera with exposure priority off is not exposure-limited."""
+        fake = _uvc_camera()
+        controls = CameraControls.open(0, io=fake)
+        controls.apply({"exposure_auto_priority": False}, fps=30.0)
+
+        _feed(controls, fps=10, negotiated=30.0, seconds=20)
+
+        assert not controls.exposure_limited
+        assert controls.delivered_fps == pytest.approx(10.0, rel=0.1)
+
+    def test_worker_applies_profile_and_reports(self, monkeypatch):
+        """CaptureWorker applies the camera's profile on open and reports the watch."""
+        from unittest.mock import MagicMock
+
+        from core import camera, config
+        from core.camera import CaptureWorker
+
+        fake = _uvc_camera()
+        real_open = CameraControls.open
+        monkeypatch.setattr(
+            camera.CameraControls,
+            "open",
+            lambda stream_link, ratio: real_open(stream_link, ratio, io=fake),
+        )
+        monkeypatch.setattr(config, "CAMERA_CONTROLS", {"exposure_auto_priority": False})
+        monkeypatch.setattr(config, "CAMERA_CONTROL_OVERRIDES", {2: {"gain": 40}})
+        worker = CaptureWorker(stream_link=2, parent=None)
+        worker._cap = MagicMock()
+        worker._cap.get.return_value = 30.0
+
+        worker._open_controls()
+
+        assert fake.controls[v4l2.V4L2_CID_EXPOSURE_AUTO_PRIORITY][0] == 0
+        assert fake.controls[v4l2.V4L2_CID_GAIN][0] == 40
+        stats = worker.get_capture_stats()
+        assert stats["exposure_limited"] is False
+
+        worker._close_capture()
+        assert fake.closed
+        assert worker._controls is None
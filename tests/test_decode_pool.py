@@ -0,0 +1,118 @@
+"""
+Tests for core/decode_pool.py - Shared latest-wins decode pool.
+"""
+
+import threading
+import time
+
+import pytest
+
+from core.decode_pool import DecodePool
+
+
+def _wait_for(predicate, timeout=2.0):
+    """Poll ``predicate`` until it is true or ``timeout`` expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+@pytest.fixture
+def pool():
+    """A two-thread pool shut down after the test."""
+    decode_pool = DecodePool(2)
+    yield decode_pool
+    decode_pool.shutdown()
+
+
+class TestDecodePool:
+    """Test job scheduling and statistics."""
+
+    def test_job_runs_and_is_counted(self, pool):
+        """A submitted job runs on a pool thread and shows up in stats."""
+        done = threading.Event()
+
+        pool.submit("cam0", done.set)
+
+        assert done.wait(2.0)
+        assert _wait_for(lambda: pool.stats("cam0")["completed"] == 1)
+        stats = pool.stats("cam0")
+        assert stats["submitted"] == 1
+        assert stats["pending"] == 0
+
+    def test_latest_job_wins_per_key(self, pool):
+        """Jobs queued behind a running one are replaced, not accumulated."""
+        gate = threading.Event()
+        ran = []
+        pool.submit("cam0", lambda: (gate.wait(2.0), ran.append(0)))
+        assert _wait_for(lambda: pool.stats("cam0")["in_flight"] == 1)
+
+        assert pool.submit("cam0", lambda: ran.append(1)) is False
+        assert pool.submit("cam0", lambda: ran.append(2)) is True
+        assert pool.stats("cam0")["pending"] == 1
+        gate.set()
+
+        assert _wait_for(lambda: pool.stats("cam0")["completed"] == 2)
+        assert ran == [0, 2]
+        assert pool.stats("cam0")["superseded"] == 1
+
+    def test_same_key_never_runs_concurrently(self, pool):
+        """A key's jobs are serialized even with idle threads available."""
+        active = []
+        overlap = []
+
+        def job():
+            active.append(1)
+            if len(active) > 1:
+                overlap.append(True)
+            time.sleep(0.01)
+            active.pop()
+
+        for _ in range(5):
+            pool.submit("cam0", job)
+            time.sleep(0.002)
+
+        assert _wait_for(lambda: pool.stats("cam0")["pending"] == 0)
+        assert _wait_for(lambda: pool.stats("cam0")["in_flight"] == 0)
+        assert not overlap
+
+    def test_cameras_decode_in_parallel(self, pool):
+        """Different keys run on different threads at the same time."""
+        barrier = threading.Barrier(2, timeout=2.0)
+        results = []
+
+        def job():
+            barrier.wait()
+            results.append(True)
+
+        pool.submit("cam0", job)
+        pool.submit("cam1", job)
+
+        assert _wait_for(lambda: len(results) == 2)
+
+    def test_failed_job_is_counted(self, pool):
+        """An exception in a job is logged and counted, not fatal."""
+        def boom():
+            raise RuntimeError("corrupt frame")
+
+        pool.submit("cam0", boom)
+
+        assert _wait_for(lambda: pool.stats("cam0")["failed"] == 1)
+
+    def test_discard_drops_pending_job(self, pool):
+        """discard() removes a waiting job and the key's stats."""
+        gate = threading.Event()
+        ran = []
+        pool.submit("cam0", lambda: gate.wait(2.0))
+        assert _wait_for(lambda: pool.stats("cam0")["in_flight"] == 1)
+        pool.submit("cam0", lambda: ran.append(1))
+
+        pool.discard("cam0")
+        gate.set()
+
+        assert _wait_for(lambda: pool.pool_stats()["busy"] == 0)
+        assert ran == []
+        assert pool.stats("cam0")["submitted"] == 0
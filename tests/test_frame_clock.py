@@ -0,0 +1,135 @@
+"""
+Tests for ui/frame_clock.py - the shared refresh-aligned render scheduler.
+"""
+
+import pytest
+
+
+class FakeTile:
+    """Stands in for a CameraWidget: counts render and housekeeping calls."""
+
+    def __init__(self):
+        self.renders = 0
+        self.housekeeping = []
+
+    def _render_latest_frame(self):
+        self.renders += 1
+
+    def clock_housekeeping(self, log_status):
+        self.housekeeping.append(log_status)
+
+
+@pytest.fixture
+def clock(qapp):
+    """A 60 Hz clock independent of the shared one."""
+    from ui.frame_clock import FrameClock
+
+    clock = FrameClock(refresh_hz=60.0)
+    yield clock
+    clock._timer.stop()
+    clock._housekeeping.stop()
+
+
+def _run_scheduled_tick(clock):
+    """Fire the armed tick without waiting for it; return the tick number."""
+    tick = clock._next_tick
+    clock._timer.stop()
+    clock._on_tick()
+    return tick
+
+
+class TestFrameClock:
+    """Test scheduling tiles on refresh ticks."""
+
+    def test_divisors_follow_ui_fps(self, clock):
+        """UI rates map to refresh divisors; rate changes take effect."""
+        tile = FakeTile()
+        clock.register(tile, 15)
+        assert clock.divisor_for(15) == 4
+        assert clock.effective_fps(tile) == pytest.approx(15.0)
+
+        clock.set_rate(tile, 20)
+        assert clock.effective_fps(tile) == pytest.approx(20.0)
+        assert clock.divisor_for(0) == 1
+
+    def test_idle_clock_does_not_wake(self, clock):
+        """Without new frames no render tick is armed."""
+        clock.register(FakeTile(), 15)
+
+        assert not clock._timer.isActive()
+        assert clock.stats()["pending"] == 0
+
+    def test_only_tiles_with_frames_render_on_shared_ticks(self, clock):
+        """Pending tiles render together on a tick their divisor divides."""
+        fast, slow, idle = FakeTile(), FakeTile(), FakeTile()
+        clock.register(fast, 30)
+        clock.register(slow, 15)
+        clock.register(idle, 15)
+
+        clock.request_frame(fast)
+        clock.request_frame(slow)
+        clock.request_frame(fast)
+        assert clock._timer.isActive()
+
+        while clock.stats()["pending"]:
+            tick = _run_scheduled_tick(clock)
+            assert tick % 2 == 0
+
+        assert fast.renders == 1
+        assert slow.renders == 1
+        assert idle.renders == 0
+        assert tick % 4 == 0
+        assert not clock._timer.isActive()
+
+    def test_real_timer_renders_and_sleeps(self, clock, qtbot):
+        """A requested render happens on the armed timer, then the clock idles."""
+        tile = FakeTile()
+        clock.register(tile, 30)
+
+        clock.request_frame(tile)
+        qtbot.waitUntil(lambda: tile.renders == 1, timeout=1000)
+
+        assert not clock._timer.isActive()
+        assert clock.stats()["wakeups"] >= 1
+
+    def test_housekeeping_and_status(self, clock):
+        """Housekeeping reaches every tile; status logs every few seconds."""
+        tile = FakeTile()
+        clock.register(tile, 0)
+        assert clock._housekeeping.isActive()
+
+        for _ in range(clock.STATUS_EVERY):
+            clock._on_housekeeping()
+
+        assert tile.housekeeping == [False] * (clock.STATUS_EVERY - 1) + [True]
+        clock.unregister(tile)
+        assert not clock._housekeeping.isActive()
+
+    @pytest.mark.requires_display
+    def test_widget_renders_through_clock(self, qapp, qtbot):
+        """A tile has no timers of its own; frame wake-ups go through the clock."""
+        from unittest.mock import MagicMock
+
+        from core.frame_pool import FrameMailbox, FramePool
+        from ui.frame_clock import get_frame_clock
+        from ui.widgets import CameraWidget
+
+        widget = CameraWidget(1, 1, stream_link=None, enable_capture=False, ui_fps=20)
+        assert not hasattr(widget, "render_timer")
+        clock = get_frame_clock()
+
+        pool = FramePool(2)
+        widget.worker = MagicMock()
+        widget.worker.mailbox = FrameMailbox()
+        widget._sync_clock()
+        assert clock.effective_fps(widget) > 0
+        widget.worker.mailbox.publish(pool.lease((4, 4, 3)))
+        widget.on_frame_ready()
+        assert widget._latest_frame is not None
+
+        qtbot.waitUntil(lambda: widget._last_rendered_id == widget._frame_id, timeout=1000)
+
+        widget.worker = None
+        widget._release_current_frame()
+        widget.cleanup()
+        assert clock.effective_fps(widget) == 0.0
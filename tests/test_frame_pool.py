@@ -0,0 +1,154 @@
+"""
+Tests for core/frame_pool.py - Frame lease lifecycle and pool accounting.
+"""
+
+import gc
+
+import numpy as np
+import pytest
+
+from core.frame_pool import FrameMailbox, FramePool
+
+
+class TestFrameLease:
+    """Test lease reference counting."""
+
+    def test_release_returns_buffer(self):
+        """Releasing a lease makes its buffer available for reuse."""
+        pool = FramePool(2)
+        lease = pool.lease((4, 4, 3))
+        array = lease.array
+        lease.release()
+
+        again = pool.lease((4, 4, 3))
+        assert again.array is array
+        assert pool.stats()["hits"] == 1
+
+    def test_release_is_idempotent(self):
+        """Double release does not double-return the buffer."""
+        pool = FramePool(2)
+        lease = pool.lease((4, 4, 3))
+        lease.release()
+        lease.release()
+
+        stats = pool.stats()
+        assert stats["free"] == 1
+        assert stats["outstanding"] == 0
+
+    def test_acquire_defers_return(self):
+        """The buffer returns only after the last reference is released."""
+        pool = FramePool(2)
+        lease = pool.lease((4, 4, 3)).acquire()
+        lease.release()
+        assert pool.stats()["outstanding"] == 1
+        lease.release()
+        assert pool.stats()["outstanding"] == 0
+        assert lease.released
+
+    def test_acquire_after_release_raises(self):
+        """A released lease cannot be revived."""
+        pool = FramePool(1)
+        lease = pool.lease((2, 2))
+        lease.release()
+        with pytest.raises(RuntimeError):
+            lease.acquire()
+
+    def test_context_manager_releases(self):
+        """Using a lease as a context manager releases it on exit."""
+        pool = FramePool(1)
+        with pool.lease((2, 2)) as array:
+            array[:] = 1
+        assert pool.stats()["outstanding"] == 0
+
+    def test_dropped_lease_is_reclaimed_as_leak(self):
+        """A lease garbage-collected without release is counted as leaked."""
+        pool = FramePool(2)
+        lease = pool.lease((4, 4, 3))
+        del lease
+        gc.collect()
+
+        stats = pool.stats()
+        assert stats["leaked"] == 1
+        assert stats["outstanding"] == 0
+        assert stats["free"] == 1
+
+
+class TestFramePool:
+    """Test pool sizing and statistics."""
+
+    def test_shape_change_invalidates_free_buffers(self):
+        """Buffers of a previous shape are not reused."""
+        pool = FramePool(2)
+        pool.lease((4, 4, 3)).release()
+        lease = pool.lease((8, 8, 3))
+        assert lease.array.shape == (8, 8, 3)
+        assert pool.stats()["free"] == 0
+
+    def test_capacity_bounds_free_list(self):
+        """No more than capacity buffers are kept free."""
+        pool = FramePool(1)
+        leases = [pool.lease((2, 2)) for _ in range(3)]
+        for lease in leases:
+            lease.release()
+        assert pool.stats()["free"] == 1
+
+    def test_adopt_sets_shape(self):
+        """Adopted arrays define the pool shape and are recycled."""
+        pool = FramePool(2)
+        array = np.zeros((3, 5, 3), dtype=np.uint8)
+        pool.adopt(array).release()
+
+        assert pool.shape == (3, 5, 3)
+        assert pool.lease((3, 5, 3)).array is array
+
+    def test_stats_hit_rate_and_alloc_rate(self):
+        """Hit rate and allocation rate reflect pool usage."""
+        pool = FramePool(2)
+        pool.lease((2, 2)).release()
+        pool.lease((2, 2)).release()
+
+        stats = pool.stats()
+        assert stats["hit_rate"] == pytest.approx(0.5)
+        assert stats["allocations"] == 1
+        assert stats["allocations_per_sec"] > 0
+
+
+class TestFrameMailbox:
+    """Test latest-frame handoff and wake-up coalescing."""
+
+    def test_publish_overwrites_and_releases(self):
+        """An untaken frame is released when a newer one is published."""
+        pool = FramePool(3)
+        mailbox = FrameMailbox()
+        first = pool.lease((2, 2))
+        second = pool.lease((2, 2))
+
+        mailbox.publish(first)
+        mailbox.publish(second)
+
+        assert first.released
+        assert mailbox.take() is second
+        assert mailbox.stats()["overwritten"] == 1
+
+    def test_single_wakeup_until_rearmed(self):
+        """Only the first publish after a re-arm requests a wake-up."""
+        pool = FramePool(3)
+        mailbox = FrameMailbox()
+
+        assert mailbox.publish(pool.lease((2, 2))) is True
+        assert mailbox.publish(pool.lease((2, 2))) is False
+        mailbox.take(rearm=False).release()
+        assert mailbox.publish(pool.lease((2, 2))) is False
+        mailbox.take().release()
+        assert mailbox.publish(pool.lease((2, 2))) is True
+        assert mailbox.stats()["wakeups"] == 2
+
+    def test_clear_releases_pending(self):
+        """clear() releases any frame still waiting in the mailbox."""
+        pool = FramePool(3)
+        mailbox = FrameMailbox()
+        mailbox.publish(pool.lease((2, 2)))
+        mailbox.clear()
+
+        assert mailbox.take() is None
+        assert pool.stats()["outstanding"] == 0
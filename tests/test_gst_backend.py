@@ -0,0 +1,121 @@
+"""
+Tests for core/gst_backend.py - PyGObject appsink capture backend.
+"""
+
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+from core.gst_backend import GstCapture, frame_view
+from core.gst_pipeline import build_pipeline, videotest_source
+
+
+class TestFrameView:
+    """Test mapping raw buffer bytes to frame views."""
+
+    def test_view_shares_buffer_memory(self):
+        """Packed frames are viewed in place, not copied."""
+        data = bytearray(np.arange(4 * 2 * 3, dtype=np.uint8).tobytes())
+
+        view = frame_view(data, 4, 2, 3)
+
+        assert view.shape == (2, 4, 3)
+        assert np.shares_memory(view, np.frombuffer(data, dtype=np.uint8))
+        assert view[1, 0, 0] == 12
+
+    def test_padded_rows_are_sliced_off(self):
+        """Rows aligned to 4 bytes keep the stride and drop the padding."""
+        # 3x2 BGR: 9 bytes per row padded to a 12-byte stride.
+        padded = np.zeros((2, 12), dtype=np.uint8)
+        padded[:, :9] = np.arange(9, dtype=np.uint8)
+        padded[:, 9:] = 255
+
+        view = frame_view(padded.tobytes(), 3, 2, 3)
+
+        assert view.shape == (2, 3, 3)
+        assert view.strides[0] == 12
+        assert int(view.max()) == 8
+
+    def test_gray_frames_are_two_dimensional(self):
+        """GRAY8 buffers become (height, width) views."""
+        view = frame_view(bytes(8 * 4), 8, 4, 1)
+
+        assert view.shape == (4, 8)
+
+    def test_short_buffer_rejected(self):
+        """A buffer smaller than the caps describe raises ValueError."""
+        with pytest.raises(ValueError):
+            frame_view(bytes(10), 4, 2, 3)
+
+
+class TestGstCaptureWithoutGi:
+    """Test the backend degrades cleanly without PyGObject."""
+
+    def test_capture_reports_closed(self):
+        """Without gi the capture is closed and every read fails."""
+        with patch("core.gst_backend.gi_available", return_value=False):
+            cap = GstCapture("videotestsrc ! appsink name=sink")
+
+        assert not cap.isOpened()
+        assert cap.error
+        assert cap.grab() is False
+        assert cap.read() == (False, None)
+        assert cap.get(cv2.CAP_PROP_FRAME_WIDTH) == 0.0
+        assert cap.latency_ms() is None
+        cap.release()
+
+
+class TestGstCaptureWithGStreamer:
+    """Run the backend on videotestsrc when PyGObject is installed."""
+
+    @pytest.fixture(autouse=True)
+    def require_gi(self):
+        gi = pytest.importorskip("gi")
+        gi.require_version("Gst", "1.0")
+
+    @pytest.mark.integration
+    def test_reads_mapped_frames(self):
+        """Frames arrive as read-only views, or copied into a given image."""
+        cap = GstCapture(
+            build_pipeline(
+                videotest_source(160, 120, fps=30),
+                pixel_format="BGR",
+                sink_name="sink",
+            )
+        )
+        try:
+            assert cap.isOpened(), cap.error
+            ok, view = cap.read()
+            assert ok
+            assert view.shape == (120, 160, 3)
+            assert not view.flags["WRITEABLE"]
+            assert cap.get(cv2.CAP_PROP_FRAME_WIDTH) == 160.0
+
+            image = np.empty((120, 160, 3), dtype=np.uint8)
+            assert cap.grab()
+            ok, frame = cap.retrieve(image=image)
+            assert ok and frame is image
+            assert cap.latency_ms() is not None
+        finally:
+            cap.release()
+        assert not cap.isOpened()
+
+    @pytest.mark.integration
+    def test_end_of_stream_fails_grab(self):
+        """EOS on the bus ends grab() and closes the capture."""
+        cap = GstCapture(
+            "videotestsrc num-buffers=2 ! video/x-raw,format=BGR,width=64,height=48 "
+            "! appsink name=sink sync=false",
+            timeout=5.0,
+        )
+        try:
+            grabs = 0
+            while cap.grab():
+                grabs += 1
+                assert grabs <= 2
+            assert cap.error == "end of stream"
+            assert not cap.isOpened()
+        finally:
+            cap.release()
@@ -0,0 +1,181 @@
+"""
+Tests for core/gst_pipeline.py - GStreamer pipeline construction.
+"""
+
+import pytest
+
+from core.gst_pipeline import (
+    build_camera_pipeline,
+    build_mosaic_pipeline,
+    build_pipeline,
+    decode_chain,
+    mosaic_cells,
+    videotest_source,
+)
+
+
+def _elements(pipeline):
+    """Split a pipeline description into its element strings."""
+    return [e.strip() for e in pipeline.split("!")]
+
+
+class TestPipelineBuilder:
+    """Test generated pipeline descriptions."""
+
+    def test_default_camera_pipeline(self):
+        """The minimal pipeline matches the original hard-coded one."""
+        pipeline = build_camera_pipeline(2, 640, 480)
+
+        assert _elements(pipeline) == [
+            "v4l2src device=/dev/video2",
+            "image/jpeg,width=640,height=480",
+            "queue max-size-buffers=2 leaky=downstream",
+            "jpegdec",
+            "videoconvert",
+            "appsink drop=1 max-buffers=1 sync=false",
+        ]
+
+    def test_videorate_drops_before_decode(self):
+        """Rate limiting runs on compressed frames, ahead of jpegdec."""
+        elements = decode_chain(fps=14.5)
+
+        rate = elements.index("videorate name=rate drop-only=true max-rate=15")
+        assert rate < elements.index("jpegdec")
+
+    def test_scale_and_output_caps(self):
+        """videoscale is pinned to the tile size and output caps are explicit."""
+        elements = decode_chain(output_size=(320, 240), pixel_format="BGRx")
+
+        scale = elements.index("videoscale")
+        assert elements[scale + 1] == "video/x-raw,width=320,height=240"
+        assert elements[-2:] == ["videoconvert", "video/x-raw,format=BGRx"]
+
+    def test_transposing_flip_swaps_scaled_size(self):
+        """A 90 degree rotation scales to swapped dimensions before flipping."""
+        elements = decode_chain(output_size=(240, 320), flip="clockwise")
+
+        assert "video/x-raw,width=320,height=240" in elements
+        assert elements.index("videoflip method=clockwise") > elements.index("videoscale")
+
+    def test_invalid_options_rejected(self):
+        """Unknown formats, flips and sizes raise ValueError."""
+        with pytest.raises(ValueError):
+            decode_chain(pixel_format="NV12")
+        with pytest.raises(ValueError):
+            decode_chain(flip="sideways")
+        with pytest.raises(ValueError):
+            decode_chain(output_size=(0, 240))
+
+    def test_videotest_source_stands_in_for_camera(self):
+        """The test source produces MJPEG so the decode chain is identical."""
+        pipeline = build_pipeline(videotest_source(640, 480), sink_name="sink")
+
+        elements = _elements(pipeline)
+        assert elements[0].startswith("videotestsrc is-live=true")
+        assert elements[3] == "image/jpeg"
+        assert elements[-1].endswith("name=sink")
+        assert elements[4:-1] == decode_chain()
+
+
+class TestMosaicPipeline:
+    """Test the compositor mosaic pipeline."""
+
+    def test_cells_follow_grid_after_settings_tile(self):
+        """Cameras fill row-major cells, skipping the settings cell."""
+        cells = mosaic_cells(3, 2, 2, (320, 240), first_cell=1)
+
+        assert cells == [(320, 0, 320, 240), (0, 240, 320, 240), (320, 240, 320, 240)]
+
+    def test_cells_must_fit_grid(self):
+        """More cameras than free cells is rejected."""
+        with pytest.raises(ValueError):
+            mosaic_cells(4, 2, 2, (320, 240), first_cell=1)
+
+    def test_pipeline_has_one_sink_and_a_branch_per_camera(self):
+        """Every source feeds its own compositor pad; one appsink reads the grid."""
+        sources = [videotest_source(640, 480) for _ in range(3)]
+
+        pipeline = build_mosaic_pipeline(
+            sources, 2, 2, (320, 240), fps=15, pixel_format="BGR", first_cell=1
+        )
+
+        chains = pipeline.split("  ")
+        assert len(chains) == 4
+        head = _elements(chains[0])
+        assert head[0].startswith("compositor name=mosaic")
+        assert "sink_0::xpos=320 sink_0::ypos=0 sink_0::width=320" in head[0]
+        assert head[1] == "video/x-raw,width=640,height=480,framerate=15/1"
+        assert head[-1] == "appsink drop=1 max-buffers=1 sync=false"
+        assert pipeline.count("appsink") == 1
+        for i, chain in enumerate(chains[1:]):
+            branch = _elements(chain)
+            assert branch[-2:] == ["jpegdec", f"mosaic.sink_{i}"]
+            assert "videorate drop-only=true max-rate=15" in branch
+
+
+class TestPipelineWithGStreamer:
+    """Run generated pipelines on videotestsrc when PyGObject is installed."""
+
+    @pytest.fixture(scope="class")
+    def gst(self):
+        gi = pytest.importorskip("gi")
+        gi.require_version("Gst", "1.0")
+        from gi.repository import Gst
+
+        Gst.init(None)
+        return Gst
+
+    @pytest.mark.integration
+    @pytest.mark.parametrize(
+        "pixel_format, channels", [("BGR", 3), ("BGRx", 4), ("GRAY8", 1)]
+    )
+    def test_pipeline_negotiates_and_produces_frames(self, gst, pixel_format, channels):
+        """Scaled, flipped, rate-limited pipelines deliver the requested caps."""
+        pipeline = gst.parse_launch(
+            build_pipeline(
+                videotest_source(640, 480, fps=30),
+                fps=10,
+                output_size=(120, 160),
+                pixel_format=pixel_format,
+                flip="clockwise",
+                sink_name="sink",
+            )
+        )
+        sink = pipeline.get_by_name("sink")
+        pipeline.set_state(gst.State.PLAYING)
+        try:
+            sample = sink.emit("try-pull-sample", 5 * gst.SECOND)
+            assert sample is not None
+            structure = sample.get_caps().get_structure(0)
+            assert structure.get_value("format") == pixel_format
+            assert structure.get_value("width") == 120
+            assert structure.get_value("height") == 160
+            assert sample.get_buffer().get_size() >= 120 * 160 * channels
+        finally:
+            pipeline.set_state(gst.State.NULL)
+
+    @pytest.mark.integration
+    def test_mosaic_produces_grid_frames(self, gst):
+        """Three videotestsrc cameras composite into one 2x2 mosaic frame."""
+        pipeline = gst.parse_launch(
+            build_mosaic_pipeline(
+                [videotest_source(320, 240, pattern=p) for p in ("smpte", "ball", "snow")],
+                2,
+                2,
+                (160, 120),
+                fps=10,
+                pixel_format="BGR",
+                first_cell=1,
+                sink_name="sink",
+            )
+        )
+        sink = pipeline.get_by_name("sink")
+        pipeline.set_state(gst.State.PLAYING)
+        try:
+            sample = sink.emit("try-pull-sample", 5 * gst.SECOND)
+            assert sample is not None
+            structure = sample.get_caps().get_structure(0)
+            assert structure.get_value("width") == 320
+            assert structure.get_value("height") == 240
+        finally:
+            pipeline.set_state(gst.State.NULL)
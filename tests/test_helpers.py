@@ -145,6 +145,21 @@ class TestKillDeviceHolders:
         mock_kill.assert_any_call(fake_pid, signal.SIGTERM)
 
 
+class TestSecondsSinceLaunch:
+    """Test launch timing across restart_app()'s exec."""
+
+    def test_restart_stamp_wins(self, monkeypatch):
+        """After mark_restart() time is measured from the restart."""
+        monkeypatch.delenv(helpers.RESTART_TS_ENV, raising=False)
+        assert helpers.seconds_since_launch() >= 0.0
+
+        helpers.mark_restart()
+
+        assert helpers.seconds_since_launch() < 1.0
+        monkeypatch.setenv(helpers.RESTART_TS_ENV, "not-a-time")
+        assert helpers.seconds_since_launch() >= 0.0
+
+
 class TestLogHealthSummary:
     """Tests for log_health_summary function."""
 
@@ -236,3 +251,19 @@ class TestLogHealthSummary:
         mock_warning.assert_called()
         warning_call = mock_warning.call_args[0][0]
         assert "unhealthy" in warning_call.lower()
+
+    @mock.patch("logging.info")
+    @mock.patch("core.performance.read_context_switches")
+    def test_reports_context_switch_rate(self, mock_ctx, mock_log):
+        """Test thread count and context switch rate are logged."""
+        mock_ctx.side_effect = [
+            {"threads": 5, "voluntary": 100, "involuntary": 20},
+            {"threads": 5, "voluntary": 300, "involuntary": 20},
+        ]
+        with mock.patch("utils.helpers.time.time", side_effect=[1000.0, 1010.0]):
+            helpers.log_health_summary([], [], set(), {})
+            helpers.log_health_summary([], [], set(), {})
+
+        args = mock_log.call_args[0]
+        assert "ctx_switches" in args[0]
+        assert args[-3:] == (5, 320, 20.0)
@@ -0,0 +1,44 @@
+"""
+Tests for core/imaging.py - Shared frame transforms.
+"""
+
+import numpy as np
+
+from core.imaging import NIGHT_MODE_GAIN, night_luma
+
+
+class TestNightLuma:
+    """Test the night-mode luma stage."""
+
+    def test_bgr_frame_reduced_to_brightened_luma(self):
+        """A BGR frame becomes one channel with the night gain applied."""
+        frame = np.full((4, 6, 3), 100, dtype=np.uint8)
+
+        out = night_luma(frame)
+
+        assert out.shape == (4, 6)
+        assert int(out[0, 0]) == int(100 * NIGHT_MODE_GAIN)
+
+    def test_gain_saturates(self):
+        """Bright pixels clamp at 255 instead of wrapping."""
+        frame = np.full((2, 2, 3), 250, dtype=np.uint8)
+
+        assert int(night_luma(frame).max()) == 255
+
+    def test_bgrx_and_gray_inputs(self):
+        """Four-channel and grayscale frames give the same luma as BGR."""
+        bgr = np.full((4, 6, 3), 80, dtype=np.uint8)
+        bgrx = np.concatenate([bgr, np.full((4, 6, 1), 255, np.uint8)], axis=2)
+        gray = np.full((4, 6), 80, dtype=np.uint8)
+
+        expected = night_luma(bgr)
+        assert np.array_equal(night_luma(bgrx), expected)
+        assert np.array_equal(night_luma(gray), expected)
+
+    def test_matching_dst_is_reused(self):
+        """A destination of the right size is written in place."""
+        frame = np.zeros((4, 6, 3), dtype=np.uint8)
+        dst = np.empty((4, 6), dtype=np.uint8)
+
+        assert night_luma(frame, dst=dst) is dst
+        assert night_luma(frame, dst=np.empty((2, 2), np.uint8)).shape == (4, 6)
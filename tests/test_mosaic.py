@@ -0,0 +1,200 @@
+"""
+Tests for core/mosaic.py - background composition of the grid into one mosaic.
+"""
+
+import numpy as np
+import pytest
+
+from core.frame_pool import FramePool
+from core.mosaic import MosaicComposer, blit_cell
+
+
+def _frame(pool, shape, color):
+    lease = pool.lease(shape)
+    lease.array[...] = color
+    return lease
+
+
+def _compose(composer):
+    """Run one composition on the calling thread and return the mosaic lease."""
+    assert composer.compose()
+    return composer.mailbox.take()
+
+
+class TestBlitCell:
+    """Test resizing and converting one frame into a mosaic cell."""
+
+    def test_resize_writes_into_cell_view(self):
+        """The frame is scaled straight into its slice of the mosaic."""
+        canvas = np.zeros((100, 200, 3), dtype=np.uint8)
+        frame = np.full((30, 40, 3), (1, 2, 3), dtype=np.uint8)
+
+        blit_cell(frame, canvas[10:60, 20:120], night=False)
+
+        assert (canvas[10:60, 20:120] == (1, 2, 3)).all()
+        assert canvas.sum() == 6 * 50 * 100
+
+    def test_channel_conversions(self):
+        """Gray frames fill colour cells and BGR frames fill 32-bit cells."""
+        canvas = np.zeros((20, 40, 4), dtype=np.uint8)
+        blit_cell(np.full((20, 20), 9, dtype=np.uint8), canvas[:, :20], night=False)
+        blit_cell(np.full((10, 10, 3), 5, dtype=np.uint8), canvas[:, 20:], night=False)
+
+        assert tuple(canvas[0, 0]) == (9, 9, 9, 255)
+        assert tuple(canvas[0, 30]) == (5, 5, 5, 255)
+
+    def test_night_mode_reduces_to_luma(self):
+        """Colour frames become brightened luma in a one-channel mosaic."""
+        canvas = np.zeros((10, 10), dtype=np.uint8)
+        frame = np.full((10, 10, 3), 100, dtype=np.uint8)
+
+        scratch = blit_cell(frame, canvas, night=True)
+
+        assert canvas[5, 5] == 160
+        assert scratch is not None and scratch.shape == (10, 10)
+
+
+class TestMosaicComposer:
+    """Test composing submitted tile frames."""
+
+    def test_cells_composed_and_leases_released(self):
+        """Each cell gets its frame; the background fills the gaps."""
+        pool = FramePool(4)
+        composer = MosaicComposer(background=43)
+        composer.set_canvas((210, 100))
+        left = _frame(pool, (100, 100, 3), (0, 0, 255))
+        right = _frame(pool, (50, 50, 3), (0, 255, 0))
+        composer.submit("a", left, (0, 0, 100, 100))
+        composer.submit("b", right, (110, 0, 100, 100))
+        left.release()
+        right.release()
+
+        mosaic = _compose(composer)
+
+        assert tuple(mosaic.array[50, 50]) == (0, 0, 255)
+        assert tuple(mosaic.array[50, 160]) == (0, 255, 0)
+        assert tuple(mosaic.array[50, 105]) == (43, 43, 43)
+        assert not composer.compose()
+
+        mosaic.release()
+        composer.stop()
+        assert pool.stats()["outstanding"] == 0
+
+    def test_move_and_discard(self):
+        """A moved cell is drawn at its new rect; a discarded one is cleared."""
+        pool = FramePool(4)
+        composer = MosaicComposer()
+        composer.set_canvas((200, 100))
+        lease = _frame(pool, (100, 100, 3), 200)
+        composer.submit("a", lease, (0, 0, 100, 100))
+        lease.release()
+        _compose(composer).release()
+
+        composer.move("a", (100, 0, 100, 100))
+        mosaic = _compose(composer)
+        assert mosaic.array[50, 50, 0] == 0
+        assert mosaic.array[50, 150, 0] == 200
+        mosaic.release()
+
+        composer.discard("a")
+        mosaic = _compose(composer)
+        assert mosaic.array.max() == 0
+        mosaic.release()
+        composer.stop()
+        assert pool.stats()["outstanding"] == 0
+
+    def test_night_mode_mosaic_is_luma(self):
+        """Night mode composes a one-channel mosaic."""
+        pool = FramePool(2)
+        composer = MosaicComposer()
+        composer.set_canvas((40, 20))
+        composer.set_night_mode(True)
+        lease = _frame(pool, (20, 20, 3), 100)
+        composer.submit("a", lease, (0, 0, 20, 20))
+        lease.release()
+
+        mosaic = _compose(composer)
+
+        assert mosaic.array.shape == (20, 40)
+        assert mosaic.array[10, 10] == 160
+        mosaic.release()
+        composer.stop()
+
+
+@pytest.fixture
+def mosaic_grid(qapp):
+    """A mosaic-mode compositor with two frame tiles side by side."""
+    from PyQt6 import QtWidgets
+    from ui.compositor import GridCompositor
+    from ui.widgets import CameraWidget
+
+    compositor = GridCompositor()
+    compositor.enable_mosaic(max_fps=100)
+    layout = QtWidgets.QGridLayout(compositor)
+    tiles = []
+    for col in range(2):
+        tile = CameraWidget(1, 1, stream_link=None, parent=compositor, enable_capture=False)
+        tile.grid_position = (0, col)
+        layout.addWidget(tile, 0, col)
+        tiles.append(tile)
+    compositor.resize(400, 200)
+    compositor.show()
+    qapp.processEvents()
+    yield compositor, tiles
+    for tile in tiles:
+        tile._release_current_frame()
+        tile.cleanup()
+    compositor.shutdown()
+    compositor.close()
+
+
+def _show_frame(tile, pool, color):
+    size = tile.video_rect().size()
+    lease = pool.lease((size.height(), size.width(), 3))
+    lease.array[...] = color
+    tile.on_frame(lease)
+    tile._render_latest_frame()
+
+
+def _wait_for_pixel(qtbot, compositor, point, rgb):
+    def matches():
+        return compositor.grab().toImage().pixelColor(point).getRgb()[:3] == rgb
+
+    qtbot.waitUntil(matches, timeout=2000)
+
+
+class TestMosaicRenderMode:
+    """Test render_mode = mosaic through the grid compositor."""
+
+    @pytest.mark.requires_display
+    def test_grid_presents_one_mosaic(self, mosaic_grid, qtbot):
+        """Tile frames reach the screen through the composer, not per-tile images."""
+        compositor, tiles = mosaic_grid
+        pool = FramePool(4)
+
+        _show_frame(tiles[0], pool, (0, 0, 255))
+        _show_frame(tiles[1], pool, (0, 255, 0))
+
+        assert tiles[0].frame_image is None
+        assert tiles[0].video_label.isHidden()
+        _wait_for_pixel(qtbot, compositor, tiles[0].video_rect().center(), (255, 0, 0))
+        _wait_for_pixel(qtbot, compositor, tiles[1].video_rect().center(), (0, 255, 0))
+        assert compositor.stats()["cells"] == 2
+
+    @pytest.mark.requires_display
+    def test_swap_moves_cells(self, mosaic_grid, qapp, qtbot):
+        """After a swap the mosaic draws each frame in the tile's new cell."""
+        compositor, tiles = mosaic_grid
+        pool = FramePool(4)
+        _show_frame(tiles[0], pool, (0, 0, 255))
+        _show_frame(tiles[1], pool, (0, 255, 0))
+
+        tiles[0].do_swap(tiles[0], tiles[1], compositor)
+        qapp.processEvents()
+
+        _wait_for_pixel(qtbot, compositor, tiles[1].video_rect().center(), (0, 255, 0))
+        assert tiles[1].video_rect().center().x() < 200
+
+        tiles[1]._release_current_frame()
+        tiles[1]._render_placeholder("DISCONNECTED")
+        assert compositor.stats()["cells"] == 1
@@ -0,0 +1,122 @@
+"""
+Tests for core/pacing.py - Cadence-accurate frame decimation.
+"""
+
+import pytest
+
+from core.pacing import FrameDecimator, HardwareRateGovernor
+
+
+def _run(decimator, camera_fps, seconds, start=100.0):
+    """Feed evenly spaced frames and return the emit timestamps."""
+    period = 1.0 / camera_fps
+    emitted = []
+    for i in range(int(camera_fps * seconds)):
+        now = start + i * period
+        if decimator.should_emit(now):
+            emitted.append(now)
+    return emitted
+
+
+class TestFrameDecimator:
+    """Test phase-accumulator decimation."""
+
+    def test_non_integer_ratio_hits_target(self):
+        """25 -> 20 FPS emits 20 frames per second, not 12.5."""
+        emitted = _run(FrameDecimator(20.0), camera_fps=25.0, seconds=10)
+        assert len(emitted) == pytest.approx(200, abs=1)
+
+    def test_integer_ratio(self):
+        """25 -> 10 FPS emits 10 frames per second."""
+        emitted = _run(FrameDecimator(10.0), camera_fps=25.0, seconds=10)
+        assert len(emitted) == pytest.approx(100, abs=1)
+
+    def test_target_above_camera_rate_emits_every_frame(self):
+        """A target above the camera rate passes every frame without bursts."""
+        emitted = _run(FrameDecimator(60.0), camera_fps=25.0, seconds=2)
+        assert len(emitted) == 50
+
+    def test_jitter_bounded_by_camera_period(self):
+        """Emit intervals never deviate by more than one camera frame."""
+        decimator = FrameDecimator(20.0)
+        emitted = _run(decimator, camera_fps=25.0, seconds=4)
+        intervals = [b - a for a, b in zip(emitted, emitted[1:])]
+        assert max(intervals) - min(intervals) <= (1.0 / 25.0) + 1e-9
+
+        stats = decimator.stats()
+        assert stats["emit_fps"] == pytest.approx(20.0, rel=0.05)
+        assert stats["jitter_ms"] < 40.0
+
+    def test_pause_does_not_burst(self):
+        """After a capture gap only one frame is emitted, not a catch-up burst."""
+        decimator = FrameDecimator(10.0)
+        _run(decimator, camera_fps=25.0, seconds=1, start=100.0)
+        emitted = _run(decimator, camera_fps=25.0, seconds=0.2, start=105.0)
+        assert len(emitted) <= 3
+
+    def test_set_target_fps(self):
+        """Changing the target rate takes effect on subsequent frames."""
+        decimator = FrameDecimator(25.0)
+        decimator.set_target_fps(5.0)
+        assert decimator.target_fps == 5.0
+        emitted = _run(decimator, camera_fps=25.0, seconds=10)
+        assert len(emitted) == pytest.approx(50, abs=1)
+
+    def test_stats_empty(self):
+        """Stats are zero before any interval has been measured."""
+        stats = FrameDecimator(10.0).stats()
+        assert stats["emit_fps"] == 0.0
+        assert stats["jitter_ms"] == 0.0
+
+
+class TestHardwareRateGovernor:
+    """Test when device frame rate changes are requested."""
+
+    def test_lower_rate_waits_for_hold(self):
+        """A lower target is requested only after it held for hold_sec."""
+        governor = HardwareRateGovernor(hold_sec=10.0)
+        governor.reset(30.0)
+
+        assert governor.update(15.0, now=0.0) is None
+        assert governor.update(15.5, now=9.0) is None
+        assert governor.update(15.0, now=10.0) == 15.0
+
+    def test_changing_target_restarts_hold(self):
+        """A target that keeps moving never reaches the device."""
+        governor = HardwareRateGovernor(hold_sec=10.0)
+        governor.reset(30.0)
+
+        governor.update(20.0, now=0.0)
+        governor.update(12.0, now=8.0)
+
+        assert governor.update(12.0, now=12.0) is None
+        assert governor.update(12.0, now=18.0) == 12.0
+
+    def test_higher_rate_is_immediate_and_capped(self):
+        """Raising happens at once, never above the rate at open."""
+        governor = HardwareRateGovernor(hold_sec=10.0)
+        governor.reset(25.0)
+        governor.applied(10.0)
+
+        assert governor.update(60.0, now=0.0) == 25.0
+        governor.applied(25.0)
+        assert governor.update(60.0, now=1.0) is None
+
+    def test_jitter_and_rejected_rates_are_ignored(self):
+        """Targets within tolerance or refused by the device are not retried."""
+        governor = HardwareRateGovernor(hold_sec=0.0)
+        governor.reset(20.0)
+
+        assert governor.update(19.0, now=0.0) is None
+        governor.update(12.0, now=0.0)
+        assert governor.update(12.0, now=1.0) == 12.0
+        governor.reject(12.0)
+        assert governor.update(12.0, now=2.0) is None
+
+    def test_disabled_without_device_rate(self):
+        """reset(None) turns the governor off for that capture."""
+        governor = HardwareRateGovernor(hold_sec=0.0)
+        governor.reset(None)
+
+        assert governor.update(5.0, now=0.0) is None
+        assert governor.device_fps is None
@@ -0,0 +1,172 @@
+"""
+Tests for core/process_capture.py - supervised capture processes.
+
+The capture processes here run small stand-in entry points instead of a
+real camera: they attach to the ring, write frames and answer controls.
+"""
+
+import os
+import signal
+import time
+
+import numpy as np
+import pytest
+
+from core import config
+from core.frame_pool import FramePool
+from core.process_capture import ProcessCaptureWorker, RingMailbox
+from core.shm_ring import ShmFrameRing
+
+
+def _frames_child(stream_link, ring_name, conn, settings, controls):
+    """Write a frame whose pixels are the night-mode flag until stopped."""
+    ring = ShmFrameRing.attach(ring_name)
+    night = bool(controls.get("night_mode"))
+    conn.send(("status", True))
+    try:
+        while True:
+            frame = np.full((48, 64), 200 if night else 10, dtype=np.uint8)
+            conn.send(("frame", ring.write(frame)))
+            conn.send(("stats", {"fourcc": "MJPG", "capture": {"grabbed": 1}}))
+            if conn.poll(0.02):
+                op, value = conn.recv()
+                if op == "stop":
+                    break
+                if op == "night_mode":
+                    night = value
+    finally:
+        ring.close()
+
+
+def _crash_once_child(stream_link, ring_name, conn, settings, controls):
+    """Segfault the first time (no marker file yet), then stream frames."""
+    if not os.path.exists(stream_link):
+        open(stream_link, "w").close()
+        os.kill(os.getpid(), signal.SIGSEGV)
+    _frames_child(stream_link, ring_name, conn, settings, controls)
+
+
+def _silent_child(stream_link, ring_name, conn, settings, controls):
+    """Never report anything, like a capture stack wedged in the driver."""
+    time.sleep(60)
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def _take_value(worker):
+    lease = worker.mailbox.take()
+    if lease is None:
+        return None
+    try:
+        return int(lease.array[0, 0])
+    finally:
+        lease.release()
+
+
+@pytest.fixture
+def make_worker(qapp):
+    """Factory for supervisors stopped after the test."""
+    workers = []
+
+    def make(target, stream_link=0):
+        worker = ProcessCaptureWorker(
+            stream_link, capture_width=64, capture_height=48, target=target
+        )
+        workers.append(worker)
+        return worker
+
+    yield make
+    for worker in workers:
+        worker.stop()
+
+
+class TestRingMailbox:
+    """Test the ring-backed mailbox handoff."""
+
+    def test_wakeups_coalesce_and_take_copies_newest(self):
+        """One wake-up until take(); take() returns the newest ring frame."""
+        ring = ShmFrameRing.create(3, 64)
+        writer = ShmFrameRing.attach(ring.name)
+        mailbox = RingMailbox(ring, FramePool(2))
+        try:
+            assert mailbox.take() is None
+            assert mailbox.note_frame(writer.write(np.full((4, 4), 1, np.uint8)))
+            assert not mailbox.note_frame(writer.write(np.full((4, 4), 2, np.uint8)))
+
+            lease = mailbox.take()
+            assert lease.array[0, 0] == 2
+            lease.release()
+            assert mailbox.take() is None
+            stats = mailbox.stats()
+            assert stats["published"] == 2 and stats["taken"] == 1
+            assert stats["overwritten"] == 1 and stats["wakeups"] == 1
+        finally:
+            writer.close()
+            ring.close()
+
+
+class TestProcessCaptureWorker:
+    """Test spawning, controls and supervision of capture processes."""
+
+    def test_frames_flow_from_child(self, make_worker):
+        """Frames written by the child arrive through the mailbox."""
+        worker = make_worker(_frames_child)
+        worker.start()
+
+        assert _wait_for(lambda: _take_value(worker) == 10)
+        assert _wait_for(lambda: worker.get_fourcc() == "MJPG")
+        stats = worker.get_capture_stats()
+        assert stats["grabbed"] == 1
+        assert stats["process_pid"] != os.getpid()
+        assert worker._online
+
+    def test_controls_reach_child(self, make_worker):
+        """Setters are forwarded to the running process."""
+        worker = make_worker(_frames_child)
+        worker.start()
+        assert _wait_for(lambda: _take_value(worker) == 10)
+
+        worker.set_night_mode(True)
+
+        assert _wait_for(lambda: _take_value(worker) == 200)
+
+    def test_crashed_process_is_restarted(self, make_worker, tmp_path, monkeypatch):
+        """A child killed by a signal is logged as a crash and restarted."""
+        monkeypatch.setattr(config, "RESTART_COOLDOWN_SEC", 0.0)
+        worker = make_worker(_crash_once_child, str(tmp_path / "crashed"))
+        worker.start()
+
+        assert _wait_for(lambda: _take_value(worker) == 10, timeout=20.0)
+        stats = worker.get_capture_stats()
+        assert stats["process_crashes"] == 1
+        assert stats["process_restarts"] == 1
+        assert stats["process_last_exit"] == "signal SIGSEGV"
+
+    def test_silent_process_is_killed(self, make_worker, monkeypatch):
+        """A child that never reports is treated as hung and replaced."""
+        monkeypatch.setattr(config, "RESTART_COOLDOWN_SEC", 0.0)
+        worker = make_worker(_silent_child)
+        worker.START_TIMEOUT_SEC = 0.5
+        worker.start()
+
+        assert _wait_for(lambda: worker.get_capture_stats()["process_hangs"] >= 1)
+        assert _wait_for(lambda: worker.get_capture_stats()["process_starts"] >= 2)
+
+    def test_output_size_fits_ring_slot(self, make_worker):
+        """Display sizes beyond a ring slot are shrunk, keeping aspect."""
+        worker = make_worker(_frames_child)
+        worker.set_output_size((32, 24))
+        assert worker._controls["output_size"] == (32, 24)
+
+        worker.set_output_size((640, 480))
+
+        w, h = worker._controls["output_size"]
+        assert w * h * 4 <= worker._ring.slot_bytes
+        assert abs(w / h - 640 / 480) < 0.05
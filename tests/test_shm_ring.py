@@ -0,0 +1,141 @@
+"""
+Tests for core/shm_ring.py - shared-memory frame ring.
+"""
+
+import numpy as np
+import pytest
+
+from core.shm_ring import ShmFrameRing
+
+
+@pytest.fixture
+def ring():
+    """A three-slot dashboard-side ring and a writer attached to it."""
+    reader = ShmFrameRing.create(3, 64 * 48 * 4)
+    writer = ShmFrameRing.attach(reader.name)
+    yield reader, writer
+    writer.close()
+    reader.close()
+
+
+def _read(reader):
+    seq, shape, _ts = reader.peek()
+    out = np.empty(shape, dtype=np.uint8)
+    assert reader.copy_into(seq, out)
+    return seq, out
+
+
+class TestShmFrameRing:
+    """Test writing, reading and overwrite detection."""
+
+    def test_empty_ring_has_no_frame(self, ring):
+        """Before the first write peek() returns None."""
+        reader, _ = ring
+
+        assert reader.latest_seq == 0
+        assert reader.peek() is None
+
+    def test_round_trip_keeps_shape_and_pixels(self, ring):
+        """Colour and single-plane frames come back unchanged."""
+        reader, writer = ring
+        colour = np.random.randint(0, 255, (48, 64, 3), dtype=np.uint8)
+        luma = np.random.randint(0, 255, (24, 32), dtype=np.uint8)
+
+        writer.write(colour)
+        assert np.array_equal(_read(reader)[1], colour)
+        seq = writer.write(luma, timestamp=12.5)
+
+        assert reader.peek() == (seq, (24, 32), 12.5)
+        assert np.array_equal(_read(reader)[1], luma)
+
+    def test_overwritten_slot_is_rejected(self, ring):
+        """A frame whose slot was reused since peek() is not copied."""
+        reader, writer = ring
+        first = writer.write(np.zeros((48, 64), dtype=np.uint8))
+        for value in range(3):
+            writer.write(np.full((48, 64), value + 1, dtype=np.uint8))
+
+        assert not reader.copy_into(first, np.empty((48, 64), dtype=np.uint8))
+        assert _read(reader)[1][0, 0] == 3
+
+    def test_slot_left_mid_write_is_skipped(self, ring):
+        """A slot a killed writer left odd is unreadable until rewritten."""
+        reader, writer = ring
+        seq = writer.write(np.ones((48, 64), dtype=np.uint8))
+        writer._meta[seq % writer.slots, 0] += 1  # writer died mid-copy
+
+        assert reader.peek() is None
+        seq = writer.write(np.full((48, 64), 9, dtype=np.uint8))
+        writer.write(np.full((48, 64), 9, dtype=np.uint8))
+        writer.write(np.full((48, 64), 7, dtype=np.uint8))
+
+        assert _read(reader)[1][0, 0] == 7
+
+    def test_access_rules(self, ring):
+        """The dashboard handle cannot write; oversized frames are refused."""
+        reader, writer = ring
+
+        with pytest.raises(PermissionError):
+            reader.write(np.zeros((4, 4), dtype=np.uint8))
+        big = np.zeros((480, 640, 3), dtype=np.uint8)
+        assert not writer.fits(big)
+        with pytest.raises(ValueError):
+            writer.write(big)
+
+    def test_new_writer_continues_sequence(self, ring):
+        """A restarted writer numbers frames after the previous one's."""
+        reader, writer = ring
+        writer.write(np.zeros((8, 8), dtype=np.uint8))
+        writer.write(np.zeros((8, 8), dtype=np.uint8))
+
+        restarted = ShmFrameRing.attach(reader.name)
+        try:
+            assert restarted.write(np.zeros((8, 8), dtype=np.uint8)) == 3
+        finally:
+            restarted.close()
+
+
+_ATTACH_AND_EXIT = """
+import sys
+sys.path.insert(0, {root!r})
+from core.shm_ring import ShmFrameRing
+ring = ShmFrameRing.attach({name!r}, writable=False, track={track})
+print(ring.latest_seq)
+ring.close()
+"""
+
+
+def _attach_in_process(name, track):
+    """Attach from an unrelated process (own resource tracker) and exit."""
+    import os
+    import subprocess
+    import sys
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-c", _ATTACH_AND_EXIT.format(root=root, name=name, track=track)],
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    assert result.returncode == 0, result.stderr
+    return int(result.stdout.strip()), result.stderr
+
+
+class TestCrossProcessAttach:
+    """Test attaching from a process that does not own the ring."""
+
+    def test_untracked_attach_survives_reader_exit(self, ring):
+        """A reader process exiting (a UI restart) leaves the ring linked."""
+        reader, writer = ring
+        writer.write(np.zeros((8, 8), dtype=np.uint8))
+
+        seq, stderr = _attach_in_process(reader.name, track=False)
+        assert seq == 1
+        assert "leaked" not in stderr
+
+        assert ShmFrameRing.exists(reader.name)
+        writer.write(np.zeros((8, 8), dtype=np.uint8))
+        seq, _ = _attach_in_process(reader.name, track=False)
+        assert seq == 2
+        assert not ShmFrameRing.exists("psm_camdash_missing")
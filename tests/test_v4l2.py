@@ -0,0 +1,320 @@
+"""
+Tests for core/v4l2.py - native V4L2 mmap capture against a fake device.
+"""
+
+import errno
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from core import v4l2
+from core.v4l2 import DeviceIO, V4L2Capture, V4L2Device
+
+
+class FakeDevice(DeviceIO):
+    """In-memory V4L2 capture device driven by a script of frames.
+
+    Each scripted frame is (payload, sequence, flags); dequeuing one copies
+    the payload into the next queued mmap buffer, like the driver would.
+    Frame rates snap to the nearest of ``rates``; ``busy_while_streaming``
+    refuses rate changes during streaming, as uvcvideo does. ``controls``
+    maps control IDs to [value, minimum, maximum]; set values are clamped.
+    """
+
+    def __init__(self, frames=(), pixelformat="MJPG", capabilities=None, buffer_size=4096):
+        self.frames = list(frames)
+        self.pixelformat = v4l2.fourcc_code(pixelformat)
+        self.capabilities = (
+            v4l2.V4L2_CAP_VIDEO_CAPTURE | v4l2.V4L2_CAP_STREAMING
+            if capabilities is None
+            else capabilities
+        )
+        self.buffer_size = buffer_size
+        self.mappings = {}
+        self.queued = []
+        self.requests = []
+        self.streaming = False
+        self.closed = False
+        self.timestamp = time.monotonic()
+        self.rates = (30, 15, 10)
+        self.fps = 30
+        self.busy_while_streaming = False
+        self.controls = {}
+
+    def open(self, path):
+        return 7
+
+    def close(self, fd):
+        self.closed = True
+
+    def mmap(self, fd, length, offset):
+        self.mappings[offset] = bytearray(length)
+        return self.mappings[offset]
+
+    def wait_readable(self, fd, timeout):
+        return bool(self.frames and self.queued)
+
+    def ioctl(self, fd, request, arg):
+        self.requests.append(request)
+        if request == v4l2.VIDIOC_QUERYCAP:
+            arg.capabilities = self.capabilities
+        elif request == v4l2.VIDIOC_S_FMT:
+            arg.fmt.pix.pixelformat = self.pixelformat
+        elif request == v4l2.VIDIOC_REQBUFS:
+            arg.count = min(arg.count, 4)
+        elif request == v4l2.VIDIOC_QUERYBUF:
+            arg.length = self.buffer_size
+            arg.m.offset = arg.index * self.buffer_size
+        elif request == v4l2.VIDIOC_QBUF:
+            self.queued.append(arg.index)
+        elif request == v4l2.VIDIOC_DQBUF:
+            if not (self.frames and self.queued):
+                raise OSError(errno.EAGAIN, "no buffer")
+            payload, sequence, flags = self.frames.pop(0)
+            index = self.queued.pop(0)
+            mapping = self.mappings[index * self.buffer_size]
+            mapping[: len(payload)] = payload
+            arg.index = index
+            arg.bytesused = len(payload)
+            arg.sequence = sequence
+            arg.flags = flags
+            arg.timestamp.tv_sec = int(self.timestamp)
+            arg.timestamp.tv_usec = int((self.timestamp % 1) * 1e6)
+        elif request == v4l2.VIDIOC_STREAMON:
+            self.streaming = True
+        elif request == v4l2.VIDIOC_STREAMOFF:
+            self.streaming = False
+            self.queued = []
+        elif request == v4l2.VIDIOC_G_PARM:
+            arg.parm.capture.capability = v4l2.V4L2_CAP_TIMEPERFRAME if self.rates else 0
+            arg.parm.capture.timeperframe.numerator = 1
+            arg.parm.capture.timeperframe.denominator = self.fps
+        elif request == v4l2.VIDIOC_S_PARM:
+            if self.busy_while_streaming and self.streaming:
+                raise OSError(errno.EBUSY, "busy")
+            interval = arg.parm.capture.timeperframe
+            wanted = interval.denominator / interval.numerator
+            self.fps = min(self.rates, key=lambda rate: abs(1 / rate - 1 / wanted))
+            interval.numerator = 1
+            interval.denominator = self.fps
+        elif request == v4l2.VIDIOC_QUERYCTRL:
+            if arg.id not in self.controls:
+                raise OSError(errno.EINVAL, "no such control")
+            _, arg.minimum, arg.maximum = self.controls[arg.id]
+        elif request in (v4l2.VIDIOC_G_CTRL, v4l2.VIDIOC_S_CTRL):
+            if arg.id not in self.controls:
+                raise OSError(errno.EINVAL, "no such control")
+            control = self.controls[arg.id]
+            if request == v4l2.VIDIOC_S_CTRL:
+                control[0] = max(control[1], min(control[2], arg.value))
+            arg.value = control[0]
+
+
+def _started(fake):
+    device = V4L2Device("/dev/video0", io=fake)
+    device.open()
+    device.set_format(640, 480)
+    device.start(4)
+    return device
+
+
+class TestIoctlEncoding:
+    """Test request numbers and structure layouts match videodev2.h."""
+
+    def test_request_numbers(self):
+        """Encoded requests equal the kernel's values on 64-bit Linux."""
+        if v4l2.ctypes.sizeof(v4l2.ctypes.c_long) != 8:
+            pytest.skip("reference values are for 64-bit ABIs")
+        assert v4l2.VIDIOC_QUERYCAP == 0x80685600
+        assert v4l2.VIDIOC_S_FMT == 0xC0D05605
+        assert v4l2.VIDIOC_REQBUFS == 0xC0145608
+        assert v4l2.VIDIOC_DQBUF == 0xC0585611
+        assert v4l2.VIDIOC_STREAMON == 0x40045612
+        assert v4l2.VIDIOC_S_PARM == 0xC0CC5616
+        assert v4l2.VIDIOC_S_CTRL == 0xC008561C
+        assert v4l2.VIDIOC_QUERYCTRL == 0xC0445624
+
+    def test_fourcc_round_trip(self):
+        """FOURCC strings and V4L2 codes convert both ways."""
+        assert v4l2.fourcc_code("MJPG") == 0x47504A4D
+        assert v4l2.fourcc_string(v4l2.fourcc_code("YUYV")) == "YUYV"
+
+
+class TestV4L2Device:
+    """Test streaming against the fake device."""
+
+    def test_start_maps_and_queues_every_buffer(self):
+        """start() maps all granted buffers, queues them and streams."""
+        fake = FakeDevice()
+        _started(fake)
+
+        assert len(fake.mappings) == 4
+        assert fake.queued == [0, 1, 2, 3]
+        assert fake.streaming
+
+    def test_close_stops_stream_and_frees_buffers(self):
+        """close() issues STREAMOFF, releases buffers and closes the node."""
+        fake = FakeDevice()
+        device = _started(fake)
+
+        device.close()
+
+        assert not fake.streaming
+        assert fake.requests[-1] == v4l2.VIDIOC_REQBUFS
+        assert fake.closed
+        assert device.fd is None
+
+    def test_frames_are_views_of_driver_memory(self):
+        """Dequeued data aliases the mmap buffer instead of copying it."""
+        fake = FakeDevice(frames=[(b"\xff\xd8jpeg", 0, 0)])
+        device = _started(fake)
+
+        frame = device.dequeue(0.1)
+
+        assert bytes(frame.data) == b"\xff\xd8jpeg"
+        view = np.frombuffer(frame.data, dtype=np.uint8)
+        mapping = np.frombuffer(fake.mappings[frame.index * fake.buffer_size], dtype=np.uint8)
+        assert np.shares_memory(view, mapping)
+
+    def test_sequence_gaps_count_drops(self):
+        """Missing sequence numbers are counted as dropped frames."""
+        fake = FakeDevice(frames=[(b"a", 0, 0), (b"b", 1, 0), (b"c", 4, 0), (b"d", 5, 0)])
+        device = _started(fake)
+
+        for _ in range(4):
+            device.queue(device.dequeue(0.1))
+
+        stats = device.stats()
+        assert stats["frames"] == 4
+        assert stats["dropped"] == 2
+        assert stats["sequence"] == 5
+
+    def test_corrupt_buffers_are_requeued(self):
+        """Buffers flagged ERROR are skipped and returned to the driver."""
+        fake = FakeDevice(frames=[(b"bad", 0, v4l2.V4L2_BUF_FLAG_ERROR), (b"good", 1, 0)])
+        device = _started(fake)
+
+        frame = device.dequeue(0.1)
+
+        assert bytes(frame.data) == b"good"
+        assert device.errors == 1
+        assert len(fake.queued) == 3
+
+    def test_monotonic_timestamps_give_latency(self):
+        """Kernel monotonic timestamps are turned into dequeue latency."""
+        fake = FakeDevice(frames=[(b"a", 0, v4l2.V4L2_BUF_FLAG_TIMESTAMP_MONOTONIC)])
+        fake.timestamp = time.monotonic() - 0.05
+        device = _started(fake)
+
+        frame = device.dequeue(0.1)
+
+        assert frame.timestamp == pytest.approx(fake.timestamp, abs=1e-5)
+        assert device.stats()["latency_ms"] >= 50.0
+
+    def test_dequeue_times_out(self):
+        """With no filled buffer dequeue() returns None."""
+        device = _started(FakeDevice())
+
+        assert device.dequeue(0.01) is None
+
+    def test_frame_rate_set_while_streaming(self):
+        """S_PARM is applied directly when the driver allows it."""
+        fake = FakeDevice()
+        device = _started(fake)
+
+        assert device.get_frame_rate() == 30.0
+        assert device.set_frame_rate(14.0) == 15.0
+        assert fake.streaming and fake.queued == [0, 1, 2, 3]
+
+    def test_busy_driver_gets_rate_between_streamoff_and_streamon(self):
+        """An EBUSY driver is stopped, reconfigured and restarted in place."""
+        fake = FakeDevice(frames=[(b"a", 7, 0)])
+        fake.busy_while_streaming = True
+        device = _started(fake)
+        device.dequeue(0.1)  # one buffer held by the caller
+
+        assert device.set_frame_rate(10.0) == 10.0
+
+        assert fake.streaming
+        assert sorted(fake.queued) == [0, 1, 2, 3]
+        assert len(fake.mappings) == 4
+        assert device.stats()["sequence"] == -1
+
+    def test_frame_rate_unsupported(self):
+        """Devices without a frame interval control raise OSError."""
+        fake = FakeDevice()
+        fake.rates = ()
+        device = _started(fake)
+
+        with pytest.raises(OSError):
+            device.set_frame_rate(15.0)
+
+    def test_output_only_device_rejected(self):
+        """Nodes without streaming capture are refused at open()."""
+        device = V4L2Device("/dev/video1", io=FakeDevice(capabilities=0))
+
+        with pytest.raises(OSError):
+            device.open()
+
+
+class TestV4L2Capture:
+    """Test the cv2.VideoCapture-compatible wrapper."""
+
+    def _jpeg(self):
+        image = np.full((8, 16, 3), 90, dtype=np.uint8)
+        return cv2.imencode(".jpg", image)[1].tobytes()
+
+    def test_compressed_retrieve_is_read_only_view(self):
+        """With CONVERT_RGB off, retrieve() returns the raw JPEG bytes."""
+        jpeg = self._jpeg()
+        cap = V4L2Capture(0, 16, 8, io=FakeDevice(frames=[(jpeg, 0, 0)]))
+        assert cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+
+        ok, buf = cap.read()
+
+        assert ok
+        assert buf.ndim == 1 and buf.tobytes() == jpeg
+        assert not buf.flags["WRITEABLE"]
+        assert cap.last_frame.sequence == 0
+        assert cap.get(cv2.CAP_PROP_FOURCC) == v4l2.fourcc_code("MJPG")
+
+    def test_default_retrieve_decodes(self):
+        """Like OpenCV, frames are decoded to BGR by default."""
+        cap = V4L2Capture(0, 16, 8, io=FakeDevice(frames=[(self._jpeg(), 0, 0)]))
+
+        ok, frame = cap.read()
+
+        assert ok
+        assert frame.shape == (8, 16, 3)
+
+    def test_grab_requeues_previous_buffer(self):
+        """Each grab() hands the previous buffer back to the driver."""
+        fake = FakeDevice(frames=[(b"a", 0, 0), (b"b", 1, 0)])
+        cap = V4L2Capture(0, 16, 8, io=fake)
+
+        assert cap.grab() and cap.grab()
+
+        assert len(fake.queued) == 3
+
+    def test_fps_property_changes_device_rate(self):
+        """CAP_PROP_FPS goes to the driver and the held buffer is returned."""
+        fake = FakeDevice(frames=[(b"a", 0, 0)])
+        cap = V4L2Capture(0, 16, 8, io=fake)
+        assert cap.grab()
+
+        assert cap.set(cv2.CAP_PROP_FPS, 15)
+
+        assert cap.get(cv2.CAP_PROP_FPS) == 15.0
+        assert cap.last_frame is None
+        assert len(fake.queued) == 4
+
+    def test_non_mjpeg_device_not_opened(self):
+        """Devices that can't deliver MJPEG leave the capture closed."""
+        fake = FakeDevice(pixelformat="YUYV")
+        cap = V4L2Capture(0, 640, 480, io=fake)
+
+        assert not cap.isOpened()
+        assert "MJPG" in cap.error
+        assert fake.closed
@@ -0,0 +1,189 @@
+"""
+Tests for ui/visibility.py - suspending tiles that cannot be seen.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core import config
+
+
+class FakeTile:
+    """Stands in for a CameraWidget: records set_occluded calls."""
+
+    def __init__(self):
+        self.is_fullscreen = False
+        self.occluded = False
+
+    def set_occluded(self, occluded):
+        self.occluded = occluded
+
+
+@pytest.fixture
+def tracker(qapp):
+    """A tracker independent of the shared one."""
+    from ui.visibility import VisibilityTracker
+
+    tracker = VisibilityTracker()
+    yield tracker
+    tracker._dpms_timer.stop()
+
+
+def _write_connector(root, name, status, dpms):
+    connector = root / name
+    connector.mkdir()
+    (connector / "status").write_text(status + "\n")
+    (connector / "dpms").write_text(dpms + "\n")
+
+
+class TestVisibilityTracker:
+    """Test which tiles count as visible."""
+
+    def test_fullscreen_tile_hides_the_others(self, tracker):
+        """Only the fullscreen tile stays visible; all resume on exit."""
+        tiles = [FakeTile() for _ in range(3)]
+        for tile in tiles:
+            tracker.register(tile)
+
+        tiles[1].is_fullscreen = True
+        tracker.refresh()
+        assert [t.occluded for t in tiles] == [True, False, True]
+        assert tracker.hidden_count() == 2
+
+        tiles[1].is_fullscreen = False
+        tracker.refresh()
+        assert tracker.hidden_count() == 0
+
+    def test_blanked_display_hides_everything(self, tracker):
+        """With the display off even a fullscreen tile is suspended."""
+        tile = FakeTile()
+        tile.is_fullscreen = True
+        tracker.register(tile)
+
+        tracker.set_display_blanked(True)
+        assert tile.occluded
+        tracker.set_display_blanked(False)
+        assert not tile.occluded
+
+    def test_disabled_by_config(self, tracker, monkeypatch):
+        """suspend_hidden = false leaves every tile running."""
+        monkeypatch.setattr(config, "SUSPEND_HIDDEN_TILES", False)
+        tile = FakeTile()
+        tracker.register(tile)
+
+        tracker.set_display_blanked(True)
+
+        assert not tile.occluded
+
+    @pytest.mark.requires_display
+    def test_minimized_window_hides_tiles(self, tracker, qapp):
+        """Minimizing the watched window suspends the grid."""
+        from PyQt6 import QtCore, QtWidgets
+
+        window = QtWidgets.QWidget()
+        tile = FakeTile()
+        tracker.register(tile)
+        tracker.watch_window(window)
+        state_change = QtCore.QEvent(QtCore.QEvent.Type.WindowStateChange)
+
+        with patch.object(window, "isMinimized", return_value=True):
+            tracker.eventFilter(window, state_change)
+        assert tile.occluded
+
+        tracker.eventFilter(window, state_change)
+        assert not tile.occluded
+        window.close()
+
+    def test_display_blanked_reads_connected_outputs(self, tmp_path):
+        """Blanked only when every connected output reports DPMS off."""
+        from ui.visibility import display_blanked
+
+        pattern = str(tmp_path / "card*-*")
+        assert display_blanked(pattern) is None
+
+        _write_connector(tmp_path, "card0-HDMI-A-1", "connected", "Off")
+        _write_connector(tmp_path, "card0-HDMI-A-2", "disconnected", "On")
+        assert display_blanked(pattern) is True
+
+        _write_connector(tmp_path, "card0-DSI-1", "connected", "On")
+        assert display_blanked(pattern) is False
+
+
+class TestWorkerStandby:
+    """Test the capture worker side of suspending a tile."""
+
+    def _make_worker(self, fps=30.0):
+        import numpy as np
+        from core.camera import CaptureWorker
+
+        worker = CaptureWorker(stream_link=0, parent=None, target_fps=fps)
+        worker.set_target_fps(fps)
+        cap = MagicMock()
+        cap.grab.return_value = True
+        cap.retrieve.return_value = (True, np.zeros((4, 4, 3), dtype=np.uint8))
+        worker._cap = cap
+        return worker, cap
+
+    def test_grab_only_standby_decodes_nothing(self):
+        """Standby 0 keeps grabbing but never retrieves a frame."""
+        worker, cap = self._make_worker()
+        worker.set_standby(0.0)
+
+        for i in range(3):
+            with patch("core.camera.time.time", return_value=100.0 + i):
+                worker._process_next_frame()
+
+        stats = worker.get_capture_stats()
+        assert cap.grab.call_count == 3
+        assert cap.retrieve.call_count == 0
+        assert stats["standby_skips"] == 3
+
+    def test_keep_alive_caps_publish_rate_only(self):
+        """A keep-alive rate caps the decimator, not the device rate target."""
+        worker, _ = self._make_worker(fps=30.0)
+
+        worker.set_standby(1.0)
+        assert worker._decimator.target_fps == pytest.approx(1.0)
+        assert worker._governor_target == pytest.approx(30.0)
+
+        worker.set_standby(None)
+        assert worker._decimator.target_fps == pytest.approx(30.0)
+        assert worker.get_capture_stats()["standby"] is None
+
+    def test_process_worker_sends_resume_as_negative(self, qapp):
+        """None is not replayed to a child, so resume travels as -1."""
+        from core.process_capture import ProcessCaptureWorker
+
+        worker = ProcessCaptureWorker(0, capture_width=64, capture_height=48)
+        worker.set_standby(0.0)
+        assert worker._controls["standby"] == 0.0
+        worker.set_standby(None)
+        assert worker._controls["standby"] == -1.0
+
+
+class TestWidgetOcclusion:
+    """Test CameraWidget suspending and resuming with the tracker."""
+
+    @pytest.mark.requires_display
+    def test_fullscreen_suspends_other_tiles(self, qapp):
+        """Going fullscreen puts the other tile's worker in standby."""
+        from ui.widgets import CameraWidget
+
+        front = CameraWidget(1, 1, stream_link=None, enable_capture=False)
+        back = CameraWidget(1, 1, stream_link=None, enable_capture=False)
+        back.worker = MagicMock()
+        try:
+            front.go_fullscreen()
+            assert back.occluded and not front.occluded
+            back.worker.set_standby.assert_called_with(config.HIDDEN_CAPTURE_FPS)
+
+            back._last_frame_ts = 1.0
+            front.exit_fullscreen()
+            assert not back.occluded
+            back.worker.set_standby.assert_called_with(None)
+            assert back._last_frame_ts > 1.0
+        finally:
+            back.worker = None
+            for widget in (front, back):
+                widget.cleanup()
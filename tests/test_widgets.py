@@ -198,6 +198,57 @@ class TestNightMode:
         
         widget.cleanup()
 
+    @pytest.mark.requires_display
+    def test_set_night_mode_forwards_to_worker(self, qapp):
+        """Toggling night mode switches the worker's night-mode stage."""
+        from ui.widgets import CameraWidget
+
+        widget = CameraWidget(
+            width=640,
+            height=480,
+            stream_link=None,
+            enable_capture=False,
+        )
+        worker = MagicMock()
+        widget.worker = worker
+
+        widget.set_night_mode(True)
+        worker.set_night_mode.assert_called_once_with(True)
+
+        widget.worker = None
+        widget.cleanup()
+
+    @pytest.mark.requires_display
+    def test_night_frames_render_with_red_palette(self, qapp):
+        """Luma frames and transitional colour frames both render red-tinted."""
+        from PyQt6 import QtGui
+        from core.frame_pool import FramePool
+        from ui.widgets import CameraWidget
+
+        widget = CameraWidget(
+            width=640,
+            height=480,
+            stream_link=None,
+            enable_capture=False,
+        )
+        widget.set_night_mode(True)
+        pool = FramePool(3)
+
+        luma = pool.lease((24, 32))
+        luma.array[...] = 160
+        widget.on_frame(luma)
+        widget._render_latest_frame()
+        assert widget._pixmap_cache.toImage().pixelColor(0, 0) == QtGui.QColor(160, 0, 0)
+
+        colour = pool.lease((24, 32, 3))
+        colour.array[...] = 100
+        widget.on_frame(colour)
+        widget._render_latest_frame()
+        assert widget._pixmap_cache.toImage().pixelColor(0, 0) == QtGui.QColor(160, 0, 0)
+
+        widget._release_current_frame()
+        widget.cleanup()
+
 
 class TestWidgetCleanup:
     """Test widget cleanup and resource release."""
@@ -331,10 +382,293 @@ class TestDynamicFPS:
             ui_fps=15,
         )
         
-        # UI FPS is adjusted to account for RENDER_OVERHEAD_MS
-        # The actual ui_render_fps may differ slightly from the requested value
+        # The frame clock rounds the rate to a refresh-rate divisor
         widget.set_dynamic_ui_fps(10)
         # Just verify it's at or above minimum
         assert widget.ui_render_fps >= config.MIN_DYNAMIC_UI_FPS
         
         widget.cleanup()
+
+
+class TestFrameLeases:
+    """Test that the widget releases frame leases deterministically."""
+
+    @pytest.mark.requires_display
+    def test_on_frame_releases_previous_lease(self, qapp):
+        """Replacing the latest frame releases the previous lease."""
+        from core.frame_pool import FramePool
+        from ui.widgets import CameraWidget
+
+        widget = CameraWidget(
+            width=640,
+            height=480,
+            stream_link=None,
+            enable_capture=False,
+        )
+        pool = FramePool(3)
+        first = pool.lease((4, 4, 3))
+        second = pool.lease((4, 4, 3))
+
+        widget.on_frame(first)
+        widget.on_frame(second)
+        assert first.released
+        assert not second.released
+
+        widget._release_current_frame()
+        assert second.released
+        assert pool.stats()["outstanding"] == 0
+
+        widget.cleanup()
+
+    @pytest.mark.requires_display
+    def test_unrendered_replacement_counts_as_wasted(self, qapp):
+        """A frame replaced before any render tick is counted as wasted."""
+        from core.frame_pool import FramePool
+        from ui.widgets import CameraWidget
+
+        widget = CameraWidget(
+            width=640,
+            height=480,
+            stream_link=None,
+            enable_capture=False,
+        )
+        pool = FramePool(3)
+        widget.on_frame(pool.lease((4, 4, 3)))
+        widget.on_frame(pool.lease((4, 4, 3)))
+
+        assert widget.get_render_stats()["wasted_frames"] == 1
+
+        widget._release_current_frame()
+        widget.cleanup()
+
+
+class TestRgb32Frames:
+    """Test display of 32-bit BGRx frames."""
+
+    @pytest.mark.requires_display
+    def test_four_channel_frame_renders_as_rgb32(self, qapp):
+        """A BGRx frame is wrapped as Format_RGB32 with its colors intact."""
+        from PyQt6 import QtGui
+        from core.frame_pool import FramePool
+        from ui.widgets import CameraWidget
+
+        widget = CameraWidget(
+            width=640,
+            height=480,
+            stream_link=None,
+            enable_capture=False,
+        )
+        lease = FramePool(3).lease((24, 32, 4))
+        lease.array[...] = (10, 20, 30, 255)
+
+        widget.on_frame(lease)
+        widget._render_latest_frame()
+
+        image = widget._pixmap_cache.toImage()
+        assert image.pixelColor(0, 0) == QtGui.QColor(30, 20, 10)
+
+        widget._release_current_frame()
+        widget.cleanup()
+
+
+class TestOutputSizeNegotiation:
+    """Test that the widget publishes its display size to the worker."""
+
+    @pytest.mark.requires_display
+    def test_render_publishes_label_size(self, qapp):
+        """Rendering sends the label's device-pixel size to the worker once."""
+        from core.frame_pool import FramePool
+        from ui.widgets import CameraWidget
+
+        widget = CameraWidget(
+            width=640,
+            height=480,
+            stream_link=None,
+            enable_capture=False,
+        )
+        widget.video_label.resize(320, 240)
+        worker = MagicMock()
+        worker.mailbox.take.return_value = None
+        widget.worker = worker
+
+        widget.on_frame(FramePool(3).lease((240, 320, 3)))
+        widget._render_latest_frame()
+        widget._frame_id += 1
+        widget._render_latest_frame()
+
+        dpr = widget.video_label.devicePixelRatioF()
+        worker.set_output_size.assert_called_once_with(
+            (round(320 * dpr), round(240 * dpr))
+        )
+
+        widget.worker = None
+        widget._release_current_frame()
+        widget.cleanup()
+
+
+class TestMosaicWidget:
+    """Test the compositor mosaic tile."""
+
+    @pytest.mark.requires_display
+    def test_mosaic_starts_compositor_worker(self, qapp):
+        """The mosaic tile starts a single worker for all its cameras."""
+        from ui.widgets import MosaicWidget
+
+        with patch("ui.widgets.GstMosaicWorker") as worker_cls:
+            widget = MosaicWidget([0, 2], (1, 3), (320, 240), target_fps=15)
+
+            worker_cls.assert_called_once()
+            args = worker_cls.call_args[0]
+            assert args == ([0, 2], (1, 3), (320, 240))
+            worker_cls.return_value.start.assert_called_once()
+            assert widget.detach_camera() is None
+
+            widget.worker = None
+            widget.cleanup()
+
+    @pytest.mark.requires_display
+    def test_tap_toggles_fullscreen_without_swap(self, qapp):
+        """A release on the mosaic toggles fullscreen and never enters swap mode."""
+        from ui.widgets import MosaicWidget
+
+        with patch("ui.widgets.GstMosaicWorker"):
+            widget = MosaicWidget([0], (1, 2), (320, 240))
+        widget._press_widget_id = widget.widget_id
+        widget._press_time = 0  # very long hold
+        with patch.object(widget, "toggle_fullscreen") as toggle:
+            widget._handle_release_as_left_click()
+
+        toggle.assert_called_once()
+        assert widget.swap_active is False
+
+        widget.worker = None
+        widget.cleanup()
+
+
+class TestProcessCaptureMode:
+    """Test tiles in capture_mode = process."""
+
+    @pytest.mark.requires_display
+    def test_supervised_worker_is_not_restarted_by_widget(self, qapp, monkeypatch):
+        """The tile starts a process worker and leaves restarts to it."""
+        from core import config
+        from ui.widgets import CameraWidget
+
+        monkeypatch.setattr(config, "CAPTURE_MODE", "process")
+        with patch("ui.widgets.ProcessCaptureWorker") as worker_cls:
+            worker_cls.return_value.supervises_restarts = True
+            widget = CameraWidget(640, 480, stream_link=0, target_fps=15)
+
+            worker_cls.assert_called_once()
+            worker_cls.return_value.start.assert_called_once()
+            widget._restart_capture_if_stale()
+
+            worker_cls.return_value.stop.assert_not_called()
+            assert widget.worker is worker_cls.return_value
+
+            widget.worker = None
+            widget.cleanup()
+
+
+class TestDaemonCaptureMode:
+    """Test tiles in capture_mode = daemon."""
+
+    @pytest.mark.requires_display
+    def test_daemon_worker_and_first_frame_log(self, qapp, monkeypatch, caplog):
+        """The tile attaches through the daemon and logs its first frame once."""
+        import logging
+
+        from core import config
+        from core.frame_pool import FramePool
+        from ui.widgets import CameraWidget
+
+        monkeypatch.setattr(config, "CAPTURE_MODE", "daemon")
+        pool = FramePool(2)
+        with patch("ui.widgets.DaemonCaptureWorker") as worker_cls:
+            widget = CameraWidget(640, 480, stream_link=0, target_fps=15)
+            worker_cls.assert_called_once()
+
+            with caplog.at_level(logging.INFO):
+                widget.on_frame(pool.lease((4, 4)))
+                widget.on_frame(pool.lease((4, 4)))
+
+            logged = [r for r in caplog.records if "first frame" in r.getMessage()]
+            assert len(logged) == 1
+            assert "after launch" in logged[0].getMessage()
+
+            widget.worker = None
+            widget.cleanup()
+
+
+class TestPlaceholderTiles:
+    """Test that empty slots stay off the frame clock and draw cached text."""
+
+    @pytest.mark.requires_display
+    def test_empty_and_settings_tiles_are_not_clocked(self, qapp):
+        """Tiles without a worker get no render or housekeeping ticks."""
+        from ui.frame_clock import get_frame_clock
+        from ui.widgets import CameraWidget
+
+        clock = get_frame_clock()
+        empty = CameraWidget(640, 480, stream_link=None, enable_capture=False)
+        settings = CameraWidget(640, 480, stream_link=None, settings_mode=True)
+
+        assert clock.effective_fps(empty) == 0.0
+        assert clock.effective_fps(settings) == 0.0
+
+        with patch("ui.widgets.CaptureWorker"):
+            empty.attach_camera(0, 15.0, (640, 480), ui_fps=15)
+        assert clock.effective_fps(empty) > 0
+
+        empty.worker.supervises_restarts = False
+        empty.detach_camera()
+        assert clock.effective_fps(empty) == 0.0
+
+        for widget in (empty, settings):
+            widget.cleanup()
+
+    @pytest.mark.requires_display
+    def test_placeholder_pixmap_shared_and_redrawn_on_resize(self, qapp):
+        """Same-sized tiles share one pixmap; a resize redraws at the new size."""
+        from ui.widgets import CameraWidget
+
+        tiles = [
+            CameraWidget(640, 480, stream_link=None, enable_capture=False)
+            for _ in range(2)
+        ]
+        for tile in tiles:
+            tile.resize(320, 240)
+            tile.show()
+        qapp.processEvents()
+
+        first, second = (tile.video_label.pixmap() for tile in tiles)
+        assert first.cacheKey() == second.cacheKey()
+        assert tiles[0].video_label.text() == ""
+        assert first.deviceIndependentSize().toSize() == tiles[0].video_label.contentsRect().size()
+
+        tiles[0].resize(200, 100)
+        qapp.processEvents()
+        resized = tiles[0].video_label.pixmap()
+        assert resized.deviceIndependentSize().toSize() == tiles[0].video_label.contentsRect().size()
+        assert resized.cacheKey() != first.cacheKey()
+
+        for tile in tiles:
+            tile.cleanup()
+            tile.close()
+
+    @pytest.mark.requires_display
+    def test_unchanged_state_does_not_restyle(self, qapp):
+        """Repeated placeholder renders and status events leave styles alone."""
+        from ui.widgets import CameraWidget
+
+        widget = CameraWidget(640, 480, stream_link=None, enable_capture=False)
+        with patch.object(widget, "setStyleSheet") as tile_style, patch.object(
+            widget.video_label, "setStyleSheet"
+        ) as label_style:
+            widget._render_placeholder("DISCONNECTED")
+            widget.on_status_changed(True)
+            widget.reset_style()
+
+        tile_style.assert_not_called()
+        label_style.assert_not_called()
+        widget.cleanup()
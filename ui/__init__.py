@@ -2,9 +2,18 @@
 
 __all__ = [
     "CameraWidget",
+    "FrameClock",
     "FullscreenOverlay",
+    "GridCompositor",
+    "MosaicWidget",
+    "VisibilityTracker",
+    "get_frame_clock",
     "get_smart_grid",
+    "get_visibility_tracker",
 ]
 
-from .widgets import CameraWidget, FullscreenOverlay
+from .compositor import GridCompositor
+from .frame_clock import FrameClock, get_frame_clock
+from .widgets import CameraWidget, FullscreenOverlay, MosaicWidget
 from .layout import get_smart_grid
+from .visibility import VisibilityTracker, get_visibility_tracker
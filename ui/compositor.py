@@ -0,0 +1,260 @@
+"""
+Grid compositor for Camera Dashboard.
+
+With ``render_mode = compositor`` the grid's container paints every tile's
+latest frame itself. A frame goes from its numpy buffer (wrapped, not
+copied, in a QImage) straight into the window in one QPainter pass,
+instead of QImage -> QPixmap -> scaled QPixmap -> QLabel -> label repaint.
+
+The CameraWidget tiles stay in the grid as children, so touch, swap and
+fullscreen handling are unchanged. They only draw their border and
+placeholder text over a transparent background. A tile with a new frame
+marks just its own rect dirty; Qt merges the rects marked during one event
+loop pass into a single paintEvent.
+
+With ``render_mode = mosaic`` the compositor goes one step further: tiles
+hand their frame leases to a core.mosaic.MosaicComposer thread, which
+resizes them into one mosaic buffer off the UI thread, and paintEvent
+presents that single image. The UI thread's per-tick cost then no longer
+grows with the number of cameras.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+from PyQt6.QtCore import Qt
+
+from core.frame_pool import FrameLease
+from core.mosaic import CellRect, MosaicComposer
+
+if TYPE_CHECKING:
+    from ui.widgets import CameraWidget
+
+
+class GridCompositor(QtWidgets.QWidget):
+    """Grid container that paints its tiles' frames in one paintEvent."""
+
+    # Matches the application stylesheet's window background.
+    BACKGROUND = QtGui.QColor("#2b2b2b")
+
+    # Red palette for night-mode luma shown as Format_Indexed8.
+    NIGHT_COLOR_TABLE = [QtGui.qRgb(i, 0, 0) for i in range(256)]
+
+    def __init__(self, parent: Optional[QtWidgets.QWidget] = None) -> None:
+        """Create an empty compositor; tiles register themselves."""
+        super().__init__(parent)
+        # Swap mode bookkeeping read by CameraWidget (see main.py).
+        self.selected_camera: Optional[CameraWidget] = None
+        self._tiles: list[CameraWidget] = []
+        # Everything exposed is painted here; skip Qt's background erase.
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, True)
+        self._paints = 0
+        self._tiles_painted = 0
+        self._paint_time = 0.0
+        # render_mode = mosaic: background composer and the mosaic on screen.
+        self.composer: Optional[MosaicComposer] = None
+        self._mosaic_image: Optional[QtGui.QImage] = None
+        self._mosaic_lease: Optional[FrameLease] = None
+        self._mosaic_dirty = QtGui.QRegion()
+
+    def enable_mosaic(self, max_fps: float) -> None:
+        """Compose tile frames on a background thread from now on."""
+        if self.composer is not None:
+            return
+        self.composer = MosaicComposer(max_fps, background=self.BACKGROUND.red())
+        self.composer.frame_ready.connect(self._on_mosaic_ready)
+        self._update_canvas()
+        self.composer.start()
+
+    def shutdown(self) -> None:
+        """Stop the mosaic composer and release the mosaic on screen."""
+        composer = self.composer
+        if composer is None:
+            return
+        self.composer = None
+        try:
+            composer.frame_ready.disconnect(self._on_mosaic_ready)
+        except Exception:
+            pass
+        composer.stop()
+        self._drop_mosaic()
+
+    def register(self, tile: CameraWidget) -> None:
+        """Paint ``tile``'s frames from now on."""
+        if tile not in self._tiles:
+            self._tiles.append(tile)
+            # Follow layout moves (swaps, resizes) in the mosaic.
+            tile.installEventFilter(self)
+
+    def unregister(self, tile: CameraWidget) -> None:
+        """Stop painting ``tile`` and clear its area."""
+        if tile in self._tiles:
+            self._tiles.remove(tile)
+            tile.removeEventFilter(self)
+            self.discard(tile)
+            self.update(tile.video_rect())
+
+    def submit(self, tile: CameraWidget, lease: FrameLease) -> None:
+        """Queue ``tile``'s new frame for the mosaic composer."""
+        if self.composer is None:
+            return
+        rect = tile.video_rect()
+        self.composer.submit(tile, lease, self._device_rect(rect))
+        self._mosaic_dirty += rect
+
+    def discard(self, tile: CameraWidget) -> None:
+        """Empty ``tile``'s mosaic cell (placeholder shown instead)."""
+        if self.composer is None:
+            return
+        self.composer.discard(tile)
+        self._mosaic_dirty += tile.video_rect()
+
+    def set_night_mode(self, enabled: bool) -> None:
+        """Switch the mosaic between colour and night-mode luma."""
+        if self.composer is not None:
+            self.composer.set_night_mode(enabled)
+            self._mosaic_dirty += self.rect()
+
+    def mark_dirty(self, tile: CameraWidget) -> None:
+        """Schedule a repaint of ``tile``'s frame area only."""
+        self.update(tile.video_rect())
+
+    def eventFilter(self, a0: Optional[QtCore.QObject], a1: Optional[QtCore.QEvent]) -> bool:  # type: ignore[override]
+        """Move a tile's mosaic cell when the layout moves or resizes the tile."""
+        if (
+            self.composer is not None
+            and a1 is not None
+            and a1.type() in (QtCore.QEvent.Type.Move, QtCore.QEvent.Type.Resize)
+            and a0 in self._tiles
+        ):
+            tile = a0
+            self.composer.move(tile, self._device_rect(tile.video_rect()))
+            self._mosaic_dirty += self.rect()
+        return False
+
+    def resizeEvent(self, a0: Optional[QtGui.QResizeEvent]) -> None:  # type: ignore[override]
+        """Resize the mosaic buffer with the grid."""
+        super().resizeEvent(a0)
+        self._update_canvas()
+
+    def _device_rect(self, rect: QtCore.QRect) -> CellRect:
+        """``rect`` in mosaic (device) pixels."""
+        dpr = self.devicePixelRatioF()
+        return (
+            round(rect.x() * dpr),
+            round(rect.y() * dpr),
+            round(rect.width() * dpr),
+            round(rect.height() * dpr),
+        )
+
+    def _update_canvas(self) -> None:
+        """Size the mosaic to the grid in device pixels."""
+        if self.composer is None:
+            return
+        _x, _y, width, height = self._device_rect(self.rect())
+        # 32-bit BGRx is the raster paint engine's native format, so the
+        # colour conversion happens on the composer thread and the paint
+        # is a plain copy.
+        self.composer.set_canvas((width, height), channels=4)
+
+    def _on_mosaic_ready(self) -> None:
+        """Present the newest mosaic and repaint the cells that changed."""
+        if self.composer is None:
+            return
+        lease = self.composer.mailbox.take()
+        if lease is None:
+            return
+        array = lease.array
+        height, width = array.shape[:2]
+        if array.ndim == 2:
+            image = QtGui.QImage(
+                array.data, width, height, width, QtGui.QImage.Format.Format_Indexed8
+            )
+            image.setColorTable(self.NIGHT_COLOR_TABLE)
+        else:
+            channels = array.shape[2]
+            image_format = (
+                QtGui.QImage.Format.Format_RGB32
+                if channels == 4
+                else QtGui.QImage.Format.Format_BGR888
+            )
+            image = QtGui.QImage(array.data, width, height, channels * width, image_format)
+        image.setDevicePixelRatio(self.devicePixelRatioF())
+        # The image wraps the buffer, so keep it leased while on screen.
+        self._drop_mosaic()
+        self._mosaic_image = image
+        self._mosaic_lease = lease
+        dirty = self._mosaic_dirty
+        self._mosaic_dirty = QtGui.QRegion()
+        self.update(dirty if not dirty.isEmpty() else QtGui.QRegion(self.rect()))
+
+    def _drop_mosaic(self) -> None:
+        """Forget the mosaic image and release its buffer."""
+        lease = self._mosaic_lease
+        self._mosaic_image = None
+        self._mosaic_lease = None
+        if lease is not None:
+            lease.release()
+
+    def paintEvent(self, a0: Optional[QtGui.QPaintEvent]) -> None:  # type: ignore[override]
+        """Draw the background and every tile frame in the exposed region."""
+        if a0 is None:
+            return
+        start = time.perf_counter()
+        region = a0.region()
+        painter = QtGui.QPainter(self)
+        try:
+            # The painter is clipped to the exposed region.
+            painter.fillRect(a0.rect(), self.BACKGROUND)
+            if self.composer is not None:
+                painted = self._paint_mosaic(painter)
+            else:
+                painted = self._paint_tiles(painter, region)
+        finally:
+            painter.end()
+        self._paints += 1
+        self._tiles_painted += painted
+        self._paint_time += time.perf_counter() - start
+
+    def _paint_tiles(self, painter: QtGui.QPainter, region: QtGui.QRegion) -> int:
+        """Draw each tile's own frame image that intersects ``region``."""
+        painted = 0
+        for tile in self._tiles:
+            if tile.isHidden():
+                continue
+            target = tile.video_rect()
+            if not region.intersects(target):
+                continue
+            image = tile.frame_image
+            if image is None:
+                painter.fillRect(target, Qt.GlobalColor.black)
+            else:
+                painter.drawImage(QtCore.QRectF(target), image)
+            painted += 1
+        return painted
+
+    def _paint_mosaic(self, painter: QtGui.QPainter) -> int:
+        """Draw the composed mosaic, which holds every tile's frame."""
+        if self._mosaic_image is None:
+            return 0
+        # Drawn at its own size so a mosaic composed before a resize is
+        # not stretched.
+        painter.drawImage(QtCore.QPointF(0, 0), self._mosaic_image)
+        return 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return paint events, images painted and mean paint time.
+
+        In mosaic mode the composer's statistics are included.
+        """
+        stats: dict[str, Any] = {
+            "paints": self._paints,
+            "tiles_painted": self._tiles_painted,
+            "paint_ms": self._paint_time * 1000.0 / self._paints if self._paints else 0.0,
+        }
+        if self.composer is not None:
+            stats.update(self.composer.stats())
+        return stats
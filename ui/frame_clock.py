@@ -0,0 +1,198 @@
+"""
+Shared render scheduler for Camera Dashboard.
+
+FrameClock replaces the per-tile render, status and FPS timers. Each tile
+used to run its own QTimer at its UI rate whether or not a frame had
+arrived, plus a 5 s status timer and an optional 1 s FPS timer, all out of
+step with each other and with the display.
+
+The clock runs on a grid of display refresh ticks (QScreen.refreshRate).
+A tile's UI rate becomes a divisor of the refresh rate, and the tile
+renders on refresh ticks that are multiples of its divisor. Tiles at the
+same rate therefore always render in the same tick. A tile is ticked only
+after its worker signals a new frame (or something else requests a
+render), and the single precise timer is armed just for the next due
+tick. With nothing to draw the clock sleeps, apart from one 1 Hz
+housekeeping timer that covers stale-frame checks and status logging for
+every tile.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+from PyQt6 import QtCore, QtGui
+from PyQt6.QtCore import QTimer
+
+from core import config
+
+if TYPE_CHECKING:
+    from ui.widgets import CameraWidget
+
+# Used when no screen reports a refresh rate (e.g. offscreen platform).
+DEFAULT_REFRESH_HZ = 60.0
+
+
+def screen_refresh_hz() -> float:
+    """Refresh rate of the primary screen, or DEFAULT_REFRESH_HZ."""
+    screen = QtGui.QGuiApplication.primaryScreen()
+    rate = screen.refreshRate() if screen is not None else 0.0
+    return rate if rate >= 1.0 else DEFAULT_REFRESH_HZ
+
+
+class FrameClock(QtCore.QObject):
+    """Ticks registered tiles on display refresh boundaries when they have work."""
+
+    # Housekeeping period and how many of them between status logs.
+    HOUSEKEEPING_MS = 1000
+    STATUS_EVERY = 5
+
+    def __init__(
+        self, refresh_hz: Optional[float] = None, parent: Optional[QtCore.QObject] = None
+    ) -> None:
+        """Create an idle clock; ``refresh_hz`` defaults to the primary screen's."""
+        super().__init__(parent)
+        self.refresh_hz = float(refresh_hz or screen_refresh_hz())
+        self.period = 1.0 / self.refresh_hz
+        # Insertion-ordered so tiles render in grid order within a tick.
+        self._divisors: dict[CameraWidget, int] = {}
+        self._pending: dict[CameraWidget, None] = {}
+        self._next_tick: Optional[int] = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._on_tick)
+        self._housekeeping = QTimer(self)
+        self._housekeeping.setInterval(self.HOUSEKEEPING_MS)
+        self._housekeeping.timeout.connect(self._on_housekeeping)
+        self._housekeeping_count = 0
+        self._wakeups = 0
+        self._housekeeping_wakeups = 0
+        self._renders = 0
+        self._stats_start = time.monotonic()
+        self._last_log = self._stats_start
+
+    def divisor_for(self, ui_fps: float) -> int:
+        """Refresh ticks between renders for a tile running at ``ui_fps``."""
+        if ui_fps <= 0:
+            return 1
+        return max(1, round(self.refresh_hz / ui_fps))
+
+    def register(self, widget: CameraWidget, ui_fps: float) -> None:
+        """Schedule ``widget`` at ``ui_fps`` (0 for housekeeping only)."""
+        self._divisors[widget] = self.divisor_for(ui_fps)
+        if not self._housekeeping.isActive():
+            self._housekeeping.start()
+
+    def unregister(self, widget: CameraWidget) -> None:
+        """Stop ticking ``widget``."""
+        self._divisors.pop(widget, None)
+        self._pending.pop(widget, None)
+        if not self._divisors:
+            self._housekeeping.stop()
+        self._schedule()
+
+    def set_rate(self, widget: CameraWidget, ui_fps: float) -> None:
+        """Change ``widget``'s render rate (dynamic UI FPS)."""
+        if widget in self._divisors:
+            self._divisors[widget] = self.divisor_for(ui_fps)
+            self._schedule()
+
+    def effective_fps(self, widget: CameraWidget) -> float:
+        """Render rate ``widget`` actually gets: refresh rate over its divisor."""
+        divisor = self._divisors.get(widget)
+        return self.refresh_hz / divisor if divisor else 0.0
+
+    def request_frame(self, widget: CameraWidget) -> None:
+        """Render ``widget`` on its next due refresh tick."""
+        if widget not in self._divisors or widget in self._pending:
+            return
+        self._pending[widget] = None
+        self._schedule()
+
+    def _schedule(self) -> None:
+        """Arm the timer for the earliest tick a pending tile is due, or sleep."""
+        if not self._pending:
+            self._timer.stop()
+            self._next_tick = None
+            return
+        now = time.monotonic()
+        current = math.floor(now / self.period)
+        due = min(
+            math.ceil((current + 1) / self._divisors[w]) * self._divisors[w]
+            for w in self._pending
+        )
+        if self._timer.isActive() and self._next_tick is not None and self._next_tick <= due:
+            return
+        self._next_tick = due
+        delay_ms = max(0.0, (due * self.period - now) * 1000.0)
+        self._timer.start(int(round(delay_ms)))
+
+    def _on_tick(self) -> None:
+        """Render every pending tile whose divisor divides this tick."""
+        tick = self._next_tick
+        self._next_tick = None
+        self._wakeups += 1
+        if tick is not None:
+            due = [w for w in self._pending if tick % self._divisors.get(w, 1) == 0]
+            for widget in due:
+                self._pending.pop(widget, None)
+                self._call(widget, "_render_latest_frame")
+                self._renders += 1
+        self._schedule()
+
+    def _on_housekeeping(self) -> None:
+        """Once a second: stale checks, FPS and (every few seconds) status logs."""
+        self._housekeeping_wakeups += 1
+        self._housekeeping_count += 1
+        log_status = self._housekeeping_count % self.STATUS_EVERY == 0
+        for widget in list(self._divisors):
+            self._call(widget, "clock_housekeeping", log_status)
+        now = time.monotonic()
+        if now - self._last_log >= config.HEALTH_LOG_INTERVAL_SEC:
+            self._last_log = now
+            stats = self.stats()
+            logging.info(
+                "Frame clock refresh=%.0fHz wakeups/s=%.1f renders/s=%.1f tiles=%d",
+                self.refresh_hz,
+                stats["wakeups_per_sec"],
+                stats["renders_per_sec"],
+                stats["tiles"],
+            )
+
+    def _call(self, widget: CameraWidget, method: str, *args: Any) -> None:
+        """Call a tile method, forgetting tiles whose Qt object is gone."""
+        try:
+            getattr(widget, method)(*args)
+        except RuntimeError:
+            # Deleted on the C++ side without cleanup(); stop ticking it.
+            self._divisors.pop(widget, None)
+            self._pending.pop(widget, None)
+
+    def stats(self) -> dict[str, Any]:
+        """Return wake-ups (render and housekeeping) and renders per second."""
+        elapsed = max(time.monotonic() - self._stats_start, 1e-6)
+        wakeups = self._wakeups + self._housekeeping_wakeups
+        return {
+            "refresh_hz": self.refresh_hz,
+            "tiles": len(self._divisors),
+            "pending": len(self._pending),
+            "wakeups": wakeups,
+            "renders": self._renders,
+            "wakeups_per_sec": wakeups / elapsed,
+            "renders_per_sec": self._renders / elapsed,
+        }
+
+
+_clock: Optional[FrameClock] = None
+
+
+def get_frame_clock() -> FrameClock:
+    """Return the process-wide frame clock, creating it on first use."""
+    global _clock
+    if _clock is None:
+        _clock = FrameClock()
+    return _clock
@@ -0,0 +1,151 @@
+"""
+Tile visibility tracking for Camera Dashboard.
+
+VisibilityTracker decides which CameraWidget tiles can actually be seen
+and tells the others to suspend. A tile is hidden while another tile is
+fullscreen (the FullscreenOverlay covers the whole grid), while the main
+window is minimized, or while the display is blanked by DPMS. A hidden
+tile stops rendering and puts its capture worker in standby (see
+CaptureWorker.set_standby), and both resume as soon as it is visible again.
+
+DPMS state is read from the DRM connectors in sysfs, which is where the
+kernel reports a KMS display being powered down. X screensavers that only
+draw a black window are not detected.
+"""
+
+from __future__ import annotations
+
+import glob
+import logging
+import os
+import platform
+from typing import TYPE_CHECKING, Optional
+
+from PyQt6 import QtCore, QtWidgets
+from PyQt6.QtCore import QTimer
+
+from core import config
+
+if TYPE_CHECKING:
+    from ui.widgets import CameraWidget
+
+
+class VisibilityTracker(QtCore.QObject):
+    """Tracks fullscreen, window and display state and suspends hidden tiles."""
+
+    # DRM connector directories (each has "status" and "dpms").
+    DRM_CONNECTORS = "/sys/class/drm/card*-*"
+    DPMS_POLL_MS = 2000
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None) -> None:
+        """Create a tracker with no window; tiles register themselves."""
+        super().__init__(parent)
+        self._tiles: list[CameraWidget] = []
+        self._window: Optional[QtWidgets.QWidget] = None
+        self._minimized = False
+        self._blanked = False
+        self._dpms_timer = QTimer(self)
+        self._dpms_timer.setInterval(self.DPMS_POLL_MS)
+        self._dpms_timer.timeout.connect(self._poll_display)
+
+    def register(self, tile: CameraWidget) -> None:
+        """Track ``tile`` and apply the current visibility to it."""
+        if tile not in self._tiles:
+            self._tiles.append(tile)
+        self.refresh()
+
+    def unregister(self, tile: CameraWidget) -> None:
+        """Stop tracking ``tile``."""
+        if tile in self._tiles:
+            self._tiles.remove(tile)
+
+    def watch_window(self, window: QtWidgets.QWidget) -> None:
+        """Follow ``window``'s minimized state and, on Linux, DPMS blanking."""
+        if self._window is not None:
+            self._window.removeEventFilter(self)
+        self._window = window
+        window.installEventFilter(self)
+        self._minimized = window.isMinimized()
+        if platform.system() == "Linux" and glob.glob(self.DRM_CONNECTORS):
+            self._dpms_timer.start()
+        self.refresh()
+
+    def eventFilter(self, a0: Optional[QtCore.QObject], a1: Optional[QtCore.QEvent]) -> bool:  # type: ignore[override]
+        """Refresh when the watched window is minimized or restored."""
+        if (
+            a0 is self._window
+            and a1 is not None
+            and a1.type() == QtCore.QEvent.Type.WindowStateChange
+        ):
+            minimized = bool(self._window.isMinimized())
+            if minimized != self._minimized:
+                self._minimized = minimized
+                logging.info("Window %s", "minimized" if minimized else "restored")
+                self.refresh()
+        return False
+
+    def set_display_blanked(self, blanked: bool) -> None:
+        """Record whether the display is powered down."""
+        if blanked == self._blanked:
+            return
+        self._blanked = blanked
+        logging.info("Display %s", "blanked" if blanked else "on")
+        self.refresh()
+
+    def _poll_display(self) -> None:
+        """Check DPMS on the connected DRM outputs."""
+        blanked = display_blanked(self.DRM_CONNECTORS)
+        if blanked is not None:
+            self.set_display_blanked(blanked)
+
+    def is_visible(self, tile: CameraWidget) -> bool:
+        """True if ``tile`` can currently be seen."""
+        if self._blanked:
+            return False
+        if tile.is_fullscreen:
+            return True
+        if self._minimized:
+            return False
+        return not any(other.is_fullscreen for other in self._tiles if other is not tile)
+
+    def refresh(self) -> None:
+        """Suspend hidden tiles and resume visible ones."""
+        for tile in list(self._tiles):
+            hidden = config.SUSPEND_HIDDEN_TILES and not self.is_visible(tile)
+            try:
+                tile.set_occluded(hidden)
+            except RuntimeError:
+                # Qt object deleted without cleanup(); forget it.
+                self._tiles.remove(tile)
+
+    def hidden_count(self) -> int:
+        """Number of tiles currently suspended."""
+        return sum(1 for tile in self._tiles if tile.occluded)
+
+
+def display_blanked(pattern: str = VisibilityTracker.DRM_CONNECTORS) -> Optional[bool]:
+    """True if every connected DRM output is in DPMS off, None if unknown."""
+    states = []
+    for connector in glob.glob(pattern):
+        try:
+            with open(os.path.join(connector, "status")) as f:
+                if f.read().strip() != "connected":
+                    continue
+            with open(os.path.join(connector, "dpms")) as f:
+                states.append(f.read().strip().lower())
+        except OSError:
+            continue
+    if not states:
+        return None
+    return all(state == "off" for state in states)
+
+
+_tracker: Optional[VisibilityTracker] = None
+
+
+def get_visibility_tracker() -> VisibilityTracker:
+    """Return the process-wide visibility tracker, creating it on first use."""
+    global _tracker
+    if _tracker is None:
+        _tracker = VisibilityTracker()
+    return _tracker
@@ -11,15 +11,56 @@ import time
 from collections import deque
 from typing import Any, Callable, Optional, Union
 
-import cv2
 import numpy as np
-from numpy.typing import NDArray
 from PyQt6 import QtCore, QtGui, QtWidgets
-from PyQt6.QtCore import Qt, QTimer, pyqtSlot
+from PyQt6.QtCore import Qt, pyqtSlot
 
 from core import config
 from core.camera import CaptureWorker
-
+from core.capture_daemon import DaemonCaptureWorker
+from core.frame_pool import FrameLease
+from core.gst_mosaic import GstMosaicWorker
+from core.imaging import night_luma
+from core.process_capture import ProcessCaptureWorker
+from ui.compositor import GridCompositor
+from ui.frame_clock import get_frame_clock
+from ui.visibility import get_visibility_tracker
+from utils.helpers import seconds_since_launch
+
+# Placeholder text style (DISCONNECTED, CONNECTING...).
+PLACEHOLDER_COLOR = "#bbbbbb"
+PLACEHOLDER_FONT_PX = 24
+
+
+def placeholder_pixmap(text: str, size: QtCore.QSize, dpr: float = 1.0) -> QtGui.QPixmap:
+    """Return ``text`` centred on a transparent pixmap of ``size``.
+
+    Drawn once per (text, size, dpr) and kept in QPixmapCache, so every
+    placeholder tile of the same size shows the same shared pixmap.
+    """
+    width, height = max(1, size.width()), max(1, size.height())
+    key = f"camdash-placeholder:{text}:{width}x{height}@{dpr:g}"
+    pixmap = QtGui.QPixmapCache.find(key)
+    if pixmap is not None:
+        return pixmap
+    pixmap = QtGui.QPixmap(max(1, round(width * dpr)), max(1, round(height * dpr)))
+    pixmap.setDevicePixelRatio(dpr)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QtGui.QPainter(pixmap)
+    font = painter.font()
+    font.setPixelSize(PLACEHOLDER_FONT_PX)
+    painter.setFont(font)
+    painter.setPen(QtGui.QColor(PLACEHOLDER_COLOR))
+    painter.drawText(QtCore.QRect(0, 0, width, height), Qt.AlignmentFlag.AlignCenter, text)
+    painter.end()
+    QtGui.QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+
+def _set_style_sheet(widget: QtWidgets.QWidget, style: str) -> None:
+    """Apply ``style`` only if it differs; every setStyleSheet re-polishes."""
+    if widget.styleSheet() != style:
+        widget.setStyleSheet(style)
 
 
 class FullscreenOverlay(QtWidgets.QWidget):
@@ -68,9 +109,12 @@ class CameraWidget(QtWidgets.QWidget):
     # How long a press needs to be to enter "swap mode".
     hold_threshold_ms: int = 400
 
+    # Red palette for night-mode luma frames shown as Format_Indexed8.
+    NIGHT_COLOR_TABLE = GridCompositor.NIGHT_COLOR_TABLE
+
     # Instance type hints
     camera_stream_link: Optional[int]
-    worker: Optional[CaptureWorker]
+    worker: Optional[Union[CaptureWorker, ProcessCaptureWorker]]
     _fs_overlay: Optional[FullscreenOverlay]
 
     def __init__(
@@ -127,6 +171,19 @@ class CameraWidget(QtWidgets.QWidget):
         # Visual styles for normal and swap-ready state
         self.normal_style = "border: 2px solid #555; background: black;"
         self.swap_ready_style = "border: 6px solid #FFFF00; background: black;"
+        # render_mode = compositor: the grid container paints this tile's
+        # frames (ui.compositor), so the tile itself stays transparent.
+        self._compositor: Optional[GridCompositor] = (
+            parent if isinstance(parent, GridCompositor) and not settings_mode else None
+        )
+        # Frame handed to the compositor, with the buffer and lease backing it.
+        self.frame_image: Optional[QtGui.QImage] = None
+        self._image_array = None
+        self._image_lease: Optional[FrameLease] = None
+        if self._compositor is not None:
+            self.normal_style = "border: 2px solid #555; background: transparent;"
+            self.swap_ready_style = "border: 6px solid #FFFF00; background: transparent;"
+            self._compositor.register(self)
         self.setStyleSheet(self.normal_style)
         self.setObjectName(self.widget_id)
 
@@ -189,12 +246,21 @@ class CameraWidget(QtWidgets.QWidget):
         self.frame_count = 0
         self.prev_time = time.time()
         self._latest_frame = None
+        self._latest_lease: Optional[FrameLease] = None
         self._last_placeholder_text = None
         self._last_placeholder_fullscreen = None
+        self._last_placeholder_size: Optional[QtCore.QSize] = None
         self._frame_id = 0
         self._last_rendered_id = -1
         self._last_rendered_size = None
         self._last_frame_ts = 0.0
+        # Worker start time, until its first frame has been logged.
+        self._first_frame_wait_start: Optional[float] = None
+        # Measured render tick rate and frames replaced before being painted.
+        self._tick_count = 0
+        self._tick_window_start = time.time()
+        self._measured_render_fps = 0.0
+        self._wasted_frames = 0
         self._stale_frame_timeout_sec = config.STALE_FRAME_TIMEOUT_SEC
         self._restart_cooldown_sec = config.RESTART_COOLDOWN_SEC
         self._restart_window_sec = config.RESTART_WINDOW_SEC
@@ -207,65 +273,47 @@ class CameraWidget(QtWidgets.QWidget):
         self._pixmap_cache = QtGui.QPixmap()
         self._scaled_pixmap_cache = None
         self._scaled_pixmap_cache_size = None
+        # Device-pixel output size last sent to the worker.
+        self._negotiated_output_size: Optional[tuple[int, int]] = None
+        # Luma buffer for colour frames rendered in night mode before the
+        # worker switched to emitting night-mode luma.
         self._night_gray = None
-        self._night_bgr = None
-        # Pre-computed LUT for night mode brightness (1.6x gain, clamped to 255)
-        self._night_lut = np.clip(np.arange(256, dtype=np.float32) * 1.6, 0, 255).astype(np.uint8)
 
         # Base FPS is the desired target; current FPS is adjusted dynamically.
         self.base_target_fps = target_fps
         self.current_target_fps = target_fps
 
+        # Render, FPS and status ticks come from the shared frame clock.
+        self._clock = get_frame_clock()
+        # True while the tile cannot be seen (see ui.visibility).
+        self.occluded = False
+
+        # The frame clock renders this tile at most every refresh-rate
+        # divisor of ui_fps, and only when a new frame is waiting; its
+        # housekeeping tick covers stale checks, FPS and status logs. Only
+        # tiles with a worker are on the clock (see _sync_clock).
+        if not self.settings_mode:
+            self.ui_render_fps = max(1, int(ui_fps))
+            self.base_ui_fps = self.ui_render_fps  # Store original for FPS recovery
+        else:
+            self.ui_render_fps = 0
+            self.base_ui_fps = 0
+
         # Start capture worker in background thread (if enabled)
         self.worker = None
         if self.capture_enabled and stream_link is not None:
             cap_w, cap_h = (
                 request_capture_size if request_capture_size else (None, None)
             )
-            self.worker = CaptureWorker(
-                stream_link,
-                parent=self,
-                target_fps=target_fps,
-                capture_width=cap_w,
-                capture_height=cap_h,
-            )
-            self.worker.frame_ready.connect(self.on_frame)
-            self.worker.status_changed.connect(self.on_status_changed)
-            self.worker.start()
+            self._start_worker(stream_link, target_fps, cap_w, cap_h)
         elif not self.settings_mode:
             # No capture: set placeholder immediately
             self._latest_frame = None
             self._render_placeholder(self.placeholder_text or "DISCONNECTED")
 
-        # Timer to render latest frame at a stable UI FPS.
-        # Compensate for render overhead to hit actual target FPS.
-        if not self.settings_mode:
-            self.ui_render_fps = max(1, int(ui_fps))
-            self.base_ui_fps = self.ui_render_fps  # Store original for FPS recovery
-            interval = max(1, int(1000 / self.ui_render_fps) - config.RENDER_OVERHEAD_MS)
-            self.render_timer = QTimer(self)
-            self.render_timer.setInterval(interval)
-            self.render_timer.timeout.connect(self._render_latest_frame)
-            self.render_timer.start()
-        else:
-            self.ui_render_fps = 0
-            self.base_ui_fps = 0
-            self.render_timer = None
-
-        # Optional UI FPS diagnostics (only for real cameras)
-        if self.capture_enabled and not self.settings_mode and config.UI_FPS_LOGGING:
-            self.ui_timer = QTimer(self)
-            self.ui_timer.setInterval(1000)
-            self.ui_timer.timeout.connect(self._print_fps)
-            self.ui_timer.start()
-        else:
-            self.ui_timer = None
-
-        # Periodic status logging for observability.
-        self._status_timer = QTimer(self)
-        self._status_timer.setInterval(5000)
-        self._status_timer.timeout.connect(self._log_status)
-        self._status_timer.start()
+        # Suspended while covered by a fullscreen tile, minimized or blanked.
+        self._visibility = get_visibility_tracker()
+        self._visibility.register(self)
 
         self.installEventFilter(self)
         self.video_label.installEventFilter(self)
@@ -283,15 +331,21 @@ class CameraWidget(QtWidgets.QWidget):
         if self._fs_overlay is None:
             self._fs_overlay = FullscreenOverlay(self.exit_fullscreen)
 
-    def _apply_ui_fps(self, ui_fps: int) -> None:
-        """Update UI render timer to match camera UI FPS.
+    def _sync_clock(self) -> None:
+        """Keep this tile on the frame clock only while it has a worker.
 
-        Compensates for render overhead to achieve actual target FPS.
+        Placeholder and settings tiles have nothing to render or check, so
+        they are left off the clock entirely and change only on events.
         """
+        if self.worker is not None and not self.settings_mode:
+            self._clock.register(self, self.ui_render_fps)
+        else:
+            self._clock.unregister(self)
+
+    def _apply_ui_fps(self, ui_fps: int) -> None:
+        """Update this tile's render rate on the frame clock."""
         self.ui_render_fps = max(1, int(ui_fps))
-        if self.render_timer:
-            interval = max(1, int(1000 / self.ui_render_fps) - config.RENDER_OVERHEAD_MS)
-            self.render_timer.setInterval(interval)
+        self._clock.set_rate(self, self.ui_render_fps)
 
     def attach_camera(
         self,
@@ -318,32 +372,52 @@ class CameraWidget(QtWidgets.QWidget):
             self.base_ui_fps = max(1, int(ui_fps))  # Store original for FPS recovery
 
         cap_w, cap_h = request_capture_size if request_capture_size else (None, None)
-        self.worker = CaptureWorker(
+        self._start_worker(stream_link, target_fps, cap_w, cap_h)
+
+        self._release_current_frame()
+        self._render_placeholder("CONNECTING...")
+        logging.info("Attached camera %s to widget %s", stream_link, self.widget_id)
+
+    def _start_worker(
+        self,
+        stream_link: int,
+        target_fps: Optional[float],
+        capture_width: Optional[int],
+        capture_height: Optional[int],
+    ) -> None:
+        """Create, connect and start the capture worker for this tile."""
+        # A fresh worker has no output size yet; renegotiate on next render.
+        self._negotiated_output_size = None
+        # capture_mode = process runs the capture in a supervised child
+        # process, capture_mode = daemon in the shared capture daemon.
+        worker_class = {
+            "process": ProcessCaptureWorker,
+            "daemon": DaemonCaptureWorker,
+        }.get(config.CAPTURE_MODE, CaptureWorker)
+        self._first_frame_wait_start = time.monotonic()
+        self.worker = worker_class(
             stream_link,
             parent=self,
             target_fps=target_fps,
-            capture_width=cap_w,
-            capture_height=cap_h,
+            capture_width=capture_width,
+            capture_height=capture_height,
         )
-        self.worker.frame_ready.connect(self.on_frame)
+        self.worker.set_night_mode(self.night_mode_enabled)
+        if self.occluded:
+            self.worker.set_standby(config.HIDDEN_CAPTURE_FPS)
+        self.worker.frame_ready.connect(self.on_frame_ready)
         self.worker.status_changed.connect(self.on_status_changed)
         self.worker.start()
-
-        if self.ui_timer is None and config.UI_FPS_LOGGING:
-            self.ui_timer = QTimer(self)
-            self.ui_timer.setInterval(1000)
-            self.ui_timer.timeout.connect(self._print_fps)
-            self.ui_timer.start()
-
-        self._latest_frame = None
-        self._render_placeholder("CONNECTING...")
-        logging.info("Attached camera %s to widget %s", stream_link, self.widget_id)
+        self._sync_clock()
 
     def eventFilter(self, a0: QtCore.QObject, a1: QtCore.QEvent) -> bool:  # type: ignore[override]
         """Handle touch and mouse events from widget or label."""
         if a0 not in (self, self.video_label) or a1 is None:
             return super().eventFilter(a0, a1)
 
+        if a0 is self.video_label and a1.type() == QtCore.QEvent.Type.Resize:
+            self._on_label_resized()
+
         if a1.type() == QtCore.QEvent.Type.TouchBegin:
             return self._on_touch_begin(a1)
         if a1.type() == QtCore.QEvent.Type.TouchEnd:
@@ -531,9 +605,12 @@ class CameraWidget(QtWidgets.QWidget):
         self._fs_overlay.raise_()
         self._fs_overlay.activateWindow()
         self.is_fullscreen = True
+        # The overlay covers every other tile.
+        self._visibility.refresh()
 
         if self._latest_frame is None and not self.settings_mode:
             self._render_placeholder(self.placeholder_text or "DISCONNECTED")
+        self._request_render()
 
     def exit_fullscreen(self) -> None:
         """Exit fullscreen and return to grid view."""
@@ -542,47 +619,122 @@ class CameraWidget(QtWidgets.QWidget):
         if self._fs_overlay:
             self._fs_overlay.hide()
         self.is_fullscreen = False
+        self._visibility.refresh()
+        self._request_render()
+
+    def set_occluded(self, occluded: bool) -> None:
+        """Suspend this tile while it cannot be seen, or resume it.
+
+        While occluded the tile is not rendered and its worker publishes at
+        most HIDDEN_CAPTURE_FPS (0 = grab only). On resume the worker goes
+        back to full rate and the newest frame is rendered on the next tick.
+        """
+        occluded = bool(occluded)
+        if occluded == self.occluded or self.settings_mode:
+            return
+        self.occluded = occluded
+        if self.worker is not None:
+            self.worker.set_standby(config.HIDDEN_CAPTURE_FPS if occluded else None)
+        logging.debug("Widget %s %s", self.widget_id, "suspended" if occluded else "resumed")
+        if not occluded:
+            if self._last_frame_ts:
+                # No frames were expected while hidden; restart the stale clock.
+                self._last_frame_ts = time.time()
+            self._last_rendered_size = None
+            self._request_render()
+
+    def _request_render(self) -> None:
+        """Ask the frame clock to render this tile unless it is occluded."""
+        if not self.occluded:
+            self._clock.request_frame(self)
+
+    @pyqtSlot()
+    def on_frame_ready(self) -> None:
+        """Wake-up from the worker: a new frame is waiting in its mailbox.
+
+        Asks the frame clock for a render on this tile's next due refresh
+        tick. Only the first frame (nothing displayed yet) is pulled here so
+        the tile leaves its placeholder promptly; otherwise the render tick
+        pulls the frame right before painting it, so nothing is taken only
+        to be replaced unseen. Wake-ups are re-armed by the render tick, so
+        at most one is delivered per render.
+        """
+        if self.worker is None:
+            return
+        if self._latest_frame is None:
+            lease = self.worker.mailbox.take(rearm=False)
+            if lease is not None:
+                self.on_frame(lease)
+        self._request_render()
+
+    def _pull_latest_frame(self) -> None:
+        """Take the newest frame from the worker mailbox and re-arm wake-ups."""
+        if self.worker is None:
+            return
+        lease = self.worker.mailbox.take()
+        if lease is not None:
+            self.on_frame(lease)
 
-    @pyqtSlot(object)
-    def on_frame(self, frame_bgr: NDArray[np.uint8]) -> None:
-        """Receive latest camera frame from worker."""
+    def on_frame(self, lease: FrameLease) -> None:
+        """Install a frame lease as the latest frame to render."""
         try:
-            if frame_bgr is None:
+            if lease is None:
                 return
-            # Return previous frame to pool before updating _latest_frame.
-            # Note: Both on_frame (signal/slot) and _render_latest_frame (timer)
-            # run on the main thread via Qt's event loop, so no actual race exists.
-            # We return before updating as a defensive pattern for clarity.
-            previous_frame = self._latest_frame
-            if previous_frame is not None and self.worker is not None:
-                try:
-                    self.worker.return_frame(previous_frame)
-                except Exception:
-                    logging.debug("Failed to return frame to pool", exc_info=True)
-            # Now safe to update the latest frame
-            self._latest_frame = frame_bgr
+            # Release the previous lease before taking the new one; both this
+            # slot and _render_latest_frame run on the main thread.
+            previous = self._latest_lease
+            self._latest_lease = lease
+            self._latest_frame = lease.array
+            if previous is not None:
+                if self._frame_id != self._last_rendered_id:
+                    # Replaced before it was ever painted.
+                    self._wasted_frames += 1
+                previous.release()
             self._frame_id += 1
             self._last_frame_ts = time.time()
+            if self._first_frame_wait_start is not None:
+                self._log_first_frame()
         except Exception:
             logging.exception("on_frame")
 
-    def _release_current_frame(self, worker: Optional[CaptureWorker] = None) -> None:
-        """Return current frame buffer to pool and clear reference."""
-        if self._latest_frame is None:
-            return
-        if worker is None:
-            worker = self.worker
-        if worker is not None:
-            try:
-                worker.return_frame(self._latest_frame)
-            except Exception:
-                logging.debug("Failed to return frame to pool", exc_info=True)
+    def _log_first_frame(self) -> None:
+        """Log time-to-first-frame since the worker started and since launch."""
+        waited = time.monotonic() - (self._first_frame_wait_start or 0.0)
+        self._first_frame_wait_start = None
+        since_launch = seconds_since_launch()
+        logging.info(
+            "Camera %s first frame %.0f ms after worker start (%s after launch)",
+            self.camera_stream_link,
+            waited * 1000.0,
+            "%.0f ms" % (since_launch * 1000.0) if since_launch is not None else "n/a",
+        )
+
+    def _release_current_frame(self) -> None:
+        """Release the current frame lease back to its pool."""
+        lease = self._latest_lease
+        self._latest_lease = None
         self._latest_frame = None
+        if lease is not None:
+            lease.release()
 
     def _dispose_worker(self, worker: CaptureWorker) -> None:
         """Disconnect and schedule a worker for deletion."""
+        worker.mailbox.clear()
         try:
-            worker.frame_ready.disconnect(self.on_frame)
+            pool = worker.get_pool_stats()
+            logging.info(
+                "Camera %s frame pool at dispose: hit_rate=%.0f%% outstanding=%d "
+                "leaked=%d allocations=%d",
+                worker.stream_link,
+                pool["hit_rate"] * 100.0,
+                pool["outstanding"],
+                pool["leaked"],
+                pool["allocations"],
+            )
+        except Exception:
+            pass
+        try:
+            worker.frame_ready.disconnect(self.on_frame_ready)
         except Exception:
             pass
         try:
@@ -596,34 +748,51 @@ class CameraWidget(QtWidgets.QWidget):
             pass
 
     def _render_placeholder(self, text: str) -> None:
-        """Render placeholder text when no frame is available."""
+        """Render placeholder text when no frame is available.
+
+        The text is drawn once per text and size into a cached pixmap
+        (see placeholder_pixmap), so no label text or stylesheet changes
+        and same-sized tiles share one pixmap.
+        """
         if self.settings_mode:
             return
+        if self.is_fullscreen and self._fs_overlay:
+            target_label = self._fs_overlay.label
+            size = self._fs_overlay.size()
+        else:
+            target_label = self.video_label
+            size = self.video_label.contentsRect().size()
         if (
             text == self._last_placeholder_text
             and not self.swap_active
             and self.is_fullscreen == self._last_placeholder_fullscreen
+            and size == self._last_placeholder_size
         ):
             return
-        target_label = (
-            self._fs_overlay.label
-            if (self.is_fullscreen and self._fs_overlay)
-            else self.video_label
-        )
-        target_label.setPixmap(QtGui.QPixmap())
-        target_label.setText(text)
-        target_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        target_label.setStyleSheet("color: #bbbbbb; font-size: 24px;")
+        if self._compositor is not None and target_label is self.video_label:
+            self._drop_frame_image()
+            self._compositor.discard(self)
+            self.video_label.show()
+            self._compositor.mark_dirty(self)
+        target_label.setPixmap(placeholder_pixmap(text, size, target_label.devicePixelRatioF()))
         self._last_placeholder_text = text
         self._last_placeholder_fullscreen = self.is_fullscreen
+        self._last_placeholder_size = size
         if self.swap_active:
-            self.setStyleSheet(self.swap_ready_style)
+            _set_style_sheet(self, self.swap_ready_style)
+
+    def _on_label_resized(self) -> None:
+        """Redraw a showing placeholder at the label's new size."""
+        if self._last_placeholder_text is not None and not self.is_fullscreen:
+            self._render_placeholder(self._last_placeholder_text)
 
     def _render_latest_frame(self) -> None:
         """Convert latest frame to QPixmap and display it."""
         if self.settings_mode:
             return
         try:
+            self._note_render_tick()
+            self._pull_latest_frame()
             frame_bgr = self._latest_frame
             if frame_bgr is None:
                 self._render_placeholder(self.placeholder_text or "DISCONNECTED")
@@ -646,8 +815,13 @@ class CameraWidget(QtWidgets.QWidget):
                 self._restart_capture_if_stale()
                 return
 
+            composited = self._compositor is not None and not (
+                self.is_fullscreen and self._fs_overlay
+            )
             if self.is_fullscreen and self._fs_overlay:
                 target_size = self._fs_overlay.size()
+            elif composited:
+                target_size = self.video_rect().size()
             else:
                 target_size = self.video_label.size()
 
@@ -657,128 +831,223 @@ class CameraWidget(QtWidgets.QWidget):
             ):
                 return
 
-            if self.night_mode_enabled:
-                try:
-                    if frame_bgr.ndim == 2:
-                        h, w = frame_bgr.shape
-                    else:
-                        h, w = frame_bgr.shape[:2]
-
-                    # Lazy allocate night mode buffers (only once per resolution)
-                    if self._night_gray is None or self._night_gray.shape != (h, w):
-                        self._night_gray = np.empty((h, w), dtype=np.uint8)
-                    if self._night_bgr is None or self._night_bgr.shape[:2] != (h, w):
-                        # Use contiguous array for efficient Qt buffer access
-                        self._night_bgr = np.zeros((h, w, 3), dtype=np.uint8, order='C')
-
-                    if frame_bgr.ndim == 2:
-                        # Apply brightness LUT directly to grayscale (in-place)
-                        cv2.LUT(frame_bgr, self._night_lut, dst=self._night_gray)
-                    else:
-                        # Convert to grayscale, then apply brightness LUT (in-place)
-                        cv2.cvtColor(
-                            frame_bgr, cv2.COLOR_BGR2GRAY, dst=self._night_gray
-                        )
-                        cv2.LUT(self._night_gray, self._night_lut, dst=self._night_gray)
-
-                    # Optimized: only update red channel, B/G stay zero from allocation
-                    # Use direct slice assignment (faster than np.copyto for this pattern)
-                    self._night_bgr[:, :, 2] = self._night_gray
-                    frame_bgr = self._night_bgr
-                except Exception:
-                    logging.debug("Night mode processing failed", exc_info=True)
+            self._publish_output_size(target_size)
+
+            if composited and self._compositor.composer is not None:
+                # render_mode = mosaic: the composer thread resizes and
+                # converts the frame; nothing else to do on the UI thread.
+                self._compositor.submit(self, self._latest_lease)
+                if not self.video_label.isHidden():
+                    self.video_label.hide()
+                self._note_frame_rendered(target_size)
+                return
+
+            # Night mode frames normally arrive from the worker as one-channel
+            # luma; colour frames captured before the toggle are reduced
+            # here so switching is instant.
+            if self.night_mode_enabled and frame_bgr.ndim != 2:
+                self._night_gray = night_luma(frame_bgr, dst=self._night_gray)
+                frame_bgr = self._night_gray
 
-            # Convert numpy frame to Qt image, handling grayscale or BGR.
             # Ensure contiguous memory layout for direct buffer access (avoids copy).
             if not frame_bgr.flags['C_CONTIGUOUS']:
                 frame_bgr = np.ascontiguousarray(frame_bgr)
+            img = self._frame_to_image(frame_bgr)
+
+            if composited:
+                self._show_composited(img, frame_bgr)
+            else:
+                self._pixmap_cache.convertFromImage(img)
 
-            if frame_bgr.ndim == 2:
-                h, w = frame_bgr.shape[:2]
-                bytes_per_line = w
+                # Fullscreen scales to screen size; grid uses label size.
+                if self.is_fullscreen and self._fs_overlay:
+                    self._present_pixmap(self._fs_overlay.label, target_size)
+                else:
+                    self._present_pixmap(self.video_label, target_size)
+
+            self._note_frame_rendered(target_size)
+        except Exception:
+            logging.exception("render frame")
+
+    def _note_frame_rendered(self, target_size: QtCore.QSize) -> None:
+        """Remember what was rendered so unchanged frames are skipped."""
+        self._last_rendered_id = self._frame_id
+        self._last_rendered_size = target_size
+        self._last_placeholder_text = None
+        self._last_placeholder_fullscreen = None
+        self._last_placeholder_size = None
+        if config.UI_FPS_LOGGING:
+            self.frame_count += 1
+
+    def _frame_to_image(self, frame_bgr: np.ndarray) -> QtGui.QImage:
+        """Wrap a contiguous frame in a QImage without copying it.
+
+        Handles night-mode luma (red palette), grayscale, BGR and 32-bit
+        BGRx frames.
+        """
+        if frame_bgr.ndim == 2:
+            h, w = frame_bgr.shape[:2]
+            bytes_per_line = w
+            if self.night_mode_enabled:
                 img = QtGui.QImage(
                     frame_bgr.data,
                     w,
                     h,
                     bytes_per_line,
-                    QtGui.QImage.Format.Format_Grayscale8,
+                    QtGui.QImage.Format.Format_Indexed8,
                 )
+                img.setColorTable(self.NIGHT_COLOR_TABLE)
             else:
-                h, w = frame_bgr.shape[:2]
-                ch = frame_bgr.shape[2] if frame_bgr.ndim > 2 else 1
-                bytes_per_line = ch * w
                 img = QtGui.QImage(
                     frame_bgr.data,
                     w,
                     h,
                     bytes_per_line,
-                    QtGui.QImage.Format.Format_BGR888,
+                    QtGui.QImage.Format.Format_Grayscale8,
                 )
+        else:
+            h, w = frame_bgr.shape[:2]
+            ch = frame_bgr.shape[2] if frame_bgr.ndim > 2 else 1
+            bytes_per_line = ch * w
+            # 32-bit BGRx frames (output_format = rgb32) are already in
+            # the pixmap's native layout, so convertFromImage just copies.
+            image_format = (
+                QtGui.QImage.Format.Format_RGB32
+                if ch == 4
+                else QtGui.QImage.Format.Format_BGR888
+            )
+            img = QtGui.QImage(
+                frame_bgr.data,
+                w,
+                h,
+                bytes_per_line,
+                image_format,
+            )
+        return img
 
-            self._pixmap_cache.convertFromImage(img)
+    def video_rect(self) -> QtCore.QRect:
+        """Frame area of this tile (inside its border) in parent coordinates."""
+        return self.geometry().marginsRemoved(self._layout.contentsMargins())
 
-            # Fullscreen scales to screen size; grid uses label size.
-            if self.is_fullscreen and self._fs_overlay:
-                if target_size.width() > 0 and target_size.height() > 0:
-                    if (
-                        self._scaled_pixmap_cache is None
-                        or self._scaled_pixmap_cache_size != target_size
-                    ):
-                        self._scaled_pixmap_cache = QtGui.QPixmap(target_size)
-                        self._scaled_pixmap_cache_size = target_size
-                    self._scaled_pixmap_cache.fill(Qt.GlobalColor.black)
-                    target_rect = QtCore.QRect(
-                        0, 0, target_size.width(), target_size.height()
-                    )
-                    painter = QtGui.QPainter(self._scaled_pixmap_cache)
-                    painter.drawPixmap(target_rect, self._pixmap_cache)
-                    painter.end()
-                    self._fs_overlay.label.setPixmap(self._scaled_pixmap_cache)
-                else:
-                    self._fs_overlay.label.setPixmap(self._pixmap_cache)
-                self._fs_overlay.label.setText("")
-            else:
-                if (
-                    target_size.width() > 0
-                    and target_size.height() > 0
-                    and self._pixmap_cache.size() != target_size
-                ):
-                    if (
-                        self._scaled_pixmap_cache is None
-                        or self._scaled_pixmap_cache_size != target_size
-                    ):
-                        self._scaled_pixmap_cache = QtGui.QPixmap(target_size)
-                        self._scaled_pixmap_cache_size = target_size
-                    self._scaled_pixmap_cache.fill(Qt.GlobalColor.black)
-                    target_rect = QtCore.QRect(
-                        0, 0, target_size.width(), target_size.height()
-                    )
-                    painter = QtGui.QPainter(self._scaled_pixmap_cache)
-                    painter.drawPixmap(target_rect, self._pixmap_cache)
-                    painter.end()
-                    self.video_label.setPixmap(self._scaled_pixmap_cache)
-                else:
-                    self.video_label.setPixmap(self._pixmap_cache)
-                self.video_label.setText("")
+    def _show_composited(self, img: QtGui.QImage, array: np.ndarray) -> None:
+        """Hand a frame to the grid compositor and repaint this tile's rect.
 
-            self._last_rendered_id = self._frame_id
-            self._last_rendered_size = target_size
-            self._last_placeholder_text = None
-            self._last_placeholder_fullscreen = None
-            if config.UI_FPS_LOGGING:
-                self.frame_count += 1
-        except Exception:
-            logging.exception("render frame")
+        The QImage wraps the frame buffer, so the buffer's lease is held
+        until the next frame replaces the image.
+        """
+        lease = self._latest_lease.acquire() if self._latest_lease is not None else None
+        self._drop_frame_image()
+        self.frame_image = img
+        self._image_array = array
+        self._image_lease = lease
+        if not self.video_label.isHidden():
+            self.video_label.hide()
+        self._compositor.mark_dirty(self)
+
+    def _drop_frame_image(self) -> None:
+        """Forget the compositor frame and release the buffer behind it."""
+        lease = self._image_lease
+        self.frame_image = None
+        self._image_array = None
+        self._image_lease = None
+        if lease is not None:
+            lease.release()
+
+    def _present_pixmap(self, label: QtWidgets.QLabel, target_size: QtCore.QSize) -> None:
+        """Show ``_pixmap_cache`` on ``label``, scaling on the UI thread only if needed.
+
+        When the worker already delivered a frame at the label's device-pixel
+        size (see _publish_output_size) the pixmap is set directly and no
+        QPainter pass is needed.
+        """
+        dpr = label.devicePixelRatioF()
+        target_px = QtCore.QSize(
+            max(1, round(target_size.width() * dpr)),
+            max(1, round(target_size.height() * dpr)),
+        )
+        if (
+            target_size.width() <= 0
+            or target_size.height() <= 0
+            or self._pixmap_cache.size() == target_px
+        ):
+            self._pixmap_cache.setDevicePixelRatio(dpr)
+            label.setPixmap(self._pixmap_cache)
+        else:
+            if (
+                self._scaled_pixmap_cache is None
+                or self._scaled_pixmap_cache_size != target_px
+            ):
+                self._scaled_pixmap_cache = QtGui.QPixmap(target_px)
+                self._scaled_pixmap_cache.setDevicePixelRatio(dpr)
+                self._scaled_pixmap_cache_size = target_px
+            self._scaled_pixmap_cache.fill(Qt.GlobalColor.black)
+            target_rect = QtCore.QRect(0, 0, target_size.width(), target_size.height())
+            painter = QtGui.QPainter(self._scaled_pixmap_cache)
+            painter.drawPixmap(target_rect, self._pixmap_cache)
+            painter.end()
+            label.setPixmap(self._scaled_pixmap_cache)
+        label.setText("")
+
+    def _publish_output_size(self, target_size: QtCore.QSize) -> None:
+        """Tell the worker the device-pixel size frames are displayed at.
+
+        The worker then resizes in the capture thread (INTER_AREA) so the UI
+        only blits. Called from the render tick, so entering or leaving
+        fullscreen renegotiates automatically.
+        """
+        if self.worker is None:
+            return
+        target = (
+            self._fs_overlay.label
+            if (self.is_fullscreen and self._fs_overlay)
+            else self.video_label
+        )
+        dpr = target.devicePixelRatioF()
+        size = (
+            round(target_size.width() * dpr),
+            round(target_size.height() * dpr),
+        )
+        if size == self._negotiated_output_size:
+            return
+        self._negotiated_output_size = size
+        self.worker.set_output_size(size)
+        logging.debug("Camera %s output size -> %dx%d", self.camera_stream_link, *size)
+
+    def _note_render_tick(self) -> None:
+        """Measure the actual render tick rate and report it to the worker."""
+        self._tick_count += 1
+        now = time.time()
+        elapsed = now - self._tick_window_start
+        if elapsed < 1.0:
+            return
+        self._measured_render_fps = self._tick_count / elapsed
+        self._tick_count = 0
+        self._tick_window_start = now
+        if config.COUPLE_CAPTURE_TO_RENDER and self.worker is not None:
+            # Renders follow frames now, so couple to the rate the clock
+            # offers this tile rather than the (frame-limited) render rate.
+            self.worker.set_consumer_fps(self._clock.effective_fps(self))
+
+    def get_render_stats(self) -> dict[str, Any]:
+        """Return measured render rate and frames emitted but never rendered."""
+        wasted = self._wasted_frames
+        if self.worker is not None:
+            wasted += self.worker.get_mailbox_stats()["overwritten"]
+        return {
+            "render_fps": self._measured_render_fps,
+            "wasted_frames": wasted,
+        }
 
     @pyqtSlot(bool)
     def on_status_changed(self, online: bool) -> None:
         """Update UI when camera goes online or offline."""
         if online:
             # Preserve yellow border if swap mode is active
-            self.setStyleSheet(
-                self.swap_ready_style if self.swap_active else self.normal_style
+            _set_style_sheet(
+                self, self.swap_ready_style if self.swap_active else self.normal_style
             )
             self.video_label.setText("")
+            self._last_placeholder_text = None
             self._last_frame_ts = time.time()
         else:
             self._release_current_frame()
@@ -787,13 +1056,13 @@ class CameraWidget(QtWidgets.QWidget):
 
     def reset_style(self) -> None:
         """Restore default border styling and margins."""
-        self.video_label.setStyleSheet("")
+        _set_style_sheet(self.video_label, "")
         if self.swap_active:
             self._layout.setContentsMargins(6, 6, 6, 6)
-            self.setStyleSheet(self.swap_ready_style)
+            _set_style_sheet(self, self.swap_ready_style)
         else:
             self._layout.setContentsMargins(2, 2, 2, 2)
-            self.setStyleSheet(self.normal_style)
+            _set_style_sheet(self, self.normal_style)
 
     def _print_fps(self) -> None:
         """Log rendering FPS for this widget."""
@@ -810,6 +1079,27 @@ class CameraWidget(QtWidgets.QWidget):
         except Exception:
             logging.debug("FPS logging exception", exc_info=True)
 
+    def clock_housekeeping(self, log_status: bool) -> None:
+        """Once-a-second work driven by the frame clock.
+
+        Runs the render tick even without a new frame so stale frames are
+        caught, logs UI FPS and, when ``log_status`` is set, the periodic
+        status line. Only tiles with a worker are on the clock.
+        """
+        if self.settings_mode:
+            return
+        if self.occluded:
+            # Keep the newest keep-alive frame ready for an instant resume.
+            self._pull_latest_frame()
+            if self._last_frame_ts:
+                self._last_frame_ts = max(self._last_frame_ts, time.time() - 1.0)
+        else:
+            self._render_latest_frame()
+        if self.capture_enabled:
+            self._print_fps()
+        if log_status:
+            self._log_status()
+
     def set_dynamic_fps(self, fps: Optional[float]) -> None:
         """Apply dynamic FPS change from stress monitor."""
         if fps is None or not self.capture_enabled:
@@ -837,9 +1127,15 @@ class CameraWidget(QtWidgets.QWidget):
             logging.exception("set_dynamic_ui_fps")
 
     def _restart_capture_if_stale(self) -> None:
-        """Restart the capture worker after a stale frame timeout."""
+        """Restart the capture worker after a stale frame timeout.
+
+        Workers that supervise their own restarts (capture processes) are
+        left alone.
+        """
         if not self.capture_enabled or not self.worker:
             return
+        if self.worker.supervises_restarts:
+            return
         now = time.time()
         if (now - self._last_restart_ts) < self._restart_cooldown_sec:
             return
@@ -901,16 +1197,7 @@ class CameraWidget(QtWidgets.QWidget):
         if self.camera_stream_link is None:
             return
         
-        self.worker = CaptureWorker(
-            self.camera_stream_link,
-            parent=self,
-            target_fps=target_fps,
-            capture_width=cap_w,
-            capture_height=cap_h,
-        )
-        self.worker.frame_ready.connect(self.on_frame)
-        self.worker.status_changed.connect(self.on_status_changed)
-        self.worker.start()
+        self._start_worker(self.camera_stream_link, target_fps, cap_w, cap_h)
         self._render_placeholder("CONNECTING...")
 
     def _log_status(self) -> None:
@@ -924,20 +1211,78 @@ class CameraWidget(QtWidgets.QWidget):
             return
         self._last_status_log_ts = now
         format_fourcc = "unknown"
+        stats: dict[str, Any] = {}
+        pool: dict[str, Any] = {}
+        mailbox: dict[str, int] = {}
+        decode: dict[str, Any] = {}
         if self.worker is not None:
             format_fourcc = self.worker.get_fourcc()
+            stats = self.worker.get_capture_stats()
+            pool = self.worker.get_pool_stats()
+            mailbox = self.worker.get_mailbox_stats()
+            decode = self.worker.get_decode_stats()
+        render = self.get_render_stats()
         logging.info(
-            "Camera %s status online=%s fps=%.1f ui_fps=%d fourcc=%s",
+            "Camera %s status online=%s fps=%.1f ui_fps=%d fourcc=%s "
+            "grabbed=%d decoded=%d emitted=%d emit_fps=%.1f jitter=%.1fms "
+            "zero_copy=%d/%d decode_scale=1/%d decode_ms=%.1f decode_q=%d "
+            "pool_hit=%.0f%% leases=%d leaked=%d allocs/s=%.1f "
+            "wasted=%d render_fps=%.1f wakeups=%d backend=%s latency=%.1fms "
+            "driver_drops=%d device_fps=%.1f rate_changes=%d "
+            "delivered_fps=%.1f exposure_limited=%s "
+            "proc_restarts=%d proc_crashes=%d hidden=%s standby_skips=%d",
             self.camera_stream_link,
             "yes" if self._latest_frame is not None else "no",
             float(self.current_target_fps or 0),
             int(self.ui_render_fps or 0),
             format_fourcc,
+            stats.get("grabbed", 0),
+            stats.get("decoded", 0),
+            stats.get("emitted", 0),
+            stats.get("emit_fps", 0.0),
+            stats.get("jitter_ms", 0.0),
+            stats.get("retrieve_in_place", 0),
+            stats.get("decoded", 0),
+            stats.get("decode_scale", 1),
+            decode.get("decode_ms", 0.0),
+            decode.get("pending", 0) + decode.get("in_flight", 0),
+            pool.get("hit_rate", 0.0) * 100.0,
+            pool.get("outstanding", 0),
+            pool.get("leaked", 0),
+            pool.get("allocations_per_sec", 0.0),
+            render["wasted_frames"],
+            render["render_fps"],
+            mailbox.get("wakeups", 0),
+            stats.get("backend", "none"),
+            stats.get("pipeline_latency_ms", 0.0),
+            stats.get("driver_dropped", 0),
+            stats.get("device_fps", 0.0),
+            stats.get("hw_rate_changes", 0),
+            stats.get("delivered_fps", 0.0),
+            "yes" if stats.get("exposure_limited") else "no",
+            stats.get("process_restarts", 0),
+            stats.get("process_crashes", 0),
+            "yes" if self.occluded else "no",
+            stats.get("standby_skips", 0),
         )
 
     def set_night_mode(self, enabled: bool) -> None:
-        """Enable or disable night mode rendering."""
-        self.night_mode_enabled = bool(enabled)
+        """Enable or disable night mode rendering.
+
+        The worker switches to emitting night-mode luma; the current frame is
+        re-rendered on the next tick so the change shows immediately.
+        """
+        enabled = bool(enabled)
+        if enabled == self.night_mode_enabled:
+            return
+        self.night_mode_enabled = enabled
+        if self.worker is not None:
+            self.worker.set_night_mode(enabled)
+        if self._compositor is not None:
+            self._compositor.set_night_mode(enabled)
+        # Force the unchanged-frame check in _render_latest_frame to repaint.
+        self._last_rendered_size = None
+        self._request_render()
 
     def set_night_mode_button_label(self, enabled: bool) -> None:
         """Update settings tile button label for night mode."""
@@ -948,17 +1293,13 @@ class CameraWidget(QtWidgets.QWidget):
     def cleanup(self) -> None:
         """Stop the capture worker thread cleanly."""
         try:
-            if self.render_timer is not None and self.render_timer.isActive():
-                self.render_timer.stop()
-            if self.ui_timer is not None and self.ui_timer.isActive():
-                self.ui_timer.stop()
-            if self._status_timer is not None and self._status_timer.isActive():
-                self._status_timer.stop()
+            self._clock.unregister(self)
+            self._visibility.unregister(self)
 
             worker = self.worker if hasattr(self, "worker") else None
             if worker:
                 try:
-                    worker.frame_ready.disconnect(self.on_frame)
+                    worker.frame_ready.disconnect(self.on_frame_ready)
                 except Exception:
                     pass
                 try:
@@ -969,7 +1310,7 @@ class CameraWidget(QtWidgets.QWidget):
                     worker.stop()
                 except Exception:
                     logging.debug("Error stopping worker during cleanup", exc_info=True)
-                self._release_current_frame(worker)
+                self._release_current_frame()
                 self._dispose_worker(worker)
                 self.worker = None
 
@@ -982,6 +1323,12 @@ class CameraWidget(QtWidgets.QWidget):
                     pass
                 self._fs_overlay = None
                 self.is_fullscreen = False
+
+            if self._compositor is not None:
+                self._compositor.unregister(self)
+                self._drop_frame_image()
+            # Tiles this one covered while fullscreen become visible again.
+            self._visibility.refresh()
         except Exception:
             pass
 
@@ -1002,9 +1349,10 @@ class CameraWidget(QtWidgets.QWidget):
                 worker.stop()
             except Exception:
                 logging.debug("Error stopping worker during detach", exc_info=True)
-            self._release_current_frame(worker)
+            self._release_current_frame()
             self._dispose_worker(worker)
             self.worker = None
+        self._sync_clock()
         
         # Reset to placeholder state
         self.capture_enabled = False
@@ -1022,3 +1370,78 @@ class CameraWidget(QtWidgets.QWidget):
         
         logging.info("Detached camera %s from widget %s", detached_index, self.widget_id)
         return detached_index
+
+
+class MosaicWidget(CameraWidget):
+    """Single tile spanning the camera grid, fed by one compositor pipeline.
+
+    Used for ``capture_mode = gst_mosaic``: every camera is mixed into one
+    frame by GStreamer, so the UI uploads one image per tick instead of one
+    per camera. The settings tile is laid over the empty top-left cell.
+    Tiles can't be swapped, and a short tap fullscreens the whole mosaic.
+    """
+
+    def __init__(
+        self,
+        camera_indexes: list[int],
+        grid: tuple[int, int],
+        cell_size: tuple[int, int],
+        parent: Optional[QtWidgets.QWidget] = None,
+        target_fps: Optional[float] = None,
+        request_capture_size: Optional[tuple[int, int]] = (640, 480),
+        ui_fps: int = 15,
+    ) -> None:
+        """Create the mosaic tile and start its compositor worker."""
+        self.mosaic_cameras = list(camera_indexes)
+        self.mosaic_grid = grid
+        self.mosaic_cell_size = cell_size
+        super().__init__(
+            1,
+            1,
+            "mosaic",  # type: ignore[arg-type]
+            parent=parent,
+            target_fps=target_fps,
+            request_capture_size=request_capture_size,
+            ui_fps=ui_fps,
+            enable_capture=True,
+        )
+
+    def _start_worker(
+        self,
+        stream_link: int,
+        target_fps: Optional[float],
+        capture_width: Optional[int],
+        capture_height: Optional[int],
+    ) -> None:
+        """Create, connect and start the compositor worker."""
+        self._negotiated_output_size = None
+        self._first_frame_wait_start = time.monotonic()
+        self.worker = GstMosaicWorker(
+            self.mosaic_cameras,
+            self.mosaic_grid,
+            self.mosaic_cell_size,
+            parent=self,
+            target_fps=target_fps,
+            capture_width=capture_width,
+            capture_height=capture_height,
+        )
+        self.worker.set_night_mode(self.night_mode_enabled)
+        if self.occluded:
+            self.worker.set_standby(config.HIDDEN_CAPTURE_FPS)
+        self.worker.frame_ready.connect(self.on_frame_ready)
+        self.worker.status_changed.connect(self.on_status_changed)
+        self.worker.start()
+        self._sync_clock()
+
+    def _handle_release_as_left_click(self) -> bool:
+        """Short tap toggles fullscreen; swap mode does not apply to the mosaic."""
+        try:
+            if self._press_widget_id == self.widget_id:
+                self.toggle_fullscreen()
+        finally:
+            self._reset_mouse_state()
+        return True
+
+    def detach_camera(self) -> Optional[int]:
+        """The mosaic is never detached; cameras are re-read on restart."""
+        return None
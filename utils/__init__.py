@@ -4,10 +4,14 @@ __all__ = [
     "run_cmd",
     "kill_device_holders",
     "log_health_summary",
+    "mark_restart",
+    "seconds_since_launch",
 ]
 
 from .helpers import (
     run_cmd,
     kill_device_holders,
     log_health_summary,
+    mark_restart,
+    seconds_since_launch,
 )
@@ -13,7 +13,7 @@ import shlex
 import signal
 import subprocess
 import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from ui.widgets import CameraWidget
@@ -81,6 +81,8 @@ def kill_device_holders(device_path: str, grace: float = 0.4) -> bool:
         pids = get_pids_from_fuser(device_path)
 
     pids.discard(os.getpid())
+    # Capture processes must never kill the dashboard that spawned them.
+    pids.discard(os.getppid())
     if not pids:
         return False
 
@@ -109,6 +111,40 @@ def kill_device_holders(device_path: str, grace: float = 0.4) -> bool:
     return True
 
 
+# Environment variable carrying the restart time across restart_app()'s exec.
+RESTART_TS_ENV = "CAMERA_DASHBOARD_RESTART_TS"
+
+
+def mark_restart() -> None:
+    """Record the current time for the process about to be exec'd."""
+    os.environ[RESTART_TS_ENV] = repr(time.time())
+
+
+def seconds_since_launch() -> Optional[float]:
+    """Seconds since the last restart_app(), or since this process started.
+
+    exec keeps the pid and its start time, so a restart is timed from the
+    mark_restart() stamp; a fresh start from /proc/self/stat. None if
+    neither is available.
+    """
+    stamp = os.environ.get(RESTART_TS_ENV)
+    if stamp:
+        try:
+            return max(0.0, time.time() - float(stamp))
+        except ValueError:
+            pass
+    try:
+        with open("/proc/self/stat", "r") as f:
+            # Fields after the parenthesised command name; starttime is field 22.
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime", "r") as f:
+            uptime = float(f.read().split()[0])
+        started = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+    return max(0.0, uptime - started)
+
+
 def log_health_summary(
     camera_widgets: list["CameraWidget"],
     placeholder_slots: list["CameraWidget"],
@@ -155,8 +191,11 @@ def log_health_summary(
             else:
                 online += 1
     
+    threads, ctx_total, ctx_rate = _context_switch_rate(now)
+
     logging.info(
-        "Health cameras online=%d stale=%d unhealthy_workers=%d/%d placeholders=%d active=%d failed=%d",
+        "Health cameras online=%d stale=%d unhealthy_workers=%d/%d placeholders=%d active=%d failed=%d "
+        "threads=%d ctx_switches=%d (%.0f/s)",
         online,
         stale,
         unhealthy_workers,
@@ -164,4 +203,27 @@ def log_health_summary(
         len(placeholder_slots),
         len(active_indexes),
         len(failed_indexes),
+        threads,
+        ctx_total,
+        ctx_rate,
     )
+
+
+# (timestamp, total) of the previous context switch sample.
+_last_ctx_sample: Optional[tuple[float, int]] = None
+
+
+def _context_switch_rate(now: float) -> tuple[int, int, float]:
+    """Return (threads, total context switches, switches/s since last call)."""
+    global _last_ctx_sample
+    from core.performance import read_context_switches
+
+    counts = read_context_switches()
+    if counts is None:
+        return 0, 0, 0.0
+    total = counts["voluntary"] + counts["involuntary"]
+    rate = 0.0
+    if _last_ctx_sample is not None and now > _last_ctx_sample[0]:
+        rate = max(0, total - _last_ctx_sample[1]) / (now - _last_ctx_sample[0])
+    _last_ctx_sample = (now, total)
+    return counts["threads"], total, rate